@@ -0,0 +1,112 @@
+"""
+敌人AI规划基准：进程内规划 vs 多进程工作池
+
+用法:
+    python benchmarks/bench_ai_worker_pool.py [--ticks 120] [--processes 4]
+
+对不同敌人数量分别统计：
+- 进程内：主线程每帧完整执行 plan_batch 的耗时
+- 工作池：主线程每帧的耗时（生成快照 + 提交 + 取回上一帧结果）
+- 工作池吞吐：等待全部规划完成时的每帧耗时（反映总计算能力）
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game_engine.ai_worker_pool import AIWorkerPool, build_world_snapshot, plan_batch
+
+GRID = 50
+COLS, ROWS = 28, 21
+
+
+def make_world(enemy_count: int, seed: int = 1234):
+    """构造一个不依赖 pygame 的合成世界（随机砖墙 + 2 名玩家 + N 个敌人）。"""
+    rng = random.Random(seed)
+    walls = []
+    occupied = set()
+    wall_id = 1
+    for gx in range(COLS):
+        for gy in range(ROWS):
+            if gy >= ROWS - 2 or rng.random() > 0.25:
+                continue
+            walls.append(SimpleNamespace(
+                wall_id=wall_id, wall_type=1, x=gx * GRID, y=gy * GRID, width=GRID, height=GRID,
+                active=True, passable=False, shoot_through=False, destructible=True))
+            occupied.add((gx, gy))
+            wall_id += 1
+    walls.append(SimpleNamespace(
+        wall_id=wall_id, wall_type=5, x=13 * GRID, y=20 * GRID, width=GRID, height=GRID,
+        active=True, passable=False, shoot_through=False, destructible=True))
+
+    def free_cell():
+        while True:
+            gx, gy = rng.randrange(COLS), rng.randrange(ROWS)
+            if (gx, gy) not in occupied:
+                return gx * GRID + 10, gy * GRID + 10
+
+    tanks = []
+    for tank_id in (1, 2):
+        x, y = free_cell()
+        tanks.append(SimpleNamespace(tank_id=tank_id, tank_type="player", x=x, y=y, width=30, height=30,
+                                     active=True, shield_active=False))
+    for i in range(enemy_count):
+        x, y = free_cell()
+        tanks.append(SimpleNamespace(tank_id=10 + i, tank_type="enemy", x=x, y=y, width=30, height=30,
+                                     active=True, shield_active=False))
+    bullets = [SimpleNamespace(x=rng.randrange(COLS * GRID), y=rng.randrange(ROWS * GRID),
+                               velocity_x=5, velocity_y=0, active=True) for _ in range(enemy_count)]
+    return SimpleNamespace(width=COLS * GRID, height=ROWS * GRID, walls=walls, tanks=tanks, bullets=bullets)
+
+
+def bench(enemy_count: int, ticks: int, pool: AIWorkerPool):
+    world = make_world(enemy_count)
+    requests = [(t.tank_id, "hell", {}, 1.0, 1.0) for t in world.tanks if t.tank_type == "enemy"]
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        plan_batch(build_world_snapshot(world, GRID), requests)
+    inproc_ms = (time.perf_counter() - start) * 1000 / ticks
+
+    # 主线程开销：不等待结果，规划延迟一帧取回
+    pool.collect(wait=True)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        pool.collect()
+        pool.submit(build_world_snapshot(world, GRID), requests)
+    main_ms = (time.perf_counter() - start) * 1000 / ticks
+    pool.collect(wait=True)
+
+    # 吞吐：每帧等待全部结果
+    start = time.perf_counter()
+    for _ in range(ticks):
+        pool.submit(build_world_snapshot(world, GRID), requests)
+        pool.collect(wait=True)
+    throughput_ms = (time.perf_counter() - start) * 1000 / ticks
+    return inproc_ms, main_ms, throughput_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="敌人AI规划基准")
+    parser.add_argument("--ticks", type=int, default=120)
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--enemies", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    pool = AIWorkerPool(args.processes)
+    try:
+        print(f"进程数: {args.processes}, 每组帧数: {args.ticks}")
+        print(f"{'敌人数':>6} | {'进程内 ms/帧':>12} | {'工作池主线程 ms/帧':>18} | {'工作池吞吐 ms/帧':>16}")
+        for n in args.enemies:
+            inproc_ms, main_ms, throughput_ms = bench(n, args.ticks, pool)
+            print(f"{n:>6} | {inproc_ms:>12.3f} | {main_ms:>18.3f} | {throughput_ms:>16.3f}")
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
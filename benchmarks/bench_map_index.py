@@ -0,0 +1,91 @@
+"""
+地图列表基准：逐个解析地图 JSON 与地图索引（冷启动 / 索引文件命中 / 内存命中）的对比
+
+用法:
+    python benchmarks/bench_map_index.py [--maps 300] [--repeat 5]
+
+以 maps/ 下最大的地图为模板，在临时目录中复制出指定数量的地图，分别统计：
+- full_parse：旧实现，每次 json.load 全部地图文件
+- index_cold：没有索引文件，首次建立索引
+- index_disk：新进程启动，从索引文件读取（只 stat 地图文件）
+- index_warm：同一实例再次刷新列表（打开地图选择界面）
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.map_index import MapIndex
+
+MAPS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'maps'))
+
+
+def template_map():
+    """maps/ 下体积最大的地图数据。"""
+    paths = [os.path.join(MAPS_DIR, name) for name in os.listdir(MAPS_DIR) if name.endswith(".json")]
+    with open(max(paths, key=os.path.getsize), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def full_parse(maps_dir):
+    maps = []
+    for filename in os.listdir(maps_dir):
+        if filename.endswith(".json"):
+            with open(os.path.join(maps_dir, filename), 'r', encoding='utf-8') as f:
+                map_data = json.load(f)
+            maps.append({"name": map_data.get("name"), "wall_count": len(map_data.get("wall_grid_data", []))})
+    return maps
+
+
+def timed(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="地图列表索引基准")
+    parser.add_argument("--maps", type=int, default=300, help="生成的地图数量")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数（取最小值）")
+    args = parser.parse_args()
+
+    map_data = template_map()
+    with tempfile.TemporaryDirectory() as tmp:
+        maps_dir = os.path.join(tmp, "maps")
+        os.makedirs(maps_dir)
+        for i in range(args.maps):
+            with open(os.path.join(maps_dir, f"map_{i}.json"), 'w', encoding='utf-8') as f:
+                json.dump(dict(map_data, name=f"地图 {i}"), f, indent=2, ensure_ascii=False)
+        size_kb = sum(os.path.getsize(os.path.join(maps_dir, name)) for name in os.listdir(maps_dir)) / 1024
+        index_path = os.path.join(tmp, "map_index.json")
+
+        def cold():
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            MapIndex(index_path).list_maps(maps_dir)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = {"full_parse": timed(lambda: full_parse(maps_dir), args.repeat),
+                       "index_cold": timed(cold, args.repeat)}
+            results["index_disk"] = timed(lambda: MapIndex(index_path).list_maps(maps_dir), args.repeat)
+            warm = MapIndex(index_path)
+            warm.list_maps(maps_dir)
+            results["index_warm"] = timed(lambda: warm.list_maps(maps_dir), args.repeat)
+
+    print(f"{args.maps} 张地图（共 {size_kb:.0f} KB，{args.repeat} 次取最小值）")
+    for name, seconds in results.items():
+        speedup = results["full_parse"] / seconds if seconds else float("inf")
+        print(f"  {name:<12} {seconds * 1000:>9.2f} ms  {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+网络消息压缩基准：使用 maps/ 下的真实地图构造 game_start 消息
+
+用法:
+    python benchmarks/bench_network_compression.py [--repeat 200]
+
+对每张地图统计原始字节数、各压缩级别下实际发送字节数、压缩比，
+以及单条消息的压缩/解压耗时（走 NetworkManager 的真实编码路径）。
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.game_config import config
+from src.network.network_manager import NetworkManager
+from src.utils.map_loader import MapLoader
+
+MAPS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'maps'))
+
+
+def game_start_message(map_name, map_data):
+    """与 NetworkManager.send_game_start 生成的消息结构一致。"""
+    return {
+        "type": "game_start",
+        "payload": {
+            "p1_tank_id": 1,
+            "p2_tank_id": 2,
+            "map_name": map_name,
+            "game_mode": "coop",
+            "map_data": map_data,
+        },
+    }
+
+
+def bench_message(message, level, repeat):
+    nm = NetworkManager()
+    nm._peer_compression = "zlib"
+    config.NETWORK_COMPRESS_LEVEL = level
+    line = nm._encode_line(message)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        nm._encode_line(message)
+    encode_us = (time.perf_counter() - start) * 1e6 / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        nm._parse_line(line)
+    decode_us = (time.perf_counter() - start) * 1e6 / repeat
+    return len(line), encode_us, decode_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="网络消息压缩基准")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9])
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = MapLoader(MAPS_DIR)
+        maps = [(m["name"], loader.load_map(m["name"])) for m in loader.get_available_maps()]
+
+    print(f"{'地图':<18} {'原始B':>8} " + " ".join(f"{'L' + str(lv) + ' B':>8} {'比率':>5} {'压缩us':>7} {'解压us':>7}" for lv in args.levels))
+    totals = {lv: 0 for lv in args.levels}
+    raw_total = 0
+    for name, data in maps:
+        if not data:
+            continue
+        message = game_start_message(name, data)
+        raw = NetworkManager()
+        raw_size = len(raw._encode_line(message))
+        raw_total += raw_size
+        cells = []
+        for lv in args.levels:
+            size, enc, dec = bench_message(message, lv, args.repeat)
+            totals[lv] += size
+            cells.append(f"{size:>8} {raw_size / size:>5.1f} {enc:>7.1f} {dec:>7.1f}")
+        print(f"{name:<18} {raw_size:>8} " + " ".join(cells))
+    print(f"{'合计':<18} {raw_total:>8} " + " ".join(
+        f"{totals[lv]:>8} {raw_total / max(1, totals[lv]):>5.1f} {'':>7} {'':>7}" for lv in args.levels))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+寻路微基准：旧版 _next_direction_via_path vs pathfinding 模块
+
+用法:
+    python benchmarks/bench_pathfinding.py [--calls 300]
+
+对比项：
+- legacy：旧实现（每次调用重建危险度图，元组字典 A*，回溯整条路径）
+- new/rebuild：新实现，每次调用都重建导航网格（相当于单个敌人）
+- new/shared：一帧内多个敌人共享同一导航网格（每帧只重建一次）
+- new/cached：网格未变化时，相同起终点直接命中缓存
+- astar vs jps：代价均匀的空旷网格上 A* 与跳点搜索对比
+"""
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_ai_worker_pool import make_world, GRID
+from src.game_engine.pathfinding import NavGrid, GridPathfinder
+
+UP, RIGHT, DOWN, LEFT = 0, 1, 2, 3
+LOS_PENALTY = 4.0
+
+
+# ---------------------------------------------------------------------- #
+# 旧实现（逐行摘自原 EnemyAIController，作为对照）
+# ---------------------------------------------------------------------- #
+def _legacy_closest_free_cell(world, gx, gy, cols, rows):
+    if 0 <= gx < cols and 0 <= gy < rows:
+        if not any(
+            w.active and not getattr(w, "passable", False)
+            and int(w.x // GRID) == gx and int(w.y // GRID) == gy
+            for w in world.walls
+        ):
+            return (gx, gy)
+    q = deque([(gx, gy)])
+    visited = {(gx, gy)}
+    while q:
+        x, y = q.popleft()
+        if 0 <= x < cols and 0 <= y < rows:
+            if not any(
+                w.active and not getattr(w, "passable", False)
+                and int(w.x // GRID) == x and int(w.y // GRID) == y
+                for w in world.walls
+            ):
+                return (x, y)
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx, ny = x + dx, y + dy
+            if (nx, ny) not in visited and -1 <= nx <= cols and -1 <= ny <= rows:
+                visited.add((nx, ny))
+                q.append((nx, ny))
+    return (max(0, min(cols - 1, gx)), max(0, min(rows - 1, gy)))
+
+
+def _legacy_line_clear(a, b, blocked):
+    ax, ay = a
+    bx, by = b
+    if ax == bx:
+        step = 1 if by > ay else -1
+        for y in range(ay + step, by, step):
+            if (ax, y) in blocked:
+                return False
+    elif ay == by:
+        step = 1 if bx > ax else -1
+        for x in range(ax + step, bx, step):
+            if (x, ay) in blocked:
+                return False
+    return True
+
+
+def legacy_next_direction(world, tank, target):
+    cols = max(1, world.width // GRID)
+    rows = max(1, world.height // GRID)
+    start = _legacy_closest_free_cell(world, int((tank.x + tank.width * 0.5) // GRID), int((tank.y + tank.height * 0.5) // GRID), cols, rows)
+    goal = _legacy_closest_free_cell(world, int((target.x + target.width * 0.5) // GRID), int((target.y + target.height * 0.5) // GRID), cols, rows)
+    if start == goal:
+        return None
+    blocked = set()
+    for w in world.walls:
+        if w.active and not getattr(w, "passable", False):
+            blocked.add((int(w.x // GRID), int(w.y // GRID)))
+    danger = [[1.0 for _ in range(rows)] for _ in range(cols)]
+    for bx, by in blocked:
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nx, ny = bx + dx, by + dy
+                if 0 <= nx < cols and 0 <= ny < rows:
+                    danger[nx][ny] += 3.0
+    for p in world.tanks:
+        if p.tank_type != "player" or not p.active:
+            continue
+        px, py = int(p.x // GRID), int(p.y // GRID)
+        for dx in range(-3, 4):
+            for dy in range(-3, 4):
+                nx, ny = px + dx, py + dy
+                if 0 <= nx < cols and 0 <= ny < rows:
+                    danger[nx][ny] += max(0, 4 - (abs(dx) + abs(dy))) * 1.5
+        for x in range(cols):
+            if _legacy_line_clear((px, py), (x, py), blocked):
+                danger[x][py] += LOS_PENALTY
+        for y in range(rows):
+            if _legacy_line_clear((px, py), (px, y), blocked):
+                danger[px][y] += LOS_PENALTY
+    for b in world.bullets:
+        if not b.active:
+            continue
+        bx, by = int(b.x // GRID), int(b.y // GRID)
+        if 0 <= bx < cols and 0 <= by < rows:
+            danger[bx][by] += 7
+            dx = 1 if b.velocity_x > 0 else -1 if b.velocity_x < 0 else 0
+            dy = 1 if b.velocity_y > 0 else -1 if b.velocity_y < 0 else 0
+            for i in range(1, 4):
+                sx, sy = bx + dx * i, by + dy * i
+                if 0 <= sx < cols and 0 <= sy < rows:
+                    danger[sx][sy] += 3
+
+    open_set = [(0, start)]
+    came_from = {start: None}
+    g_score = {start: 0}
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        if current == goal:
+            break
+        cx, cy = current
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx, ny = cx + dx, cy + dy
+            if nx < 0 or ny < 0 or nx >= cols or ny >= rows or (nx, ny) in blocked:
+                continue
+            tentative = g_score[current] + danger[nx][ny]
+            if tentative < g_score.get((nx, ny), float("inf")):
+                g_score[(nx, ny)] = tentative
+                came_from[(nx, ny)] = current
+                heapq.heappush(open_set, (tentative + abs(nx - goal[0]) + abs(ny - goal[1]), (nx, ny)))
+    if goal not in came_from:
+        return None
+    step = goal
+    while came_from[step] and came_from[step] != start:
+        step = came_from[step]
+    return _direction(start, step)
+
+
+def _direction(start, step):
+    nx, ny = step
+    sx, sy = start
+    if nx > sx:
+        return RIGHT
+    if nx < sx:
+        return LEFT
+    if ny > sy:
+        return DOWN
+    if ny < sy:
+        return UP
+    return None
+
+
+def new_next_direction(world, tank, target, nav, finder, rebuild=True, max_expansions=None, use_jps=False):
+    if rebuild:
+        nav.mark_dirty()
+    nav.refresh(world, GRID, LOS_PENALTY)
+    start = nav.closest_free_cell(int((tank.x + tank.width * 0.5) // GRID), int((tank.y + tank.height * 0.5) // GRID))
+    goal = nav.closest_free_cell(int((target.x + target.width * 0.5) // GRID), int((target.y + target.height * 0.5) // GRID))
+    if start == goal:
+        return None
+    step = finder.first_step(nav, nav.index(*start), nav.index(*goal), max_expansions=max_expansions, use_jps=use_jps)
+    if step < 0:
+        return None
+    return _direction(start, nav.cell(step))
+
+
+def timed(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="寻路微基准")
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--enemies", type=int, default=8)
+    args = parser.parse_args()
+
+    world = make_world(args.enemies)
+    cols, rows = world.width // GRID, world.height // GRID
+    enemies = [t for t in world.tanks if t.tank_type == "enemy"]
+    player = next(t for t in world.tanks if t.tank_type == "player")
+
+    # 正确性：不设扩展上限时，新旧实现方向一致
+    nav, finder = NavGrid(cols, rows), GridPathfinder(cols, rows)
+    mismatches = sum(
+        1 for e in enemies
+        if legacy_next_direction(world, e, player) != new_next_direction(world, e, player, nav, finder)
+    )
+    print(f"方向一致性: {len(enemies) - mismatches}/{len(enemies)}")
+
+    results = []
+    results.append(("legacy (每次重建)", timed(lambda: [legacy_next_direction(world, e, player) for e in enemies], args.calls)))
+
+    def new_rebuild():
+        finder.clear_cache()
+        for e in enemies:
+            new_next_direction(world, e, player, nav, finder, rebuild=True)
+    results.append(("new/rebuild (每次重建)", timed(new_rebuild, args.calls)))
+
+    def new_shared():
+        finder.clear_cache()
+        nav.mark_dirty()
+        for e in enemies:
+            new_next_direction(world, e, player, nav, finder, rebuild=False)
+    results.append(("new/shared (每帧重建一次)", timed(new_shared, args.calls)))
+
+    def new_cached():
+        for e in enemies:
+            new_next_direction(world, e, player, nav, finder, rebuild=False)
+    new_cached()
+    results.append(("new/cached (网格未变)", timed(new_cached, args.calls)))
+
+    def new_capped():
+        finder.clear_cache()
+        nav.mark_dirty()
+        for e in enemies:
+            new_next_direction(world, e, player, nav, finder, rebuild=False, max_expansions=100)
+    results.append(("new/shared + 扩展上限100", timed(new_capped, args.calls)))
+
+    print(f"\n{len(enemies)} 个敌人 / 帧，{args.calls} 帧")
+    for name, us in results:
+        print(f"  {name:<28} {us:>10.1f} us/帧")
+
+    # 代价均匀网格：A* vs JPS
+    rng = random.Random(7)
+    open_nav = NavGrid(cols, rows)
+    open_nav.blocked = bytearray(1 if rng.random() < 0.12 else 0 for _ in range(cols * rows))
+    open_nav.cost = [1.0] * (cols * rows)
+    open_nav.uniform = True
+    free = [i for i in range(cols * rows) if not open_nav.blocked[i]]
+    pairs = [tuple(rng.sample(free, 2)) for _ in range(50)]
+    uniform_finder = GridPathfinder(cols, rows, cache_size=0)
+
+    def run(use_jps):
+        for s, g in pairs:
+            uniform_finder.first_step(open_nav, s, g, use_jps=use_jps)
+            uniform_finder.clear_cache()
+
+    print(f"\n代价均匀网格，{len(pairs)} 组起终点")
+    print(f"  {'A*':<28} {timed(lambda: run(False), max(1, args.calls // 10)):>10.1f} us/组")
+    print(f"  {'JPS':<28} {timed(lambda: run(True), max(1, args.calls // 10)):>10.1f} us/组")
+
+
+if __name__ == "__main__":
+    main()
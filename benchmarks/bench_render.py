@@ -0,0 +1,103 @@
+"""
+世界渲染基准：逐个 blit vs 纹理图集 + 每层一次 Surface.blits()
+
+用法:
+    python benchmarks/bench_render.py [--tanks 200] [--bullets 400] [--frames 300]
+
+在无界面显示上构建一张铺满各类墙体的地图，放入大量坦克（各皮肤/等级/方向、
+部分带护盾）、子弹、爆炸与星星特效，分别在 config.ATLAS_ENABLED 关闭/开启时
+重复调用 GameWorld.render，统计每帧耗时。
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from src.config.game_config import config
+from src.game_engine.bullet import Bullet
+from src.game_engine.game_world import Explosion, GameWorld, Star
+from src.game_engine.tank import Tank
+from src.game_engine.wall import Wall
+from src.utils.resource_manager import resource_manager
+
+WIDTH, HEIGHT = 1300, 900
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def make_world(tanks, bullets, seed=1):
+    rng = random.Random(seed)
+    world = GameWorld(WIDTH, HEIGHT)
+    cols, rows = WIDTH // config.WALL_WIDTH, HEIGHT // config.WALL_HEIGHT
+    layout = [[rng.choice((0, 0, Wall.BRICK, Wall.STEEL, Wall.GRASS, Wall.RIVER)) for _ in range(cols)]
+              for _ in range(rows)]
+    world.load_map_layout(layout, config.WALL_WIDTH)
+    for index in range(tanks):
+        tank_type = "player" if index % 4 == 0 else "enemy"
+        skin = rng.randint(1, 4)
+        tank = Tank(rng.randrange(WIDTH - 30), rng.randrange(HEIGHT - 30),
+                    tank_type=tank_type, tank_id=index + 1, skin_id=skin)
+        tank.level = rng.randint(0, 3 if tank_type == "player" else 1)
+        tank.images = tank._load_tank_images()
+        tank.direction = rng.randint(0, 3)
+        tank.current_image = tank.images[tank.direction][rng.randint(0, 1)]
+        tank.shield_active = index % 5 == 0
+        world.add_object(tank)
+    for _ in range(bullets):
+        world.add_object(Bullet(rng.randrange(WIDTH), rng.randrange(HEIGHT), rng.randint(0, 3)))
+    for _ in range(max(1, tanks // 10)):
+        world.add_object(Explosion(rng.randrange(WIDTH), rng.randrange(HEIGHT)))
+        world.add_object(Star(rng.randrange(WIDTH), rng.randrange(HEIGHT)))
+    return world
+
+
+def run(world, screen, frames, batched):
+    config.ATLAS_ENABLED = batched
+    samples = []
+    for frame in range(frames):
+        alpha = (frame % 4) / 4.0
+        start = time.perf_counter()
+        world.render(screen, alpha)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="世界渲染基准（图集批量绘制）")
+    parser.add_argument("--tanks", type=int, default=200, help="坦克数量")
+    parser.add_argument("--bullets", type=int, default=400, help="子弹数量")
+    parser.add_argument("--frames", type=int, default=300, help="每种方式渲染的帧数")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    with contextlib.redirect_stdout(io.StringIO()):
+        resource_manager.preload_all()
+        if not len(resource_manager.atlas):
+            resource_manager.build_atlas()
+        world = make_world(args.tanks, args.bullets)
+
+    print(f"墙体 {len(world.walls)}，坦克 {len(world.tanks)}，子弹 {len(world.bullets)}，"
+          f"图集 {len(resource_manager.atlas)} 张图片 / {len(resource_manager.atlas.pages)} 页")
+    run(world, screen, 20, True)  # 预热
+    print(f"{'方式':<16} {'平均ms':>8} {'P50ms':>8} {'P95ms':>8}")
+    for label, batched in (("逐个 blit", False), ("图集 + blits", True)):
+        samples = run(world, screen, args.frames, batched)
+        print(f"{label:<16} {sum(samples) / len(samples):>8.3f} {percentile(samples, 0.5):>8.3f} "
+              f"{percentile(samples, 0.95):>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+录像重放基准：以无界面、不限速的方式重放录像，统计模拟吞吐
+
+用法:
+    python benchmarks/bench_replay.py replays/xxx.twr [更多录像...] [--repeat 3]
+
+录像由 config.REPLAY_RECORD = True 时的真实对局生成，可作为固定的性能语料：
+同一录像在优化前后各跑一遍，比较逐帧模拟耗时（不含渲染与真实时间等待）。
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from src.game_engine.replay import Replay, play_replay
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="录像重放基准")
+    parser.add_argument("replays", nargs="+", help="录像文件路径")
+    parser.add_argument("--repeat", type=int, default=1, help="每个录像重放次数")
+    parser.add_argument("--full", action="store_true", help="对局结束后继续重放剩余帧")
+    args = parser.parse_args()
+
+    pygame.init()
+    with contextlib.redirect_stdout(io.StringIO()):
+        from src.game_engine.game import GameEngine
+        engine = GameEngine()
+
+    print(f"{'录像':<36} {'帧数':>7} {'帧/秒':>9} {'平均ms':>8} {'P95ms':>8} {'最大ms':>8} {'结果':>8}")
+    for path in args.replays:
+        replay = Replay.load(path)
+        for _ in range(args.repeat):
+            with contextlib.redirect_stdout(io.StringIO()):
+                stats = play_replay(replay, engine, timing=True, stop_on_game_over=not args.full)
+            tick_ms = stats["tick_ms"]
+            mean_ms = sum(tick_ms) / max(1, len(tick_ms))
+            print(f"{os.path.basename(path):<36} {stats['ticks']:>7} {stats['ticks'] / max(stats['elapsed_s'], 1e-9):>9.0f} "
+                  f"{mean_ms:>8.3f} {percentile(tick_ms, 0.95):>8.3f} {max(tick_ms, default=0.0):>8.3f} "
+                  f"{str(stats['winner'] or '-'):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+启动基准：导入耗时（-X importtime 汇总）与首个菜单帧的出现时间
+
+用法:
+    python benchmarks/bench_startup.py [--runs 5] [--top 15]
+
+每次测量都在全新的解释器进程中进行（无界面显示驱动），依次记录：
+- import：导入 GameEngine 及其依赖
+- engine：构造 GameEngine（窗口、ScreenManager 与初始菜单屏幕）
+- first_frame：第一次 update + render + flip
+随后用 -X importtime 导入一次，按累计耗时列出最重的模块。
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+_FIRST_FRAME_SNIPPET = r"""
+import time
+t0 = time.perf_counter()
+import contextlib, io, json, sys
+import src.ui.init_i18n
+import pygame
+with contextlib.redirect_stdout(io.StringIO()):
+    from src.game_engine.game import GameEngine
+    t1 = time.perf_counter()
+    pygame.init()
+    game = GameEngine()
+    t2 = time.perf_counter()
+    game.update()
+    game.render(1.0)
+    pygame.display.flip()
+t3 = time.perf_counter()
+heavy = [name for name in HEAVY_MODULES if name in sys.modules]
+print(json.dumps({"import": t1 - t0, "engine": t2 - t1, "first_frame": t3 - t2, "total": t3 - t0,
+                  "modules": len(sys.modules), "heavy": heavy}))
+"""
+
+# 首帧之前不应导入的模块（视频解码、非初始屏幕）
+HEAVY_MODULES = ("moviepy", "numpy", "src.ui.map_editor_screen", "src.ui.loading_screen")
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def measure_first_frame():
+    snippet = f"HEAVY_MODULES = {HEAVY_MODULES!r}\n" + _FIRST_FRAME_SNIPPET
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=ROOT, env=_env(),
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_report(module="src.game_engine.game"):
+    """解析 -X importtime 输出，返回 [(累计微秒, 自身微秒, 模块名)]，按累计耗时降序。"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                            env=_env(), capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    rows.sort(reverse=True)
+    return rows
+
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准")
+    parser.add_argument("--runs", type=int, default=5, help="首帧测量次数（取中位数）")
+    parser.add_argument("--top", type=int, default=15, help="列出累计导入耗时最高的模块数")
+    args = parser.parse_args()
+
+    samples = [measure_first_frame() for _ in range(args.runs)]
+    print(f"首个菜单帧（{args.runs} 次中位数，已加载模块 {samples[-1]['modules']} 个）")
+    for phase in ("import", "engine", "first_frame", "total"):
+        print(f"  {phase:<12} {median([s[phase] for s in samples]) * 1000:>9.1f} ms")
+
+    rows = import_report()
+    print(f"\n导入耗时（-X importtime，src.game_engine.game 累计 {rows[0][0] / 1000:.1f} ms）")
+    print(f"{'累计ms':>9} {'自身ms':>8}  模块")
+    for cumulative_us, self_us, name in rows[:args.top]:
+        print(f"{cumulative_us / 1000:>9.1f} {self_us / 1000:>8.1f}  {name}")
+    heavy = samples[-1]["heavy"]
+    print(f"\n首帧时已导入的重型模块: {', '.join(heavy) if heavy else '无'}")
+
+
+if __name__ == "__main__":
+    main()
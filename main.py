@@ -10,7 +10,10 @@ import src.ui.init_i18n
 import pygame
 import sys
 
+from src.config.game_config import config
 from src.game_engine.game import GameEngine
+from src.game_engine.game_loop import FixedTimestep
+from src.utils.profiler import profiler
 
 # 初始化pygame
 pygame.init()
@@ -54,24 +57,30 @@ def main():
     
     # 创建时钟对象用于帧率控制
     clock = pygame.time.Clock()
+    # 固定步长：逻辑按 SIMULATION_FPS 推进，渲染帧率独立（RENDER_FPS_LIMIT）
+    timestep = FixedTimestep()
+    # 逐帧阶段计时（F3 开关，未开启时几乎无开销）
+    profiler.set_enabled(config.PROFILER_ENABLED)
     
     # 游戏主循环
     running = True
     while running:
+        # 控制渲染帧率，并把真实经过的时间交给固定步长累加器
+        elapsed = clock.tick(config.RENDER_FPS_LIMIT) / 1000.0
+        
         # 处理事件
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             game.handle_event(event)
         
-        # 更新游戏状态
-        game.update()
-        
-        # 渲染游戏画面
-        game.render()
+        # 更新游戏状态（落后时一帧内追赶多步，跳过中间的渲染）
+        for _ in range(timestep.advance(elapsed)):
+            game.update()
         
-        # 控制帧率（使用同一个Clock对象）
-        clock.tick(60)
+        # 渲染游戏画面（在两个逻辑帧之间插值）
+        game.render(timestep.alpha if config.RENDER_INTERPOLATION else 1.0)
+        profiler.end_frame()
     
     # 退出游戏
     pygame.quit()
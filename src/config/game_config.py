@@ -60,6 +60,18 @@ class GameConfig:
     
     # ========== 时间参数（帧数，60fps） ==========
     
+    # 逻辑帧率（每秒模拟步数，固定步长，与渲染帧率无关）
+    SIMULATION_FPS = 60
+    
+    # 渲染帧率上限（窗口未开启垂直同步，由 clock.tick 限速；0 表示不限制，主循环会占满 CPU，仅用于基准测试）
+    RENDER_FPS_LIMIT = 60
+    
+    # 单个渲染帧内最多追赶的模拟步数，超出部分丢弃（防止卡顿时越积越多）
+    MAX_SIMULATION_STEPS = 5
+    
+    # 渲染时在两个逻辑帧之间插值坦克与子弹位置
+    RENDER_INTERPOLATION = True
+    
     # 射击冷却时间（帧）
     SHOOT_COOLDOWN_BASE = 20
     
@@ -168,6 +180,128 @@ class GameConfig:
     
     # 子弹生成位置偏移（像素）
     BULLET_SPAWN_OFFSET = 2
+    
+    # ========== 网络参数 ==========
+    
+    # 主机状态快照发送频率（Hz，可选 20/30/60；与逻辑帧率无关，仅在发送帧编码快照）
+    NETWORK_SEND_RATE = 60
+    
+    # 每隔多少次发送携带一次完整坦克状态（关键帧），其余发送只携带变化的坦克
+    NETWORK_KEYFRAME_INTERVAL = 60
+    
+    # 快照数值字段量化编码（16位定点坐标 + varint），主机与客户端需一致
+    NETWORK_QUANTIZE_STATE = True
+    
+    # TCP 消息 zlib 压缩（握手协商，对端不支持时自动关闭）
+    NETWORK_COMPRESSION = True
+    
+    # 小于该字节数的消息不压缩
+    NETWORK_COMPRESS_THRESHOLD = 512
+    
+    # zlib 压缩级别（1 最快，9 最小）
+    NETWORK_COMPRESS_LEVEL = 6
+    
+    # 开局只发送地图内容哈希，客户端缓存未命中时才分块传输完整地图
+    MAP_TRANSFER_BY_HASH = True
+    
+    # 客户端地图缓存目录（按内容哈希命名）
+    MAP_CACHE_DIR = "cache/maps"
+    
+    # 地图分块大小（字符）与每次 update 最多发送的块数，避免阻塞游戏消息
+    MAP_CHUNK_SIZE = 8192
+    MAP_CHUNKS_PER_UPDATE = 2
+    
+    # 确定性锁步模式：双方各自模拟，只交换每帧输入（需双方版本一致；默认关闭，使用状态同步）
+    NETWORK_LOCKSTEP = False
+    
+    # 锁步输入延迟（帧）：本帧采集的输入在若干帧后生效，用于掩盖网络延迟
+    LOCKSTEP_INPUT_DELAY = 3
+    
+    # 锁步状态校验和交换间隔（帧），用于检测失步
+    LOCKSTEP_CHECKSUM_INTERVAL = 60
+    
+    # 锁步等待同一帧对端输入的上限（帧，约 10 秒，与连接超时一致）；超过后判定连接中断并结束对局
+    LOCKSTEP_STALL_LIMIT = 600
+    
+    # ========== 视频参数 ==========
+    
+    # 流式播放：播放时由后台线程解码到小环形缓冲区，不再在加载时解码全部帧
+    VIDEO_STREAMING = True
+    
+    # 流式播放环形缓冲区帧数（内存上限 = 帧数 × 宽 × 高 × 3 字节）
+    VIDEO_STREAM_BUFFER_FRAMES = 8
+    
+    # 视频资源常驻内存预算（MB，超出时按最久未播放淘汰，需要时重新加载）
+    VIDEO_MEMORY_BUDGET_MB = 256
+    
+    # 解码帧磁盘缓存：首次启动后台生成，之后直接内存映射，无需再经 moviepy 解码
+    VIDEO_CACHE = True
+    
+    # 帧缓存目录（按源文件哈希与大小分目录）
+    VIDEO_CACHE_DIR = "cache/videos"
+    
+    # 缓存帧的最大高度（像素，超出时等比缩小；0 表示保持原尺寸）
+    VIDEO_CACHE_MAX_HEIGHT = 540
+    
+    # ========== 资源加载 ==========
+    
+    # 预加载素材时解码图片/读取音频的线程数
+    ASSET_LOADER_THREADS = 4
+    
+    # 加载界面每帧在主线程转换素材的时间预算（毫秒）
+    ASSET_PRELOAD_BUDGET_MS = 8
+    
+    # 缓存缩放/旋转后的精灵像素（源图片未变时启动直接读取，跳过解码与变换）
+    SPRITE_CACHE = True
+    SPRITE_CACHE_PATH = "cache/sprites.bin"
+    
+    # 地图列表索引（按文件 mtime 与大小增量刷新，只保存显示信息）
+    MAP_INDEX_PATH = "cache/map_index.json"
+    
+    # ========== 纹理图集 ==========
+    
+    # 把精灵图片打包进图集，世界按层用一次 Surface.blits() 批量绘制（关闭时逐个 blit）
+    ATLAS_ENABLED = True
+    
+    # 图集页面边长（像素）
+    ATLAS_PAGE_SIZE = 1024
+    
+    # ========== 录像参数 ==========
+    
+    # 记录每局的随机种子、地图哈希与逐帧玩家输入（对局结束时写出录像文件）
+    REPLAY_RECORD = False
+    
+    # 录像文件目录
+    REPLAY_DIR = "replays"
+    
+    # ========== 性能剖析 ==========
+    
+    # 启动时开启逐帧阶段计时（游戏内 F3 开关叠加层，F4 导出轨迹）
+    PROFILER_ENABLED = False
+    
+    # 百分位统计的滚动窗口（帧）
+    PROFILER_WINDOW = 300
+    
+    # 轨迹最多保留的帧数（超出后丢弃最早的帧）
+    PROFILER_TRACE_FRAMES = 36000
+    
+    # 轨迹导出目录与格式（"csv" 或 "json"）
+    PROFILER_TRACE_DIR = "profiles"
+    PROFILER_TRACE_FORMAT = "csv"
+    
+    # ========== AI参数 ==========
+    
+    # 敌人AI规划进程数（0 表示在主线程内规划；>0 时使用多进程工作池，规划结果延迟一帧生效）
+    AI_WORKER_PROCESSES = 0
+    
+    # 单次寻路最大扩展节点数（超限时朝最接近目标的已扩展节点前进，会改变远距离寻路的走向；None 表示不限）
+    AI_PATH_MAX_EXPANSIONS = None
+    
+    # 寻路结果缓存条目数（键为 起点/终点/导航网格版本）
+    AI_PATH_CACHE_SIZE = 256
+    
+    # 导航网格代价均匀时使用跳点搜索（JPS）
+    AI_PATH_USE_JPS = False
 
 
 # 创建全局配置实例（方便导入使用）
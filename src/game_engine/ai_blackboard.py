@@ -0,0 +1,126 @@
+"""
+敌人AI共享黑板
+
+每帧由 GameEngine 统一计算一次所有敌人都需要的感知数据（存活玩家、基地、
+每个敌人的最近玩家与基地距离、团队威胁），避免每个控制器各自扫描
+``world.tanks`` / ``world.walls`` 造成的 N×M 重复计算。
+
+难度配置开启 ``team_coordination``（地狱难度）时，黑板还会在所有敌人之间
+分配角色：
+
+- ``attacker``：集火团队当前锁定的玩家
+- ``flanker``：从侧翼包抄
+- ``base_raider``：直取玩家基地
+"""
+from typing import Dict, List, Optional
+
+from src.game_engine.wall import Wall
+
+ROLE_ATTACKER = "attacker"
+ROLE_FLANKER = "flanker"
+ROLE_BASE_RAIDER = "base_raider"
+
+# 近距压制距离（像素），与 EnemyAIController._update_state 保持一致
+CLOSE_PLAYER_DISTANCE = 120
+
+
+class AIBlackboard:
+    """每帧共享的敌人AI感知与团队角色分配。"""
+
+    def __init__(self):
+        self.players: List = []
+        self.base = None
+        self.focus_player = None  # 团队集火目标
+        self.team_threat: Dict[int, float] = {}  # player tank_id -> 团队累计威胁
+        self.nearest_player: Dict[int, object] = {}  # enemy tank_id -> 最近玩家
+        self.nearest_player_dist2: Dict[int, float] = {}
+        self.base_distance: Dict[int, float] = {}  # enemy tank_id -> 到基地距离
+        self.close_player: Dict[int, bool] = {}  # enemy tank_id -> 是否有玩家贴身
+        self.enemy_positions: Dict[int, tuple] = {}
+        self.roles: Dict[int, Optional[str]] = {}
+
+    def update(self, world, controllers, team_coordination: bool = False):
+        """
+        刷新黑板并（可选）分配角色
+
+        Args:
+            world: GameWorld 实例
+            controllers: 当前所有 EnemyAIController
+            team_coordination: 是否启用团队协同（分配角色）
+        """
+        self.players = [t for t in world.tanks if t.active and t.tank_type == "player"]
+        self.base = next((w for w in world.walls if w.active and w.wall_type == Wall.BASE), None)
+
+        enemies = {t.tank_id: t for t in world.tanks if t.active and t.tank_type == "enemy"}
+        self.enemy_positions = {tid: (t.x, t.y) for tid, t in enemies.items()}
+
+        self.team_threat = {}
+        for c in controllers:
+            for pid, score in c.threat_scores.items():
+                self.team_threat[pid] = self.team_threat.get(pid, 0) + score
+
+        self.nearest_player.clear()
+        self.nearest_player_dist2.clear()
+        self.base_distance.clear()
+        self.close_player.clear()
+        close2 = CLOSE_PLAYER_DISTANCE ** 2
+        for tid, tank in enemies.items():
+            nearest, best = None, float("inf")
+            for p in self.players:
+                d2 = (p.x - tank.x) ** 2 + (p.y - tank.y) ** 2
+                if d2 < best:
+                    nearest, best = p, d2
+            self.nearest_player[tid] = nearest
+            self.nearest_player_dist2[tid] = best
+            self.close_player[tid] = nearest is not None and best < close2
+            if self.base is not None:
+                self.base_distance[tid] = ((self.base.x - tank.x) ** 2 + (self.base.y - tank.y) ** 2) ** 0.5
+
+        self.focus_player = self._select_focus_player(enemies)
+
+        if team_coordination:
+            self._assign_roles([c for c in controllers if c.tank_id in enemies])
+        else:
+            self.roles = {}
+
+        for c in controllers:
+            c.blackboard = self
+            c.role = self.roles.get(c.tank_id)
+
+    def _select_focus_player(self, enemies):
+        """团队集火目标：离敌群最近、团队威胁高、无护盾的玩家优先。"""
+        if not self.players:
+            return None
+        if not enemies:
+            return self.players[0]
+
+        def _score(p):
+            min_dist2 = min((p.x - e.x) ** 2 + (p.y - e.y) ** 2 for e in enemies.values())
+            shield_penalty = 40000 if getattr(p, "shield_active", False) else 0
+            return min_dist2 - self.team_threat.get(p.tank_id, 0) * 5000 + shield_penalty
+
+        return min(self.players, key=_score)
+
+    def _assign_roles(self, controllers):
+        """按距离分配角色：离基地最近者突袭基地，其余在集火与包抄之间交替。"""
+        self.roles = {}
+        if not controllers:
+            return
+        remaining = list(controllers)
+        if self.base is not None and (len(remaining) > 1 or not self.players):
+            raider = min(remaining, key=lambda c: self.base_distance.get(c.tank_id, float("inf")))
+            self.roles[raider.tank_id] = ROLE_BASE_RAIDER
+            remaining.remove(raider)
+        if self.focus_player is None:
+            for c in remaining:
+                self.roles[c.tank_id] = ROLE_BASE_RAIDER if self.base is not None else None
+            return
+        fx, fy = self.focus_player.x, self.focus_player.y
+
+        def _dist2(c):
+            x, y = self.enemy_positions.get(c.tank_id, (fx, fy))
+            return (x - fx) ** 2 + (y - fy) ** 2
+
+        remaining.sort(key=_dist2)
+        for i, c in enumerate(remaining):
+            self.roles[c.tank_id] = ROLE_ATTACKER if i % 2 == 0 else ROLE_FLANKER
@@ -0,0 +1,357 @@
+"""
+敌人AI规划的多进程工作池
+
+默认情况下敌人AI在主线程内逐个规划；敌人数量较多时，寻路（A*）与目标评分
+会成为帧耗时的主要来源。本模块提供一种可选模式：
+
+1. 主线程每帧调用 ``build_world_snapshot`` 生成一份紧凑、可 pickle 的世界快照；
+2. 快照与每个敌人的规划请求一起提交到 ``multiprocessing`` 进程池；
+3. 下一帧取回规划结果（目标 + 下一步方向），由 ``EnemyAIController.apply_plan``
+   应用到控制器上。
+
+规划函数只依赖标准库，工作进程无需导入 pygame。
+"""
+import multiprocessing
+from typing import Dict, List, Optional
+
+from src.config.game_config import config
+from src.game_engine.pathfinding import NavGrid, GridPathfinder, los_penalty_for
+
+# 方向常量（与 Tank 保持一致，避免工作进程导入 pygame）
+UP, RIGHT, DOWN, LEFT = 0, 1, 2, 3
+
+# 每个工作进程复用的导航网格与寻路器：(cols, rows) -> (NavGrid, GridPathfinder)
+_navigation = {}
+
+
+def build_world_snapshot(world, grid_size: int) -> dict:
+    """
+    从 GameWorld 生成紧凑的规划快照
+
+    Args:
+        world: GameWorld 实例
+        grid_size: 寻路网格尺寸（像素）
+
+    Returns:
+        dict: 仅包含元组/整数的快照，可直接 pickle 发送到工作进程
+    """
+    blocked = []
+    blockers = []
+    base = None
+    for w in world.walls:
+        if not w.active:
+            continue
+        if not getattr(w, "passable", False):
+            blocked.append((int(w.x // grid_size), int(w.y // grid_size)))
+        if not getattr(w, "shoot_through", False):
+            blockers.append((w.wall_id, w.x, w.y, w.width, w.height, bool(getattr(w, "destructible", False))))
+        if base is None and w.wall_type == 5:  # Wall.BASE
+            base = (w.wall_id, w.x, w.y, w.width, w.height)
+
+    players = []
+    enemies = {}
+    for t in world.tanks:
+        if not t.active:
+            continue
+        if t.tank_type == "player":
+            players.append((t.tank_id, t.x, t.y, t.width, t.height, bool(getattr(t, "shield_active", False))))
+        elif t.tank_type == "enemy":
+            enemies[t.tank_id] = (t.x, t.y, t.width, t.height)
+
+    bullets = tuple(
+        (b.x, b.y, b.velocity_x, b.velocity_y)
+        for b in world.bullets if b.active
+    )
+
+    return {
+        "width": world.width,
+        "height": world.height,
+        "grid": grid_size,
+        "blocked": tuple(blocked),
+        "blockers": tuple(blockers),
+        "base": base,
+        "players": tuple(players),
+        "enemies": enemies,
+        "bullets": bullets,
+    }
+
+
+# ---------------------------------------------------------------------- #
+# 纯函数规划逻辑（与 EnemyAIController 中的进程内逻辑保持一致，
+# 由 tests/test_ai_worker_pool.py 的一致性测试在同一世界状态上对比两者）
+# ---------------------------------------------------------------------- #
+def _line_intersection(p1, p2, p3, p4) -> bool:
+    """线段 p1-p2 与 p3-p4 是否相交（叉积法）。"""
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    def on_segment(a, b, p):
+        return (min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and
+                min(a[1], b[1]) <= p[1] <= max(a[1], b[1]))
+
+    d1 = cross(p3, p4, p1)
+    d2 = cross(p3, p4, p2)
+    d3 = cross(p1, p2, p3)
+    d4 = cross(p1, p2, p4)
+    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+        return True
+    if d1 == 0 and on_segment(p3, p4, p1):
+        return True
+    if d2 == 0 and on_segment(p3, p4, p2):
+        return True
+    if d3 == 0 and on_segment(p1, p2, p3):
+        return True
+    if d4 == 0 and on_segment(p1, p2, p4):
+        return True
+    return False
+
+
+def _line_rect_intersection(p1, p2, x, y, w, h) -> bool:
+    """线段与矩形 (x, y, w, h) 是否相交。"""
+    left, top, right, bottom = x, y, x + w, y + h
+    edges = (
+        ((left, top), (right, top)),
+        ((right, top), (right, bottom)),
+        ((right, bottom), (left, bottom)),
+        ((left, bottom), (left, top)),
+    )
+    for e1, e2 in edges:
+        if _line_intersection(p1, p2, e1, e2):
+            return True
+
+    def inside(p):
+        return left <= p[0] < right and top <= p[1] < bottom
+
+    return inside(p1) and inside(p2)
+
+
+def _first_blocker(snapshot, tank_rect, target_rect):
+    """沿射线找到首个阻挡物，返回阻挡物元组或 None。"""
+    tx, ty, tw, th = tank_rect
+    gx, gy, gw, gh = target_rect
+    tank_center = (tx + tw // 2, ty + th // 2)
+    tgt_center = (gx + gw // 2, gy + gh // 2)
+    blockers = sorted(snapshot["blockers"], key=lambda b: (b[1] - gx) ** 2 + (b[2] - gy) ** 2)
+    for b in blockers:
+        if _line_rect_intersection(tank_center, tgt_center, b[1], b[2], b[3], b[4]):
+            return b
+    return None
+
+
+def _base_or_blocker(snapshot, tank_rect, base):
+    """以基地为目标；若基地被可破坏墙体阻挡，则先锁定该墙体。"""
+    base_rect = (base[1], base[2], base[3], base[4])
+    blocker = _first_blocker(snapshot, tank_rect, base_rect)
+    if blocker and blocker[5]:
+        return ("blocker", blocker[0], (blocker[1], blocker[2], blocker[3], blocker[4]))
+    return ("base", base[0], base_rect)
+
+
+def select_target(snapshot, tank_rect, difficulty, threat_scores, player_weight, base_weight,
+                  role=None, focus_id=None):
+    """
+    目标选择（对应 EnemyAIController._select_target）
+
+    Returns:
+        tuple: (kind, id, rect)，kind 为 "player" / "base" / "blocker"；无目标时返回 None
+    """
+    tx, ty = tank_rect[0], tank_rect[1]
+    target = None
+    players = snapshot["players"]
+    base = snapshot["base"]
+    # 团队角色（地狱难度）
+    if role == "base_raider" and base:
+        return _base_or_blocker(snapshot, tank_rect, base)
+    if role == "attacker" and focus_id is not None:
+        focus = next((p for p in players if p[0] == focus_id), None)
+        if focus is not None:
+            return ("player", focus[0], (focus[1], focus[2], focus[3], focus[4]))
+    if players:
+        def _score(p):
+            dist2 = (p[1] - tx) ** 2 + (p[2] - ty) ** 2
+            threat = threat_scores.get(p[0], 0)
+            shield_penalty = 40000 if p[5] else 0
+            return dist2 - threat * 5000 + shield_penalty
+        target = min(players, key=_score)
+
+    if base:
+        base_rect = (base[1], base[2], base[3], base[4])
+        if not target:
+            return ("base", base[0], base_rect)
+        base_dist = ((base[1] - tx) ** 2 + (base[2] - ty) ** 2) ** 0.5
+        target_dist = ((target[1] - tx) ** 2 + (target[2] - ty) ** 2) ** 0.5
+        base_score = (1500 / (base_dist + 1)) * max(0.1, base_weight)
+        target_score = (1000 / (target_dist + 1)) * max(0.1, player_weight)
+        if difficulty in ["hard", "hell"]:
+            base_score *= 1.4 if difficulty == "hell" else 1.25
+        if base_score > target_score:
+            return _base_or_blocker(snapshot, tank_rect, base)
+
+    if target is None:
+        return None
+    return ("player", target[0], (target[1], target[2], target[3], target[4]))
+
+
+def _get_navigation(cols, rows):
+    """获取本进程复用的导航网格与寻路器。"""
+    key = (cols, rows)
+    nav = _navigation.get(key)
+    if nav is None:
+        nav = (NavGrid(cols, rows), GridPathfinder(cols, rows, config.AI_PATH_CACHE_SIZE))
+        _navigation[key] = nav
+    return nav
+
+
+def next_direction(snapshot, tank_rect, target_rect, difficulty):
+    """A* 寻路（对应 EnemyAIController._next_direction_via_path），返回下一步方向或 None。"""
+    grid = snapshot["grid"]
+    cols = max(1, snapshot["width"] // grid)
+    rows = max(1, snapshot["height"] // grid)
+    nav, finder = _get_navigation(cols, rows)
+    player_cells = [(int(p[1] // grid), int(p[2] // grid)) for p in snapshot["players"]]
+    bullet_cells = [
+        (int(x // grid), int(y // grid), 1 if vx > 0 else -1 if vx < 0 else 0, 1 if vy > 0 else -1 if vy < 0 else 0)
+        for x, y, vx, vy in snapshot["bullets"]
+    ]
+    nav.build(snapshot["blocked"], player_cells, bullet_cells, los_penalty_for(difficulty))
+
+    sx, sy = nav.closest_free_cell(int((tank_rect[0] + tank_rect[2] * 0.5) // grid),
+                                   int((tank_rect[1] + tank_rect[3] * 0.5) // grid))
+    gx, gy = nav.closest_free_cell(int((target_rect[0] + target_rect[2] * 0.5) // grid),
+                                   int((target_rect[1] + target_rect[3] * 0.5) // grid))
+    if (sx, sy) == (gx, gy):
+        return None
+    step = finder.first_step(nav, nav.index(sx, sy), nav.index(gx, gy),
+                             max_expansions=config.AI_PATH_MAX_EXPANSIONS, use_jps=config.AI_PATH_USE_JPS)
+    if step < 0:
+        return None
+    nx, ny = nav.cell(step)
+    if nx > sx:
+        return RIGHT
+    if nx < sx:
+        return LEFT
+    if ny > sy:
+        return DOWN
+    if ny < sy:
+        return UP
+    return None
+
+
+def plan_enemy(snapshot: dict, request: tuple) -> Optional[dict]:
+    """
+    为单个敌人生成规划
+
+    Args:
+        snapshot: build_world_snapshot 生成的快照
+        request: (tank_id, difficulty, threat_scores, player_weight, base_weight[, role, focus_id])
+
+    Returns:
+        dict: {"tank_id", "target": (kind, id) 或 None, "direction": 方向或 None}；
+              敌人已不在快照中时返回 None
+    """
+    tank_id, difficulty, threat_scores, player_weight, base_weight = request[:5]
+    role = request[5] if len(request) > 5 else None
+    focus_id = request[6] if len(request) > 6 else None
+    tank_rect = snapshot["enemies"].get(tank_id)
+    if tank_rect is None:
+        return None
+    target = select_target(snapshot, tank_rect, difficulty, threat_scores, player_weight, base_weight,
+                           role, focus_id)
+    direction = None
+    if target is not None and target[0] != "base":
+        direction = next_direction(snapshot, tank_rect, target[2], difficulty)
+    return {
+        "tank_id": tank_id,
+        "target": (target[0], target[1]) if target else None,
+        "direction": direction,
+    }
+
+
+def plan_batch(snapshot: dict, requests: List[tuple]) -> List[dict]:
+    """批量规划（工作进程入口）。"""
+    plans = []
+    for request in requests:
+        plan = plan_enemy(snapshot, request)
+        if plan is not None:
+            plans.append(plan)
+    return plans
+
+
+class AIWorkerPool:
+    """
+    敌人AI规划进程池
+
+    每帧 ``collect`` 取回上一帧提交的规划，再 ``submit`` 本帧快照；
+    规划结果因此总是延迟一帧生效，主线程不会阻塞等待工作进程。
+    同一时间只有一批请求在计算，上一批未完成时 ``submit`` 直接忽略，队列不会积压；
+    每个规划带有提交时的帧号 ``tick``，由调用方据此丢弃过期结果。
+    """
+
+    def __init__(self, processes: int):
+        self.processes = max(1, int(processes))
+        self._pool = None
+        self._pending = []  # 尚未完成的 (tick, AsyncResult) 列表
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(processes=self.processes)
+            print(f"[AI] 已启动AI规划进程池，进程数: {self.processes}")
+        return self._pool
+
+    @property
+    def busy(self) -> bool:
+        """是否还有已提交但尚未取回的批次。"""
+        return bool(self._pending)
+
+    def submit(self, snapshot: dict, requests: List[tuple], tick: int = 0) -> bool:
+        """
+        提交本帧的规划请求（按进程数切分批次）
+
+        Args:
+            snapshot: build_world_snapshot 生成的快照
+            requests: 规划请求列表
+            tick: 快照对应的帧号，随规划结果一起返回
+
+        Returns:
+            bool: 是否已提交（上一批仍在计算或没有请求时为 False）
+        """
+        if not requests or self._pending:
+            return False
+        pool = self._ensure_pool()
+        chunk = max(1, (len(requests) + self.processes - 1) // self.processes)
+        for i in range(0, len(requests), chunk):
+            self._pending.append((tick, pool.apply_async(plan_batch, (snapshot, requests[i:i + chunk]))))
+        return True
+
+    def collect(self, wait: bool = False) -> Dict[int, dict]:
+        """
+        取回已完成的规划
+
+        Args:
+            wait: 是否阻塞等待所有未完成的批次（基准测试/无头模式使用）
+
+        Returns:
+            dict: tank_id -> plan（plan["tick"] 为提交时的帧号）
+        """
+        plans = {}
+        still_pending = []
+        for tick, result in self._pending:
+            if not wait and not result.ready():
+                still_pending.append((tick, result))
+                continue
+            try:
+                for plan in result.get():
+                    plan["tick"] = tick
+                    plans[plan["tank_id"]] = plan
+            except Exception as e:
+                print(f"[AI] 规划进程出错: {e}")
+        self._pending = still_pending
+        return plans
+
+    def shutdown(self):
+        """关闭进程池。"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._pending = []
@@ -46,18 +46,11 @@ class Bullet(GameObject):
             子弹图像
         """
         # 使用资源管理器加载真实子弹图片
-        bullet_img = resource_manager.get_bullet_image()
+        # 4个方向的旋转图片由资源管理器统一缓存（并已打包进纹理图集）
+        bullet_img = resource_manager.get_bullet_images().get(self.direction)
         
         if bullet_img:
-            # 根据方向旋转子弹图片
-            if self.direction == 0:  # UP
-                return bullet_img
-            elif self.direction == 1:  # RIGHT
-                return pygame.transform.rotate(bullet_img, -90)
-            elif self.direction == 2:  # DOWN
-                return pygame.transform.rotate(bullet_img, 180)
-            elif self.direction == 3:  # LEFT
-                return pygame.transform.rotate(bullet_img, 90)
+            return bullet_img
         
         # 备用：使用简单的黄色矩形
         surface = pygame.Surface((config.BULLET_WIDTH, config.BULLET_HEIGHT), pygame.SRCALPHA)
@@ -73,10 +66,10 @@ class Bullet(GameObject):
         if self.lifetime <= 0:
             self.destroy()
     
-    def render(self, screen):
-        """渲染子弹"""
+    def render(self, screen, alpha=1.0):
+        """渲染子弹（alpha 为逻辑帧间插值比例）"""
         if self.visible:
-            screen.blit(self.image, (self.x, self.y))
+            screen.blit(self.image, self.draw_position(alpha))
     
     def handle_collision(self, other):
         """处理碰撞
@@ -1,5 +1,4 @@
 import os
-import heapq
 import random
 from typing import List, Optional, Tuple
 import ctypes
@@ -9,13 +8,19 @@ import pygame
 from src.game_engine.game_world import GameWorld
 from src.game_engine.tank import Tank
 from src.game_engine.wall import Wall
+from src.game_engine.pathfinding import NavGrid, GridPathfinder, NavigationCache, los_penalty_for
+from src.game_engine.ai_blackboard import AIBlackboard
+from src.game_engine.ai_config import get_difficulty_config
 from src.network.network_manager import NetworkManager
+from src.game_engine.replay import ACTION_SHOOT, ACTION_STOP, ReplayRecorder, default_replay_path, replay_map_data
+from src.state_sync.lockstep import LockstepSession
 from src.state_sync.state_manager import StateManager
 from src.ui.screen_manager import ScreenManager
 from src.ui.pause_menu import PauseMenuOverlay
 from src.ui.video_manager import VideoPlaybackController
 from src.utils.resource_manager import resource_manager
 from src.utils.map_loader import map_loader
+from src.utils.profiler import profiler
 from src.game_engine.window_manager import WindowManager
 from src.config.game_config import config
 
@@ -25,10 +30,11 @@ class EnemyAIController:
 
     def __init__(self, tank_id: int, world: GameWorld, difficulty: str = "normal", player_weight: float = 1.0, base_weight: float = 1.0):
         from src.game_engine.ai_config import get_difficulty_config
-        import random
         
         self.tank_id = tank_id
         self.world = world
+        # 使用世界的每局随机数发生器，固定种子时AI行为可复现
+        self.rng = getattr(world, "rng", random)
         self.difficulty = difficulty
         self.config = get_difficulty_config(difficulty)
         self.player_weight = player_weight
@@ -36,12 +42,13 @@ class EnemyAIController:
         
         # 初始化计时器为随机值，确保敌人立即开始移动
         min_interval, max_interval = self.config["direction_interval"]
-        self.direction_timer = random.randint(min_interval, max_interval)
+        self.direction_timer = self.rng.randint(min_interval, max_interval)
         
         min_interval, max_interval = self.config["shoot_interval"]
-        self.shoot_timer = random.randint(min_interval, max_interval)
+        self.shoot_timer = self.rng.randint(min_interval, max_interval)
         
-        self.role = None  # For Hell difficulty team coordination
+        self.role = None  # For Hell difficulty team coordination（由 AIBlackboard 分配）
+        self.blackboard = None  # 每帧共享的感知数据（由 GameEngine 注入）
         self.turn_timer = 0  # 方向调转计时器
         self.target_direction = None  # 目标方向
         # 防止卡住：记录上一次位置与卡住帧计数
@@ -51,6 +58,13 @@ class EnemyAIController:
         self.threat_scores = {}  # tank_id -> score
         self._state = "attack"   # attack / defend / retreat / flank
         self._state_timer = 0
+        # 多进程规划模式下，由工作池返回的最新规划（延迟一帧）及其快照距今的帧数
+        self._plan = None
+        self._plan_age = 0
+        # 寻路：导航网格与寻路器（通常由 GameEngine 注入共享实例）
+        self.nav_grid = None
+        self.pathfinder = None
+        self._owns_navigation = False
 
     def _turn_to_direction(self, tank, target_direction):
         """
@@ -81,6 +95,11 @@ class EnemyAIController:
             return False
 
     def update(self):
+        self._update_tank()
+        # 规划按帧老化（冻结期间同样计时），本帧未使用的规划下一帧即过期
+        self._plan_age += 1
+
+    def _update_tank(self):
         # 检查敌人是否被冻结
         if self.world.freeze_enemies_timer > 0:
             return
@@ -110,7 +129,7 @@ class EnemyAIController:
             self._stuck_frames = 0
             # 重新计时，避免立即再次卡住
             min_interval, max_interval = self.config["direction_interval"]
-            self.direction_timer = random.randint(min_interval, max_interval)
+            self.direction_timer = self.rng.randint(min_interval, max_interval)
             return
 
         # 子弹威胁优先级高：发现必躲场景立即闪避
@@ -130,13 +149,13 @@ class EnemyAIController:
         if self.direction_timer <= 0:
             self._update_movement(tank)
             min_interval, max_interval = self.config["direction_interval"]
-            self.direction_timer = random.randint(min_interval, max_interval)
+            self.direction_timer = self.rng.randint(min_interval, max_interval)
         
         # Shooting logic - 只在计时器到0时执行
         if self.shoot_timer <= 0:
             self._update_shooting(tank)
             min_interval, max_interval = self.config["shoot_interval"]
-            self.shoot_timer = random.randint(min_interval, max_interval)
+            self.shoot_timer = self.rng.randint(min_interval, max_interval)
     
     def _update_movement(self, tank):
         """更新移动逻辑"""
@@ -147,7 +166,7 @@ class EnemyAIController:
     
     def _move_random(self, tank):
         """随机移动（简单难度）"""
-        direction = random.choice([Tank.UP, Tank.RIGHT, Tank.DOWN, Tank.LEFT])
+        direction = self.rng.choice([Tank.UP, Tank.RIGHT, Tank.DOWN, Tank.LEFT])
         
         # 先调转方向，再移动
         if self._turn_to_direction(tank, direction):
@@ -189,11 +208,70 @@ class EnemyAIController:
         if self._turn_to_direction(tank, best_dir):
             tank.move(best_dir)
     
+    def make_plan_request(self):
+        """生成提交给AI规划进程池的请求（仅包含可 pickle 的基础类型）。"""
+        focus = self.blackboard.focus_player if self.blackboard is not None else None
+        return (
+            self.tank_id,
+            self.difficulty,
+            dict(self.threat_scores),
+            self.player_weight,
+            self.base_weight,
+            self.role,
+            focus.tank_id if focus is not None else None,
+        )
+
+    def apply_plan(self, plan, age: int = 1):
+        """应用工作进程返回的规划结果（目标 + 下一步方向）。
+
+        Args:
+            plan: 规划结果
+            age: 规划所基于的快照距今的帧数（从提交时算起）；超过一帧的规划直接丢弃
+        """
+        if age > 1:
+            self._plan = None
+            return
+        self._plan = plan
+        self._plan_age = age
+
+    def _take_plan(self):
+        """取出尚未过期的规划（只使用一次；基于一帧以前快照的规划直接丢弃）。"""
+        plan = self._plan
+        self._plan = None
+        if plan is None or self._plan_age > 1:
+            return None
+        return plan
+
+    def _resolve_plan_target(self, plan):
+        """将规划中的目标引用解析为当前世界中的对象；目标已失效时返回 None。"""
+        ref = plan.get("target")
+        if not ref:
+            return None, False
+        kind, obj_id = ref
+        if kind == "player":
+            target = self.world.tank_id_map.get(obj_id)
+            if not target or not target.active or target.tank_type != "player":
+                return None, False
+            return target, False
+        wall = self.world.wall_id_map.get(obj_id)
+        if not wall or not wall.active:
+            return None, False
+        if kind == "base":
+            return wall, True
+        return wall, False
+
     def _move_with_tracking(self, tank):
         """带追踪的移动（普通+难度）"""
-        # 1. 选择目标（考虑威胁与状态）
+        # 1. 选择目标（考虑威胁与状态）；多进程模式下优先使用上一帧的规划
         base = self._find_player_base()
-        target, target_is_base = self._select_target(tank, base)
+        plan = self._take_plan()
+        target = None
+        if plan is not None:
+            target, target_is_base = self._resolve_plan_target(plan)
+            if not target:
+                plan = None
+        if plan is None:
+            target, target_is_base = self._select_target(tank, base)
         if not target:
             self._move_random(tank)
             return
@@ -205,7 +283,7 @@ class EnemyAIController:
         
         # Check if should track based on probability
         tracking_prob = self.config.get("tracking_prob", 0.7)
-        if not target_is_base and random.random() > tracking_prob:
+        if not target_is_base and self.rng.random() > tracking_prob:
             self._move_random(tank)
             return
         
@@ -244,15 +322,18 @@ class EnemyAIController:
             flank_offset = 120
             if abs(dx) > abs(dy):
                 target_x = target.x
-                target_y = target.y + (flank_offset if random.random() < 0.5 else -flank_offset)
+                target_y = target.y + (flank_offset if self.rng.random() < 0.5 else -flank_offset)
             else:
-                target_x = target.x + (flank_offset if random.random() < 0.5 else -flank_offset)
+                target_x = target.x + (flank_offset if self.rng.random() < 0.5 else -flank_offset)
                 target_y = target.y
             dx = target_x - tank.x
             dy = target_y - tank.y
 
         # 路径规划（简单网格 BFS）优先
-        next_dir = self._next_direction_via_path(tank, target)
+        if plan is not None:
+            next_dir = plan.get("direction")
+        else:
+            next_dir = self._next_direction_via_path(tank, target)
         if next_dir is not None:
             if self._turn_to_direction(tank, next_dir):
                 tank.move(next_dir)
@@ -525,9 +606,17 @@ class EnemyAIController:
         return (min(p1[0], p2[0]) <= p[0] <= max(p1[0], p2[0]) and
                 min(p1[1], p2[1]) <= p[1] <= max(p1[1], p2[1]))
     
+    def _active_players(self):
+        """存活的玩家坦克列表（优先使用黑板中本帧已计算的结果）。"""
+        if self.blackboard is not None:
+            return self.blackboard.players
+        return [t for t in self.world.tanks if t.active and t.tank_type == "player"]
+
     def _find_nearest_player(self, tank):
         """查找最近的玩家（兼容旧代码）"""
-        players = [t for t in self.world.tanks if t.active and t.tank_type == "player"]
+        if self.blackboard is not None and self.tank_id in self.blackboard.nearest_player:
+            return self.blackboard.nearest_player[self.tank_id]
+        players = self._active_players()
         if not players:
             return None
         
@@ -542,6 +631,8 @@ class EnemyAIController:
         
     def _find_player_base(self):
         """查找玩家基地（唯一的BASE类型墙体）"""
+        if self.blackboard is not None:
+            return self.blackboard.base
         bases = [wall for wall in self.world.walls if wall.active and wall.wall_type == Wall.BASE]
         return bases[0] if bases else None
 
@@ -577,7 +668,7 @@ class EnemyAIController:
                     return base
         
         # 2. 如果没有合适的基地目标，则选择玩家坦克
-        players = [t for t in self.world.tanks if t.active and t.tank_type == "player"]
+        players = self._active_players()
         if not players:
             # 如果没有玩家坦克，返回基地作为目标
             return base
@@ -609,7 +700,7 @@ class EnemyAIController:
     def _should_dodge(self, tank):
         """检查是否应该躲避子弹"""
         dodge_prob = self.config.get("dodge_prob", 0.3)
-        if random.random() > dodge_prob:
+        if self.rng.random() > dodge_prob:
             return False
         
         # Check for incoming bullets
@@ -645,22 +736,32 @@ class EnemyAIController:
         # 撤退条件：血量低或附近高威胁
         high_threat = max(self.threat_scores.values()) if self.threat_scores else 0
         # 近距压制：玩家靠太近也触发撤退
-        close_player = any(
-            ((p.x - tank.x) ** 2 + (p.y - tank.y) ** 2) ** 0.5 < 120
-            for p in self.world.tanks
-            if p.tank_type == "player" and p.active
-        )
+        if self.blackboard is not None and self.tank_id in self.blackboard.close_player:
+            close_player = self.blackboard.close_player[self.tank_id]
+        else:
+            close_player = any(
+                ((p.x - tank.x) ** 2 + (p.y - tank.y) ** 2) ** 0.5 < 120
+                for p in self._active_players()
+            )
         if health_ratio < 0.3 or high_threat > 50 or close_player:
             self._state = "retreat"
             self._state_timer = 60
             return
+        # 团队角色（地狱难度）：包抄手持续侧翼，突袭手专注进攻基地
+        if self.role == "flanker" and self._state_timer == 0:
+            self._state = "flank"
+            self._state_timer = 90
+            return
+        if self.role == "base_raider":
+            self._state = "attack"
+            return
         # 侧翼：周期性触发
-        if self._state_timer == 0 and random.random() < 0.15:
+        if self._state_timer == 0 and self.rng.random() < 0.15:
             self._state = "flank"
             self._state_timer = 90
             return
         # 防守：如果基地存在且可见，且难度较高时偶尔守
-        if self._state_timer == 0 and self.difficulty in ["hard", "hell"] and random.random() < 0.2:
+        if self._state_timer == 0 and self.difficulty in ["hard", "hell"] and self.rng.random() < 0.2:
             self._state = "defend"
             self._state_timer = 90
             return
@@ -669,9 +770,15 @@ class EnemyAIController:
 
     def _select_target(self, tank, base):
         """结合威胁与基地优先，返回目标与是否基地。"""
-        players = [t for t in self.world.tanks if t.active and t.tank_type == "player"]
+        players = self._active_players()
         target = None
         target_is_base = False
+        # 团队角色（地狱难度）：突袭手直取基地，攻击手集火团队锁定的玩家
+        if self.role == "base_raider" and base:
+            return self._base_or_blocker(base)
+        focus = self.blackboard.focus_player if self.blackboard is not None else None
+        if self.role == "attacker" and focus is not None and focus.active:
+            return focus, False
         if players:
             def _score(p):
                 dist2 = (p.x - tank.x) ** 2 + (p.y - tank.y) ** 2
@@ -690,14 +797,18 @@ class EnemyAIController:
             if self.difficulty in ["hard", "hell"]:
                 base_score *= 1.4 if self.difficulty == "hell" else 1.25
             if base_score > target_score:
-                # 若基地被墙阻挡，沿射线找第一块阻挡物，若可破坏则锁定拆除
-                blocker = self._find_first_blocker_to(base)
-                if blocker and getattr(blocker, "destructible", False):
-                    return blocker, False
-                # 若找不到阻挡或不可破坏，则仍以基地为目标
-                return base, True
+                return self._base_or_blocker(base)
         return target, False
 
+    def _base_or_blocker(self, base):
+        """以基地为目标；若基地被可破坏墙体阻挡，则先锁定该墙体。"""
+        # 若基地被墙阻挡，沿射线找第一块阻挡物，若可破坏则锁定拆除
+        blocker = self._find_first_blocker_to(base)
+        if blocker and getattr(blocker, "destructible", False):
+            return blocker, False
+        # 若找不到阻挡或不可破坏，则仍以基地为目标
+        return base, True
+
     def _find_first_blocker_to(self, target):
         """沿射线找到首个阻挡物（墙/基地），用于拆墙或判定遮挡。"""
         tank = next((t for t in self.world.tanks if t.tank_id == self.tank_id and t.active), None)
@@ -739,108 +850,50 @@ class EnemyAIController:
             return Tank.RIGHT if dx > 0 else Tank.LEFT
         return Tank.DOWN if dy > 0 else Tank.UP
 
+    def set_navigation(self, nav_grid, pathfinder):
+        """使用引擎注入的共享导航网格与寻路器（由引擎每帧标记重建，控制器不再自行重建）。"""
+        self.nav_grid = nav_grid
+        self.pathfinder = pathfinder
+        self._owns_navigation = False
+
+    def _get_navigation(self):
+        """获取导航网格与寻路器；未由引擎注入共享实例时按需创建私有实例。"""
+        grid = config.GRID_SIZE
+        cols = max(1, self.world.width // grid)
+        rows = max(1, self.world.height // grid)
+        if self.nav_grid is None or self.nav_grid.cols != cols or self.nav_grid.rows != rows:
+            # 尺寸不符时换用私有实例，共享网格本身保持不变
+            self.nav_grid = NavGrid(cols, rows)
+            self.pathfinder = GridPathfinder(cols, rows, config.AI_PATH_CACHE_SIZE)
+            self._owns_navigation = True
+        if self._owns_navigation:
+            # 私有网格无法得知帧边界，每次调用都重建（内容未变时版本号不变，缓存仍可命中）
+            self.nav_grid.mark_dirty()
+        return self.nav_grid, self.pathfinder
+
     def _next_direction_via_path(self, tank, target):
         """A* 寻路，使用危险度代价图。返回下一步方向或 None。"""
         if not target:
             return None
         grid = config.GRID_SIZE
-        cols = max(1, self.world.width // grid)
-        rows = max(1, self.world.height // grid)
-        start = self._closest_free_cell(int((tank.x + tank.width * 0.5) // grid), int((tank.y + tank.height * 0.5) // grid), cols, rows)
-        goal = self._closest_free_cell(int((target.x + target.width * 0.5) // grid), int((target.y + target.height * 0.5) // grid), cols, rows)
-        if start == goal:
+        nav, finder = self._get_navigation()
+        # 代价图：基础1，墙体膨胀一圈、玩家危险半径与直线视野、子弹轨迹提高代价
+        nav.refresh(self.world, grid, los_penalty_for(self.difficulty))
+        sx, sy = nav.closest_free_cell(int((tank.x + tank.width * 0.5) // grid), int((tank.y + tank.height * 0.5) // grid))
+        gx, gy = nav.closest_free_cell(int((target.x + target.width * 0.5) // grid), int((target.y + target.height * 0.5) // grid))
+        if (sx, sy) == (gx, gy):
             return None
 
-        # 构建代价图：基础1，危险区域提高代价；对墙体膨胀一圈提高代价，减少贴墙蹭卡
-        blocked = set()
-        for w in self.world.walls:
-            if not w.active:
-                continue
-            if getattr(w, "passable", False):
-                continue
-            blocked.add((int(w.x // grid), int(w.y // grid)))
-
-        danger = [[1.0 for _ in range(rows)] for _ in range(cols)]
-        # 墙体膨胀：周围一圈提高代价，避免贴墙路径
-        for bx, by in blocked:
-            for dx in (-1, 0, 1):
-                for dy in (-1, 0, 1):
-                    nx, ny = bx + dx, by + dy
-                    if 0 <= nx < cols and 0 <= ny < rows:
-                        danger[nx][ny] += 3.0
-        # 玩家位置增加危险半径
-        for p in self.world.tanks:
-            if p.tank_type != "player" or not p.active:
-                continue
-            px, py = int(p.x // grid), int(p.y // grid)
-            for dx in range(-3, 4):
-                for dy in range(-3, 4):
-                    nx, ny = px + dx, py + dy
-                    if 0 <= nx < cols and 0 <= ny < rows:
-                        danger[nx][ny] += max(0, 4 - (abs(dx) + abs(dy))) * 1.5
-            # 直线视野惩罚（硬/地狱更重）
-            los_penalty = 4.0 if self.difficulty == "hell" else 2.5 if self.difficulty == "hard" else 1.5
-            # 同行
-            for x in range(cols):
-                if self._line_clear((px, py), (x, py), blocked):
-                    danger[x][py] += los_penalty
-            # 同列
-            for y in range(rows):
-                if self._line_clear((px, py), (px, y), blocked):
-                    danger[px][y] += los_penalty
-        # 子弹轨迹危险
-        for b in self.world.bullets:
-            if not b.active:
-                continue
-            bx, by = int(b.x // grid), int(b.y // grid)
-            if 0 <= bx < cols and 0 <= by < rows:
-                danger[bx][by] += 7
-                # 沿子弹方向扩散危险（更少直线穿越）
-                spread_len = 3
-                dx = 1 if b.velocity_x > 0 else -1 if b.velocity_x < 0 else 0
-                dy = 1 if b.velocity_y > 0 else -1 if b.velocity_y < 0 else 0
-                for i in range(1, spread_len + 1):
-                    sx = bx + dx * i
-                    sy = by + dy * i
-                    if 0 <= sx < cols and 0 <= sy < rows:
-                        danger[sx][sy] += 3
-
-        def heuristic(a, b):
-            return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-        open_set = []
-        heapq.heappush(open_set, (0, start))
-        came_from = {start: None}
-        g_score = {start: 0}
-        dirs = [(1,0),(-1,0),(0,1),(0,-1)]
-
-        while open_set:
-            _, current = heapq.heappop(open_set)
-            if current == goal:
-                break
-            cx, cy = current
-            for dx, dy in dirs:
-                nx, ny = cx + dx, cy + dy
-                if nx < 0 or ny < 0 or nx >= cols or ny >= rows:
-                    continue
-                if (nx, ny) in blocked:
-                    continue
-                step_cost = danger[nx][ny]
-                tentative = g_score[current] + step_cost
-                if tentative < g_score.get((nx, ny), float("inf")):
-                    g_score[(nx, ny)] = tentative
-                    came_from[(nx, ny)] = current
-                    f = tentative + heuristic((nx, ny), goal)
-                    heapq.heappush(open_set, (f, (nx, ny)))
-
-        if goal not in came_from:
+        step = finder.first_step(
+            nav,
+            nav.index(sx, sy),
+            nav.index(gx, gy),
+            max_expansions=config.AI_PATH_MAX_EXPANSIONS,
+            use_jps=config.AI_PATH_USE_JPS,
+        )
+        if step < 0:
             return None
-        # 回溯获取下一步
-        step = goal
-        while came_from[step] and came_from[step] != start:
-            step = came_from[step]
-        nx, ny = step
-        sx, sy = start
+        nx, ny = nav.cell(step)
         if nx > sx:
             return Tank.RIGHT
         if nx < sx:
@@ -850,55 +903,6 @@ class EnemyAIController:
         if ny < sy:
             return Tank.UP
         return None
-
-    def _closest_free_cell(self, gx, gy, cols, rows):
-        """若目标格被墙堵塞或越界，寻找最近的可通行格。"""
-        if 0 <= gx < cols and 0 <= gy < rows:
-            if not any(
-                w.active and not getattr(w, "passable", False)
-                and int(w.x // config.GRID_SIZE) == gx
-                and int(w.y // config.GRID_SIZE) == gy
-                for w in self.world.walls
-            ):
-                return (gx, gy)
-        from collections import deque
-        q = deque()
-        q.append((gx, gy))
-        visited = set([(gx, gy)])
-        dirs = [(1,0),(-1,0),(0,1),(0,-1)]
-        while q:
-            x, y = q.popleft()
-            if 0 <= x < cols and 0 <= y < rows:
-                blocked_here = any(
-                    w.active and not getattr(w, "passable", False)
-                    and int(w.x // config.GRID_SIZE) == x
-                    and int(w.y // config.GRID_SIZE) == y
-                    for w in self.world.walls
-                )
-                if not blocked_here:
-                    return (x, y)
-            for dx, dy in dirs:
-                nx, ny = x + dx, y + dy
-                if (nx, ny) not in visited and -1 <= nx <= cols and -1 <= ny <= rows:
-                    visited.add((nx, ny))
-                    q.append((nx, ny))
-        return (max(0, min(cols - 1, gx)), max(0, min(rows - 1, gy)))
-
-    def _line_clear(self, a, b, blocked):
-        """网格直线是否有阻挡（用于视野惩罚）。"""
-        ax, ay = a
-        bx, by = b
-        if ax == bx:
-            step = 1 if by > ay else -1
-            for y in range(ay + step, by, step):
-                if (ax, y) in blocked:
-                    return False
-        elif ay == by:
-            step = 1 if bx > ax else -1
-            for x in range(ax + step, bx, step):
-                if (x, ay) in blocked:
-                    return False
-        return True
     
     def _bullet_will_hit(self, bullet, tank):
         """预测子弹是否会击中坦克"""
@@ -932,14 +936,14 @@ class EnemyAIController:
                     if tank.direction in [Tank.LEFT, Tank.RIGHT]:
                         dodge_dir = tank.direction  # 保持当前水平方向
                     else:
-                        dodge_dir = Tank.LEFT if random.random() < 0.5 else Tank.RIGHT
+                        dodge_dir = Tank.LEFT if self.rng.random() < 0.5 else Tank.RIGHT
                 else:
                     # 子弹从左往右或从右往左，向上下躲避
                     # 优先选择与当前方向一致的垂直方向
                     if tank.direction in [Tank.UP, Tank.DOWN]:
                         dodge_dir = tank.direction  # 保持当前垂直方向
                     else:
-                        dodge_dir = Tank.UP if random.random() < 0.5 else Tank.DOWN
+                        dodge_dir = Tank.UP if self.rng.random() < 0.5 else Tank.DOWN
                 
                 # 先调转方向，再移动
                 if self._turn_to_direction(tank, dodge_dir):
@@ -1117,7 +1121,21 @@ class GameEngine:
         self.enable_network = enable_network
         self.player_tank: Optional[Tank] = None
         self.enemy_controllers: List[EnemyAIController] = []
+        # 可选的AI规划进程池（config.AI_WORKER_PROCESSES > 0 时按需创建）
+        self.ai_worker_pool = None
+        self.ai_tick = 0  # AI规划帧计数，用于计算规划结果的年龄
+        # 敌人共享的每帧感知黑板
+        self.ai_blackboard = AIBlackboard()
+        # 敌人共享的导航网格与寻路器（按直线视野惩罚分组，按需创建）
+        self.ai_navigation = NavigationCache(config.AI_PATH_CACHE_SIZE)
         self._movement_stack: List[int] = []
+        # 确定性锁步会话（仅锁步联机时存在）与待提交的射击输入
+        self.lockstep: Optional[LockstepSession] = None
+        self._lockstep_shoot = False
+        # 对局录像（config.REPLAY_RECORD 开启时每局创建）
+        self.replay_recorder: Optional[ReplayRecorder] = None
+        self._replaying = False
+        self._replay_ticks = 0  # 重放时已模拟的逻辑帧数（关卡计时改用逻辑帧换算）
         
         # 全屏状态跟踪
         self.is_fullscreen = False
@@ -1171,6 +1189,7 @@ class GameEngine:
             
         # 更新渲染表面，但不重新创建游戏世界
         self.update_render_surface()
+        self.video_manager.invalidate_scaled_frames()
         
     def restore_window(self):
         """恢复窗口到原始尺寸"""
@@ -1206,14 +1225,23 @@ class GameEngine:
             
         print(f"游戏引擎已响应窗口大小改变: {width}x{height} (游戏状态已保留)")
         
-    def _setup_single_player_world(self, player_tank_id=1, map_name="default"):
-        """初始化单机模式对象。"""
+    def _setup_single_player_world(self, player_tank_id=1, map_name="default", seed=None):
+        """初始化单机模式对象。
+        
+        Args:
+            player_tank_id: 玩家坦克ID（皮肤）
+            map_name: 地图名称
+            seed: 本局随机种子（重放录像时传入，默认随机选取）
+        """
         self._movement_stack.clear()
         self.enemy_controllers.clear()  # 清除旧的控制器
+        self.next_enemy_id = 10
         grid_size = config.GRID_SIZE
         
         # 重置游戏世界，清除旧的游戏对象
         self.game_world.reset()
+        seed = self.game_world.seed_match(seed)
+        print(f"[Game] 本局随机种子: {seed}")
         
         # 播放游戏开始音效
         from src.utils.resource_manager import resource_manager
@@ -1237,7 +1265,8 @@ class GameEngine:
             from src.utils.level_map_generator import generate_level_map
             map_data = generate_level_map(self.current_level, 
                                         self.game_world.width, 
-                                        self.game_world.height)
+                                        self.game_world.height,
+                                        rng=self.game_world.rng)
             print(f"生成关卡地图: {map_data.get('name', '关卡地图')}")
         
         if map_data:
@@ -1390,6 +1419,9 @@ class GameEngine:
             # 按顺序生成墙体
             for x, y, wall_type in default_walls:
                 self.game_world.spawn_wall(x, y, wall_type)
+        
+        self.map_data = map_data
+        self._start_replay_recording("single")
 
     def setup_multiplayer_world(self, p1_tank_id, p2_tank_id, map_name="default", game_mode="coop", level_number=None):
         """初始化联机模式对象
@@ -1402,8 +1434,12 @@ class GameEngine:
             level_number: 关卡编号（仅关卡模式使用）
         """
         self.game_world.reset()
+        # 主机选取种子并随 game_start 发给客户端，双方使用同一随机序列
+        seed = self.game_world.seed_match(getattr(self.screen_manager.context, 'match_seed', None))
+        print(f"[Game] 本局随机种子: {seed}")
         self._movement_stack.clear()
         self.enemy_controllers.clear()  # 清除旧的控制器
+        self.next_enemy_id = 10
         grid_size = config.GRID_SIZE
         
         # 播放游戏开始音效
@@ -1428,6 +1464,14 @@ class GameEngine:
             self._setup_mixed_mode(p1_tank_id, p2_tank_id, map_name)
         else:  # coop (default)
             self._setup_coop_mode(p1_tank_id, p2_tank_id, map_name)
+        
+        # 录像：锁步双方都可录制；状态同步只有主机运行完整模拟
+        if getattr(self.screen_manager.context, 'lockstep', False):
+            self._start_replay_recording("lockstep")
+        elif self.network_manager.stats.role == "host":
+            self._start_replay_recording("host")
+        else:
+            self._finish_replay_recording()
     
     def _setup_coop_mode(self, p1_tank_id, p2_tank_id, map_name):
         """设置合作模式"""
@@ -1495,7 +1539,7 @@ class GameEngine:
                 if not map_data:
                     # 地图不存在，生成新地图
                     print(f"[Game] 关卡{level_number}地图不存在，生成新地图")
-                    map_data = multiplayer_map_generator.generate_level_map(level_number)
+                    map_data = multiplayer_map_generator.generate_level_map(level_number, seed=self.game_world.match_seed)
                 
                 # 使用关卡配置和地图数据
                 self._load_map_and_setup_players(p1_tank_id, p2_tank_id, level_map_name, level_config, map_data)
@@ -1522,7 +1566,7 @@ class GameEngine:
                     # 实现时间限制功能
                     self.time_limit = level_config['time_limit']
                     self.time_remaining = self.time_limit
-                    self.level_start_time = pygame.time.get_ticks()  # 记录关卡开始时间
+                    self.level_start_time = self._level_clock_ms()  # 记录关卡开始时间
                     print(f"[Game] 关卡{level_number}有时间限制: {self.time_limit}秒")
                 
                 if level_config.get('score_target'):
@@ -1738,6 +1782,16 @@ class GameEngine:
             self.resize_window(width, height)
             return
 
+        # 性能剖析：F3 开关叠加层，F4 导出轨迹（任意界面可用）
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.set_enabled(not profiler.enabled)
+            print(f"[Profiler] 性能剖析已{'开启' if profiler.enabled else '关闭'}")
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and profiler.enabled:
+            try:
+                print(f"[Profiler] 轨迹已导出: {profiler.export_default()}")
+            except OSError as e:
+                print(f"[Profiler] 导出轨迹失败: {e}")
+
         if self.current_state != "game":
             return
 
@@ -1791,31 +1845,37 @@ class GameEngine:
     def update(self):
         """更新游戏状态"""
         now_ms = pygame.time.get_ticks()
-        self.video_manager.update(now_ms)
-        
-        # 定期尝试重新加载失败的视频资源（复加载机制）
-        # 每5秒检查一次，避免过于频繁
-        if not hasattr(self, '_last_reload_check'):
-            self._last_reload_check = now_ms
-        elif now_ms - self._last_reload_check > 5000:  # 5秒
-            self._last_reload_check = now_ms
-            # 只在主线程中执行（update 在主线程中）
-            self.video_manager.reload_failed_assets()
+        with profiler.section("video"):
+            self.video_manager.update(now_ms)
+            
+            # 定期尝试重新加载失败的视频资源（复加载机制）
+            # 每5秒检查一次，避免过于频繁
+            if not hasattr(self, '_last_reload_check'):
+                self._last_reload_check = now_ms
+            elif now_ms - self._last_reload_check > 5000:  # 5秒
+                self._last_reload_check = now_ms
+                # 只在主线程中执行（update 在主线程中）
+                self.video_manager.reload_failed_assets()
         
         # 如果暂停，只更新UI管理器，跳过游戏逻辑
         if self.paused:
             # 更新UI管理器以处理暂停菜单
-            time_delta = 1.0 / 60.0
+            time_delta = 1.0 / config.SIMULATION_FPS
             self.screen_manager.ui_manager.update(time_delta)
             return
         
         # Network Update
         if self.enable_network:
-            self.network_manager.update()
+            with profiler.section("network"):
+                self.network_manager.update()
             
             role = self.network_manager.stats.role
             
-            if role == "client":
+            if self.lockstep is not None:
+                # Lockstep: 双方各自模拟，只交换输入与校验和
+                if self.current_state == "game" and not self.game_world.game_over:
+                    self._update_lockstep(role)
+            elif role == "client":
                 # Client: Send Input -> Receive State -> Render
                 # 1. Send Input
                 # We need to capture current input state. 
@@ -1828,6 +1888,10 @@ class GameEngine:
                 }
                 self.network_manager.send_input(input_data)
                 
+                # 远程坦克不在客户端模拟：每个逻辑帧以当前位置作为插值起点，收到状态后平滑过渡
+                for tank in self.game_world.tanks:
+                    tank.prev_x, tank.prev_y = tank.x, tank.y
+                
                 # 2. Client-Side Prediction: Update local player tank
                 if self.player_tank and self.player_tank.active:
                     # Store previous position for error calculation
@@ -1847,7 +1911,8 @@ class GameEngine:
                         self.player_tank.stop()
                     
                     # 进行预测性碰撞检测（在移动前检测，避免穿透）
-                    self.game_world._check_collisions_predictive()
+                    with profiler.section("predictive"):
+                        self.game_world._check_collisions_predictive()
                     
                     # 更新坦克位置（如果速度没有被碰撞检测清除）
                     self.player_tank.update()
@@ -1917,7 +1982,8 @@ class GameEngine:
                                     self.player_tank.rect.topleft = (self.player_tank.x, self.player_tank.y)
                     
                     # Apply state for other entities (other players, bullets, etc.)
-                    self.state_manager.decode_state(remote_state)
+                    with profiler.section("state_decode"):
+                        self.state_manager.decode_state(remote_state)
                     
                     # 消费同步的事件（用于触发视频播放等客户端效果）
                     # 注意：事件是从服务端同步过来的，通过 decode_state 添加到 world.events 中
@@ -1932,20 +1998,7 @@ class GameEngine:
                             pygame.mixer.stop()
                             self._play_game_over_video()
                             # 设置游戏结果并显示游戏结束屏幕
-                            winner = self.game_world.winner
-                            if self.multiplayer_game_mode == "pvp":
-                                # PvP模式：根据本地玩家ID判断是否获胜
-                                is_host = self.network_manager.stats.role == "host"
-                                local_player_key = "player1" if is_host else "player2"
-                                self.screen_manager.context.game_won = (winner == local_player_key)
-                            elif self.multiplayer_game_mode == "mixed":
-                                # 混战模式：根据本地玩家ID判断是否获胜
-                                is_host = self.network_manager.stats.role == "host"
-                                local_player_key = "player1" if is_host else "player2"
-                                self.screen_manager.context.game_won = (winner == local_player_key)
-                            else:
-                                # 合作模式和关卡模式：winner为"player"表示获胜
-                                self.screen_manager.context.game_won = (winner == "player")
+                            self.screen_manager.context.game_won = self._local_player_won()
                             # 通知屏幕管理器切换到游戏结束屏幕
                             self.screen_manager.set_state("game_over")
                 
@@ -1968,9 +2021,11 @@ class GameEngine:
                                 client_tank.move(move_dir)
                             else:
                                 client_tank.stop()
+                            self._record_action(client_tank.tank_id, move_dir if move_dir != -1 else ACTION_STOP)
                             
                             # Process shoot input
                             if inp.get("shoot"):
+                                self._record_action(client_tank.tank_id, ACTION_SHOOT)
                                 self.game_world.spawn_bullet(client_tank)
                         else:
                             tank_ids = [t.tank_id for t in self.game_world.tanks if t.active]
@@ -1984,95 +2039,66 @@ class GameEngine:
                     # 应用本地主机的移动输入（设置速度，但不立即更新位置）
                     self._apply_player_direction()
                     
-                    # 更新敌人AI（必须在游戏世界更新之前，因为AI会调用move等方法）
-                    self._update_enemy_ai()
-                    
-                    # 先进行预测性碰撞检测（在移动前检测，避免穿透）
-                    self.game_world._check_collisions_predictive()
-                    
-                    # 然后更新所有坦克的物理状态（位置、动画等）
-                    if self.player_tank and self.player_tank.active:
-                        self.player_tank.update()
-                    client_tank = next((t for t in self.game_world.tanks if t.tank_id == 2 and t.active), None)
-                    if client_tank:
-                        client_tank.update()
-                    for tank in self.game_world.tanks:
-                        if tank.tank_type == "enemy" and tank.active:
-                            tank.update()
-                    
-                    # 更新游戏世界（处理碰撞、子弹等）
-                    self.game_world.update()
+                    # 更新AI、坦克物理与游戏世界
+                    self._simulate_world_tick(host_physics=True)
+                    self._end_replay_tick()
                     
                     # 在消费事件之前，先让状态管理器捕获事件（用于同步到客户端）
-                    # 这样确保事件在清空之前被捕获
+                    # 事件会累积到下一个网络发送帧，确保降低发送频率时不丢事件
                     if hasattr(self.state_manager, 'world') and self.state_manager.world:
-                        self.state_manager._captured_events = []
-                        if hasattr(self.game_world, 'events'):
-                            self.state_manager._captured_events = list(self.game_world.events)
+                        self.state_manager.capture_events(list(self.game_world.events))
                     
                     # 消费事件（触发本地视频播放等效果）
                     self._consume_game_events()
                     
                     # 更新关卡模式特殊条件
-                    if self.multiplayer_game_mode == "level":
-                        self._update_level_conditions()
+                    self._update_match_rules()
                     
                     # 检查游戏是否结束
                     if self._check_game_over():
                         # 游戏结束，停止所有音效
                         pygame.mixer.stop()
                         self._play_game_over_video()
+                        self._finish_replay_recording()
                         # 设置游戏结果并显示游戏结束屏幕
-                        # 根据游戏模式判断是否获胜
-                        winner = self.game_world.winner
-                        if self.multiplayer_game_mode == "pvp":
-                            # PvP模式：根据本地玩家ID判断是否获胜
-                            is_host = self.network_manager.stats.role == "host"
-                            local_player_key = "player1" if is_host else "player2"
-                            self.screen_manager.context.game_won = (winner == local_player_key)
-                        elif self.multiplayer_game_mode == "mixed":
-                            # 混战模式：根据本地玩家ID判断是否获胜
-                            is_host = self.network_manager.stats.role == "host"
-                            local_player_key = "player1" if is_host else "player2"
-                            self.screen_manager.context.game_won = (winner == local_player_key)
-                        else:
-                            # 合作模式和关卡模式：winner为"player"表示获胜
-                            self.screen_manager.context.game_won = (winner == "player")
+                        self.screen_manager.context.game_won = self._local_player_won()
                         # 通知屏幕管理器切换到游戏结束屏幕
                         self.screen_manager.set_state("game_over")
                         # 向客户端发送最终状态，避免客户端卡在旧画面
                         try:
-                            final_state = self.state_manager.encode_state()
+                            final_state = self.state_manager.build_snapshot()
                             self.network_manager.send_state(final_state)
                         except Exception as e:
                             print(f"[Game] Failed to send final state: {e}")
                         # 不要立即重置游戏世界，等回到主菜单时再重置
-                    else:
-                        # 3. Send State - 只有游戏未结束时才发送状态
-                        state = self.state_manager.encode_state()
-                        self.network_manager.send_state(state)
+                    elif self.state_manager.should_send():
+                        # 3. Send State - 只在网络发送帧编码并发送（频率见 config.NETWORK_SEND_RATE）
+                        with profiler.section("state_encode"):
+                            state = self.state_manager.build_snapshot()
+                        with profiler.section("network"):
+                            self.network_manager.send_state(state)
         
         else:
             # Single Player
             # 只有在游戏未结束时才更新游戏世界
             if self.current_state == "game" and not self.game_world.game_over:
-                # 统一移动调用时机：先更新所有坦克的移动状态
+                # 统一移动调用时机：先更新玩家坦克的移动状态
                 self._apply_player_direction()  # 玩家坦克移动
-                self._update_enemy_ai()          # 敌人坦克移动
                 
-                # 然后更新游戏世界（处理物理和碰撞）
-                self.game_world.update()
+                # 然后更新敌人AI与游戏世界（处理物理和碰撞）
+                self._simulate_world_tick()
+                self._end_replay_tick()
                 self._consume_game_events()
                 
                 # 更新关卡模式特殊条件
-                if self.multiplayer_game_mode == "level":
-                    self._update_level_conditions()
+                self._update_match_rules()
                 
                 # 检查游戏是否结束
                 if self._check_game_over():
                     # 游戏结束，停止所有音效
                     pygame.mixer.stop()
                     self._play_game_over_video()
+                    self._finish_replay_recording()
                     # 设置游戏结果并显示游戏结束屏幕
                     # 单机模式：winner为"player"表示获胜
                     self.screen_manager.context.game_won = self.game_world.winner == "player"
@@ -2081,7 +2107,8 @@ class GameEngine:
                     # 不要立即重置游戏世界，等回到主菜单时再重置
 
         # UI Update
-        self.screen_manager.update()
+        with profiler.section("ui"):
+            self.screen_manager.update()
         
         # Sync State
         if self.screen_manager.current_state != self.current_state:
@@ -2095,11 +2122,14 @@ class GameEngine:
                     if status["progress"] < 0.5:  # 如果加载进度小于50%，尝试同步预加载
                         print("[Video] 游戏开始前同步预加载视频...")
                         self.video_manager.preload_all_sync()
+                # 对局中最常触发的视频
+                self.video_manager.prefetch("player_killed_by_enemy")
                 
                 # Initialize Game World
                 mode = self.screen_manager.context.game_mode
                 if mode == "single":
                     self.enable_network = False
+                    self.lockstep = None
                     selected_map = getattr(self.screen_manager.context, 'selected_map', 'default')
                     self._setup_single_player_world(self.screen_manager.context.player_tank_id, selected_map)
                 elif mode == "multi":
@@ -2123,7 +2153,18 @@ class GameEngine:
                         
                     self.setup_multiplayer_world(p1_skin, p2_skin, selected_map, game_mode, level_number)
                     
+                    # 锁步模式：双方在同一种子下各自模拟
+                    self.lockstep = None
+                    self._lockstep_shoot = False
+                    if getattr(self.screen_manager.context, 'lockstep', False):
+                        local_id = p1_logic_id if self.network_manager.stats.role == "host" else p2_logic_id
+                        remote_id = p2_logic_id if local_id == p1_logic_id else p1_logic_id
+                        self.lockstep = LockstepSession(local_id, remote_id)
+                        self.game_world.is_client_mode = False
+                        print(f"[Lockstep] 锁步模式启动，输入延迟 {self.lockstep.input_delay} 帧")
+                    
                     # Set player IDs for state manager
+                    self.state_manager.reset_send_clock()
                     if self.network_manager.stats.role == "host":
                         self.state_manager.client_tank_id = p2_logic_id  # For encoding my_tank
                         self.state_manager.local_player_id = None  # Host doesn't skip
@@ -2132,6 +2173,7 @@ class GameEngine:
                         self.state_manager.local_player_id = p2_logic_id  # Skip this in decode
                 elif mode == "level":
                     self.enable_network = False
+                    self.lockstep = None
                     # 设置当前关卡为选择的关卡
                     self.current_level = self.screen_manager.context.selected_level
                     selected_map = "default"  # 关卡模式使用生成的地图
@@ -2158,6 +2200,7 @@ class GameEngine:
                     if event_count > 0:
                         print(f"[Client] 警告：事件队列中有 {event_count} 个未消费的事件")
         
+        self._issue_video_prefetch_hints(events)
         for event in events:
             etype = event.get("type")
             data = event.get("data", {}) or {}
@@ -2186,6 +2229,18 @@ class GameEngine:
                 import traceback
                 traceback.print_exc()
 
+    def _issue_video_prefetch_hints(self, events):
+        """根据即将触发视频的局面提前加载视频（被 LRU 淘汰的视频不会在播放时才解码）。"""
+        for event in events:
+            if event.get("type") != "player_killed_by_enemy":
+                continue
+            tank_id = (event.get("data") or {}).get("tank_id")
+            # 玩家只剩最后一条命：失败/队友阵亡视频可能即将播放
+            if self.game_world.tank_lives.get(tank_id, 0) <= 1:
+                self.video_manager.prefetch("defeat")
+                if self.game_world.game_mode in ("coop", "mixed", "pvp"):
+                    self.video_manager.prefetch("teammate_out_of_lives")
+
     def _get_teammate_focus_position(self, depleted_id: Optional[int]) -> Tuple[int, int]:
         """找到仍然存活/有命的队友位置，用于显示鼓励视频。"""
         other_id = None
@@ -2233,8 +2288,12 @@ class GameEngine:
             self.game_world.height = game_world_height
             self.game_world.bounds = pygame.Rect(0, 0, game_world_width, game_world_height)
     
-    def render(self):
-        """渲染游戏画面 - 实现宽高比适配"""
+    def render(self, alpha: float = 1.0):
+        """渲染游戏画面 - 实现宽高比适配
+        
+        Args:
+            alpha: 逻辑帧间插值比例（固定步长主循环提供，暂停时不插值）
+        """
         # 1. 填充背景为黑色
         self.screen.fill((0, 0, 0))
 
@@ -2246,8 +2305,10 @@ class GameEngine:
             self.render_surface.fill((0, 0, 0))
             
             # 4. 将游戏世界渲染到中间表面
-            self.game_world.render(self.render_surface)
-            self.video_manager.render_world(self.render_surface)
+            with profiler.section("render"):
+                self.game_world.render(self.render_surface, 1.0 if self.paused else alpha)
+            with profiler.section("video"):
+                self.video_manager.render_world(self.render_surface)
             
             # 5. 计算缩放比例和居中位置
             # 获取当前窗口的实际大小
@@ -2274,25 +2335,31 @@ class GameEngine:
             y_offset = (current_height - scaled_height) // 2
             
             # 6. 缩放并绘制游戏世界到主窗口
-            scaled_surface = pygame.transform.scale(self.render_surface, (scaled_width, scaled_height))
-            self.screen.blit(scaled_surface, (x_offset, y_offset))
-            
-            # 8. 绘制生命值显示（在非游戏区域）
-            self._draw_lives_display(x_offset, y_offset, scaled_width, scaled_height)
+            with profiler.section("render"):
+                scaled_surface = pygame.transform.scale(self.render_surface, (scaled_width, scaled_height))
+                self.screen.blit(scaled_surface, (x_offset, y_offset))
+                
+                # 8. 绘制生命值显示（在非游戏区域）
+                self._draw_lives_display(x_offset, y_offset, scaled_width, scaled_height)
             
             # 7. 渲染暂停菜单
             if self.paused and self.pause_menu:
-                # 渲染半透明背景
-                self.pause_menu.render()
-                # 渲染UI元素（按钮和标签）
-                self.screen_manager.ui_manager.draw_ui(self.screen)
+                with profiler.section("ui"):
+                    # 渲染半透明背景
+                    self.pause_menu.render()
+                    # 渲染UI元素（按钮和标签）
+                    self.screen_manager.ui_manager.draw_ui(self.screen)
         else:
             # 菜单界面直接渲染到主窗口
-            self.screen_manager.render()
+            with profiler.section("ui"):
+                self.screen_manager.render()
 
         # 视频覆盖层（全屏/界面层）
-        self.video_manager.render_screen(self.screen)
-        pygame.display.flip()
+        with profiler.section("video"):
+            self.video_manager.render_screen(self.screen)
+        profiler.render_overlay(self.screen)
+        with profiler.section("present"):
+            pygame.display.flip()
 
     def _draw_lives_display(self, x_offset, y_offset, scaled_width, scaled_height):
         """在非游戏区域绘制玩家和敌人的生命值显示
@@ -2481,14 +2548,25 @@ class GameEngine:
         
         print(f"[Game] 第 {self.current_level} 关已准备就绪！")
     
+    def _level_clock_ms(self) -> int:
+        """关卡计时（毫秒）：重放时按已模拟的逻辑帧换算，与全速重放的实际耗时无关"""
+        if self._replaying:
+            return self._replay_ticks * 1000 // config.SIMULATION_FPS
+        return pygame.time.get_ticks()
+
+    def _update_match_rules(self):
+        """逻辑帧模拟之后的对局规则检查（关卡模式的时间限制与目标得分），重放时同样执行"""
+        if self.multiplayer_game_mode == "level":
+            self._update_level_conditions()
+
     def _update_level_conditions(self):
         """更新关卡模式的特殊条件（时间限制和目标得分）"""
         if not self.level_start_time:
-            self.level_start_time = pygame.time.get_ticks()
+            self.level_start_time = self._level_clock_ms()
         
         # 更新时间限制
         if self.time_limit is not None:
-            current_time = pygame.time.get_ticks()
+            current_time = self._level_clock_ms()
             elapsed_seconds = (current_time - self.level_start_time) / 1000.0
             self.time_remaining = max(0, self.time_limit - elapsed_seconds)
             
@@ -2552,11 +2630,233 @@ class GameEngine:
             return
         if self._movement_stack:
             self.player_tank.move(self._movement_stack[-1])
+            self._record_action(self.player_tank.tank_id, self._movement_stack[-1])
         else:
             self.player_tank.stop()
+            self._record_action(self.player_tank.tank_id, ACTION_STOP)
+
+    def _local_player_won(self) -> bool:
+        """根据游戏模式判断本地玩家是否获胜"""
+        winner = self.game_world.winner
+        if self.multiplayer_game_mode in ("pvp", "mixed"):
+            # PvP/混战模式：根据本地玩家ID判断是否获胜
+            is_host = self.network_manager.stats.role == "host"
+            local_player_key = "player1" if is_host else "player2"
+            return winner == local_player_key
+        # 合作模式和关卡模式：winner为"player"表示获胜
+        return winner == "player"
+
+    def _simulate_world_tick(self, host_physics: bool = False):
+        """模拟一个逻辑帧（玩家输入已应用）
+        
+        Args:
+            host_physics: 联机主机的物理步骤——先做预测性碰撞检测并单独更新各坦克，
+                再更新游戏世界；单机与锁步只更新游戏世界
+        """
+        # 更新敌人AI（必须在游戏世界更新之前，因为AI会调用move等方法）
+        with profiler.section("ai"):
+            self._update_enemy_ai()
+        
+        if host_physics:
+            with profiler.section("predictive"):
+                # 先进行预测性碰撞检测（在移动前检测，避免穿透）
+                self.game_world._check_collisions_predictive()
+            
+            # 然后更新所有坦克的物理状态（位置、动画等），计入世界更新
+            with profiler.section("world"):
+                if self.player_tank and self.player_tank.active:
+                    self.player_tank.update()
+                client_tank = next((t for t in self.game_world.tanks if t.tank_id == 2 and t.active), None)
+                if client_tank:
+                    client_tank.update()
+                for tank in self.game_world.tanks:
+                    if tank.tank_type == "enemy" and tank.active:
+                        tank.update()
+        
+        # 更新游戏世界（处理碰撞、子弹等；预测性碰撞与子弹碰撞单独计时）
+        with profiler.section("world"):
+            self.game_world.update()
+        if self._replaying:
+            self._replay_ticks += 1
+
+    def _apply_player_action(self, tank_id: int, action: int):
+        """对指定玩家坦克应用一个输入动作（移动方向、ACTION_STOP 或 ACTION_SHOOT）"""
+        tank = self.game_world.tank_id_map.get(tank_id)
+        if not tank or not tank.active:
+            return
+        self._record_action(tank_id, action)
+        if action == ACTION_SHOOT:
+            self.game_world.spawn_bullet(tank)
+        elif action == ACTION_STOP:
+            tank.stop()
+        else:
+            tank.move(action)
+
+    # ------------------------------------------------------------------ #
+    # 对局录像
+    # ------------------------------------------------------------------ #
+    def _record_action(self, tank_id: int, action: int):
+        if self.replay_recorder is not None:
+            self.replay_recorder.record(tank_id, action)
+
+    def _end_replay_tick(self):
+        if self.replay_recorder is not None:
+            self.replay_recorder.end_tick()
+
+    def _start_replay_recording(self, physics: str):
+        """对局初始化完成后开始录像（未开启 REPLAY_RECORD 时不录制）
+        
+        Args:
+            physics: 重放时使用的模拟步骤（"single" / "host" / "lockstep"）
+        """
+        self._finish_replay_recording()
+        if not config.REPLAY_RECORD or self._replaying:
+            return
+        from src.utils.map_cache import map_content_hash
+        context = self.screen_manager.context
+        map_data = getattr(self, 'map_data', None)
+        players = sorted(t.tank_id for t in self.game_world.tanks if t.tank_type == "player")
+        header = {
+            "seed": self.game_world.match_seed,
+            "physics": physics,
+            "mode": self.multiplayer_game_mode,
+            "map_name": getattr(context, 'selected_map', 'default'),
+            "map_hash": map_content_hash(map_data) if map_data else None,
+            "level": self.level_number if physics != "single" else self.current_level,
+            "difficulty": self.game_difficulty,
+            "ai_weights": [getattr(self, "ai_player_weight", 1.0), getattr(self, "ai_base_weight", 1.0)],
+            "skins": {str(t.tank_id): t.skin_id for t in self.game_world.tanks if t.tank_type == "player"},
+            "players": players,
+            "local_player_id": self.local_player_id,
+        }
+        self.replay_recorder = ReplayRecorder(header)
+        print(f"[Replay] 开始录制 (种子 {header['seed']}, 模式 {header['mode']})")
+
+    def _finish_replay_recording(self):
+        """写出当前录像（如有）"""
+        recorder, self.replay_recorder = self.replay_recorder, None
+        if recorder is None or recorder.ticks == 0:
+            return
+        try:
+            path = recorder.save(default_replay_path(config.REPLAY_DIR, recorder.header))
+            print(f"[Replay] 录像已保存: {path} ({recorder.ticks} 帧)")
+        except OSError as e:
+            print(f"[Replay] 保存录像失败: {e}")
+
+    def setup_replay(self, header: dict):
+        """按录像头部重建对局（用于无界面重放）"""
+        self._finish_replay_recording()
+        self._replaying = True
+        self._replay_ticks = 0
+        context = self.screen_manager.context
+        context.enemy_difficulty = header.get("difficulty") or "normal"
+        self.ai_player_weight, self.ai_base_weight = header.get("ai_weights", [1.0, 1.0])
+        skins = {int(k): v for k, v in header.get("skins", {}).items()}
+        context.selected_map = header.get("map_name", "default")
+        if header.get("physics") == "single":
+            self.enable_network = False
+            self.current_level = header.get("level") or 1
+            local_id = header.get("local_player_id") or 1
+            self._setup_single_player_world(skins.get(local_id, local_id), context.selected_map, seed=header.get("seed"))
+        else:
+            # 联机对局：以主机视角重建（玩家 1 为本地坦克）
+            self.enable_network = False
+            self.network_manager.stats.role = "host"
+            context.match_seed = header.get("seed")
+            context.received_map_data = replay_map_data(header)
+            context.lockstep = header.get("physics") == "lockstep"
+            self.setup_multiplayer_world(skins.get(1, 1), skins.get(2, 1), context.selected_map,
+                                         header.get("mode", "coop"), header.get("level"))
+            self.game_world.is_client_mode = False
+        # 地图按名称重新加载，内容与录制时不同则重放必然偏离原对局
+        expected_hash = header.get("map_hash")
+        if expected_hash:
+            from src.utils.map_cache import map_content_hash
+            map_data = getattr(self, 'map_data', None)
+            actual_hash = map_content_hash(map_data) if map_data else None
+            if actual_hash != expected_hash:
+                raise ValueError(f"录像地图 {context.selected_map} 与本地地图不一致 "
+                                 f"(录像 {expected_hash[:12]}，本地 {str(actual_hash)[:12]})")
+        self.current_state = "game"
+
+    def _update_lockstep(self, role: str):
+        """锁步模式的一帧：交换输入，双方输入到齐后推进一个确定性逻辑帧"""
+        session = self.lockstep
+        
+        # 1. 收取对端的输入与校验和（主机从输入队列，客户端从事件队列）
+        if role == "host":
+            messages = self.network_manager.get_inputs()
+        else:
+            self.network_manager.get_latest_state()
+            messages = self.network_manager.get_events()
+        for msg in messages:
+            payload = msg.get("payload") or {}
+            if msg.get("type") == "ls_input":
+                session.receive_input(payload.get("t", -1), payload.get("in") or {})
+            elif msg.get("type") == "ls_crc":
+                session.receive_checksum(payload.get("t", -1), payload.get("crc"))
+        
+        # 2. 提交本地输入（在 input_delay 帧后生效）
+        local_input = {
+            "move": self._movement_stack[-1] if self._movement_stack else -1,
+            "shoot": self._lockstep_shoot,
+        }
+        tick = session.submit_local(local_input)
+        if tick is not None:
+            self._lockstep_shoot = False
+            self.network_manager.send_lockstep_input(tick, local_input)
+        
+        # 3. 等待对端输入，未到齐时不推进（双方在同一帧停住）；等待过久则结束对局
+        if not session.ready():
+            if session.note_stall():
+                self._abort_lockstep()
+            return
+        
+        # 4. 按固定顺序应用双方输入并模拟一帧（与单机一致：先射击后移动）
+        for player_id, player_input in session.pop_inputs().items():
+            if player_input.get("shoot"):
+                self._apply_player_action(player_id, ACTION_SHOOT)
+            move_dir = player_input.get("move", -1)
+            self._apply_player_action(player_id, move_dir if move_dir != -1 else ACTION_STOP)
+        
+        self._simulate_world_tick()
+        self._end_replay_tick()
+        self._consume_game_events()
+        self._update_match_rules()
+        
+        checksum = session.end_tick(self.game_world)
+        if checksum is not None:
+            self.network_manager.send_lockstep_checksum(session.tick, checksum)
+        
+        if self._check_game_over():
+            pygame.mixer.stop()
+            self._play_game_over_video()
+            self._finish_replay_recording()
+            self.screen_manager.context.game_won = self._local_player_won()
+            self.screen_manager.set_state("game_over")
+
+    def _abort_lockstep(self):
+        """对端输入长时间未到：结束锁步会话与网络连接，显示连接中断/失步的结算界面"""
+        session = self.lockstep
+        reason = "双方状态已失步" if session.desynced else "与对方的连接已中断"
+        print(f"[Lockstep] 第 {session.tick} 帧等待对端输入超过 {session.stall_limit} 帧，{reason}，结束对局")
+        self.lockstep = None
+        pygame.mixer.stop()
+        self._finish_replay_recording()
+        self.network_manager.stop()
+        self.game_world.game_over = True
+        self.game_world.winner = None
+        context = self.screen_manager.context
+        context.game_won = False
+        context.next_level = None
+        context.game_over_reason = reason
+        self.screen_manager.set_state("game_over")
 
     def _player_shoot(self):
-        if self.enable_network and self.network_manager.stats.role == "client":
+        if self.enable_network and self.lockstep is not None:
+            # 锁步模式：射击作为输入随下一帧提交，双方在同一帧生成子弹
+            self._lockstep_shoot = True
+        elif self.enable_network and self.network_manager.stats.role == "client":
             # Client: Send shoot command and play sound immediately (client-side prediction)
             # 客户端预测：立即播放射击音效，即使服务端可能拒绝
             if self.player_tank and self.player_tank.active:
@@ -2571,6 +2871,7 @@ class GameEngine:
         else:
             # Host or Single: Shoot locally
             if self.player_tank and self.player_tank.active:
+                self._record_action(self.player_tank.tank_id, ACTION_SHOOT)
                 self.game_world.spawn_bullet(self.player_tank)
 
     # ------------------------------------------------------------------ #
@@ -2599,11 +2900,52 @@ class GameEngine:
         # 移除已死亡敌人的控制器
         self.enemy_controllers = [c for c in self.enemy_controllers if c.tank_id in active_enemy_ids]
         
+        # 共享黑板：每帧统一计算感知数据，地狱难度下分配团队角色
+        difficulty = self.game_difficulty if self.game_difficulty else 'normal'
+        team_coordination = get_difficulty_config(difficulty).get("team_coordination", False)
+        self.ai_blackboard.update(self.game_world, self.enemy_controllers, team_coordination)
+
+        # 同一难度的敌人共享导航网格与寻路缓存，代价图每帧最多重建一次
+        self.ai_navigation.mark_dirty()
+
         # 更新所有控制器
         for controller in self.enemy_controllers:
             controller.player_weight = getattr(self, "ai_player_weight", 1.0)
             controller.base_weight = getattr(self, "ai_base_weight", 1.0)
+            controller.set_navigation(*self._get_ai_navigation(controller.difficulty))
+
+        if config.AI_WORKER_PROCESSES > 0:
+            self._dispatch_ai_plans()
+
+        for controller in self.enemy_controllers:
             controller.update()
+
+    def _get_ai_navigation(self, difficulty):
+        """获取（必要时创建）指定难度敌人共享的导航网格与寻路器。"""
+        cols = max(1, self.game_world.width // config.GRID_SIZE)
+        rows = max(1, self.game_world.height // config.GRID_SIZE)
+        return self.ai_navigation.get(cols, rows, los_penalty_for(difficulty))
+
+    def _dispatch_ai_plans(self):
+        """多进程规划：应用上一帧返回的规划，并提交本帧世界快照。"""
+        from src.game_engine.ai_worker_pool import AIWorkerPool, build_world_snapshot
+
+        if self.ai_worker_pool is None:
+            self.ai_worker_pool = AIWorkerPool(config.AI_WORKER_PROCESSES)
+
+        self.ai_tick += 1
+        plans = self.ai_worker_pool.collect()
+        for controller in self.enemy_controllers:
+            plan = plans.get(controller.tank_id)
+            if plan is not None:
+                controller.apply_plan(plan, self.ai_tick - plan["tick"])
+
+        # 上一批仍在计算时不再提交，避免进程池积压；这期间敌人在进程内规划
+        if self.ai_worker_pool.busy or self.game_world.freeze_enemies_timer > 0 or not self.enemy_controllers:
+            return
+        snapshot = build_world_snapshot(self.game_world, config.GRID_SIZE)
+        requests = [c.make_plan_request() for c in self.enemy_controllers]
+        self.ai_worker_pool.submit(snapshot, requests, self.ai_tick)
     
     def _toggle_pause(self):
         """切换暂停状态"""
@@ -2655,6 +2997,9 @@ class GameEngine:
         self.game_world.reset()
         self.enemy_controllers.clear()
         self._movement_stack.clear()
+        if self.ai_worker_pool is not None:
+            self.ai_worker_pool.shutdown()
+            self.ai_worker_pool = None
         
         # 清理状态管理器
         if hasattr(self.state_manager, 'latest_snapshot'):
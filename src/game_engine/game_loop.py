@@ -0,0 +1,52 @@
+"""
+固定步长主循环 - 逻辑帧率与渲染帧率解耦
+
+所有计时器（重生、护盾、子弹寿命、AI 间隔等）都按逻辑帧计数，
+因此逻辑必须以固定频率推进：累加真实经过的时间，每满一个步长执行一次
+update；渲染帧可以更快（插值显示两步之间的位置），机器较慢时一帧内
+追赶多步（跳过渲染），超过 MAX_SIMULATION_STEPS 的积压直接丢弃，
+避免越落越多。
+"""
+from src.config.game_config import config
+
+
+class FixedTimestep:
+    """固定步长累加器"""
+
+    def __init__(self, tick_rate: int = None, max_steps: int = None):
+        """
+        Args:
+            tick_rate: 逻辑帧率（每秒步数），默认 config.SIMULATION_FPS
+            max_steps: 单个渲染帧内最多执行的步数，默认 config.MAX_SIMULATION_STEPS
+        """
+        self.tick_rate = tick_rate or config.SIMULATION_FPS
+        self.step = 1.0 / self.tick_rate
+        self.max_steps = max(1, max_steps or config.MAX_SIMULATION_STEPS)
+        self._accumulator = 0.0
+        # 统计：累计模拟步数、被跳过渲染的步数、因积压被丢弃的步数
+        self.ticks = 0
+        self.skipped_renders = 0
+        self.dropped_ticks = 0
+
+    def advance(self, elapsed: float) -> int:
+        """累加真实经过的时间（秒），返回本帧需要执行的逻辑步数。"""
+        self._accumulator += max(0.0, elapsed)
+        steps = int(self._accumulator / self.step)
+        if steps > self.max_steps:
+            self.dropped_ticks += steps - self.max_steps
+            steps = self.max_steps
+            self._accumulator = self.step * steps + (self._accumulator % self.step)
+        self._accumulator -= steps * self.step
+        if steps > 1:
+            self.skipped_renders += steps - 1
+        self.ticks += steps
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """当前时间在上一步与下一步之间的比例（0~1），用于渲染插值。"""
+        return min(1.0, self._accumulator / self.step)
+
+    def reset(self):
+        """清空积压时间（如加载完成、暂停恢复后），避免一次追赶大量步数。"""
+        self._accumulator = 0.0
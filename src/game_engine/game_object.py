@@ -23,22 +23,54 @@ class GameObject:
         self.velocity_x = 0
         self.velocity_y = 0
         self.health = config.DEFAULT_HEALTH
+        # 状态版本号：影响网络同步的状态变化时递增，状态编码器据此复用缓存
+        self.version = 0
+        # 网络同步ID（子弹、爆炸、星星由主机在加入世界时分配）
+        self.net_id = None
+        # 上一逻辑帧开始时的位置（渲染插值用）
+        self.prev_x = x
+        self.prev_y = y
+    
+    def mark_dirty(self):
+        """标记对象状态已变化（递增版本号）"""
+        self.version += 1
     
     def update(self):
         """更新游戏对象状态"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # 更新位置
-        self.x += self.velocity_x
-        self.y += self.velocity_y
+        if self.velocity_x or self.velocity_y:
+            self.x += self.velocity_x
+            self.y += self.velocity_y
+            self.version += 1
         
         # 更新矩形
         self.rect.x = self.x
         self.rect.y = self.y
     
-    def render(self, screen):
+    def draw_position(self, alpha=1.0):
+        """渲染位置：在上一逻辑帧与当前位置之间按 alpha 插值
+        
+        Args:
+            alpha: 插值比例（0~1），1 表示当前位置
+        
+        Returns:
+            (x, y) 渲染坐标；位移超过一格（重生、状态校正）时不插值
+        """
+        dx = self.x - self.prev_x
+        dy = self.y - self.prev_y
+        if alpha >= 1.0 or abs(dx) + abs(dy) > config.GRID_SIZE:
+            return self.x, self.y
+        return self.prev_x + dx * alpha, self.prev_y + dy * alpha
+    
+    def render(self, screen, alpha=1.0):
         """渲染游戏对象
         
         Args:
             screen: 游戏屏幕
+            alpha: 渲染插值比例
         """
         if self.visible:
             # 默认渲染为红色矩形，可以在子类中重写
@@ -59,6 +91,7 @@ class GameObject:
             damage: 伤害值
         """
         self.health -= damage
+        self.version += 1
         if self.health <= 0:
             self.destroy()
     
@@ -66,6 +99,7 @@ class GameObject:
         """销毁对象"""
         self.active = False
         self.visible = False
+        self.version += 1
     
     def get_center(self):
         """获取对象中心点坐标
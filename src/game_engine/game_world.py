@@ -1,5 +1,5 @@
 import random
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import pygame
 
@@ -9,7 +9,9 @@ from src.game_engine.tank import Tank
 from src.game_engine.wall import Wall
 from src.game_engine.wall import Wall
 from src.items.prop import PropManager
+from src.utils.profiler import profiler
 from src.utils.resource_manager import resource_manager
+from src.utils.texture_atlas import SpriteBatch
 from src.config.game_config import config
 
 
@@ -57,11 +59,14 @@ class Explosion(GameObject):
             y = self.y + self.radius - frame.get_height() // 2
             screen.blit(frame, (x, y))
         else:
-            # 备用：绘制圆形爆炸
+            # 备用：绘制圆形爆炸（先画到独立表面，screen 也可能是 SpriteBatch）
             progress = min(1.0, self.elapsed / max(1, self.duration))
             current_radius = int(self.radius * (1 + progress * 0.5))
             color_index = min(int(progress * len(self.color_cycle)), len(self.color_cycle) - 1)
-            pygame.draw.circle(screen, self.color_cycle[color_index], self.get_center(), current_radius)
+            surface = pygame.Surface((current_radius * 2, current_radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, self.color_cycle[color_index], (current_radius, current_radius), current_radius)
+            center_x, center_y = self.get_center()
+            screen.blit(surface, (center_x - current_radius, center_y - current_radius))
 
 
 class Star(GameObject):
@@ -139,6 +144,8 @@ class GameWorld:
         self.player_scores: Dict[str, int] = {}
         self.spawn_points: Dict[str, List[Tuple[int, int]]] = {"player": [], "enemy": []}
         self.debug_overlay = False
+        # 按层批量绘制（图集由资源管理器在预加载完成后打包）
+        self.sprite_batch = SpriteBatch(resource_manager.atlas)
         
         # 坦克生命系统
         self.tank_lives: Dict[int, int] = {}  # {tank_id: remaining_lives}
@@ -146,8 +153,12 @@ class GameWorld:
         self.tank_info: Dict[int, Dict] = {}  # {tank_id: {type, skin_id, spawn_point}}
         self.respawn_timers: Dict[int, int] = {}  # {tank_id: frames_until_respawn}
 
+        # 每局随机数发生器：AI、道具掉落与地图生成共用，固定种子即可复现整局
+        self.match_seed: Optional[int] = None
+        self.rng = random.Random()
+
         # 道具管理器
-        self.prop_manager = PropManager()
+        self.prop_manager = PropManager(self.rng)
         
         # 道具效果计时器
         self.freeze_enemies_timer = 0
@@ -162,6 +173,10 @@ class GameWorld:
         # 墙体ID计数器（用于网络同步）
         self.next_wall_id = 1  # 从1开始，0保留为无效ID
         self.wall_id_map: Dict[int, Wall] = {}  # wall_id -> Wall 映射，用于快速查找
+        self.tank_id_map: Dict[int, Tank] = {}  # tank_id -> Tank 映射（同ID取最后加入的坦克）
+        self.next_net_id = 1  # 子弹/爆炸/星星的网络ID计数器（仅主机分配）
+        self.wall_layout_version = 0  # 墙体增删时递增（状态同步据此判断墙体数组是否需要重建）
+        self.runtime_wall_ids: Set[int] = set()  # 对局中生成的墙体ID（基地强化/恢复），主机随墙体数组下发
 
     # ----------------------------------------------------------------------
     # 对象管理
@@ -171,12 +186,21 @@ class GameWorld:
         if game_object not in self.game_objects:
             self.game_objects.append(game_object)
 
+        if (isinstance(game_object, (Bullet, Explosion, Star)) and game_object.net_id is None
+                and not self.is_client_mode):
+            game_object.net_id = self.next_net_id
+            self.next_net_id += 1
+
         if isinstance(game_object, Tank):
             self.tanks.append(game_object)
+            self.tank_id_map[game_object.tank_id] = game_object
         elif isinstance(game_object, Bullet):
             self.bullets.append(game_object)
         elif isinstance(game_object, Wall):
             self.walls.append(game_object)
+            self.wall_layout_version += 1
+            if game_object.wall_id is not None:
+                self.wall_id_map[game_object.wall_id] = game_object
         elif isinstance(game_object, Explosion):
             self.explosions.append(game_object)
         elif isinstance(game_object, Star):
@@ -189,18 +213,42 @@ class GameWorld:
 
         if isinstance(game_object, Tank) and game_object in self.tanks:
             self.tanks.remove(game_object)
+            if self.tank_id_map.get(game_object.tank_id) is game_object:
+                # 同ID的其他坦克（如重生前的残留）接替映射
+                replacement = next((t for t in reversed(self.tanks) if t.tank_id == game_object.tank_id), None)
+                if replacement:
+                    self.tank_id_map[game_object.tank_id] = replacement
+                else:
+                    del self.tank_id_map[game_object.tank_id]
         elif isinstance(game_object, Bullet) and game_object in self.bullets:
             self.bullets.remove(game_object)
         elif isinstance(game_object, Wall) and game_object in self.walls:
             self.walls.remove(game_object)
+            self.wall_layout_version += 1
             # 从ID映射中移除
-            if hasattr(game_object, 'wall_id') and game_object.wall_id in self.wall_id_map:
+            if self.wall_id_map.get(game_object.wall_id) is game_object:
                 del self.wall_id_map[game_object.wall_id]
+                self.runtime_wall_ids.discard(game_object.wall_id)
         elif isinstance(game_object, Explosion) and game_object in self.explosions:
             self.explosions.remove(game_object)
         elif isinstance(game_object, Star) and game_object in self.stars:
             self.stars.remove(game_object)
 
+    def seed_match(self, seed: Optional[int] = None) -> int:
+        """为新的一局设置随机种子。
+
+        Args:
+            seed: 随机种子；None 时随机选取（联机时由主机选取并发给客户端）
+
+        Returns:
+            实际使用的种子
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.match_seed = seed
+        self.rng.seed(seed)
+        return seed
+
     def reset(self):
         """清空世界，方便重新开局或重新同步。"""
         self.game_objects.clear()
@@ -216,6 +264,7 @@ class GameWorld:
         self.spawn_points = {"player": [], "enemy": []}
         # 清理道具
         self.prop_manager.props.empty()
+        self.prop_manager.next_prop_id = 1
         # 重置道具效果计时器
         self.freeze_enemies_timer = 0
         self.fortify_base_timer = 0
@@ -228,6 +277,10 @@ class GameWorld:
         # 重置墙体ID系统
         self.next_wall_id = 1
         self.wall_id_map.clear()
+        self.runtime_wall_ids.clear()
+        self.tank_id_map.clear()
+        self.next_net_id = 1
+        self.wall_layout_version += 1
 
     # ----------------------------------------------------------------------
     # 事件队列（供上层如 GameEngine 消费）
@@ -332,10 +385,7 @@ class GameWorld:
             self.next_wall_id += 1
         
         wall = Wall(x, y, wall_type=wall_type, wall_id=wall_id)
-        self.add_object(wall)
-        
-        # 添加到ID映射
-        self.wall_id_map[wall_id] = wall
+        self.add_object(wall)  # add_object 同时登记ID映射
         
         return wall
 
@@ -371,7 +421,8 @@ class GameWorld:
         # 预测性碰撞检测（在移动前检测，避免穿透）
         # 客户端模式下也需要进行预测性检测，以确保客户端预测的流畅性
         # 但最终的碰撞判定由服务端权威控制
-        self._check_collisions_predictive()
+        with profiler.section("predictive"):
+            self._check_collisions_predictive()
         
         # 然后更新所有对象位置
         for obj in list(self.game_objects):
@@ -384,7 +435,7 @@ class GameWorld:
                     # 使用标记防止重复掉落（墙体对象会保留在列表中）
                     if obj.destructible and not getattr(obj, '_prop_dropped', False):
                         # 墙体被破坏，触发道具掉落
-                        if random.random() < config.WALL_DROP_RATE:
+                        if self.rng.random() < config.WALL_DROP_RATE:
                             self.prop_manager.spawn_prop(obj.x, obj.y)
                             print(f"[Prop] 墙体被破坏，掉落道具于 ({obj.x}, {obj.y})")
                         # 标记已掉落，防止重复
@@ -432,53 +483,73 @@ class GameWorld:
                         if wall.rect.collidepoint(center_x, center_y):
                             on_river = True
                             break
-                tank.is_on_river = on_river
             else:
-                tank.is_on_river = False
+                on_river = False
+            if tank.is_on_river != on_river:
+                tank.is_on_river = on_river
+                tank.mark_dirty()
 
         # 执行子弹碰撞检测（客户端和服务端都需要）
         # 注意：坦克碰撞已在移动前通过预测性检测处理
-        self._check_collisions()
+        with profiler.section("collisions"):
+            self._check_collisions()
         
         # 游戏状态检查
         self._check_game_status()
 
-    def render(self, screen):
-        """分层渲染世界。"""
+    def render(self, screen, alpha: float = 1.0):
+        """分层渲染世界。
+
+        Args:
+            screen: 渲染目标
+            alpha: 逻辑帧间插值比例，移动中的坦克与子弹据此平滑显示
+        """
+        # 开启图集时各层先收集到 SpriteBatch，每层一次 Surface.blits() 提交
+        batch = self.sprite_batch if config.ATLAS_ENABLED else None
+        target = batch or screen
+
         # 1. 除草地外的墙体
         for wall in self.walls:
             if wall.visible and wall.wall_type != Wall.GRASS:
-                wall.render(screen)
+                wall.render(target)
+        if batch:
+            batch.flush(screen)
 
         # 2. 坦克
         for tank in self.tanks:
             if tank.visible:
-                tank.render(screen)
+                tank.render(target, alpha)
+        if batch:
+            batch.flush(screen)
 
         # 3. 子弹
         for bullet in self.bullets:
             if bullet.visible:
-                bullet.render(screen)
+                bullet.render(target, alpha)
+        if batch:
+            batch.flush(screen)
 
         # 4. 爆炸特效
         for explosion in self.explosions:
             if explosion.visible:
-                explosion.render(screen)
+                explosion.render(target)
         
         # 4.5. 星星特效
         for star in self.stars:
             if star.visible:
-                star.render(screen)
+                star.render(target)
                 
         # 4.6 道具
-        self.prop_manager.draw(screen)
-
-        # 5. 草地覆盖
+        self.prop_manager.draw(target)
+        if batch:
+            batch.flush(screen)
 
         # 5. 草地覆盖
         for wall in self.walls:
             if wall.visible and wall.wall_type == Wall.GRASS:
-                wall.render(screen)
+                wall.render(target)
+        if batch:
+            batch.flush(screen)
 
         # 绘制地图边界线，区分地图和黑边
         # 将边界线向内移动1像素，确保在缩放时不会被裁剪
@@ -561,14 +632,14 @@ class GameWorld:
                     )
             
             # 敌人死亡掉落道具 (25%概率)
-            if obj.tank_type == "enemy" and random.random() < config.ENEMY_DROP_RATE:
+            if obj.tank_type == "enemy" and self.rng.random() < config.ENEMY_DROP_RATE:
                 self.prop_manager.spawn_prop(obj.x, obj.y)
                 
         elif isinstance(obj, Bullet):
             self.trigger_explosion(obj.get_center(), radius=config.BULLET_EXPLOSION_RADIUS, duration=config.BULLET_EXPLOSION_DURATION)
         elif isinstance(obj, Wall) and obj.destructible:
             # 墙体被破坏也有小概率掉落道具 (5%)
-            if random.random() < config.WALL_DROP_RATE:
+            if self.rng.random() < config.WALL_DROP_RATE:
                 self.prop_manager.spawn_prop(obj.x, obj.y)
     
     def _respawn_tank(self, tank_id: int):
@@ -621,6 +692,7 @@ class GameWorld:
             obj.x = clamped_x
             obj.y = clamped_y
             obj.rect.topleft = (obj.x, obj.y)
+            obj.mark_dirty()
             if hasattr(obj, "stop"):
                 obj.stop()
 
@@ -838,7 +910,7 @@ class GameWorld:
                 
                 # 生成钢墙
                 print(f"[Fortify] 在网格 ({tx}, {ty}) 生成钢墙，像素位置: ({tx * 50}, {ty * 50})")
-                self.spawn_wall(tx * 50, ty * 50, Wall.STEEL)
+                self.runtime_wall_ids.add(self.spawn_wall(tx * 50, ty * 50, Wall.STEEL).wall_id)
 
     def _restore_base(self):
         """恢复基地周围墙体"""
@@ -871,7 +943,7 @@ class GameWorld:
         # 恢复原始墙体
         for x, y, w_type in self.original_base_walls:
             if w_type is not None:
-                self.spawn_wall(x, y, w_type)
+                self.runtime_wall_ids.add(self.spawn_wall(x, y, w_type).wall_id)
             # 如果是None，说明原来是空地，不需要生成墙
     
     def _check_game_status(self):
@@ -0,0 +1,442 @@
+"""
+网格寻路模块
+
+敌人AI使用的 A* 寻路，针对每帧多次调用做了以下优化：
+
+- 格子使用扁平整数索引 ``idx = gx * rows + gy``（与原先 (x, y) 元组的堆排序次序一致）；
+- ``GridPathfinder`` 预分配 g 值 / 首步 / 访问标记数组，跨调用复用，通过代数标记免清空；
+- 搜索时直接传播“首步”，命中目标即可返回，无需回溯整条路径；
+- 支持最大扩展数上限，超限时返回朝向已扩展节点中最接近目标者的首步；
+- 以 (起点, 终点, 导航网格版本) 为键缓存结果，网格未变化时直接命中；
+- 代价均匀的网格上可选跳点搜索（JPS，4 邻接）。
+
+``NavGrid`` 负责危险度代价图，每帧最多重建一次并在内容变化时递增版本号，
+可由多个敌人共享；代价图含难度相关的直线视野惩罚，``NavigationCache`` 按惩罚值
+为不同难度的敌人分别维护网格。
+"""
+import heapq
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def los_penalty_for(difficulty: str) -> float:
+    """难度对应的玩家直线视野惩罚（难度越高越回避玩家射界）。"""
+    return 4.0 if difficulty == "hell" else 2.5 if difficulty == "hard" else 1.5
+
+
+class NavGrid:
+    """导航网格：阻挡标记 + 危险度代价（扁平数组）。"""
+
+    def __init__(self, cols: int, rows: int):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        self.blocked = bytearray(self.size)
+        self.cost = [1.0] * self.size
+        self.version = 0
+        self.uniform = True  # 所有可通行格代价相同（可用 JPS）
+        self._dirty = True
+
+    def index(self, gx: int, gy: int) -> int:
+        return gx * self.rows + gy
+
+    def cell(self, idx: int) -> Tuple[int, int]:
+        return divmod(idx, self.rows)
+
+    def mark_dirty(self):
+        """标记需要重建（每帧由引擎调用一次）。"""
+        self._dirty = True
+
+    def refresh(self, world, grid_size: int, los_penalty: float) -> bool:
+        """
+        根据世界状态重建代价图（仅在标记为脏时执行）
+
+        Args:
+            world: GameWorld 实例（或具有 walls/tanks/bullets 的对象）
+            grid_size: 网格尺寸（像素）
+            los_penalty: 玩家直线视野惩罚
+
+        Returns:
+            bool: 网格内容是否发生变化（版本号是否递增）
+        """
+        if not self._dirty:
+            return False
+        blocked_cells = [
+            (int(w.x // grid_size), int(w.y // grid_size))
+            for w in world.walls
+            if w.active and not getattr(w, "passable", False)
+        ]
+        player_cells = [
+            (int(p.x // grid_size), int(p.y // grid_size))
+            for p in world.tanks
+            if p.tank_type == "player" and p.active
+        ]
+        bullet_cells = []
+        for b in world.bullets:
+            if not b.active:
+                continue
+            dx = 1 if b.velocity_x > 0 else -1 if b.velocity_x < 0 else 0
+            dy = 1 if b.velocity_y > 0 else -1 if b.velocity_y < 0 else 0
+            bullet_cells.append((int(b.x // grid_size), int(b.y // grid_size), dx, dy))
+        return self.build(blocked_cells, player_cells, bullet_cells, los_penalty)
+
+    def build(self, blocked_cells: Iterable[Tuple[int, int]], player_cells: Iterable[Tuple[int, int]],
+              bullet_cells: Iterable[Tuple[int, int, int, int]], los_penalty: float) -> bool:
+        """
+        由格子坐标直接构建代价图（工作进程使用快照时调用）
+
+        Args:
+            blocked_cells: 不可通行格 (gx, gy)
+            player_cells: 玩家所在格 (gx, gy)
+            bullet_cells: 子弹所在格与方向 (gx, gy, dx, dy)
+            los_penalty: 玩家直线视野惩罚
+
+        Returns:
+            bool: 网格内容是否发生变化
+        """
+        self._dirty = False
+        cols, rows = self.cols, self.rows
+        blocked = bytearray(self.size)
+        cost = [1.0] * self.size
+
+        for bx, by in blocked_cells:
+            if 0 <= bx < cols and 0 <= by < rows:
+                blocked[bx * rows + by] = 1
+            # 墙体膨胀：周围一圈提高代价，避免贴墙路径
+            for nx in (bx - 1, bx, bx + 1):
+                if 0 <= nx < cols:
+                    for ny in (by - 1, by, by + 1):
+                        if 0 <= ny < rows:
+                            cost[nx * rows + ny] += 3.0
+
+        for px, py in player_cells:
+            # 玩家位置增加危险半径
+            for dx in range(-3, 4):
+                nx = px + dx
+                if not 0 <= nx < cols:
+                    continue
+                for dy in range(-3, 4):
+                    ny = py + dy
+                    if 0 <= ny < rows:
+                        cost[nx * rows + ny] += max(0, 4 - (abs(dx) + abs(dy))) * 1.5
+            # 直线视野惩罚：从玩家向四个方向延伸直至被墙阻挡（阻挡格本身也计入）
+            if 0 <= py < rows:
+                for xs in (range(px, cols), range(px - 1, -1, -1)):
+                    for x in xs:
+                        if 0 <= x < cols:
+                            cost[x * rows + py] += los_penalty
+                            if x != px and blocked[x * rows + py]:
+                                break
+            if 0 <= px < cols:
+                for ys in (range(py, rows), range(py - 1, -1, -1)):
+                    for y in ys:
+                        if 0 <= y < rows:
+                            cost[px * rows + y] += los_penalty
+                            if y != py and blocked[px * rows + y]:
+                                break
+
+        for bx, by, dx, dy in bullet_cells:
+            if 0 <= bx < cols and 0 <= by < rows:
+                cost[bx * rows + by] += 7
+                # 沿子弹方向扩散危险
+                for i in range(1, 4):
+                    sx, sy = bx + dx * i, by + dy * i
+                    if 0 <= sx < cols and 0 <= sy < rows:
+                        cost[sx * rows + sy] += 3
+
+        if blocked == self.blocked and cost == self.cost:
+            return False
+        self.blocked = blocked
+        self.cost = cost
+        free_costs = {c for i, c in enumerate(cost) if not blocked[i]}
+        self.uniform = len(free_costs) <= 1
+        self.version += 1
+        return True
+
+    def closest_free_cell(self, gx: int, gy: int) -> Tuple[int, int]:
+        """若格子被墙堵塞或越界，BFS 寻找最近的可通行格。"""
+        cols, rows, blocked = self.cols, self.rows, self.blocked
+        if 0 <= gx < cols and 0 <= gy < rows and not blocked[gx * rows + gy]:
+            return (gx, gy)
+        q = deque([(gx, gy)])
+        visited = {(gx, gy)}
+        while q:
+            x, y = q.popleft()
+            if 0 <= x < cols and 0 <= y < rows and not blocked[x * rows + y]:
+                return (x, y)
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                nx, ny = x + dx, y + dy
+                if (nx, ny) not in visited and -1 <= nx <= cols and -1 <= ny <= rows:
+                    visited.add((nx, ny))
+                    q.append((nx, ny))
+        return (max(0, min(cols - 1, gx)), max(0, min(rows - 1, gy)))
+
+
+class GridPathfinder:
+    """复用缓冲区的 A* / JPS 寻路器，返回从起点出发的第一步格子索引。"""
+
+    def __init__(self, cols: int, rows: int, cache_size: int = 256):
+        self.cols = cols
+        self.rows = rows
+        size = cols * rows
+        self._g = [0.0] * size
+        self._first = [0] * size
+        self._stamp = [0] * size  # 本次搜索是否已写入 g 值（代数标记，免清空）
+        self._generation = 0
+        self._xs = [i // rows for i in range(size)]
+        self._ys = [i % rows for i in range(size)]
+        # 邻居表，顺序与原实现一致：(+1,0) (-1,0) (0,+1) (0,-1)
+        self._neighbors = [
+            tuple(
+                (x + dx) * rows + (y + dy)
+                for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                if 0 <= x + dx < cols and 0 <= y + dy < rows
+            )
+            for x, y in ((i // rows, i % rows) for i in range(size))
+        ]
+        self._heap = []
+        self._cache: "OrderedDict[tuple, int]" = OrderedDict()
+        self._cache_size = cache_size
+        self.last_cost: Optional[float] = None  # 最近一次搜索到达终点的路径代价
+        self._jump_tables = {}
+        self._jump_tables_key = None
+        self.stats = {"searches": 0, "cache_hits": 0, "expansions": 0, "capped": 0}
+
+    def first_step(self, nav: NavGrid, start: int, goal: int,
+                   max_expansions: Optional[int] = None, use_jps: bool = False) -> int:
+        """
+        计算从 start 到 goal 的路径第一步
+
+        Args:
+            nav: 导航网格
+            start: 起点索引
+            goal: 终点索引
+            max_expansions: 最大扩展节点数（None 表示不限）
+            use_jps: 网格代价均匀时使用跳点搜索
+
+        Returns:
+            int: 第一步的格子索引；无路径或起终点相同时返回 -1
+        """
+        if start == goal:
+            return -1
+        key = (start, goal, nav.version, max_expansions, use_jps)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return cached
+
+        self.stats["searches"] += 1
+        if use_jps and nav.uniform:
+            step = self._search_jps(nav, start, goal, max_expansions)
+        else:
+            step = self._search_astar(nav, start, goal, max_expansions)
+
+        self._cache[key] = step
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return step
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _next_generation(self) -> int:
+        self._generation += 1
+        return self._generation
+
+    def _search_astar(self, nav: NavGrid, start: int, goal: int, max_expansions: Optional[int]) -> int:
+        neighbors = self._neighbors
+        blocked, cost = nav.blocked, nav.cost
+        g, first, stamp = self._g, self._first, self._stamp
+        xs, ys = self._xs, self._ys
+        gen = self._next_generation()
+        gx, gy = xs[goal], ys[goal]
+        heap = self._heap
+        heap.clear()
+        push, pop = heapq.heappush, heapq.heappop
+
+        stamp[start] = gen
+        g[start] = 0
+        first[start] = start
+        heap.append((0, start))
+        expansions = 0
+        best_node, best_h = -1, None
+        self.last_cost = None
+
+        while heap:
+            f, current = pop(heap)
+            gc = g[current]
+            cx, cy = xs[current], ys[current]
+            h = abs(cx - gx) + abs(cy - gy)
+            if current != start and f > gc + h:
+                continue  # 过期条目
+            if current == goal:
+                self.last_cost = gc
+                self.stats["expansions"] += expansions
+                return first[goal]
+            if current != start and (best_h is None or h < best_h):
+                best_node, best_h = current, h
+            expansions += 1
+            if max_expansions is not None and expansions > max_expansions:
+                self.stats["capped"] += 1
+                break
+            for n in neighbors[current]:
+                if blocked[n]:
+                    continue
+                tentative = gc + cost[n]
+                if stamp[n] != gen or tentative < g[n]:
+                    stamp[n] = gen
+                    g[n] = tentative
+                    first[n] = n if current == start else first[current]
+                    push(heap, (tentative + (abs(xs[n] - gx) + abs(ys[n] - gy)), n))
+
+        self.stats["expansions"] += expansions
+        if best_node >= 0 and max_expansions is not None and expansions > max_expansions:
+            return first[best_node]
+        return -1
+
+    # ------------------------------------------------------------------ #
+    # 跳点搜索（4 邻接，仅用于代价均匀的网格）
+    # ------------------------------------------------------------------ #
+    def _build_jump_tables(self, nav: NavGrid):
+        """
+        预计算水平跳跃表（每个导航网格版本计算一次）
+
+        对每个格子与水平方向 dx，记录从该格出发第一个带强制邻居的跳点 x 坐标（无则 -1），
+        以及撞墙前可到达的最远 x 坐标，使水平跳跃变为 O(1) 查表。
+        """
+        cols, rows, blocked = self.cols, self.rows, nav.blocked
+
+        def free(x, y):
+            return 0 <= x < cols and 0 <= y < rows and not blocked[x * rows + y]
+
+        tables = {}
+        for dx in (1, -1):
+            jump = [-1] * nav.size
+            reach = [-1] * nav.size
+            xs = range(cols - 1, -1, -1) if dx == 1 else range(cols)
+            for y in range(rows):
+                for x in xs:
+                    nx = x + dx
+                    idx = x * rows + y
+                    if not free(nx, y):
+                        jump[idx] = -1
+                        reach[idx] = x
+                        continue
+                    nidx = nx * rows + y
+                    reach[idx] = reach[nidx]
+                    forced = (
+                        (free(nx, y - 1) and not free(x, y - 1))
+                        or (free(nx, y + 1) and not free(x, y + 1))
+                    )
+                    jump[idx] = nx if forced else jump[nidx]
+            tables[dx] = (jump, reach)
+        self._jump_tables = tables
+        self._jump_tables_key = (id(nav), nav.version)
+
+    def _jump_horizontal(self, x: int, y: int, dx: int, gx: int, gy: int):
+        """水平跳跃（查表），返回跳点坐标或 None。"""
+        jump, reach = self._jump_tables[dx]
+        idx = x * self.rows + y
+        jx = jump[idx]
+        if y == gy:
+            far = reach[idx]
+            if (dx == 1 and x < gx <= far) or (dx == -1 and far <= gx < x):
+                if jx < 0 or (gx - jx) * dx <= 0:
+                    return (gx, gy)
+        if jx < 0:
+            return None
+        return (jx, y)
+
+    def _jump(self, nav: NavGrid, x: int, y: int, dx: int, dy: int, gx: int, gy: int):
+        """沿 (dx, dy) 跳跃，返回跳点坐标或 None。竖直移动时每步横向扫描。"""
+        if dx != 0:
+            return self._jump_horizontal(x, y, dx, gx, gy)
+        rows, blocked = self.rows, nav.blocked
+        while True:
+            y += dy
+            if not 0 <= y < rows or blocked[x * rows + y]:
+                return None
+            if x == gx and y == gy:
+                return (x, y)
+            if self._jump_horizontal(x, y, 1, gx, gy) or self._jump_horizontal(x, y, -1, gx, gy):
+                return (x, y)
+
+    def _search_jps(self, nav: NavGrid, start: int, goal: int, max_expansions: Optional[int]) -> int:
+        rows = self.rows
+        g, first, stamp = self._g, self._first, self._stamp
+        xs, ys = self._xs, self._ys
+        gen = self._next_generation()
+        gx, gy = xs[goal], ys[goal]
+        step_cost = nav.cost[start] if not nav.blocked[start] else 1.0
+        if self._jump_tables_key != (id(nav), nav.version):
+            self._build_jump_tables(nav)
+        heap = self._heap
+        heap.clear()
+
+        stamp[start] = gen
+        g[start] = 0
+        first[start] = start
+        heap.append((0, start))
+        expansions = 0
+        best_node, best_h = -1, None
+        self.last_cost = None
+
+        while heap:
+            f, current = heapq.heappop(heap)
+            gc = g[current]
+            cx, cy = xs[current], ys[current]
+            h = (abs(cx - gx) + abs(cy - gy)) * step_cost
+            if current != start and f > gc + h:
+                continue
+            if current == goal:
+                self.last_cost = gc
+                self.stats["expansions"] += expansions
+                return first[goal]
+            if current != start and (best_h is None or h < best_h):
+                best_node, best_h = current, h
+            expansions += 1
+            if max_expansions is not None and expansions > max_expansions:
+                self.stats["capped"] += 1
+                break
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                jp = self._jump(nav, cx, cy, dx, dy, gx, gy)
+                if jp is None:
+                    continue
+                n = jp[0] * rows + jp[1]
+                tentative = gc + (abs(jp[0] - cx) + abs(jp[1] - cy)) * step_cost
+                if stamp[n] != gen or tentative < g[n]:
+                    stamp[n] = gen
+                    g[n] = tentative
+                    first[n] = (cx + dx) * rows + (cy + dy) if current == start else first[current]
+                    heapq.heappush(heap, (tentative + (abs(jp[0] - gx) + abs(jp[1] - gy)) * step_cost, n))
+
+        self.stats["expansions"] += expansions
+        if best_node >= 0 and max_expansions is not None and expansions > max_expansions:
+            return first[best_node]
+        return -1
+
+
+class NavigationCache:
+    """按直线视野惩罚分组的共享导航网格与寻路器。
+
+    代价图包含视野惩罚，不同难度的敌人不能共用同一张网格；
+    惩罚相同的敌人共享网格，每帧调用 mark_dirty() 后各网格最多重建一次。
+    """
+
+    def __init__(self, cache_size: int = 256):
+        self.cache_size = cache_size
+        self._entries: Dict[float, Tuple[NavGrid, GridPathfinder]] = {}
+
+    def get(self, cols: int, rows: int, los_penalty: float) -> Tuple[NavGrid, GridPathfinder]:
+        """获取（必要时创建）指定尺寸与惩罚值的导航网格与寻路器。"""
+        entry = self._entries.get(los_penalty)
+        if entry is None or entry[0].cols != cols or entry[0].rows != rows:
+            entry = (NavGrid(cols, rows), GridPathfinder(cols, rows, self.cache_size))
+            self._entries[los_penalty] = entry
+        return entry
+
+    def mark_dirty(self):
+        """标记所有网格需要重建（每帧由引擎调用一次）。"""
+        for nav, _ in self._entries.values():
+            nav.mark_dirty()
@@ -0,0 +1,196 @@
+"""
+对局录像：记录随机种子、地图哈希与每个逻辑帧的玩家输入，并可无界面全速重放
+
+文件格式（小端）：
+    b"TWRP" | 版本(1字节) | 头部长度(uint32) | 头部 JSON | zlib 压缩的帧数据
+
+帧数据为游程编码的记录序列：varint 重复次数、varint 动作数、每个动作 1 字节
+（高 4 位为玩家序号，低 4 位为动作码）。按住同一方向的连续帧合并为一条记录。
+
+重放时按头部重建对局（同一种子、同一地图），每帧按录制顺序应用动作后
+执行与原对局相同的模拟步骤，因此单机与锁步对局可逐帧复现；录像也可作为
+性能基准语料（见 benchmarks/bench_replay.py）。
+"""
+import json
+import os
+import struct
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from src.state_sync.snapshot_codec import read_varint, write_varint
+
+REPLAY_MAGIC = b"TWRP"
+REPLAY_VERSION = 1
+
+# 动作码：0-3 为移动方向（与 Tank.UP/RIGHT/DOWN/LEFT 一致）
+ACTION_STOP = 4
+ACTION_SHOOT = 5
+
+_HEADER_LEN = struct.Struct("<I")
+
+
+class ReplayRecorder:
+    """在引擎的输入路径上记录每帧动作，对局结束时写出录像文件。"""
+
+    def __init__(self, header: Dict):
+        """
+        Args:
+            header: 重建对局所需的信息（seed、map_hash、map_name、physics、players 等）
+        """
+        self.header = dict(header)
+        self._slots = {player_id: slot for slot, player_id in enumerate(self.header.get("players", []))}
+        self._records: List[Tuple[int, bytes]] = []  # [(重复次数, 动作字节)]
+        self._current = bytearray()
+        self.ticks = 0
+
+    def record(self, player_id: int, action: int):
+        """记录当前帧内某玩家的一个动作（移动方向、ACTION_STOP 或 ACTION_SHOOT）。"""
+        slot = self._slots.get(player_id)
+        if slot is None:
+            slot = self._slots[player_id] = len(self._slots)
+            self.header.setdefault("players", []).append(player_id)
+        self._current.append((slot << 4) | (action & 0x0F))
+
+    def end_tick(self):
+        """结束当前帧（与上一帧动作相同时合并计数）。"""
+        actions = bytes(self._current)
+        self._current.clear()
+        if self._records and self._records[-1][1] == actions:
+            repeat, _ = self._records[-1]
+            self._records[-1] = (repeat + 1, actions)
+        else:
+            self._records.append((1, actions))
+        self.ticks += 1
+
+    def to_bytes(self) -> bytes:
+        body = bytearray()
+        for repeat, actions in self._records:
+            write_varint(body, repeat)
+            write_varint(body, len(actions))
+            body += actions
+        header = dict(self.header, ticks=self.ticks)
+        header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return (REPLAY_MAGIC + bytes([REPLAY_VERSION]) + _HEADER_LEN.pack(len(header_bytes))
+                + header_bytes + zlib.compress(bytes(body), 9))
+
+    def save(self, path: str) -> str:
+        """写出录像文件，返回路径。"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+
+class Replay:
+    """已加载的录像。"""
+
+    def __init__(self, header: Dict, records: List[Tuple[int, bytes]]):
+        self.header = header
+        self.records = records
+
+    @property
+    def ticks(self) -> int:
+        return sum(repeat for repeat, _ in self.records)
+
+    def iter_ticks(self):
+        """逐帧产出动作列表 [(玩家坦克ID, 动作码), ...]。"""
+        players = self.header.get("players", [])
+        for repeat, actions in self.records:
+            decoded = [(players[byte >> 4], byte & 0x0F) for byte in actions]
+            for _ in range(repeat):
+                yield decoded
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Replay":
+        if data[:4] != REPLAY_MAGIC:
+            raise ValueError("不是坦克大战录像文件")
+        if data[4] != REPLAY_VERSION:
+            raise ValueError(f"不支持的录像版本: {data[4]}")
+        (header_len,) = _HEADER_LEN.unpack_from(data, 5)
+        pos = 5 + _HEADER_LEN.size
+        header = json.loads(data[pos:pos + header_len].decode("utf-8"))
+        body = zlib.decompress(data[pos + header_len:])
+        records = []
+        pos = 0
+        while pos < len(body):
+            repeat, pos = read_varint(body, pos)
+            count, pos = read_varint(body, pos)
+            records.append((repeat, body[pos:pos + count]))
+            pos += count
+        return cls(header, records)
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def play_replay(replay: Replay, engine=None, timing: bool = False, stop_on_game_over: bool = True) -> Dict:
+    """无界面全速重放录像。
+
+    Args:
+        replay: 已加载的录像
+        engine: 用于重放的 GameEngine（默认新建；调用方需先以 dummy 视频驱动初始化 pygame）
+        timing: 是否记录每帧模拟耗时（毫秒）
+        stop_on_game_over: 对局结束后停止（与原对局一致）
+
+    Returns:
+        统计字典：ticks、elapsed_s、game_over、winner，timing 开启时含 tick_ms 列表
+
+    Raises:
+        ValueError: 本地地图与录像头部的地图哈希不一致
+    """
+    if engine is None:
+        from src.game_engine.game import GameEngine
+        engine = GameEngine()
+    engine.setup_replay(replay.header)
+    host_physics = replay.header.get("physics") == "host"
+
+    tick_ms: List[float] = []
+    ticks = 0
+    start = time.perf_counter()
+    for actions in replay.iter_ticks():
+        tick_start = time.perf_counter() if timing else 0.0
+        for player_id, action in actions:
+            engine._apply_player_action(player_id, action)
+        engine._simulate_world_tick(host_physics=host_physics)
+        engine.game_world.consume_events()  # 视频/音效事件不影响模拟，重放时丢弃
+        engine._update_match_rules()  # 关卡模式的时间限制/目标得分，与原对局一致地结束
+        ticks += 1
+        if timing:
+            tick_ms.append((time.perf_counter() - tick_start) * 1000)
+        if stop_on_game_over and engine.game_world.game_over:
+            break
+    stats = {
+        "ticks": ticks,
+        "elapsed_s": time.perf_counter() - start,
+        "game_over": engine.game_world.game_over,
+        "winner": engine.game_world.winner,
+    }
+    if timing:
+        stats["tick_ms"] = tick_ms
+    return stats
+
+
+def default_replay_path(directory: str, header: Dict) -> str:
+    """按时间与模式生成录像文件路径。"""
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    return os.path.join(directory, f"{stamp}_{header.get('mode', 'match')}_{header.get('seed', 0)}.twr")
+
+
+def replay_map_data(header: Dict) -> Optional[Dict]:
+    """按头部中的地图哈希/名称找回录制时的地图（优先地图缓存，其次 maps/ 下的同名地图）。"""
+    map_hash = header.get("map_hash")
+    map_name = header.get("map_name", "default")
+    if not map_hash:
+        return None
+    from src.config.game_config import config
+    from src.utils.map_cache import MapCache
+    from src.utils.map_loader import map_loader
+    map_data = MapCache(config.MAP_CACHE_DIR).lookup(map_hash, lambda: map_loader.load_map(map_name, config.GRID_SIZE))
+    if map_data is None:
+        print(f"[Replay] 找不到哈希为 {map_hash[:12]} 的地图 {map_name}，重放可能与原对局不一致")
+    return map_data
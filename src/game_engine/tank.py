@@ -110,6 +110,7 @@ class Tank(GameObject):
             self.shield_duration -= 1
             if self.shield_duration <= 0:
                 self.shield_active = False
+                self.version += 1
         
         # 更新移动状态
         self.is_moving = (self.velocity_x != 0 or self.velocity_y != 0)
@@ -161,10 +162,11 @@ class Tank(GameObject):
             # 音效播放失败不应该影响游戏逻辑
             print(f"[Tank] 播放待机音效失败: {e}")
     
-    def render(self, screen):
-        """渲染坦克"""
+    def render(self, screen, alpha=1.0):
+        """渲染坦克（alpha 为逻辑帧间插值比例）"""
         if self.visible and self.current_image:
-            screen.blit(self.current_image, (self.x, self.y))
+            pos = self.draw_position(alpha)
+            screen.blit(self.current_image, pos)
             
             # 渲染护盾
             if self.shield_active:
@@ -174,20 +176,20 @@ class Tank(GameObject):
                     frame_index = (pygame.time.get_ticks() // config.SHIELD_ANIMATION_INTERVAL) % len(shield_frames)
                     shield_img = shield_frames[frame_index]
                     # 护盾与坦克大小一致，直接覆盖在坦克上
-                    screen.blit(shield_img, (self.x, self.y))
+                    screen.blit(shield_img, pos)
                 else:
                     # 备用：绘制半透明的护盾圆圈
                     shield_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
                     pygame.draw.circle(shield_surface, (0, 191, 255, 128), 
                                        (self.width // 2, self.height // 2), 
                                        self.width // 2)
-                    screen.blit(shield_surface, (self.x, self.y))
+                    screen.blit(shield_surface, pos)
             
             # 渲染河流护盾 (仅当有船且在水中时)
             if self.has_boat and self.is_on_river:
                  river_shield_img = resource_manager.get_river_shield_image()
                  if river_shield_img:
-                     screen.blit(river_shield_img, (self.x, self.y))
+                     screen.blit(river_shield_img, pos)
     
     def move(self, direction):
         """移动坦克
@@ -195,6 +197,7 @@ class Tank(GameObject):
         Args:
             direction: 移动方向
         """
+        previous = (self.direction, self.velocity_x, self.velocity_y)
         self.direction = direction
         self.velocity_x = 0
         self.velocity_y = 0
@@ -207,9 +210,14 @@ class Tank(GameObject):
             self.velocity_y = self.speed
         elif direction == self.LEFT:
             self.velocity_x = -self.speed
+        
+        if previous != (self.direction, self.velocity_x, self.velocity_y):
+            self.version += 1
     
     def stop(self):
         """停止移动"""
+        if self.velocity_x or self.velocity_y:
+            self.version += 1
         self.velocity_x = 0
         self.velocity_y = 0
     
@@ -268,6 +276,7 @@ class Tank(GameObject):
         """激活护盾"""
         self.shield_active = True
         self.shield_duration = self.max_shield_duration
+        self.version += 1
     
     def handle_collision(self, other):
         """处理碰撞
@@ -320,6 +329,7 @@ class Tank(GameObject):
             
         # 重新加载图片
         self.images = self._load_tank_images()
+        self.version += 1
         
     def set_level(self, target_level):
         """直接设置等级"""
@@ -334,8 +344,10 @@ class Tank(GameObject):
         """启用船道具"""
         self.has_boat = True
         self.boat_shield_active = True
+        self.version += 1
         # 重新加载图片可能会有船的特效？目前需求是 river_shield 独立显示
         
     def disable_boat(self):
         self.has_boat = False
         self.boat_shield_active = False
+        self.version += 1
@@ -24,9 +24,13 @@ class Wall(GameObject):
             wall_id: 墙体唯一ID（用于网络同步），如果为None则自动生成
         """
         super().__init__(x, y, config.WALL_WIDTH, config.WALL_HEIGHT)
-        self.wall_type = wall_type
         self.wall_id = wall_id  # 墙体唯一ID，用于网络同步
         self.is_wall = True
+        self._apply_type(wall_type)
+    
+    def _apply_type(self, wall_type):
+        """根据墙体类型设置属性并加载图像"""
+        self.wall_type = wall_type
         
         # 根据类型设置属性
         self.destructible = False
@@ -45,13 +49,20 @@ class Wall(GameObject):
         elif wall_type == self.RIVER:
             self.shoot_through = True
         
-        # 为可摧毁墙体设置生命值（修复health属性未定义的bug）
-        # if self.destructible: # This block is now redundant as health is set above
-        #     self.health = 100  # 砖墙和基地的生命值
-        
         # 加载墙体图像
         self.image = self._load_wall_image()
     
+    def set_wall_type(self, wall_type):
+        """改变墙体类型（属性、图像随之更新）
+        
+        Args:
+            wall_type: 新的墙体类型
+        """
+        if wall_type == self.wall_type:
+            return
+        self._apply_type(wall_type)
+        self.version += 1
+    
     def _load_wall_image(self):
         """加载墙体图像
         
@@ -111,6 +122,7 @@ class Wall(GameObject):
         # 只有可摧毁的墙体才会受到伤害
         if self.destructible:
             self.health -= damage
+            self.version += 1
             if self.health <= 0:
                 # 播放砖块消除音效
                 if self.wall_type == self.BRICK:
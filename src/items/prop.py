@@ -1,19 +1,22 @@
 import pygame
 import random
 import time
-import os
 from src.config.game_config import config
+from src.utils.resource_manager import resource_manager
 
 class Prop(pygame.sprite.Sprite):
-    def __init__(self, x, y, prop_type):
+    def __init__(self, x, y, prop_type, prop_id=None, image=None):
         super().__init__()
         self.type = prop_type  # 1-8
-        # Use absolute path for image loading
-        base_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        image_path = os.path.join(base_path, "images", "props", f"prop{prop_type}.png")
-        loaded_image = pygame.image.load(image_path).convert_alpha()
-        # 缩放到配置的尺寸
-        self.image = pygame.transform.scale(loaded_image, (config.PROP_WIDTH, config.PROP_HEIGHT))
+        self.prop_id = prop_id  # 网络同步ID
+        # 引用 ResourceManager 中按类型共享的已缩放图片，生成道具时不读磁盘
+        if image is None:
+            image = resource_manager.get_prop_image(prop_type)
+        if image is None:
+            # 备用：品红色方块
+            image = pygame.Surface((config.PROP_WIDTH, config.PROP_HEIGHT), pygame.SRCALPHA)
+            image.fill((255, 0, 255))
+        self.image = image
         self.rect = self.image.get_rect()
         self.rect.topleft = (x, y)
         self.creation_time = time.time()
@@ -27,14 +30,31 @@ class Prop(pygame.sprite.Sprite):
         pass
 
 class PropManager:
-    def __init__(self):
+    def __init__(self, rng=None):
         self.props = pygame.sprite.Group()
+        self.next_prop_id = 1
+        # 随机数发生器（由 GameWorld 传入每局的 rng，保证掉落类型可复现）
+        self.rng = rng or random
+        # 按类型共享的道具图片表（首次生成道具时从 ResourceManager 取得）
+        self._images = None
+    
+    def _image_for(self, prop_type):
+        if self._images is None:
+            self._images = resource_manager.get_prop_images()
+        image = self._images.get(prop_type)
+        if image is None:
+            image = resource_manager.get_prop_image(prop_type)
+        return image
         
-    def spawn_prop(self, x, y, prop_type=None):
+    def spawn_prop(self, x, y, prop_type=None, prop_id=None):
         # Randomly select a prop type (1-8) if not specified
         if prop_type is None:
-            prop_type = random.randint(1, 8)
-        prop = Prop(x, y, prop_type)
+            prop_type = self.rng.randint(1, 8)
+        # 主机分配网络ID；客户端沿用快照中的ID
+        if prop_id is None:
+            prop_id = self.next_prop_id
+            self.next_prop_id += 1
+        prop = Prop(x, y, prop_type, prop_id, image=self._image_for(prop_type))
         self.props.add(prop)
         return prop
 
@@ -42,7 +62,9 @@ class PropManager:
         self.props.update()
 
     def draw(self, screen):
-        self.props.draw(screen)
+        # 逐个 blit（screen 也可能是收集绘制项的 SpriteBatch）
+        for prop in self.props:
+            screen.blit(prop.image, prop.rect)
 
     def check_collision(self, player_rect):
         # Returns a list of props collided with
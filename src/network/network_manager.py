@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import base64
 import json
 import queue
 import socket
 import threading
 import time
+import zlib
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Optional
 
+from src.config.game_config import config
+from src.state_sync.snapshot_codec import decode_snapshot, encode_snapshot
+from src.utils.map_cache import MapCache, join_map_payload, map_content_hash, split_map_payload
+
 
 @dataclass
 class NetworkStats:
@@ -17,6 +24,17 @@ class NetworkStats:
     packets_received: int = 0
     connected: bool = False
     role: str = "standalone"  # "host" 或 "client"
+    # 压缩统计（仅统计发送方向的字节数；CPU 时间为累计毫秒）
+    bytes_raw: int = 0
+    bytes_sent: int = 0
+    compressed_messages: int = 0
+    compress_time_ms: float = 0.0
+    decompress_time_ms: float = 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """原始字节数 / 实际发送字节数（未压缩时为 1.0）。"""
+        return self.bytes_raw / self.bytes_sent if self.bytes_sent else 1.0
 
 
 class NetworkManager:
@@ -37,6 +55,15 @@ class NetworkManager:
         self._incoming_input = queue.Queue() # Queue for input (from Client)
         self._event_queue = queue.Queue() # Queue for non-state events (for Client)
         self._client_buffer = ""  # Buffer for client TCP data
+        # 握手协商出的压缩算法（None 表示对端不支持，消息不压缩）
+        self._peer_compression: Optional[str] = None
+        # 地图按哈希传输：主机保存已宣告的地图并排队待发分块，客户端暂存收到的分块
+        self.map_cache = MapCache(config.MAP_CACHE_DIR)
+        self._offered_maps: dict[str, dict] = {}
+        # 客户端回报的地图状态：True 已就绪（缓存命中或分块收齐校验通过），False 传输失败
+        self._peer_maps: dict[str, bool] = {}
+        self._outgoing_chunks: deque = deque()
+        self._incoming_chunks: dict[str, list] = {}
         self.found_servers = [] # List of (ip, room_name)
 
     # ------------------------------------------------------------------ #
@@ -105,6 +132,7 @@ class NetworkManager:
             self._tcp_socket.connect((server_ip, self.CONTROL_PORT))
             self._conn = self._tcp_socket
             self.stats.connected = True
+            self._send_hello()
             
             # Initialize last state time
             self._last_state_time = time.time()
@@ -155,6 +183,7 @@ class NetworkManager:
         while not self._event_queue.empty():
             try: self._event_queue.get_nowait()
             except: pass
+        self._reset_map_transfer()
             
         print("[Network] Stopped")
 
@@ -163,6 +192,8 @@ class NetworkManager:
     # ------------------------------------------------------------------ #
     def update(self):
         """在游戏循环中调用"""
+        self._pump_map_chunks()
+
         # Check for connection timeouts and attempt reconnection
         if self.stats.connected and self._conn:
             # Check if connection is still alive
@@ -237,6 +268,7 @@ class NetworkManager:
         self._incoming_state.queue.clear()
         self._incoming_input.queue.clear()
         self._event_queue.queue.clear()
+        self._reset_map_transfer()
     
     def _attempt_reconnect(self):
         """Attempt to reconnect to the last host"""
@@ -246,6 +278,7 @@ class NetworkManager:
                 self._conn = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 self._conn.settimeout(3.0)  # 3 second timeout
                 self._conn.connect((self._last_host_ip, self.CONTROL_PORT))
+                self._send_hello()
                 
                 # Start receiver thread
                 self._receiver_thread = threading.Thread(target=self._client_receiver_loop, daemon=True)
@@ -273,6 +306,8 @@ class NetworkManager:
     def send_state(self, payload: dict):
         """主机发送状态给客户端"""
         if self.stats.role == "host" and self.stats.connected and self._conn:
+            if config.NETWORK_QUANTIZE_STATE:
+                payload = encode_snapshot(payload)
             self._send_json(self._conn, {"type": "state", "payload": payload})
 
     def send_input(self, input_data: dict):
@@ -301,8 +336,14 @@ class NetworkManager:
             self._send_json(self._conn, {"type": "ready_state", "payload": {"is_ready": is_ready}})
 
     def send_game_start(self, p1_tank_id: int, p2_tank_id: int, map_name: str = "default", 
-                        map_data: dict = None, game_mode: str = "coop", level_number: int = None):
-        """主机发送游戏开始信号（包含完整地图数据、游戏模式和关卡编号）"""
+                        map_data: dict = None, game_mode: str = "coop", level_number: int = None,
+                        seed: int = None, lockstep: bool = False):
+        """主机发送游戏开始信号（包含地图、游戏模式和关卡编号）
+
+        MAP_TRANSFER_BY_HASH 开启时只携带地图内容哈希，完整地图在客户端
+        回复缓存未命中后再分块发送。seed 为本局随机种子，lockstep 表示
+        本局使用确定性锁步同步。
+        """
         if self.stats.role == "host" and self.stats.connected and self._conn:
             payload = {
                 "p1_tank_id": p1_tank_id,
@@ -311,19 +352,64 @@ class NetworkManager:
                 "game_mode": game_mode
             }
             
-            # Include map data if provided
-            if map_data:
+            # Include map data (or just its content hash) if provided
+            if map_data and config.MAP_TRANSFER_BY_HASH:
+                map_hash = map_content_hash(map_data)
+                self._offered_maps[map_hash] = map_data
+                payload["map_hash"] = map_hash
+            elif map_data:
                 payload["map_data"] = map_data
             
             # Include level number if provided
             if level_number is not None:
                 payload["level_number"] = level_number
             
+            if seed is not None:
+                payload["seed"] = seed
+            if lockstep:
+                payload["lockstep"] = True
+            
             self._send_json(self._conn, {
                 "type": "game_start", 
                 "payload": payload
             })
 
+    def send_lockstep_input(self, tick: int, player_input: dict):
+        """锁步模式：发送本地玩家在某一帧的输入。"""
+        if self.stats.connected and self._conn:
+            self._send_json(self._conn, {"type": "ls_input", "payload": {"t": tick, "in": player_input}})
+
+    def send_lockstep_checksum(self, tick: int, checksum: int):
+        """锁步模式：发送某一帧的世界状态校验和。"""
+        if self.stats.connected and self._conn:
+            self._send_json(self._conn, {"type": "ls_crc", "payload": {"t": tick, "crc": checksum}})
+
+    def offer_map(self, map_name: str, map_data: Optional[dict]) -> Optional[str]:
+        """主机在房间内预先宣告所选地图的哈希，客户端据此查缓存或请求分块传输。
+
+        Returns:
+            地图哈希；没有地图数据或未开启 MAP_TRANSFER_BY_HASH（地图随 game_start 整体发送）时返回 None
+        """
+        if not map_data or not config.MAP_TRANSFER_BY_HASH:
+            return None
+        map_hash = map_content_hash(map_data)
+        self._offered_maps[map_hash] = map_data
+        if self.stats.role == "host" and self.stats.connected and self._conn:
+            self._send_json(self._conn, {"type": "map_offer", "payload": {"map_name": map_name, "map_hash": map_hash}})
+        return map_hash
+
+    def peer_map_state(self, map_hash: str) -> Optional[bool]:
+        """客户端对某张地图的回报：True 已就绪，False 传输失败，None 尚未完成。"""
+        return self._peer_maps.get(map_hash)
+
+    def send_map_status(self, map_hash: str, cached: bool, failed: bool = False):
+        """客户端回复地图是否已就绪（缓存命中或分块收齐）；未就绪时主机开始分块发送，failed 表示分块校验失败。"""
+        if self.stats.connected and self._conn:
+            payload = {"map_hash": map_hash, "cached": cached}
+            if failed:
+                payload["failed"] = True
+            self._send_json(self._conn, {"type": "map_status", "payload": payload})
+
     def send_event(self, event_type: str, payload: dict):
         """通用事件发送方法"""
         if self.stats.connected and self._conn:
@@ -339,6 +425,8 @@ class NetworkManager:
             while True:
                 msg = self._incoming_state.get_nowait()
                 if msg.get("type") == "state":
+                    if latest is not None:
+                        self._fold_skipped_state(latest.get("payload") or {}, msg.get("payload") or {})
                     latest = msg
                 else:
                     self._event_queue.put(msg)
@@ -346,6 +434,19 @@ class NetworkManager:
             pass
         return latest.get("payload") if latest else None
 
+    @staticmethod
+    def _fold_skipped_state(skipped: dict, newer: dict):
+        """被丢弃的旧状态中的坦克、墙体变化合并进增量快照，避免客户端漏掉变化。"""
+        if not newer.get("delta"):
+            return
+        if skipped.get("walls") and not newer.get("walls"):
+            newer["walls"] = skipped["walls"]
+        alive_ids = set(newer.get("tank_ids", []))
+        newer_ids = {t.get("id") for t in newer.get("tanks", [])}
+        carried = [t for t in skipped.get("tanks", []) if t.get("id") in alive_ids and t.get("id") not in newer_ids]
+        if carried:
+            newer["tanks"] = carried + newer.get("tanks", [])
+
     def get_events(self) -> list[dict]:
         """客户端获取事件消息"""
         events = []
@@ -438,6 +539,7 @@ class NetworkManager:
                 conn, addr = self._tcp_socket.accept()
                 print(f"[Network] Accepted connection from {addr}")
                 self._conn = conn
+                self._peer_compression = None
                 self.stats.connected = True
                 # Start receiving inputs from this client
                 t_recv = threading.Thread(target=self._tcp_recv_loop, args=(conn, self._incoming_input), daemon=True)
@@ -505,9 +607,15 @@ class NetworkManager:
                     line, buffer = buffer.split('\n', 1)
                     if line.strip():
                         try:
-                            msg = json.loads(line)
+                            msg = self._parse_line(line)
+                            if msg.get("type") == "hello":
+                                self._handle_hello(sock, msg.get("payload") or {})
+                                continue
+                            if msg.get("type") == "map_status":
+                                self._handle_map_status(msg.get("payload") or {})
+                                continue
                             out_queue.put(msg)
-                        except json.JSONDecodeError:
+                        except (json.JSONDecodeError, zlib.error, ValueError):
                             pass
             except Exception as e:
                 if self._running: print(f"[Network] Recv error: {e}")
@@ -533,7 +641,7 @@ class NetworkManager:
                         continue
                         
                     try:
-                        msg = json.loads(line)
+                        msg = self._parse_line(line)
                         msg_type = msg.get("type")
                         
                         # Update last state time for timeout detection (any message indicates connection is alive)
@@ -543,12 +651,19 @@ class NetworkManager:
                         else:
                             self._last_state_time = time.time()
                         
-                        if msg_type == "state":
+                        if msg_type == "hello_ack":
+                            self._peer_compression = (msg.get("payload") or {}).get("compression")
+                            print(f"[Network] 协商压缩算法: {self._peer_compression}")
+                        elif msg_type == "map_chunk":
+                            self._handle_map_chunk(msg.get("payload") or {})
+                        elif msg_type == "state":
+                            # 在接收线程中还原量化快照，主线程拿到的始终是普通字典
+                            msg["payload"] = decode_snapshot(msg.get("payload"))
                             self._incoming_state.put(msg)
                         else:
                             # 所有非状态消息统一放入事件队列，避免大厅更新等被丢弃
                             self._event_queue.put(msg)
-                    except json.JSONDecodeError:
+                    except (json.JSONDecodeError, zlib.error, ValueError):
                         continue
                         
             except socket.timeout:
@@ -578,7 +693,7 @@ class NetworkManager:
                         continue
                         
                     try:
-                        msg = json.loads(line)
+                        msg = self._parse_line(line)
                         msg_type = msg.get("type")
                         
                         # Update last input time for timeout detection (any message indicates connection is alive)
@@ -588,11 +703,13 @@ class NetworkManager:
                         else:
                             self._last_input_time = time.time()
                         
-                        if msg_type == "input":
+                        if msg_type == "map_status":
+                            self._handle_map_status(msg.get("payload") or {})
+                        elif msg_type == "input":
                             self._incoming_input.put(msg)
-                        elif msg_type in ("lobby_update", "map_selection", "ready_state"):
+                        elif msg_type in ("lobby_update", "map_selection", "ready_state", "ls_input", "ls_crc"):
                             self._incoming_input.put(msg)
-                    except json.JSONDecodeError:
+                    except (json.JSONDecodeError, zlib.error, ValueError):
                         continue
                         
             except socket.timeout:
@@ -603,9 +720,107 @@ class NetworkManager:
                     self._handle_disconnect()
                 break
 
+    def _send_hello(self):
+        """客户端连接后声明支持的压缩算法。"""
+        self._peer_compression = None
+        offer = ["zlib"] if config.NETWORK_COMPRESSION else []
+        self._send_json(self._conn, {"type": "hello", "payload": {"compression": offer}})
+
+    def _handle_hello(self, sock: socket.socket, payload: dict):
+        """主机处理握手：双方都支持时启用压缩并回复确认。"""
+        offered = payload.get("compression") or []
+        self._peer_compression = "zlib" if config.NETWORK_COMPRESSION and "zlib" in offered else None
+        print(f"[Network] 客户端握手，压缩算法: {self._peer_compression}")
+        self._send_json(sock, {"type": "hello_ack", "payload": {"compression": self._peer_compression}})
+
+    # ------------------------------------------------------------------ #
+    # 地图传输
+    # ------------------------------------------------------------------ #
+    def _reset_map_transfer(self):
+        self._outgoing_chunks.clear()
+        self._incoming_chunks.clear()
+        self._peer_maps.clear()
+
+    def _handle_map_status(self, payload: dict):
+        """主机处理客户端的地图回复：记录就绪/失败状态，未命中时把地图分块排入发送队列。"""
+        map_hash = payload.get("map_hash")
+        if payload.get("failed"):
+            print(f"[Network] 客户端地图 {str(map_hash)[:12]} 校验失败")
+            self._peer_maps[map_hash] = False
+            return
+        if payload.get("cached"):
+            print(f"[Network] 客户端地图 {str(map_hash)[:12]} 已就绪")
+            self._peer_maps[map_hash] = True
+            return
+        map_data = self._offered_maps.get(map_hash)
+        if map_data is None:
+            print(f"[Network] 客户端请求未知地图 {str(map_hash)[:12]}")
+            return
+        chunks = split_map_payload(map_data, config.MAP_CHUNK_SIZE)
+        print(f"[Network] 客户端缺少地图，分 {len(chunks)} 块发送")
+        for index, data in enumerate(chunks):
+            self._outgoing_chunks.append({
+                "type": "map_chunk",
+                "payload": {"map_hash": map_hash, "index": index, "total": len(chunks), "data": data},
+            })
+
+    def _pump_map_chunks(self):
+        """每次 update 最多发送 MAP_CHUNKS_PER_UPDATE 块，与状态消息交错发送。"""
+        for _ in range(config.MAP_CHUNKS_PER_UPDATE):
+            if not self._outgoing_chunks or not (self.stats.connected and self._conn):
+                return
+            self._send_json(self._conn, self._outgoing_chunks.popleft())
+
+    def _handle_map_chunk(self, payload: dict):
+        """客户端收集地图分块；收齐并校验哈希后写入缓存，投递 map_data 事件。"""
+        map_hash = payload.get("map_hash")
+        total = payload.get("total", 0)
+        chunks = self._incoming_chunks.setdefault(map_hash, [None] * total)
+        index = payload.get("index", -1)
+        if not 0 <= index < len(chunks):
+            return
+        chunks[index] = payload.get("data", "")
+        if any(chunk is None for chunk in chunks):
+            return
+        del self._incoming_chunks[map_hash]
+        map_data = join_map_payload(chunks)
+        if map_content_hash(map_data) != map_hash:
+            print(f"[Network] 地图 {str(map_hash)[:12]} 校验失败，改用本地地图")
+            map_data = None
+            self.send_map_status(map_hash, False, failed=True)
+        else:
+            self.map_cache.put(map_data)
+            self.send_map_status(map_hash, True)  # 告知主机地图已完整保存，可以开局
+        self._event_queue.put({"type": "map_data", "payload": {"map_hash": map_hash, "map_data": map_data}})
+
+    def _encode_line(self, data: dict) -> str:
+        """序列化消息；对端支持且超过阈值时压缩为 {"z": base64} 信封。"""
+        msg = json.dumps(data)
+        raw_size = len(msg)
+        if self._peer_compression == "zlib" and raw_size >= config.NETWORK_COMPRESS_THRESHOLD:
+            start = time.perf_counter()
+            packed = base64.b64encode(zlib.compress(msg.encode('utf-8'), config.NETWORK_COMPRESS_LEVEL)).decode('ascii')
+            self.stats.compress_time_ms += (time.perf_counter() - start) * 1000
+            if len(packed) + 8 < raw_size:
+                msg = json.dumps({"z": packed})
+                self.stats.compressed_messages += 1
+        self.stats.bytes_raw += raw_size
+        self.stats.bytes_sent += len(msg)
+        return msg + '\n'
+
+    def _parse_line(self, line: str) -> dict:
+        """解析一行消息，自动解压压缩信封。"""
+        msg = json.loads(line)
+        if "z" in msg and "type" not in msg:
+            start = time.perf_counter()
+            raw = zlib.decompress(base64.b64decode(msg["z"]))
+            self.stats.decompress_time_ms += (time.perf_counter() - start) * 1000
+            msg = json.loads(raw)
+        return msg
+
     def _send_json(self, sock: socket.socket, data: dict):
         try:
-            msg = json.dumps(data) + '\n'
+            msg = self._encode_line(data)
             sock.sendall(msg.encode('utf-8'))
         except Exception as e:
             print(f"[Network] Send error: {e}")
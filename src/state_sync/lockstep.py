@@ -0,0 +1,143 @@
+"""
+确定性锁步同步（可选联机模式）
+
+双方使用同一随机种子（GameWorld.seed_match）各自运行完整模拟，网络上只交换
+每个逻辑帧的玩家输入：第 T 帧采集的本地输入在第 T + input_delay 帧生效，
+双方都收齐某一帧的输入后才推进该帧。每隔 checksum_interval 帧交换一次
+世界状态校验和，不一致时记录发生失步的帧号。同一帧的对端输入连续
+stall_limit 帧未到达时视为连接中断，由引擎结束对局。
+
+注意：锁步要求模拟完全确定——AI 多进程规划（AI_WORKER_PROCESSES > 0）
+与基于真实时间的关卡计时不在确定性范围内。
+"""
+import struct
+import zlib
+from typing import Dict, Optional
+
+from src.config.game_config import config
+
+# 无操作输入（预填充输入延迟内的帧）
+EMPTY_INPUT = {"move": -1, "shoot": False}
+
+_POSITION_SCALE = 32  # 校验和中坐标的定点精度（与快照量化一致）
+
+
+def _fixed(value) -> int:
+    return int(round(value * _POSITION_SCALE))
+
+
+def world_checksum(world) -> int:
+    """计算影响玩法的世界状态的 CRC32（坦克、子弹、墙体、道具、计时器与随机数状态）。"""
+    buf = bytearray()
+    for tank in sorted(world.tanks, key=lambda t: t.tank_id):
+        buf += struct.pack("<i?iiBii", tank.tank_id, tank.active, _fixed(tank.x), _fixed(tank.y),
+                           tank.direction & 0xFF, int(tank.health), int(tank.level or 0))
+    for bullet in world.bullets:
+        buf += struct.pack("<?iiB", bullet.active, _fixed(bullet.x), _fixed(bullet.y), bullet.direction & 0xFF)
+    for wall in world.walls:
+        buf += struct.pack("<?B", wall.active, wall.wall_type & 0xFF)
+    for prop in world.prop_manager.props:
+        buf += struct.pack("<iBii", prop.prop_id or 0, prop.type, prop.rect.x, prop.rect.y)
+    for tank_id in sorted(world.respawn_timers):
+        buf += struct.pack("<ii", tank_id, world.respawn_timers[tank_id])
+    for tank_id in sorted(world.tank_lives):
+        buf += struct.pack("<ii", tank_id, world.tank_lives[tank_id])
+    buf += struct.pack("<ii?", world.freeze_enemies_timer, world.fortify_base_timer, world.game_over)
+    rng_state = world.rng.getstate()[1]
+    buf += struct.pack(f"<{len(rng_state)}I", *rng_state)
+    return zlib.crc32(bytes(buf))
+
+
+class LockstepSession:
+    """锁步会话：缓冲双方输入、决定何时推进下一帧，并比对校验和。"""
+
+    def __init__(self, local_id: int, remote_id: int, input_delay: int = None, checksum_interval: int = None,
+                 stall_limit: int = None):
+        """
+        Args:
+            local_id: 本地玩家坦克ID
+            remote_id: 对端玩家坦克ID
+            input_delay: 输入延迟（帧），默认 config.LOCKSTEP_INPUT_DELAY
+            checksum_interval: 校验和间隔（帧），默认 config.LOCKSTEP_CHECKSUM_INTERVAL
+            stall_limit: 等待同一帧对端输入的上限（帧），默认 config.LOCKSTEP_STALL_LIMIT
+        """
+        self.local_id = local_id
+        self.remote_id = remote_id
+        self.input_delay = max(1, input_delay or config.LOCKSTEP_INPUT_DELAY)
+        self.checksum_interval = max(1, checksum_interval or config.LOCKSTEP_CHECKSUM_INTERVAL)
+        self.tick = 0  # 下一个待模拟的帧
+        self._inputs: Dict[int, Dict[int, dict]] = {local_id: {}, remote_id: {}}
+        for tick in range(self.input_delay):
+            for buffer in self._inputs.values():
+                buffer[tick] = dict(EMPTY_INPUT)
+        self._local_checksums: Dict[int, int] = {}
+        self._remote_checksums: Dict[int, int] = {}
+        self.desync_tick: Optional[int] = None
+        self.stalls = 0  # 因等待对端输入而未推进的次数
+        self.stall_limit = max(1, stall_limit or config.LOCKSTEP_STALL_LIMIT)
+        self.waiting = 0  # 当前帧已连续等待的次数
+
+    @property
+    def desynced(self) -> bool:
+        return self.desync_tick is not None
+
+    def submit_local(self, player_input: dict) -> Optional[int]:
+        """登记本地输入（在第 tick + input_delay 帧生效）。
+
+        Returns:
+            输入对应的帧号；该帧已登记过（等待对端时）返回 None
+        """
+        tick = self.tick + self.input_delay
+        if tick in self._inputs[self.local_id]:
+            return None
+        self._inputs[self.local_id][tick] = player_input
+        return tick
+
+    def receive_input(self, tick: int, player_input: dict):
+        """登记对端在某一帧的输入。"""
+        if tick >= self.tick:
+            self._inputs[self.remote_id][tick] = player_input
+
+    @property
+    def stalled_out(self) -> bool:
+        """当前帧等待对端输入是否已超过上限（视为连接中断）。"""
+        return self.waiting >= self.stall_limit
+
+    def note_stall(self) -> bool:
+        """记录一次因对端输入未到而未推进；返回是否已超过等待上限。"""
+        self.stalls += 1
+        self.waiting += 1
+        return self.stalled_out
+
+    def ready(self) -> bool:
+        """双方的本帧输入是否都已到达。"""
+        return all(self.tick in buffer for buffer in self._inputs.values())
+
+    def pop_inputs(self) -> Dict[int, dict]:
+        """取出本帧双方输入（按坦克ID，顺序固定）。"""
+        self.waiting = 0
+        return {player_id: self._inputs[player_id].pop(self.tick) for player_id in sorted(self._inputs)}
+
+    def end_tick(self, world) -> Optional[int]:
+        """本帧模拟完成；到达校验间隔时返回本地校验和（需发给对端）。"""
+        self.tick += 1
+        if self.tick % self.checksum_interval:
+            return None
+        checksum = world_checksum(world)
+        self._local_checksums[self.tick] = checksum
+        self._compare(self.tick)
+        return checksum
+
+    def receive_checksum(self, tick: int, checksum: int):
+        """登记对端在某一帧的校验和。"""
+        self._remote_checksums[tick] = checksum
+        self._compare(tick)
+
+    def _compare(self, tick: int):
+        if tick not in self._local_checksums or tick not in self._remote_checksums:
+            return
+        local = self._local_checksums.pop(tick)
+        remote = self._remote_checksums.pop(tick)
+        if local != remote and self.desync_tick is None:
+            self.desync_tick = tick
+            print(f"[Lockstep] 第 {tick} 帧状态校验不一致，双方已失步 (本地 {local:08x} / 对端 {remote:08x})")
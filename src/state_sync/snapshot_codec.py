@@ -0,0 +1,287 @@
+"""
+快照数值字段的量化编码
+
+把快照中体积最大的数值部分（坦克、子弹、爆炸、星星、重生信息与时间戳）
+打包为紧凑的二进制，再以 base64 放入 JSON 消息的 ``q`` 字段：
+
+- 位置：定点数（1/32 像素）存为 16 位无符号整数，带 64 像素边距，
+  覆盖 1400×1050 世界（最大约 1983 像素）
+- 方向：2 位，与布尔标志一起打包进一个字节
+- 计时器、生命值、ID 等整数：zig-zag 变长整数（varint）
+
+量化只发生在网络传输层，主机上的权威状态不受影响；整数及 1/32 像素
+倍数的坐标可以无损往返。
+"""
+import base64
+import struct
+from typing import Dict, List, Optional, Tuple
+
+POSITION_SCALE = 32  # 定点精度：1/32 像素
+POSITION_OFFSET = 64  # 允许略微越界（子弹、爆炸）的边距（像素）
+_MAX_POSITION = 0xFFFF
+
+_TANK_TYPES = ("player", "enemy")
+
+# 标志位
+_FLAG_ACTIVE = 0x01
+_FLAG_SHIELD = 0x02
+_FLAG_BOAT = 0x04
+_FLAG_RIVER = 0x08
+_FLAG_ENEMY = 0x10
+_DIR_SHIFT = 5
+
+# 被量化编码替换的快照字段
+QUANTIZED_KEYS = ("ts", "tanks", "my_tank", "bullets", "exps", "stars", "respawn")
+
+_UINT16_PAIR = struct.Struct("<HH")
+
+
+# ---------------------------------------------------------------------- #
+# 基础编码
+# ---------------------------------------------------------------------- #
+def zigzag(value: int) -> int:
+    """有符号整数映射为无符号整数（0,-1,1,-2 → 0,1,2,3）。"""
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def unzigzag(value: int) -> int:
+    """zigzag 的逆映射。"""
+    return (value >> 1) ^ -(value & 1)
+
+
+def write_varint(buf: bytearray, value: int):
+    """写入无符号变长整数（每字节 7 位，最高位为续位标志）。"""
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """读取无符号变长整数，返回 (值, 新位置)。"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def write_svarint(buf: bytearray, value: int):
+    write_varint(buf, zigzag(int(value)))
+
+
+def read_svarint(data: bytes, pos: int) -> Tuple[int, int]:
+    value, pos = read_varint(data, pos)
+    return unzigzag(value), pos
+
+
+def quantize_position(value: float) -> int:
+    """坐标量化为 16 位定点数（超出范围时钳制）。"""
+    q = int(round((value + POSITION_OFFSET) * POSITION_SCALE))
+    return max(0, min(_MAX_POSITION, q))
+
+
+def dequantize_position(q: int):
+    value = q / POSITION_SCALE - POSITION_OFFSET
+    return int(value) if value.is_integer() else value
+
+
+def _write_scaled(buf: bytearray, value: float):
+    write_svarint(buf, int(round(value * POSITION_SCALE)))
+
+
+def _read_scaled(data: bytes, pos: int):
+    q, pos = read_svarint(data, pos)
+    value = q / POSITION_SCALE
+    return (int(value) if value.is_integer() else value), pos
+
+
+def _write_optional_id(buf: bytearray, value: Optional[int]):
+    write_varint(buf, 0 if value is None else zigzag(int(value)) + 1)
+
+
+def _read_optional_id(data: bytes, pos: int):
+    value, pos = read_varint(data, pos)
+    return (None if value == 0 else unzigzag(value - 1)), pos
+
+
+# ---------------------------------------------------------------------- #
+# 实体编码
+# ---------------------------------------------------------------------- #
+def _write_tank(buf: bytearray, tank: Dict):
+    active = tank.get("active", True)
+    flags = (tank.get("dir", 0) & 0x03) << _DIR_SHIFT
+    if active:
+        flags |= _FLAG_ACTIVE
+    if tank.get("shield"):
+        flags |= _FLAG_SHIELD
+    if tank.get("has_boat"):
+        flags |= _FLAG_BOAT
+    if tank.get("is_on_river"):
+        flags |= _FLAG_RIVER
+    if tank.get("type") == "enemy":
+        flags |= _FLAG_ENEMY
+    write_svarint(buf, tank["id"])
+    buf.append(flags)
+    if active:
+        buf += _UINT16_PAIR.pack(quantize_position(tank["x"]), quantize_position(tank["y"]))
+        _write_scaled(buf, tank.get("vx", 0))
+        _write_scaled(buf, tank.get("vy", 0))
+        write_svarint(buf, tank.get("hp", 100))
+        write_svarint(buf, tank.get("skin", 1))
+        write_svarint(buf, tank.get("level", 0) or 0)
+
+
+def _read_tank(data: bytes, pos: int) -> Tuple[Dict, int]:
+    tank_id, pos = read_svarint(data, pos)
+    flags = data[pos]
+    pos += 1
+    tank_type = _TANK_TYPES[1] if flags & _FLAG_ENEMY else _TANK_TYPES[0]
+    if not flags & _FLAG_ACTIVE:
+        return {"id": tank_id, "type": tank_type, "active": False, "hp": 0}, pos
+    qx, qy = _UINT16_PAIR.unpack_from(data, pos)
+    pos += _UINT16_PAIR.size
+    vx, pos = _read_scaled(data, pos)
+    vy, pos = _read_scaled(data, pos)
+    hp, pos = read_svarint(data, pos)
+    skin, pos = read_svarint(data, pos)
+    level, pos = read_svarint(data, pos)
+    return {
+        "id": tank_id,
+        "type": tank_type,
+        "x": dequantize_position(qx),
+        "y": dequantize_position(qy),
+        "dir": (flags >> _DIR_SHIFT) & 0x03,
+        "vx": vx,
+        "vy": vy,
+        "hp": hp,
+        "shield": bool(flags & _FLAG_SHIELD),
+        "skin": skin,
+        "level": level,
+        "has_boat": bool(flags & _FLAG_BOAT),
+        "is_on_river": bool(flags & _FLAG_RIVER),
+        "active": True,
+    }, pos
+
+
+def _write_bullet(buf: bytearray, bullet: Dict):
+    _write_optional_id(buf, bullet.get("nid"))
+    buf.append(bullet["dir"] & 0x03)
+    buf += _UINT16_PAIR.pack(quantize_position(bullet["x"]), quantize_position(bullet["y"]))
+    write_svarint(buf, bullet.get("owner", -1))
+
+
+def _read_bullet(data: bytes, pos: int) -> Tuple[Dict, int]:
+    nid, pos = _read_optional_id(data, pos)
+    direction = data[pos] & 0x03
+    pos += 1
+    qx, qy = _UINT16_PAIR.unpack_from(data, pos)
+    pos += _UINT16_PAIR.size
+    owner, pos = read_svarint(data, pos)
+    return {"nid": nid, "x": dequantize_position(qx), "y": dequantize_position(qy),
+            "dir": direction, "owner": owner}, pos
+
+
+def _write_effect(buf: bytearray, effect: Dict, with_radius: bool):
+    _write_optional_id(buf, effect.get("nid"))
+    buf += _UINT16_PAIR.pack(quantize_position(effect["x"]), quantize_position(effect["y"]))
+    if with_radius:
+        write_svarint(buf, effect["r"])
+    write_svarint(buf, effect["d"])
+    write_svarint(buf, effect["e"])
+
+
+def _read_effect(data: bytes, pos: int, with_radius: bool) -> Tuple[Dict, int]:
+    nid, pos = _read_optional_id(data, pos)
+    qx, qy = _UINT16_PAIR.unpack_from(data, pos)
+    pos += _UINT16_PAIR.size
+    effect = {"nid": nid, "x": dequantize_position(qx), "y": dequantize_position(qy)}
+    if with_radius:
+        effect["r"], pos = read_svarint(data, pos)
+    effect["d"], pos = read_svarint(data, pos)
+    effect["e"], pos = read_svarint(data, pos)
+    return effect, pos
+
+
+def _write_int_map(buf: bytearray, values: Dict):
+    write_varint(buf, len(values))
+    for key, value in values.items():
+        write_svarint(buf, int(key))
+        write_svarint(buf, value)
+
+
+def _read_int_map(data: bytes, pos: int) -> Tuple[Dict[int, int], int]:
+    count, pos = read_varint(data, pos)
+    values = {}
+    for _ in range(count):
+        key, pos = read_svarint(data, pos)
+        values[key], pos = read_svarint(data, pos)
+    return values, pos
+
+
+def _write_list(buf: bytearray, items: List[Dict], writer, *args):
+    write_varint(buf, len(items))
+    for item in items:
+        writer(buf, item, *args)
+
+
+def _read_list(data: bytes, pos: int, reader, *args) -> Tuple[List[Dict], int]:
+    count, pos = read_varint(data, pos)
+    items = []
+    for _ in range(count):
+        item, pos = reader(data, pos, *args)
+        items.append(item)
+    return items, pos
+
+
+# ---------------------------------------------------------------------- #
+# 快照编码
+# ---------------------------------------------------------------------- #
+def encode_snapshot(state: Dict) -> Dict:
+    """把快照中的数值字段量化打包，返回新的字典（不修改传入的快照）。"""
+    if not state or "tanks" not in state:
+        return state
+    buf = bytearray()
+    write_svarint(buf, int(round(state.get("ts", 0) * 1000)))
+    _write_list(buf, state.get("tanks", []), _write_tank)
+    my_tank = state.get("my_tank")
+    buf.append(1 if my_tank else 0)
+    if my_tank:
+        _write_tank(buf, my_tank)
+    _write_list(buf, state.get("bullets", []), _write_bullet)
+    _write_list(buf, state.get("exps", []), _write_effect, True)
+    _write_list(buf, state.get("stars", []), _write_effect, False)
+    respawn = state.get("respawn") or {}
+    _write_int_map(buf, respawn.get("lives", {}))
+    _write_int_map(buf, respawn.get("timers", {}))
+
+    packed = {key: value for key, value in state.items() if key not in QUANTIZED_KEYS}
+    packed["q"] = base64.b64encode(bytes(buf)).decode("ascii")
+    return packed
+
+
+def decode_snapshot(packed: Dict) -> Dict:
+    """还原 encode_snapshot 打包的快照；未打包的快照原样返回。"""
+    if not packed or "q" not in packed:
+        return packed
+    data = base64.b64decode(packed["q"])
+    state = {key: value for key, value in packed.items() if key != "q"}
+    ts_ms, pos = read_svarint(data, 0)
+    state["ts"] = ts_ms / 1000.0
+    state["tanks"], pos = _read_list(data, pos, _read_tank)
+    has_my_tank = data[pos]
+    pos += 1
+    state["my_tank"] = None
+    if has_my_tank:
+        state["my_tank"], pos = _read_tank(data, pos)
+    state["bullets"], pos = _read_list(data, pos, _read_bullet)
+    state["exps"], pos = _read_list(data, pos, _read_effect, True)
+    state["stars"], pos = _read_list(data, pos, _read_effect, False)
+    lives, pos = _read_int_map(data, pos)
+    timers, pos = _read_int_map(data, pos)
+    state["respawn"] = {"lives": lives, "timers": timers}
+    return state
@@ -1,13 +1,29 @@
 from __future__ import annotations
 
+import base64
 import json
 import time
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+from src.config.game_config import config
 from src.game_engine.game_world import GameWorld
 
 
+def pack_wall_cells(world, grid: int = config.GRID_SIZE) -> bytearray:
+    """把墙体打包为按行排列的每格一字节类型数组（0 表示无墙，其余为 wall_type + 1）。"""
+    cols = max(1, world.width // grid)
+    rows = max(1, world.height // grid)
+    cells = bytearray(cols * rows)
+    for wall in world.walls:
+        if not wall.active:
+            continue
+        gx, gy = int(wall.x // grid), int(wall.y // grid)
+        if 0 <= gx < cols and 0 <= gy < rows:
+            cells[gy * cols + gx] = wall.wall_type + 1
+    return cells
+
+
 @dataclass
 class StateSnapshot:
     """描述一次状态同步的数据结构。"""
@@ -21,42 +37,89 @@ class StateSnapshot:
 class StateManager:
     """负责在本地维护游戏世界快照并为网络层提供接口的占位实现。"""
 
-    def __init__(self):
+    def __init__(self, send_rate: Optional[int] = None):
         self.world: Optional[GameWorld] = None
-        self.latest_snapshot: Optional[StateSnapshot] = None
+        self.latest_snapshot: Optional[Dict] = None
         self.pending_remote_state: Optional[Dict] = None
+        # Events captured on simulation ticks, held until the next network send
+        self._captured_events: List[Dict] = []
+        # 发送频率（Hz）与逻辑帧率解耦：按逻辑帧累加，到点才编码发送（与 set_send_rate 同样限制范围）
+        self.set_send_rate(config.NETWORK_SEND_RATE if send_rate is None else send_rate)
+        # 每实体编码缓存：tank_id -> (tank, version, data)，版本号未变时直接复用
+        self._tank_cache: Dict[int, tuple] = {}
+        # 上一次编码输出的坦克数据，用于增量快照只携带变化的坦克
+        self._sent_tanks: Dict[int, Dict] = {}
+        self._sends_since_keyframe = 0
+        # 客户端：已知的全部坦克状态，增量快照在此基础上合并
+        self._remote_tank_states: Dict[int, Dict] = {}
+        # 墙体类型数组及其版本：墙体签名变化时才重新打包，内容变化时版本递增
+        self.wall_version = 0
+        self._wall_cells = bytearray()
+        # 对局中生成的墙体 [格子索引, wall_id]，客户端据此使用主机分配的ID
+        self._wall_ids: List[List[int]] = []
+        self._wall_signature = None
+        self._sent_wall_version = -1
+        # 客户端：最近一次应用的墙体版本
+        self._remote_wall_version = None
 
     def attach_world(self, world: GameWorld):
         """绑定 GameWorld；UI/网络初始化后调用一次。"""
         self.world = world
 
+    def set_send_rate(self, rate_hz: int):
+        """设置快照发送频率（如 20/30/60 Hz），不超过逻辑帧率。"""
+        self.send_rate = max(1, min(int(rate_hz), config.SIMULATION_FPS))
+        self._send_accumulator = 0
+
+    def reset_send_clock(self):
+        """新对局开始时重置发送节拍，使第一帧立即发送。"""
+        self._send_accumulator = config.SIMULATION_FPS
+        self._sends_since_keyframe = 0
+        self._sent_tanks = {}
+        self._tank_cache = {}
+        self._sent_wall_version = -1
+
+    def capture_events(self, events: List[Dict]):
+        """主机每个逻辑帧在事件被消费前调用，事件累积到下一次发送。"""
+        if events:
+            self._captured_events.extend(events)
+
+    def should_send(self) -> bool:
+        """推进一个逻辑帧，返回本帧是否为网络发送帧。"""
+        self._send_accumulator += self.send_rate
+        if self._send_accumulator >= config.SIMULATION_FPS:
+            self._send_accumulator -= config.SIMULATION_FPS
+            return True
+        return False
+
+    def build_snapshot(self) -> dict:
+        """在发送帧编码快照，并清空已随快照发送的事件。
+
+        每 NETWORK_KEYFRAME_INTERVAL 次发送一次完整快照，其余为只含变化坦克的增量快照。
+        """
+        keyframe = self._sends_since_keyframe % max(1, config.NETWORK_KEYFRAME_INTERVAL) == 0
+        state = self.encode_state(delta=not keyframe)
+        self._sends_since_keyframe += 1
+        self._captured_events = []
+        self.latest_snapshot = state
+        return state
+
     def update(self):
-        """在每帧调用，用于生成本地快照或应用远端状态。"""
+        """在每帧调用，用于应用远端状态；快照只在网络发送帧由 build_snapshot 生成。"""
         if not self.world:
             return
         if self.pending_remote_state:
             self.decode_state(self.pending_remote_state)
             self.pending_remote_state = None
-        # Capture events before they're consumed by game engine
-        # This ensures events are synced even if they're consumed in the same frame
-        # Note: For host, events should be captured BEFORE _consume_game_events() is called
-        # If _captured_events is already set (by game engine), use it; otherwise capture now
-        if not hasattr(self, '_captured_events') or not self._captured_events:
-            self._captured_events = []
-            if hasattr(self.world, 'events'):
-                self._captured_events = list(self.world.events)
-        self.latest_snapshot = self.encode_state()
-
-    def encode_state(self) -> dict:
-        """生成完整的世界状态快照"""
-        if not self.world:
-            return {}
-            
-        tanks = []
-        my_tank_data = None  # Separate data for client's own tank
-        
-        for tank in self.world.tanks:
-            # Include all tanks, not just active ones, to properly sync death state
+
+    def _encode_tank(self, tank) -> Dict:
+        """编码单个坦克；版本号未变化时复用上次的编码结果。"""
+        version = getattr(tank, "version", None)
+        cached = self._tank_cache.get(tank.tank_id)
+        if version is not None and cached and cached[0] is tank and cached[1] == version:
+            return cached[2]
+
+        if tank.active:
             tank_data = {
                 "id": tank.tank_id,
                 "type": tank.tank_type,
@@ -73,61 +136,111 @@ class StateManager:
                 "is_on_river": getattr(tank, "is_on_river", False),
                 "active": tank.active  # Explicitly include active state
             }
-            
+        else:
             # Only include position/velocity data for active tanks
-            if not tank.active:
-                # For inactive tanks, we only need basic info
-                tank_data = {
-                    "id": tank.tank_id,
-                    "type": tank.tank_type,
-                    "active": False,
-                    "hp": 0
-                }
-                
-            tanks.append(tank_data)
+            # For inactive tanks, we only need basic info
+            tank_data = {
+                "id": tank.tank_id,
+                "type": tank.tank_type,
+                "active": False,
+                "hp": 0
+            }
+
+        if version is not None:
+            self._tank_cache[tank.tank_id] = (tank, version, tank_data)
+        return tank_data
+
+    def _refresh_wall_cells(self):
+        """墙体增删或任一墙体版本变化时重新打包类型数组，内容变化则版本号递增。"""
+        walls = self.world.walls
+        signature = (getattr(self.world, "wall_layout_version", 0), len(walls),
+                     sum(getattr(w, "version", 0) for w in walls))
+        if signature == self._wall_signature:
+            return
+        self._wall_signature = signature
+        cells = pack_wall_cells(self.world)
+        wall_ids = self._runtime_wall_cells()
+        if cells != self._wall_cells or wall_ids != self._wall_ids:
+            self._wall_cells = cells
+            self._wall_ids = wall_ids
+            self.wall_version += 1
+
+    def _runtime_wall_cells(self) -> List[List[int]]:
+        """对局中生成的活跃墙体所在格子与主机ID（按格子排序）。"""
+        grid = config.GRID_SIZE
+        cols = max(1, self.world.width // grid)
+        cells = []
+        for wall_id in getattr(self.world, "runtime_wall_ids", ()):
+            wall = self.world.wall_id_map.get(wall_id)
+            if wall is not None and wall.active:
+                cells.append([int(wall.y // grid) * cols + int(wall.x // grid), wall_id])
+        cells.sort()
+        return cells
+
+    def encode_state(self, delta: bool = False) -> dict:
+        """生成世界状态快照
+
+        Args:
+            delta: 为True时 tanks 只包含自上次编码以来变化的坦克，
+                并附带 tank_ids 供客户端判断哪些坦克仍然存在
+        """
+        if not self.world:
+            return {}
+            
+        tanks = []
+        my_tank_data = None  # Separate data for client's own tank
+        
+        # 同ID的坦克以列表中最后一个为准（与客户端按ID解码的结果一致）
+        latest_tanks = {}
+        for tank in self.world.tanks:
+            latest_tanks[tank.tank_id] = tank
+
+        sent_tanks = {}
+        for tank_id, tank in latest_tanks.items():
+            # Include all tanks, not just active ones, to properly sync death state
+            tank_data = self._encode_tank(tank)
+            sent_tanks[tank_id] = tank_data
+            if not delta or self._sent_tanks.get(tank_id) is not tank_data:
+                tanks.append(tank_data)
             
             # Mark client's tank separately (will be set by game.py)
-            if hasattr(self, 'client_tank_id') and tank.tank_id == self.client_tank_id:
+            if hasattr(self, 'client_tank_id') and tank_id == self.client_tank_id:
                 my_tank_data = tank_data
+        self._sent_tanks = sent_tanks
+        # 清理已离开世界的坦克缓存
+        for tank_id in list(self._tank_cache):
+            if tank_id not in latest_tanks:
+                del self._tank_cache[tank_id]
                 
         bullets = []
         for bullet in self.world.bullets:
             if bullet.active:
                 bullets.append({
+                    "nid": bullet.net_id,
                     "x": bullet.x,
                     "y": bullet.y,
                     "dir": bullet.direction,
                     "owner": getattr(bullet.owner, "tank_id", -1)
                 })
                 
-        # Optimization: Only send destroyed walls and changed wall types
-        # 使用墙体ID而非索引，避免列表顺序不一致的问题
-        destroyed_walls = []
-        changed_walls = []
-        for wall in self.world.walls:
-            # 确保墙体有ID
-            if not hasattr(wall, 'wall_id') or wall.wall_id is None:
-                continue
-                
-            if not wall.active:
-                destroyed_walls.append(wall.wall_id)
-            # Track wall type changes (for Shovel effect)
-            # We need to store original types to detect changes
-            # For now, just send all wall types
-            if wall.active:
-                # 发送位置，用于客户端缺失墙体时创建
-                changed_walls.append({
-                    "id": wall.wall_id,
-                    "type": wall.wall_type,
-                    "x": getattr(wall, "x", None),
-                    "y": getattr(wall, "y", None)
-                })
+        # 墙体：每格一字节的类型数组，只在内容变化或完整快照时发送
+        self._refresh_wall_cells()
+        walls_state = None
+        if not delta or self.wall_version != self._sent_wall_version:
+            walls_state = {
+                "v": self.wall_version,
+                "cols": max(1, self.world.width // config.GRID_SIZE),
+                "cells": base64.b64encode(bytes(self._wall_cells)).decode("ascii"),
+                "ids": self._wall_ids,
+            }
+            self._sent_wall_version = self.wall_version
                 
         # Sync Explosions
         explosions = []
         for exp in self.world.explosions:
             if exp.visible:
                 explosions.append({
+                    "nid": exp.net_id,
                     "x": exp.x,
                     "y": exp.y,
                     "r": exp.radius,
@@ -140,6 +253,7 @@ class StateManager:
         for star in self.world.stars:
             if star.visible:
                 stars.append({
+                    "nid": star.net_id,
                     "x": star.x,
                     "y": star.y,
                     "d": star.duration,
@@ -157,6 +271,7 @@ class StateManager:
         if hasattr(self.world, 'prop_manager'):
             for prop in self.world.prop_manager.props:
                 props.append({
+                    "nid": prop.prop_id,
                     "type": prop.type,
                     "x": prop.rect.x,
                     "y": prop.rect.y
@@ -173,13 +288,12 @@ class StateManager:
         if len(events) > 0 and hasattr(self.world, 'is_client_mode') and not self.world.is_client_mode:
             print(f"[Host] 同步 {len(events)} 个事件到客户端: {[e.get('type', 'unknown') for e in events]}")
 
-        return {
+        state = {
             "ts": time.time(),
             "tanks": tanks,
             "my_tank": my_tank_data,  # Client's own tank for reconciliation
             "bullets": bullets,
-            "d_walls": destroyed_walls,
-            "c_walls": changed_walls,
+            "walls": walls_state,
             "exps": explosions,
             "stars": stars,
             "respawn": respawn_data,
@@ -202,18 +316,18 @@ class StateManager:
                 "base_fortified": getattr(self.world, "base_fortified", False)
             }
         }
+        if delta:
+            state["delta"] = True
+            state["tank_ids"] = list(latest_tanks)
+        return state
 
     def decode_state(self, state: dict):
         """应用远端状态到本地世界"""
         if not self.world or not state:
             return
         
-        # 去重未知墙体日志，避免刷屏
-        if not hasattr(self, "_unknown_wall_ids_logged"):
-            self._unknown_wall_ids_logged = set()
-            
         # 1. Sync Tanks
-        remote_tanks = {t["id"]: t for t in state.get("tanks", [])}
+        remote_tanks = self._merge_remote_tanks(state)
         local_player_id = getattr(self, 'local_player_id', None)
         
         # Update existing or spawn new
@@ -227,7 +341,7 @@ class StateManager:
             is_active = t_data.get("active", True)
             
             # Find tank by ID
-            tank = next((t for t in self.world.tanks if t.tank_id == tid), None)
+            tank = self.world.tank_id_map.get(tid)
             if tank:
                 # For local player: only update critical state (health, active), skip position (client-side prediction)
                 if local_player_id and tid == local_player_id:
@@ -399,118 +513,13 @@ class StateManager:
                     tank.active = False
                     tank.visible = False
                 
-        # 2. Sync Bullets
-        self.world.bullets.clear() 
-        
-        from src.game_engine.bullet import Bullet
-        for b_data in state.get("bullets", []):
-            owner_id = b_data["owner"]
-            owner = next((t for t in self.world.tanks if t.tank_id == owner_id), None)
-            b = Bullet(b_data["x"], b_data["y"], b_data["dir"], owner=owner)
-            self.world.add_object(b)
-                
-        # 3. Sync Walls
-        # 使用墙体ID而非索引，避免列表顺序不一致的问题
-        d_walls = set(state.get("d_walls", []))
-        if d_walls:
-            print(f"[Client] Applying {len(d_walls)} destroyed walls by ID: {list(d_walls)[:5]}...")
-        
-        # 通过ID查找墙体
-        for wall in self.world.walls:
-            if not hasattr(wall, 'wall_id') or wall.wall_id is None:
-                continue
-                
-            if wall.wall_id in d_walls:
-                wall.active = False
-                wall.visible = False
-            else:
-                # 确保未被销毁的墙体是活跃的
-                wall.active = True
-                wall.visible = True
-        
-        # Apply wall type changes (for Shovel effect)
-        # 同时处理新生成的墙体（基地强化时动态生成的钢墙）
-        c_walls = state.get("c_walls", [])
-        existing_wall_ids = {w.wall_id for w in self.world.walls if hasattr(w, 'wall_id') and w.wall_id is not None}
-        
-        for wall_data in c_walls:
-            wall_id = wall_data.get("id")  # 使用ID而非idx
-            new_type = wall_data.get("type")
-            
-            if wall_id is None:
-                continue
-            
-            # 通过ID查找墙体
-            wall = None
-            if hasattr(self.world, 'wall_id_map') and wall_id in self.world.wall_id_map:
-                wall = self.world.wall_id_map[wall_id]
-            else:
-                # 回退：遍历查找（兼容旧代码）
-                wall = next((w for w in self.world.walls if hasattr(w, 'wall_id') and w.wall_id == wall_id), None)
-            
-            if wall:
-                # 墙体已存在，更新类型
-                if wall.wall_type != new_type:
-                    wall.wall_type = new_type
-                    # Reload wall image
-                    from src.utils.resource_manager import resource_manager
-                    wall.image = resource_manager.get_wall_image(new_type)
-                    wall.active = True
-                    wall.visible = True
-            elif wall_id not in existing_wall_ids:
-                # 墙体不存在，可能是新生成的（基地强化时动态生成）
-                # 如果有位置数据则在客户端创建，否则保留一次性警告
-                wx = wall_data.get("x")
-                wy = wall_data.get("y")
-                if wx is not None and wy is not None:
-                    try:
-                        from src.utils.resource_manager import resource_manager
-                        new_wall = self.world.spawn_wall(wx, wy, wall_type=new_type, wall_id=wall_id)
-                        new_wall.image = resource_manager.get_wall_image(new_type)
-                        new_wall.active = True
-                        new_wall.visible = True
-                        if hasattr(self.world, "wall_id_map"):
-                            self.world.wall_id_map[wall_id] = new_wall
-                        print(f"[Client] 新建缺失墙体 ID={wall_id} type={new_type} @({wx},{wy})")
-                    except Exception as exc:
-                        if wall_id not in self._unknown_wall_ids_logged:
-                            print(f"[Client] 警告：创建缺失墙体 {wall_id} 失败: {exc}")
-                            if len(self._unknown_wall_ids_logged) < 256:
-                                self._unknown_wall_ids_logged.add(wall_id)
-                else:
-                    if wall_id not in self._unknown_wall_ids_logged:
-                        print(f"[Client] 警告：收到未知墙体ID {wall_id}，类型 {new_type}，但缺少位置信息")
-                        # 限制记录数量，防止集合无限增长
-                        if len(self._unknown_wall_ids_logged) < 256:
-                            self._unknown_wall_ids_logged.add(wall_id)
-
-        # 4. Sync Explosions
-        self.world.explosions.clear()
-        from src.game_engine.game_world import Explosion
-        for exp_data in state.get("exps", []):
-            exp = Explosion(exp_data["x"] + exp_data["r"], exp_data["y"] + exp_data["r"], exp_data["r"], exp_data["d"])
-            exp.elapsed = exp_data["e"]
-            self.world.add_object(exp)
-            
-        # 5. Sync Stars
-        self.world.stars.clear()
-        from src.game_engine.game_world import Star
-        for star_data in state.get("stars", []):
-            star = Star(star_data["x"] + 25, star_data["y"] + 25, star_data["d"])  # x,y passed to init are center-25, so we reverse it or just pass correct coords
-            # Wait, Star init takes x,y as top-left?
-            # Star(x, y) calls super(x-25, y-25) if we look at previous edit?
-            # Let's check Star.__init__ in game_world.py
-            # It was: def __init__(self, x, y, ...): super().__init__(x-25, y-25, 50, 50)
-            # So x,y passed to __init__ are the CENTER coordinates.
-            # In encode_state, we sent star.x, star.y which are TOP-LEFT coordinates (from GameObject).
-            # So we need to convert back to center for Star constructor, OR modify Star constructor, OR just set properties.
-            # Easiest: Create Star and set properties.
-            # But Star.__init__ loads frames.
-            # Let's pass center coordinates: x + width/2, y + height/2.
-            # Star width is 50. So center is x+25, y+25.
-            star = Star(star_data["x"] + 25, star_data["y"] + 25, star_data["d"])
-            star.elapsed = star_data["e"]
-            self.world.add_object(star)
+        # 2-5. Sync Bullets / Explosions / Stars：按网络ID就地更新，只创建新出现的实体
+        self._reconcile_entities(self.world.bullets, state.get("bullets", []),
+                                 self._create_bullet, self._update_bullet, self.world.remove_object)
+        self._reconcile_entities(self.world.explosions, state.get("exps", []),
+                                 self._create_explosion, self._update_explosion, self.world.remove_object)
+        self._reconcile_entities(self.world.stars, state.get("stars", []),
+                                 self._create_star, self._update_star, self.world.remove_object)
 
         # 6. Sync Respawn System
         respawn_data = state.get("respawn", {})
@@ -555,17 +564,19 @@ class StateManager:
                 # 服务端未强化，客户端已强化，需要恢复
                 print("[Client] 同步基地强化状态：恢复原始状态")
                 self.world._restore_base()
+
+        # 3. Sync Walls（在基地强化同步之后应用，确保强化记录的是原始墙体）
+        walls_state = state.get("walls")
+        if walls_state:
+            self._apply_wall_cells(walls_state, force=not state.get("delta"))
         
         # 7. Sync Props
         if hasattr(self.world, 'prop_manager'):
-            # Clear existing props (use empty() for sprite groups)
-            self.world.prop_manager.props.empty()
-            
-            # Recreate props from state
-            from src.items.prop import Prop
-            for prop_data in state.get("props", []):
-                prop = Prop(prop_data["x"], prop_data["y"], prop_data["type"])
-                self.world.prop_manager.props.add(prop)
+            props = self.world.prop_manager.props
+            self._reconcile_entities(props.sprites(), state.get("props", []),
+                                     self._create_prop, self._update_prop, lambda prop: prop.kill(),
+                                     id_attr="prop_id",
+                                     matches=lambda prop, data: prop.type == data["type"])
 
         # 8. Sync Events (for client-side video playback)
         # Add events to world's event queue so they can be consumed by game engine
@@ -578,6 +589,172 @@ class StateManager:
             for event in remote_events:
                 self.world.events.append(event)
 
+    def _apply_wall_cells(self, walls_state: dict, force: bool = False):
+        """把本地墙体与主机类型数组做异或比较，只更新有差异的格子。
+
+        Args:
+            walls_state: 快照中的墙体数据 {"v", "cols", "cells", "ids"}
+            force: 为True（完整快照）时即使版本未变也重新比较，纠正本地偏差
+        """
+        if not force and walls_state.get("v") == self._remote_wall_version:
+            return
+        grid = config.GRID_SIZE
+        cols = max(1, self.world.width // grid)
+        remote = base64.b64decode(walls_state.get("cells", ""))
+        local = pack_wall_cells(self.world, grid)
+        if walls_state.get("cols") != cols or len(remote) != len(local):
+            print(f"[Client] 警告：墙体数组尺寸不匹配 (cols={walls_state.get('cols')}, len={len(remote)})，跳过")
+            return
+        self._remote_wall_version = walls_state.get("v")
+
+        size = len(local)
+        # 每格对应的本地墙体（同格多块时优先活跃墙体）
+        cell_walls = {}
+        for wall in self.world.walls:
+            gx, gy = int(wall.x // grid), int(wall.y // grid)
+            index = gy * cols + gx
+            if 0 <= index < size and (index not in cell_walls or wall.active):
+                cell_walls[index] = wall
+
+        # 对局中生成的墙体使用主机分配的ID，保证后续按 wall_id 的事件指向同一块墙
+        host_ids = {index: wall_id for index, wall_id in walls_state.get("ids", ())}
+        for index, wall_id in host_ids.items():
+            wall = cell_walls.get(index)
+            if wall is not None and wall.wall_id != wall_id:
+                self._rekey_wall(wall, wall_id)
+
+        diff = int.from_bytes(local, "big") ^ int.from_bytes(remote, "big")
+        if not diff:
+            return
+
+        for index, changed in enumerate(diff.to_bytes(size, "big")):
+            if not changed:
+                continue
+            code = remote[index]
+            wall = cell_walls.get(index)
+            if code == 0:
+                if wall:
+                    wall.active = False
+                    wall.visible = False
+            elif wall:
+                wall.set_wall_type(code - 1)
+                wall.active = True
+                wall.visible = True
+            else:
+                # 主机上新生成的墙体（如基地强化的钢墙）
+                wall_id = host_ids.get(index)
+                if wall_id is not None:
+                    self._release_wall_id(wall_id)
+                    self.world.next_wall_id = max(self.world.next_wall_id, wall_id + 1)
+                self.world.spawn_wall((index % cols) * grid, (index // cols) * grid, wall_type=code - 1,
+                                      wall_id=wall_id)
+
+    def _release_wall_id(self, wall_id: int):
+        """主机ID已被本地另一块墙占用时，给那块墙换一个本地新ID。"""
+        other = self.world.wall_id_map.get(wall_id)
+        if other is not None:
+            new_id = max(self.world.next_wall_id, wall_id + 1)
+            self.world.next_wall_id = new_id + 1
+            other.wall_id = new_id
+            self.world.wall_id_map[new_id] = other
+            del self.world.wall_id_map[wall_id]
+
+    def _rekey_wall(self, wall, wall_id: int):
+        """把本地墙体改用主机分配的ID（更新 wall_id_map 并推进本地ID计数器）。"""
+        self._release_wall_id(wall_id)
+        if self.world.wall_id_map.get(wall.wall_id) is wall:
+            del self.world.wall_id_map[wall.wall_id]
+            if wall.wall_id in self.world.runtime_wall_ids:
+                self.world.runtime_wall_ids.discard(wall.wall_id)
+                self.world.runtime_wall_ids.add(wall_id)
+        wall.wall_id = wall_id
+        self.world.wall_id_map[wall_id] = wall
+        self.world.next_wall_id = max(self.world.next_wall_id, wall_id + 1)
+
+    @staticmethod
+    def _reconcile_entities(local_objects, entries, create, update, retire, id_attr: str = "net_id",
+                            matches=None):
+        """按网络ID对齐本地实体：已有的就地更新，新出现的创建，主机上已不存在的移除。
+
+        Args:
+            local_objects: 本地实体列表
+            entries: 快照中的实体数据（带 "nid"）
+            create: 根据数据创建实体的函数
+            update: 就地更新实体的函数 (obj, data)
+            retire: 移除实体的函数
+            id_attr: 实体上保存网络ID的属性名
+            matches: 可选的一致性检查 (obj, data)，不通过时重新创建
+        """
+        previous = list(local_objects)
+        existing = {}
+        for obj in previous:
+            nid = getattr(obj, id_attr, None)
+            if nid is not None:
+                existing[nid] = obj
+        kept = set()
+        for data in entries:
+            obj = existing.get(data.get("nid"))
+            if obj is None or (matches and not matches(obj, data)):
+                create(data)
+            else:
+                update(obj, data)
+                kept.add(id(obj))
+        # 主机上已消失的实体及客户端本地生成的实体（无网络ID）一并移除
+        for obj in previous:
+            if id(obj) not in kept:
+                retire(obj)
+
+    def _create_bullet(self, data: dict):
+        from src.game_engine.bullet import Bullet
+        bullet = Bullet(data["x"], data["y"], data["dir"], owner=self.world.tank_id_map.get(data["owner"]))
+        bullet.net_id = data.get("nid")
+        self.world.add_object(bullet)
+
+    def _update_bullet(self, bullet, data: dict):
+        bullet.x = data["x"]
+        bullet.y = data["y"]
+        bullet.rect.topleft = (bullet.x, bullet.y)
+
+    def _create_explosion(self, data: dict):
+        from src.game_engine.game_world import Explosion
+        exp = Explosion(data["x"] + data["r"], data["y"] + data["r"], data["r"], data["d"])
+        exp.elapsed = data["e"]
+        exp.net_id = data.get("nid")
+        self.world.add_object(exp)
+
+    def _update_explosion(self, exp, data: dict):
+        exp.elapsed = data["e"]
+
+    def _create_star(self, data: dict):
+        from src.game_engine.game_world import Star
+        # Star 构造参数为中心坐标，快照中是左上角坐标（星星宽高为50）
+        star = Star(data["x"] + 25, data["y"] + 25, data["d"])
+        star.elapsed = data["e"]
+        star.net_id = data.get("nid")
+        self.world.add_object(star)
+
+    def _update_star(self, star, data: dict):
+        star.elapsed = data["e"]
+
+    def _create_prop(self, data: dict):
+        self.world.prop_manager.spawn_prop(data["x"], data["y"], data["type"], prop_id=data.get("nid"))
+
+    def _update_prop(self, prop, data: dict):
+        prop.rect.topleft = (data["x"], data["y"])
+
+    def _merge_remote_tanks(self, state: dict) -> Dict[int, Dict]:
+        """合并收到的坦克数据：增量快照中未变化的坦克沿用上次收到的状态。"""
+        if state.get("delta"):
+            for t_data in state.get("tanks", []):
+                self._remote_tank_states[t_data.get("id")] = t_data
+            alive_ids = set(state.get("tank_ids", []))
+            self._remote_tank_states = {
+                tid: t_data for tid, t_data in self._remote_tank_states.items() if tid in alive_ids
+            }
+        else:
+            self._remote_tank_states = {t.get("id"): t for t in state.get("tanks", [])}
+        return dict(self._remote_tank_states)
+
     def _apply_level_effects(self, tank):
         """根据坦克等级应用效果（速度、能力等）"""
         from src.config.game_config import config
@@ -6,6 +6,7 @@ import pygame_gui
 from pygame_gui.elements import UIProgressBar, UILabel, UIPanel
 import math
 
+from src.config.game_config import config
 from src.ui.screen_manager import BaseScreen
 from src.utils.resource_manager import resource_manager
 from src.ui.video_manager import VideoPlaybackController
@@ -131,9 +132,9 @@ class LoadingScreen(BaseScreen):
         """开始加载资源"""
         # 预加载图片和音频资源（如果还没加载）
         if not resource_manager.is_preload_complete():
+            # 线程池在后台解码，update() 中每帧分批完成转换
             print("[Loading] 开始预加载图片和音频资源...")
-            resource_manager.preload_all()
-            print(f"[Loading] 资源预加载完成: loaded={resource_manager._resources_loaded}, progress={resource_manager.get_preload_progress()}")
+            resource_manager.start_preload()
         else:
             # 如果已经加载完成，确保进度是1.0
             if resource_manager.get_preload_progress() < 1.0:
@@ -193,6 +194,9 @@ class LoadingScreen(BaseScreen):
         if self._rotation_angle >= 360.0:
             self._rotation_angle -= 360.0
         
+        # 在帧时间预算内处理已解码的素材
+        resource_manager.pump_preload(config.ASSET_PRELOAD_BUDGET_MS)
+        
         # 检查资源是否真正加载完成
         # 检查资源管理器：如果进度是1.0或状态是"资源加载完成"，认为完成
         resource_progress = resource_manager.get_preload_progress()
@@ -266,6 +270,8 @@ class LoadingScreen(BaseScreen):
             # 模拟进度增长（最多到90%）
             if self._simulated_progress < 0.9:
                 self._simulated_progress = min(0.9, self._simulated_progress + self._simulated_speed * time_delta)
+            # 实际进度超过模拟进度时以实际为准
+            self._simulated_progress = max(self._simulated_progress, resource_progress * 0.6 + video_progress * 0.4)
             
             # 更新进度条
             if self.progress_bar:
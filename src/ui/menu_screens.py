@@ -1,11 +1,14 @@
 # 必须在导入pygame_gui之前初始化i18n
 import src.ui.init_i18n
 
+import random
+
 import pygame
 import pygame_gui
 from pygame_gui.elements import UIButton, UILabel, UISelectionList, UIImage, UITextEntryLine, UIDropDownMenu, UIPanel, UIHorizontalSlider
 from pygame_gui.windows import UIMessageWindow
 
+from src.config.game_config import config
 from src.ui.screen_manager import BaseScreen, ScreenContext
 from src.ui.ui_components import UIManagerWrapper
 from src.utils.resource_manager import resource_manager
@@ -24,9 +27,9 @@ class MainMenuScreen(BaseScreen):
         from src.ui.video_manager import VideoPlaybackController
         import os
         
-        # 预加载图片和音频资源（如果还没加载）
+        # 预加载图片和音频资源（如果还没加载）：后台线程解码，首次取用时补完
         if not resource_manager.is_preload_complete():
-            resource_manager.preload_all()
+            resource_manager.start_preload()
         
         # 初始化并预加载视频资源（如果还没有）
         if not hasattr(self.context, 'video_manager'):
@@ -116,6 +119,10 @@ class MainMenuScreen(BaseScreen):
             elif event.ui_element == self.btn_exit:
                 pygame.event.post(pygame.event.Event(pygame.QUIT))
 
+    def update(self, time_delta: float):
+        # 停留在主菜单时，在帧时间预算内逐步完成资源预加载
+        resource_manager.pump_preload(config.ASSET_PRELOAD_BUDGET_MS)
+
     def render(self):
         self.surface.fill((30, 30, 30))
         # 绘制标题
@@ -481,7 +488,7 @@ class SinglePlayerSetupScreen(BaseScreen):
                 display_name = f"关卡 {level_num}"
                 
                 # 检查地图文件是否存在，不存在则生成
-                if not multiplayer_map_generator.load_multiplayer_map("level", map_name):
+                if not multiplayer_map_generator.has_multiplayer_map("level", map_name):
                     multiplayer_map_generator.generate_level_map(level_num)
                 
                 self.map_names.append(map_name)
@@ -509,18 +516,8 @@ class SinglePlayerSetupScreen(BaseScreen):
                 map_name = map_info["filename"]
                 self.map_names.append(map_name)
                 
-                try:
-                    # Try to get map details
-                    map_data = map_loader.load_map(map_name)
-                    if map_data and 'name' in map_data:
-                        # Add map stats to display name
-                        wall_count = len(map_data.get('walls', []))
-                        display_name = f"{map_data['name']} ({wall_count} 个障碍物)"
-                    else:
-                        display_name = map_info.get("name", map_name.replace(".json", ""))
-                except Exception as e:
-                    print(f"加载地图 {map_name} 时出错: {e}")
-                    display_name = map_info.get("name", map_name.replace(".json", ""))
+                # 名称与障碍物数量来自地图索引，无需逐个解析地图文件
+                display_name = f"{map_info['name']} ({map_info['wall_count']} 个障碍物)"
                 
                 self.map_display_names.append(display_name)
                 self.map_name_mapping[display_name] = map_name
@@ -965,6 +962,12 @@ class RoomScreen(BaseScreen):
         self.remote_ready = False
         self._sent_initial_ready = False
         self._sent_name = False  # 防止重复发送昵称
+        self._pending_game_start = None  # 等待地图分块传输完成的开局消息
+        # 主机：已向客户端宣告的地图（名称、数据、哈希）及客户端回报的状态，地图就绪前不能开局
+        self._offered_map = None
+        self._offered_map_data = None
+        self._offered_map_hash = None
+        self._peer_map_state = None
         
         # 左侧：玩家与准备
         self.left_panel = UIPanel(
@@ -1169,16 +1172,8 @@ class RoomScreen(BaseScreen):
             # map_info是包含地图信息的字典
             map_identifier = map_info["filename"]  # 使用文件名作为唯一标识符
             
-            try:
-                map_data = map_loader.load_map(map_identifier)
-                if map_data and 'name' in map_data:
-                    wall_count = len(map_data.get('walls', []))
-                    display_name = f"{map_data['name']} ({wall_count} 个障碍物)"
-                else:
-                    display_name = map_identifier.replace(".json", "")
-            except Exception as e:
-                print(f"加载地图 {map_identifier} 时出错: {e}")
-                display_name = map_identifier.replace(".json", "")
+            # 名称与障碍物数量来自地图索引，无需逐个解析地图文件
+            display_name = f"{map_info['name']} ({map_info['wall_count']} 个障碍物)"
             
             self.map_names.append(map_identifier)
             self.map_display_names.append(display_name)
@@ -1204,15 +1199,40 @@ class RoomScreen(BaseScreen):
         else:
             status = f"你: {'已准备' if self.local_ready else '未准备'} | 房主: {'已准备' if self.remote_ready else '未准备'}"
         
+        if self.context.is_host and self._offered_map_hash is not None:
+            if self._peer_map_state is True:
+                status += " | 地图: 已同步"
+            elif self._peer_map_state is False:
+                status += " | 地图: 传输失败"
+            else:
+                status += " | 地图: 同步中"
+        
         self.ready_status_label.set_text(status)
         
         # Enable/Disable start button for host
         if self.context.is_host and hasattr(self, 'btn_start'):
-            if self.local_ready and self.remote_ready and self.network_manager.stats.connected:
+            if (self.local_ready and self.remote_ready and self.network_manager.stats.connected
+                    and self._map_ready()):
                 self.btn_start.enable()
             else:
                 self.btn_start.disable()
 
+    def _offer_selected_map(self):
+        """主机向客户端宣告当前所选地图（客户端缺图时在房间内完成分块传输）"""
+        from src.utils.map_loader import map_loader
+        # 始终尝试加载地图数据（包括默认地图），便于客户端缺图时使用
+        self._offered_map = self.selected_map
+        self._offered_map_data = map_loader.load_map(self.selected_map)
+        self._offered_map_hash = self.network_manager.offer_map(self.selected_map, self._offered_map_data)
+        self._peer_map_state = None
+        self._update_ready_status()
+
+    def _map_ready(self) -> bool:
+        """客户端是否已确认收到并保存了当前所选地图（无需传输时视为就绪）"""
+        if self._offered_map != self.selected_map:
+            return False
+        return self._offered_map_hash is None or self._peer_map_state is True
+
     def update(self, time_delta: float):
         super().update(time_delta)
         
@@ -1263,6 +1283,15 @@ class RoomScreen(BaseScreen):
                 
                 # Process network messages (every frame for immediate response)
                 if self.context.is_host:
+                    # 所选地图变化（或刚连上客户端）时重新宣告，并跟踪客户端的地图回报
+                    if self._offered_map != self.selected_map:
+                        self._offer_selected_map()
+                    if self._offered_map_hash is not None:
+                        map_state = self.network_manager.peer_map_state(self._offered_map_hash)
+                        if map_state != self._peer_map_state:
+                            self._peer_map_state = map_state
+                            self._update_ready_status()
+                    
                     # Host: Check for lobby updates from client
                     msgs = self.network_manager.get_inputs()
                     for msg in msgs:
@@ -1309,30 +1338,39 @@ class RoomScreen(BaseScreen):
                             payload = event.get("payload")
                             if payload:
                                 # Game Start!
-                                self.context.enemy_tank_id = payload["p1_tank_id"]
-                                self.context.player_tank_id = payload["p2_tank_id"]
-                                self.context.selected_map = payload.get("map_name", "default")
-                                
-                                # Store map data if provided by host
-                                if "map_data" in payload:
-                                    self.context.received_map_data = payload["map_data"]
-                                    print(f"[Client] 接收到地图数据: {self.context.selected_map}")
-                                else:
-                                    self.context.received_map_data = None
-                                
-                                # Store game mode
-                                self.context.multiplayer_game_mode = payload.get("game_mode", "coop")
-                                self.context.level_number = payload.get("level_number")
-                                
-                                print(f"[Client] 游戏模式: {self.context.multiplayer_game_mode}")
-                                if self.context.level_number:
-                                    print(f"[Client] 关卡编号: {self.context.level_number}")
-                                
-                                self.local_tank_id = self.context.player_tank_id
-                                
-                                # 标记即将进入游戏，避免 on_exit() 断开网络
-                                self.context._leaving_room_for_game = True
-                                self.context.next_state = "game"
+                                if "map_hash" in payload:
+                                    # 主机只发送了地图哈希：先查本地缓存，未命中则等待分块传输
+                                    map_name = payload.get("map_name", "default")
+                                    from src.utils.map_loader import map_loader
+                                    map_data = self.network_manager.map_cache.lookup(
+                                        payload["map_hash"], lambda: map_loader.load_map(map_name))
+                                    self.network_manager.send_map_status(payload["map_hash"], map_data is not None)
+                                    if map_data is None:
+                                        print(f"[Client] 本地无地图 {map_name} 的缓存，等待主机传输")
+                                        self._pending_game_start = payload
+                                        continue
+                                    print(f"[Client] 命中地图缓存: {map_name}")
+                                    payload = dict(payload, map_data=map_data)
+                                self._start_client_game(payload)
+                        
+                        elif event.get("type") == "map_offer":
+                            # 主机预先宣告地图：缓存未命中时请求分块传输，收齐后由网络层回报就绪
+                            payload = event.get("payload") or {}
+                            if payload.get("map_hash"):
+                                map_name = payload.get("map_name", "default")
+                                from src.utils.map_loader import map_loader
+                                map_data = self.network_manager.map_cache.lookup(
+                                    payload["map_hash"], lambda: map_loader.load_map(map_name))
+                                self.network_manager.send_map_status(payload["map_hash"], map_data is not None)
+                                if map_data is None:
+                                    print(f"[Client] 本地无地图 {map_name}，请求主机传输")
+                        
+                        elif event.get("type") == "map_data":
+                            payload = event.get("payload") or {}
+                            pending = self._pending_game_start
+                            if pending and pending.get("map_hash") == payload.get("map_hash"):
+                                self._pending_game_start = None
+                                self._start_client_game(dict(pending, map_data=payload.get("map_data")))
                         
                         elif event.get("type") == "lobby_update":
                             payload = event.get("payload")
@@ -1466,6 +1504,8 @@ class RoomScreen(BaseScreen):
                     # Reset initial ready state flag when disconnected
                     self._sent_initial_ready = False
                     self._sent_name = False
+                    # 重新连接后需要重新宣告地图
+                    self._offered_map = None
                     
                     # Update connection status label if exists
                     if hasattr(self, 'connection_status'):
@@ -1534,6 +1574,37 @@ class RoomScreen(BaseScreen):
         if hasattr(self.context, 'remote_tank_id'):
             delattr(self.context, 'remote_tank_id')
     
+    def _start_client_game(self, payload: dict):
+        """客户端根据 game_start 载荷（已解析出地图数据）进入游戏"""
+        self.context.enemy_tank_id = payload["p1_tank_id"]
+        self.context.player_tank_id = payload["p2_tank_id"]
+        self.context.selected_map = payload.get("map_name", "default")
+        
+        # Store map data if provided by host (or resolved from the map cache)
+        if payload.get("map_data"):
+            self.context.received_map_data = payload["map_data"]
+            print(f"[Client] 接收到地图数据: {self.context.selected_map}")
+        else:
+            self.context.received_map_data = None
+        
+        # Store game mode
+        self.context.multiplayer_game_mode = payload.get("game_mode", "coop")
+        self.context.level_number = payload.get("level_number")
+        
+        # 本局随机种子与同步方式由主机决定
+        self.context.match_seed = payload.get("seed")
+        self.context.lockstep = payload.get("lockstep", False)
+        
+        print(f"[Client] 游戏模式: {self.context.multiplayer_game_mode}")
+        if self.context.level_number:
+            print(f"[Client] 关卡编号: {self.context.level_number}")
+        
+        self.local_tank_id = self.context.player_tank_id
+        
+        # 标记即将进入游戏，避免 on_exit() 断开网络
+        self.context._leaving_room_for_game = True
+        self.context.next_state = "game"
+    
     def handle_event(self, event: pygame.event.Event):
         super().handle_event(event)
         if event.type == pygame_gui.UI_BUTTON_PRESSED:
@@ -1542,13 +1613,13 @@ class RoomScreen(BaseScreen):
                     self.network_manager.stop()
                 self.context.next_state = "lobby"
             elif event.ui_element == self.btn_start:
-                # Host starts game
+                # Host starts game（客户端确认地图已保存之前不允许开局）
+                if not self._map_ready():
+                    print(f"[Host] 客户端尚未收到地图 {self.selected_map}，暂不开局")
+                    return
                 if hasattr(self, 'network_manager'):
-                    # Load map data to send to client
-                    map_data = None
-                    from src.utils.map_loader import map_loader
-                    # 始终尝试加载地图数据（包括默认地图），便于客户端缺图时使用
-                    map_data = map_loader.load_map(self.selected_map)
+                    # 与房间内宣告的地图数据一致，客户端按哈希直接命中缓存
+                    map_data = self._offered_map_data
                     if map_data:
                         print(f"[Host] 发送地图数据: {self.selected_map}")
                     else:
@@ -1565,6 +1636,10 @@ class RoomScreen(BaseScreen):
                         except (IndexError, ValueError):
                             pass
                     
+                    # 主机选取本局随机种子，双方据此生成相同的随机序列
+                    self.context.match_seed = random.getrandbits(32)
+                    self.context.lockstep = config.NETWORK_LOCKSTEP
+                    
                     # Send Game Start with tank IDs, map name, map data, and game mode
                     self.network_manager.send_game_start(
                         self.local_tank_id, 
@@ -1572,7 +1647,9 @@ class RoomScreen(BaseScreen):
                         self.selected_map, 
                         map_data,
                         game_mode=game_mode,
-                        level_number=level_number
+                        level_number=level_number,
+                        seed=self.context.match_seed,
+                        lockstep=self.context.lockstep
                     )
                 
                 # 标记即将进入游戏，避免 on_exit() 断开网络
@@ -1704,7 +1781,7 @@ class RoomScreen(BaseScreen):
                 display_name = f"关卡 {level_num}"
                 
                 # 检查地图文件是否存在，不存在则生成
-                if not multiplayer_map_generator.load_multiplayer_map("level", map_name):
+                if not multiplayer_map_generator.has_multiplayer_map("level", map_name):
                     multiplayer_map_generator.generate_level_map(level_num)
                 
                 self.map_names.append(map_name)
@@ -1734,18 +1811,8 @@ class RoomScreen(BaseScreen):
                 map_name = map_info["filename"]
                 self.map_names.append(map_name)
                 
-                try:
-                    # Try to get map details
-                    map_data = map_loader.load_map(map_name)
-                    if map_data and 'name' in map_data:
-                        # Add map stats to display name
-                        wall_count = len(map_data.get('walls', []))
-                        display_name = f"{map_data['name']} ({wall_count} 个障碍物)"
-                    else:
-                        display_name = map_info.get("name", map_name.replace(".json", ""))
-                except Exception as e:
-                    print(f"加载地图 {map_name} 时出错: {e}")
-                    display_name = map_info.get("name", map_name.replace(".json", ""))
+                # 名称与障碍物数量来自地图索引，无需逐个解析地图文件
+                display_name = f"{map_info['name']} ({map_info['wall_count']} 个障碍物)"
                 
                 self.map_display_names.append(display_name)
                 self.map_name_mapping[display_name] = map_name
@@ -3,13 +3,15 @@ from __future__ import annotations
 # 必须在导入pygame_gui之前初始化i18n
 import src.ui.init_i18n
 
+import importlib
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 
 import pygame
 import pygame_gui
 from pygame_gui.elements import UIButton, UILabel, UIPanel
 
+from src.config.game_config import config
 from src.ui.ui_components import UIManagerWrapper
 
 
@@ -28,6 +30,9 @@ class ScreenContext:
     username: str = "Player"
     remote_username: str = "Player2"  # 联机模式下显示对方名称
     game_mode: str = "single"  # 'single', 'multi', or 'level'
+    match_seed: Optional[int] = None  # 本局随机种子（主机选取，随 game_start 同步）
+    lockstep: bool = False  # 本局是否使用确定性锁步同步
+    game_over_reason: Optional[str] = None  # 对局异常结束的原因（结算界面显示后清除）
     
     # 坦克选择
     player_tank_id: int = 1
@@ -142,7 +147,13 @@ class GameOverScreen(BaseScreen):
         is_level_mode = getattr(self.context, "game_mode", "single") == "level"
         show_next_level = self.game_won and is_level_mode and next_level is not None
         
-        if self.game_won:
+        # 对局异常结束（如锁步联机连接中断）时显示原因，只使用一次
+        reason = self.context.game_over_reason
+        self.context.game_over_reason = None
+        if reason:
+            self.title = "对局中断"
+            self.description = reason
+        elif self.game_won:
             self.title = "恭喜你获胜了！"
             self.description = "你成功击败了所有敌人！"
         else:
@@ -290,6 +301,8 @@ class ScreenManager:
         self.surface = surface
         self.context = ScreenContext()
         self.screens: Dict[str, BaseScreen] = {}
+        # 尚未创建的屏幕：首次 set_state 时才导入模块并构造
+        self._screen_factories: Dict[str, Callable[[], BaseScreen]] = {}
         self.current_state = "menu"
         self.network_manager = network_manager
         self.game_engine = None  # 将由GameEngine设置
@@ -341,7 +354,7 @@ class ScreenManager:
 
     def update(self, requested_state: Optional[str] = None):
         # 计算时间增量
-        time_delta = 1.0 / 60.0
+        time_delta = 1.0 / config.SIMULATION_FPS
         
         # 检查 context 中的状态跳转请求
         if self.context.next_state:
@@ -393,13 +406,13 @@ class ScreenManager:
     # 状态切换与注册
     # ------------------------------------------------------------------ #
     def set_state(self, state: str):
-        if state not in self.screens:
+        if state not in self.screens and state not in self._screen_factories:
             raise ValueError(f"未注册的屏幕状态: {state}")
             
         old_state = self.current_state
         
-        # 退出旧屏幕
-        old_screen = self._get_current_screen()
+        # 退出旧屏幕（只退出已创建的屏幕，不为调用 on_exit 而构造它）
+        old_screen = self.screens.get(old_state)
         if old_screen:
             old_screen.on_exit()
         
@@ -419,57 +432,54 @@ class ScreenManager:
 
     def register_screen(self, state: str, screen: BaseScreen):
         self.screens[state] = screen
+        self._screen_factories.pop(state, None)
+
+    def register_screen_factory(self, state: str, factory: Callable[[], BaseScreen]):
+        """登记延迟创建的屏幕（首次进入该状态时调用 factory 构造）。"""
+        if state not in self.screens:
+            self._screen_factories[state] = factory
+
+    def get_screen(self, state: str) -> Optional[BaseScreen]:
+        """获取屏幕实例，尚未创建时立即创建。"""
+        screen = self.screens.get(state)
+        if screen is None and state in self._screen_factories:
+            screen = self._screen_factories.pop(state)()
+            self.screens[state] = screen
+        return screen
 
     # ------------------------------------------------------------------ #
     # 内部工具
     # ------------------------------------------------------------------ #
+    def _lazy_screen(self, module_name: str, class_name: str, with_network: bool = True) -> Callable[[], BaseScreen]:
+        """按模块名与类名生成屏幕构造函数（调用时才导入模块）。"""
+        def factory() -> BaseScreen:
+            screen_cls = getattr(importlib.import_module(module_name), class_name)
+            if with_network:
+                return screen_cls(self.surface, self.context, self.ui_manager, self.network_manager)
+            return screen_cls(self.surface, self.context, self.ui_manager)
+        return factory
+
     def _init_default_screens(self):
-        # 延迟导入以避免循环依赖
-        from src.ui.menu_screens import (
-            MainMenuScreen, 
-            SinglePlayerSetupScreen, 
-            LobbyScreen, 
-            RoomScreen,
-            LevelSelectScreen,
-            LevelTankSelectScreen,
-            SingleModeSelectScreen,
-            TankSelectScreen,
-            SettingsScreen
-        )
-        from src.ui.map_editor_screen import MapEditorScreen
-        from src.ui.loading_screen import LoadingScreen
-        
-        # 注册加载界面
-        self.register_screen(
-            "loading",
-            LoadingScreen(self.surface, self.context, self.ui_manager)
-        )
-        
-        # 添加游戏结束屏幕
-        self.register_screen(
-            "game_over",
-            GameOverScreen(self.surface, self.context, self.ui_manager)
-        )
-        
-        self.register_screen(
-            "menu",
-            MainMenuScreen(self.surface, self.context, self.ui_manager, self.network_manager)
-        )
-        self.register_screen(
-            "single_setup",
-            SinglePlayerSetupScreen(self.surface, self.context, self.ui_manager, self.network_manager)
-        )
-        self.register_screen(
-            "lobby",
-            LobbyScreen(self.surface, self.context, self.ui_manager, self.network_manager)
-        )
-        self.register_screen(
-            "room",
-            RoomScreen(self.surface, self.context, self.ui_manager, self.network_manager)
-        )
-        self.register_screen(
+        # 只登记构造函数：屏幕模块（地图编辑器、加载界面等）在首次进入时才导入，
+        # 同时避免循环依赖
+        self.register_screen_factory("loading", self._lazy_screen("src.ui.loading_screen", "LoadingScreen", with_network=False))
+        self.register_screen_factory("game_over", lambda: GameOverScreen(self.surface, self.context, self.ui_manager))
+        for state, class_name in (
+            ("menu", "MainMenuScreen"),
+            ("single_setup", "SinglePlayerSetupScreen"),
+            ("lobby", "LobbyScreen"),
+            ("room", "RoomScreen"),
+            ("settings", "SettingsScreen"),
+            ("single_mode_select", "SingleModeSelectScreen"),
+            ("tank_select", "TankSelectScreen"),
+            # 关卡模式相关屏幕
+            ("level_select", "LevelSelectScreen"),
+            ("level_tank_select", "LevelTankSelectScreen"),
+        ):
+            self.register_screen_factory(state, self._lazy_screen("src.ui.menu_screens", class_name))
+        self.register_screen_factory(
             "game",
-            TextScreen(
+            lambda: TextScreen(
                 self.surface,
                 self.context,
                 self.ui_manager,
@@ -478,37 +488,8 @@ class ScreenManager:
                 network_manager=self.network_manager
             ),
         )
-        self.register_screen(
-            "settings",
-            SettingsScreen(
-                self.surface,
-                self.context,
-                self.ui_manager,
-                self.network_manager
-            ),
-        )
-        self.register_screen(
-            "map_editor",
-            MapEditorScreen(self.surface, self.context, self.ui_manager, self.network_manager)
-        )
-        self.register_screen(
-            "single_mode_select",
-            SingleModeSelectScreen(self.surface, self.context, self.ui_manager, self.network_manager)
-        )
-        self.register_screen(
-            "tank_select",
-            TankSelectScreen(self.surface, self.context, self.ui_manager, self.network_manager)
-        )
-        # 关卡模式相关屏幕
-        self.register_screen(
-            "level_select",
-            LevelSelectScreen(self.surface, self.context, self.ui_manager, self.network_manager)
-        )
-        self.register_screen(
-            "level_tank_select",
-            LevelTankSelectScreen(self.surface, self.context, self.ui_manager, self.network_manager)
-        )
+        self.register_screen_factory("map_editor", self._lazy_screen("src.ui.map_editor_screen", "MapEditorScreen"))
 
     def _get_current_screen(self) -> Optional[BaseScreen]:
-        return self.screens.get(self.current_state)
+        return self.get_screen(self.current_state)
 
@@ -1,13 +1,25 @@
 import os
 import threading
 import atexit
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
 
 import pygame
 
+from src.config.game_config import config
+from src.utils.video_cache import MappedFrames, VideoFrameCache
+
+# 单个视频最多解码的帧数（约66秒@15fps），避免异常文件占满内存或长时间解码
+MAX_VIDEO_FRAMES = 1000
+
 
 class VideoAsset:
-    """缓存视频帧与音频，便于在游戏循环中高效播放。"""
+    """缓存视频帧与音频，便于在游戏循环中高效播放。
+
+    流式资源（stream_path 非空）只保存元数据与音频，帧在播放时由 VideoStream 解码；
+    来自磁盘帧缓存的资源（frame_store 非空）按需从内存映射文件构建帧。
+    """
 
     def __init__(
         self,
@@ -16,14 +28,200 @@ class VideoAsset:
         fps: int,
         placeholder: bool = False,
         audio: Optional[pygame.mixer.Sound] = None,
+        stream_path: Optional[str] = None,
+        frame_count: Optional[int] = None,
+        size: Optional[Tuple[int, int]] = None,
+        frame_store: Optional[MappedFrames] = None,
     ):
         self.name = name
         self.frames = frames
         self.fps = max(1, fps)
-        self.placeholder = placeholder or len(frames) <= 1
-        self.duration_ms = int(len(frames) / self.fps * 1000) if frames else 0
-        self.size = frames[0].get_size() if frames else (0, 0)
+        self.stream_path = stream_path
+        self.frame_count = frame_count if frame_count is not None else len(frames)
+        self.placeholder = placeholder or self.frame_count <= 1
+        self.duration_ms = int(self.frame_count / self.fps * 1000) if self.frame_count else 0
+        self.size = size or (frames[0].get_size() if frames else (0, 0))
         self.audio = audio
+        self.frame_store = frame_store
+        self.resident_bytes = self._estimate_resident_bytes()
+
+    @property
+    def streaming(self) -> bool:
+        return self.stream_path is not None
+
+    @property
+    def kind(self) -> str:
+        if self.placeholder:
+            return "placeholder"
+        if self.streaming:
+            return "stream"
+        return "mapped" if self.frame_store is not None else "frames"
+
+    def _estimate_resident_bytes(self) -> int:
+        """估算常驻内存：已解码帧 + 播放时的帧缓冲/当前帧 + 解压后的音频。"""
+        total = sum(f.get_bytesize() * f.get_width() * f.get_height() for f in self.frames)
+        frame_bytes = self.size[0] * self.size[1] * 4
+        if self.streaming:
+            total += frame_bytes * (config.VIDEO_STREAM_BUFFER_FRAMES + 1)
+        elif self.frame_store is not None:
+            total += frame_bytes  # 只有当前帧常驻，其余在内存映射文件中按需换入
+        mixer_init = pygame.mixer.get_init()
+        if self.audio is not None and mixer_init:
+            freq, sample_bits, channels = mixer_init
+            total += int(self.audio.get_length() * freq * channels * abs(sample_bits) // 8)
+        return total
+
+    def release(self):
+        """释放资源占用的内存（被 LRU 淘汰时调用）。"""
+        if self.frame_store is not None:
+            self.frame_store.close()
+            self.frame_store = None
+        self.frames = []
+        self.audio = None
+
+
+class VideoAssetCache(OrderedDict):
+    """按字节计量的 LRU 视频资源表：超出预算时淘汰最久未播放的资源（正在播放的除外）。"""
+
+    def __init__(self, budget_bytes: int):
+        super().__init__()
+        self.budget_bytes = budget_bytes
+        self.total_bytes = 0
+        self.pinned: Optional[str] = None  # 正在播放的资源，不参与淘汰
+        self.evictions = 0
+
+    def __setitem__(self, key: str, asset: VideoAsset):
+        if key in self:
+            self.total_bytes -= self[key].resident_bytes
+        super().__setitem__(key, asset)
+        self.move_to_end(key)
+        self.total_bytes += asset.resident_bytes
+        self._evict()
+
+    def __delitem__(self, key: str):
+        self.total_bytes -= self[key].resident_bytes
+        super().__delitem__(key)
+
+    def pop(self, key: str, *default):
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        asset = self[key]
+        del self[key]
+        return asset
+
+    def clear(self):
+        super().clear()
+        self.total_bytes = 0
+
+    def touch(self, key: str):
+        """标记为最近使用。"""
+        if key in self:
+            self.move_to_end(key)
+
+    def _evict(self):
+        for key in list(self.keys())[:-1]:  # 最新加入的资源保留
+            if self.total_bytes <= self.budget_bytes:
+                break
+            if key == self.pinned:
+                continue
+            asset = self[key]
+            del self[key]
+            asset.release()
+            self.evictions += 1
+            print(f"[Video] 超出内存预算，淘汰 {key} ({asset.resident_bytes // 1024} KB)")
+
+
+class VideoStream:
+    """后台线程解码 + 小环形缓冲区的流式播放。
+
+    解码线程把原始 RGB 帧（bytes）写入最多 capacity 帧的缓冲区，缓冲区满时等待；
+    主线程按播放进度取帧，丢弃已过期的帧，只把当前帧上传为 pygame.Surface。
+    内存占用上限为 capacity × 宽 × 高 × 3 字节，与视频长度无关。
+    """
+
+    def __init__(self, open_frames: Callable[[], Iterable], size: Tuple[int, int],
+                 capacity: int = None, max_frames: int = MAX_VIDEO_FRAMES):
+        """
+        Args:
+            open_frames: 返回 RGB 帧迭代器的函数（在解码线程中调用，帧为 uint8 数组或 bytes）
+            size: 帧尺寸 (宽, 高)
+            capacity: 环形缓冲区帧数，默认 config.VIDEO_STREAM_BUFFER_FRAMES
+            max_frames: 最多解码的帧数
+        """
+        self.size = size
+        self.capacity = max(1, capacity or config.VIDEO_STREAM_BUFFER_FRAMES)
+        self.max_frames = max_frames
+        self.finished = False  # 解码线程已结束
+        self.dropped_frames = 0  # 主线程取帧时跳过的过期帧数
+        self._open_frames = open_frames
+        self._buffer: Deque[Tuple[int, bytes]] = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._surface: Optional[pygame.Surface] = None
+        self._surface_index = -1
+        self._thread = threading.Thread(target=self._decode, name="VideoStream", daemon=True)
+        self._thread.start()
+
+    def _decode(self):
+        frames = None
+        try:
+            frames = self._open_frames()
+            for index, frame in enumerate(frames):
+                if index >= self.max_frames:
+                    break
+                data = bytes(frame)
+                with self._cond:
+                    while len(self._buffer) >= self.capacity and not self._stopped:
+                        self._cond.wait()
+                    if self._stopped:
+                        break
+                    self._buffer.append((index, data))
+                    self._cond.notify_all()
+        except Exception as exc:
+            print(f"[Video] 流式解码出错: {exc}")
+        finally:
+            close = getattr(frames, "close", None)
+            if close:
+                try:
+                    close()
+                except Exception:
+                    pass
+            with self._cond:
+                self.finished = True
+                self._cond.notify_all()
+
+    def buffered(self) -> int:
+        with self._cond:
+            return len(self._buffer)
+
+    def frame(self, index: int) -> Optional[pygame.Surface]:
+        """取第 index 帧（解码落后时返回最近一次上传的帧，开头尚未解码时返回 None）。"""
+        if index == self._surface_index:
+            return self._surface
+        latest = None
+        with self._cond:
+            while self._buffer and self._buffer[0][0] <= index:
+                if latest is not None:
+                    self.dropped_frames += 1
+                latest = self._buffer.popleft()
+            if latest is not None:
+                self._cond.notify_all()
+        if latest is not None:
+            surf = pygame.image.frombuffer(latest[1], self.size, "RGB")
+            self._surface = surf.convert() if pygame.display.get_surface() else surf.copy()
+            self._surface_index = latest[0]
+        return self._surface
+
+    def close(self, timeout: float = 1.0):
+        """停止解码线程并释放缓冲区。"""
+        with self._cond:
+            self._stopped = True
+            self._buffer.clear()
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
 
 
 class VideoInstance:
@@ -44,20 +242,25 @@ class VideoInstance:
         self.position = position
         self.start_ticks = pygame.time.get_ticks()
         self.audio_channel: Optional[pygame.mixer.Channel] = None
+        self.stream: Optional[VideoStream] = None
 
     def is_finished(self, now_ms: int) -> bool:
-        if not self.asset.frames:
+        if not self.asset.frame_count:
             return True
         return now_ms - self.start_ticks >= max(1, self.asset.duration_ms)
 
     def current_frame(self, now_ms: int) -> pygame.Surface:
-        if not self.asset or not self.asset.frames:
+        if not self.asset or not self.asset.frame_count:
             return None
         try:
             elapsed = now_ms - self.start_ticks
-            frame_idx = min(len(self.asset.frames) - 1, int((elapsed / 1000.0) * self.asset.fps))
-            if frame_idx < 0 or frame_idx >= len(self.asset.frames):
+            frame_idx = min(self.asset.frame_count - 1, int((elapsed / 1000.0) * self.asset.fps))
+            if frame_idx < 0:
                 return None
+            if self.stream is not None:
+                return self.stream.frame(frame_idx)
+            if self.asset.frame_store is not None:
+                return self.asset.frame_store.surface(frame_idx)
             return self.asset.frames[frame_idx]
         except Exception as exc:
             print(f"[Video] 获取视频帧时发生错误: {exc}")
@@ -93,10 +296,19 @@ class VideoPlaybackController:
 
     def __init__(self, video_dir: str):
         self.video_dir = video_dir
-        self.assets: Dict[str, VideoAsset] = {}
+        self.assets = VideoAssetCache(config.VIDEO_MEMORY_BUDGET_MB * 1024 * 1024)
+        # 预取提示：在后台加载线程准备资源，主线程 update 中只收取已完成的结果
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._prefetch_futures: Dict[str, Future] = {}
+        # 缩放帧缓存：(源帧, 缩放结果)。视频帧率（15fps）远低于渲染帧率，
+        # 同一源帧与目标尺寸只缩放一次，且复用目标 Surface 避免每次分配
+        self._scaled: Optional[Tuple[pygame.Surface, pygame.Surface]] = None
+        self.scale_count = 0  # 实际执行 smoothscale 的次数（统计用）
         self.active: Optional[VideoInstance] = None
+        # moviepy（连带 NumPy/imageio）导入很重，推迟到第一次真正需要解码时
         self._moviepy = None
         self._moviepy_ready = False
+        self._backend_checked = False
         self._moviepy_error_logged = False
         self.debug = bool(int(os.environ.get("VIDEO_DEBUG", "0")))
         self._preload_started = False
@@ -110,15 +322,25 @@ class VideoPlaybackController:
         self._reload_attempts: Dict[str, int] = {}  # 跟踪每个资源的重试次数
         self._max_reload_attempts = 3  # 最大重试次数
         self._reload_delay = 1.0  # 重试延迟（秒）
-        self._ensure_backend()
+        # 解码帧磁盘缓存（按源文件哈希+大小；未命中时后台生成，下次启动直接映射）
+        self.frame_cache = VideoFrameCache(config.VIDEO_CACHE_DIR) if config.VIDEO_CACHE else None
+        self._cache_keys: Dict[str, str] = {}  # 视频路径 -> 缓存键
+        self._cache_builds = set()  # 已启动生成的缓存键
         # 为视频音频预留混音通道，确保有可用通道
         if pygame.mixer.get_init() and pygame.mixer.get_num_channels() < 16:
             pygame.mixer.set_num_channels(16)
         # 注册清理函数
         atexit.register(self._cleanup_temp_files)
 
+    def _backend_ready(self) -> bool:
+        """moviepy 后端是否可用（首次调用时才导入）。"""
+        if not self._backend_checked:
+            self._ensure_backend()
+        return self._moviepy_ready
+
     def _ensure_backend(self):
         """尝试加载 moviepy 后端，失败则使用占位帧。"""
+        self._backend_checked = True
         try:
             import moviepy as mp
 
@@ -148,6 +370,148 @@ class VideoPlaybackController:
             surface.blit(label, label_rect)
         return surface
 
+    def _load_clip_audio(self, clip, filename: str) -> Optional[pygame.mixer.Sound]:
+        """提取视频音轨为临时 wav 并加载为 pygame Sound（失败或无音轨时返回 None）。"""
+        audio_sound = None
+        tmp_path = None
+        # 尝试提取音频为临时 wav，并加载为 pygame Sound
+        if clip.audio is not None:
+            import tempfile
+
+            try:
+                # 确保 pygame.mixer 已初始化
+                if not pygame.mixer.get_init():
+                    if self.debug:
+                        print(f"[Video] pygame.mixer 未初始化，跳过音频加载")
+                else:
+                    with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmpf:
+                        tmp_path = tmpf.name
+
+                    try:
+                        # 使用 logger=None 来禁用输出
+                        clip.audio.write_audiofile(tmp_path, fps=44100, logger=None)
+                        # 将临时文件路径保存以便后续清理
+                        with self._load_lock:
+                            self._temp_files.append(tmp_path)
+
+                        # 再次检查 mixer 是否可用
+                        if pygame.mixer.get_init():
+                            audio_sound = pygame.mixer.Sound(tmp_path)
+                            if self.debug:
+                                print(f"[Video] Loaded audio for {filename}: {tmp_path}")
+                        else:
+                            if self.debug:
+                                print(f"[Video] pygame.mixer 在加载音频时未初始化，跳过")
+                            # 清理临时文件
+                            if tmp_path and os.path.exists(tmp_path):
+                                try:
+                                    os.unlink(tmp_path)
+                                except Exception:
+                                    pass
+                            tmp_path = None
+                    except Exception as exc:
+                        if self.debug:
+                            print(f"[Video] Audio load failed for {filename}: {exc}")
+                        import traceback
+                        if self.debug:
+                            traceback.print_exc()
+                        # 清理失败的临时文件
+                        if tmp_path and os.path.exists(tmp_path):
+                            try:
+                                os.unlink(tmp_path)
+                            except Exception:
+                                pass
+                        tmp_path = None
+            except Exception as exc:
+                if self.debug:
+                    print(f"[Video] 音频提取准备失败 {filename}: {exc}")
+        return audio_sound
+
+    def _load_cached_asset(self, filename: str, path: str) -> Optional[VideoAsset]:
+        """从解码帧缓存构建资源（未开启缓存或未命中时返回 None）。"""
+        if self.frame_cache is None:
+            return None
+        try:
+            key = self.frame_cache.key_for(path)
+        except OSError:
+            return None
+        self._cache_keys[path] = key
+        frames = self.frame_cache.load(key)
+        if frames is None:
+            return None
+        audio_sound = None
+        audio_path = self.frame_cache.audio_path(key)
+        if audio_path and pygame.mixer.get_init():
+            try:
+                audio_sound = pygame.mixer.Sound(audio_path)
+            except pygame.error as exc:
+                print(f"[Video] 加载缓存音频失败 {filename}: {exc}")
+        if self.debug:
+            print(f"[Video] 使用帧缓存 {filename}: {frames.frame_count} frames @ {frames.fps}fps, size={frames.size}")
+        return VideoAsset(filename, [], frames.fps, audio=audio_sound, frame_count=frames.frame_count,
+                          size=frames.size, frame_store=frames)
+
+    def _schedule_cache_build(self, path: str, fps: int):
+        """缓存未命中时在后台线程生成解码帧缓存（每个源文件每次运行最多一次）。"""
+        key = self._cache_keys.get(path)
+        if self.frame_cache is None or key is None or key in self._cache_builds:
+            return
+        self._cache_builds.add(key)
+        threading.Thread(target=self._build_frame_cache, args=(path, key, fps), daemon=True).start()
+
+    def _build_frame_cache(self, path: str, key: str, fps: int):
+        import tempfile
+
+        source = None
+        audio_tmp = None
+        try:
+            source = self._moviepy.VideoFileClip(path)
+            clip = source
+            max_height = config.VIDEO_CACHE_MAX_HEIGHT
+            if max_height and clip.size[1] > max_height:
+                # moviepy 2.x 为 resized，1.x 为 resize
+                resize = getattr(clip, "resized", None) or getattr(clip, "resize")
+                clip = resize(height=max_height)
+            if clip.audio is not None:
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmpf:
+                    audio_tmp = tmpf.name
+                clip.audio.write_audiofile(audio_tmp, fps=44100, logger=None)
+            if self.frame_cache.store(key, clip.iter_frames(fps=fps, dtype="uint8"), tuple(clip.size), fps,
+                                      audio_path=audio_tmp, max_frames=MAX_VIDEO_FRAMES):
+                print(f"[Video] 已生成帧缓存: {os.path.basename(path)}")
+        except Exception as exc:
+            print(f"[Video] 生成帧缓存失败 {os.path.basename(path)}: {exc}")
+        finally:
+            if source is not None:
+                try:
+                    source.close()
+                except Exception:
+                    pass
+            if audio_tmp and os.path.exists(audio_tmp):
+                try:
+                    os.unlink(audio_tmp)
+                except OSError:
+                    pass
+
+    def _probe_stream_asset(self, filename: str, path: str, fps_limit: int) -> VideoAsset:
+        """读取视频元数据与音轨，构建流式资源（不创建 Surface，可在后台线程调用）。"""
+        clip = self._moviepy.VideoFileClip(path)
+        try:
+            target_fps = min(fps_limit, int(clip.fps) if clip.fps else fps_limit)
+            frame_count = min(MAX_VIDEO_FRAMES, int((clip.duration or 0) * target_fps))
+            size = tuple(clip.size)
+            audio_sound = self._load_clip_audio(clip, filename)
+        finally:
+            try:
+                clip.close()
+            except Exception:
+                pass
+        if self.debug:
+            print(f"[Video] Streaming {filename}: {frame_count} frames @ {target_fps}fps, size={size}")
+        self._schedule_cache_build(path, target_fps)
+        return VideoAsset(filename, [], target_fps, audio=audio_sound,
+                          stream_path=path, frame_count=frame_count, size=size)
+
     def _load_asset(self, filename: str, fps_limit: int = 15) -> VideoAsset:
         # 如果已经加载，检查是否是占位符
         if filename in self.assets:
@@ -208,11 +572,31 @@ class VideoPlaybackController:
             clip = None
 
             # 检查视频文件是否存在
+            cached = self._load_cached_asset(filename, path) if os.path.exists(path) else None
             if not os.path.exists(path):
                 print(f"[Video] 警告：视频文件不存在: {path}")
                 frames.append(self._make_placeholder(filename))
                 placeholder = True
-            elif self._moviepy_ready and os.path.exists(path):
+            elif cached is not None:
+                with self._load_lock:
+                    self.assets[filename] = cached
+                    self._loading_flags.pop(filename, None)
+                    loading_event.set()
+                return cached
+            elif self._backend_ready() and config.VIDEO_STREAMING:
+                # 流式模式：只读取元数据与音频，帧在播放时由后台线程解码
+                try:
+                    asset = self._probe_stream_asset(filename, path, fps_limit)
+                    with self._load_lock:
+                        self.assets[filename] = asset
+                        self._loading_flags.pop(filename, None)
+                        loading_event.set()
+                    return asset
+                except Exception as exc:  # pragma: no cover - 依赖外部环境
+                    print(f"[Video] 读取视频信息失败 {filename}: {exc}")
+                    frames.append(self._make_placeholder(filename))
+                    placeholder = True
+            elif self._backend_ready() and os.path.exists(path):
                 try:
                     clip = self._moviepy.VideoFileClip(path)
                     target_fps = min(fps_limit, int(clip.fps) if clip.fps else fps_limit)
@@ -231,7 +615,7 @@ class VideoPlaybackController:
                                 frame_count += 1
                                 
                                 # 限制最大帧数，避免内存溢出
-                                if frame_count > 1000:  # 约66秒的视频（15fps）
+                                if frame_count > MAX_VIDEO_FRAMES:
                                     if self.debug:
                                         print(f"[Video] 警告：视频帧数过多，截断到 {frame_count} 帧")
                                     break
@@ -248,57 +632,8 @@ class VideoPlaybackController:
                             if self.debug:
                                 print(f"[Video] Loaded {filename}: {len(frames)} frames @ {target_fps}fps, size={frames[0].get_size()}")
 
-                            # 尝试提取音频为临时 wav，并加载为 pygame Sound
-                            if clip.audio is not None:
-                                import tempfile
-
-                                try:
-                                    # 确保 pygame.mixer 已初始化
-                                    if not pygame.mixer.get_init():
-                                        if self.debug:
-                                            print(f"[Video] pygame.mixer 未初始化，跳过音频加载")
-                                    else:
-                                        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmpf:
-                                            tmp_path = tmpf.name
-                                        
-                                        try:
-                                            # 使用 logger=None 来禁用输出
-                                            clip.audio.write_audiofile(tmp_path, fps=44100, logger=None)
-                                            # 将临时文件路径保存以便后续清理
-                                            with self._load_lock:
-                                                self._temp_files.append(tmp_path)
-                                            
-                                            # 再次检查 mixer 是否可用
-                                            if pygame.mixer.get_init():
-                                                audio_sound = pygame.mixer.Sound(tmp_path)
-                                                if self.debug:
-                                                    print(f"[Video] Loaded audio for {filename}: {tmp_path}")
-                                            else:
-                                                if self.debug:
-                                                    print(f"[Video] pygame.mixer 在加载音频时未初始化，跳过")
-                                                # 清理临时文件
-                                                if tmp_path and os.path.exists(tmp_path):
-                                                    try:
-                                                        os.unlink(tmp_path)
-                                                    except Exception:
-                                                        pass
-                                                tmp_path = None
-                                        except Exception as exc:
-                                            if self.debug:
-                                                print(f"[Video] Audio load failed for {filename}: {exc}")
-                                            import traceback
-                                            if self.debug:
-                                                traceback.print_exc()
-                                            # 清理失败的临时文件
-                                            if tmp_path and os.path.exists(tmp_path):
-                                                try:
-                                                    os.unlink(tmp_path)
-                                                except Exception:
-                                                    pass
-                                            tmp_path = None
-                                except Exception as exc:
-                                    if self.debug:
-                                        print(f"[Video] 音频提取准备失败 {filename}: {exc}")
+                            audio_sound = self._load_clip_audio(clip, filename)
+                            self._schedule_cache_build(path, target_fps)
                     except Exception as exc:
                         print(f"[Video] 在主线程中加载视频时发生错误 {filename}: {exc}")
                         import traceback
@@ -397,6 +732,9 @@ class VideoPlaybackController:
                 
                 for idx, cfg in enumerate(config_list):
                     filename = cfg["file"]
+                    if self.assets.total_bytes >= self.assets.budget_bytes:
+                        print("[Video] 已达到视频内存预算，其余视频改为按需加载")
+                        break
                     self._preload_current_file = filename
                     self._preload_progress = (idx + 1) / total if total > 0 else 0.0
                     self._preload_status = f"加载视频: {filename}"
@@ -496,10 +834,16 @@ class VideoPlaybackController:
             包含预加载状态的字典
         """
         total = len(self.DEFAULT_CONFIG)
-        loaded = sum(1 for asset in self.assets.values() if not asset.placeholder)
-        placeholder = sum(1 for asset in self.assets.values() if asset.placeholder)
+        # 后台加载线程会修改资源缓存，在锁内取快照再统计
+        with self._load_lock:
+            assets = list(self.assets.values())
+            resident_bytes = self.assets.total_bytes
+        loaded = sum(1 for asset in assets if not asset.placeholder)
+        placeholder = len(assets) - loaded
         
         return {
+            "resident_bytes": resident_bytes,
+            "budget_bytes": self.assets.budget_bytes,
             "started": self._preload_started,
             "completed": self._preload_completed,
             "total": total,
@@ -527,9 +871,13 @@ class VideoPlaybackController:
 
             filename = cfg["file"]
             
+            # 预取仍在后台进行时等待其完成，避免在主线程重复加载
+            if filename in self._prefetch_futures:
+                self._collect_prefetched(wait_for=filename)
+
             # 安全地加载资源（如果还在加载中，会等待或返回占位符）
             asset = self._load_asset(filename)
-            if not asset or not asset.frames:
+            if not asset or not asset.frame_count:
                 print(f"[Video] 警告：无法加载视频资源 {filename}，跳过播放")
                 return
             
@@ -578,7 +926,11 @@ class VideoPlaybackController:
                 size_ratio=size_ratio if size_ratio is not None else cfg.get("size_ratio", 0.2),
                 position=position,
             )
+            if asset.streaming:
+                instance.stream = self._open_stream(asset)
             self.active = instance
+            self.assets.pinned = filename
+            self.assets.touch(filename)
             # 播放音频
             if asset.audio:
                 try:
@@ -612,11 +964,71 @@ class VideoPlaybackController:
             # 不抛出异常，避免闪退
 
     def update(self, now_ms: Optional[int] = None):
-        """更新播放状态。"""
+        """更新播放状态，并收取已在后台准备好的预取资源。"""
         if not now_ms:
             now_ms = pygame.time.get_ticks()
         if self.active and self.active.is_finished(now_ms):
             self._stop_active()
+        if self._prefetch_futures:
+            self._collect_prefetched()
+
+    def prefetch(self, event_key: str):
+        """预取提示：某个视频可能即将播放（如玩家只剩最后一条命），在后台加载线程提前准备。"""
+        cfg = self.DEFAULT_CONFIG.get(event_key)
+        if not cfg:
+            return
+        filename = cfg["file"]
+        if filename in self.assets:
+            self.assets.touch(filename)
+        elif filename not in self._prefetch_futures:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VideoLoader")
+            self._prefetch_futures[filename] = self._prefetch_executor.submit(self._prepare_prefetch, filename)
+
+    def _prepare_prefetch(self, filename: str, fps_limit: int = 15) -> Optional[VideoAsset]:
+        """后台加载线程：从帧缓存或流式元数据构建资源。
+
+        这两种资源都不在加载时创建 Surface，可以离开主线程准备；文件缺失、moviepy 不可用
+        或关闭流式播放（需在主线程逐帧转换）时返回 None，仍在播放时按需加载。
+        """
+        path = os.path.join(self.video_dir, filename)
+        if not os.path.exists(path):
+            return None
+        cached = self._load_cached_asset(filename, path)
+        if cached is not None:
+            return cached
+        if not config.VIDEO_STREAMING or not self._backend_ready():
+            return None
+        return self._probe_stream_asset(filename, path, fps_limit)
+
+    def _collect_prefetched(self, wait_for: Optional[str] = None):
+        """把已完成的预取结果放入资源缓存（wait_for 指定的文件会等待其完成）。"""
+        for filename, future in list(self._prefetch_futures.items()):
+            if filename != wait_for and not future.done():
+                continue
+            del self._prefetch_futures[filename]
+            try:
+                asset = future.result()
+            except Exception as exc:  # pragma: no cover - 依赖外部环境
+                print(f"[Video] 预取视频失败 {filename}: {exc}")
+                continue
+            if asset is not None:
+                with self._load_lock:
+                    duplicate = filename in self.assets
+                    if not duplicate:
+                        self.assets[filename] = asset
+                if duplicate:
+                    asset.release()  # 已由 play() 等路径加载，释放预取结果持有的帧映射与文件句柄
+
+    def get_memory_report(self) -> List[Dict[str, any]]:
+        """各资源的常驻内存（按最近播放顺序，最久未用在前）。"""
+        with self._load_lock:
+            items = list(self.assets.items())
+        return [
+            {"file": filename, "kind": asset.kind, "bytes": asset.resident_bytes,
+             "frames": asset.frame_count, "playing": filename == self.assets.pinned}
+            for filename, asset in items
+        ]
 
     def _stop_active(self):
         if self.active:
@@ -625,7 +1037,24 @@ class VideoPlaybackController:
                     self.active.audio_channel.stop()
                 except Exception:
                     pass
+            if self.active.stream is not None:
+                self.active.stream.close()
             self.active = None
+            self.assets.pinned = None
+            self.invalidate_scaled_frames()
+
+    def _open_stream(self, asset: VideoAsset) -> VideoStream:
+        """为流式资源启动后台解码。"""
+        path, fps = asset.stream_path, asset.fps
+
+        def open_frames():
+            clip = self._moviepy.VideoFileClip(path)
+            try:
+                yield from clip.iter_frames(fps=fps, dtype="uint8")
+            finally:
+                clip.close()
+
+        return VideoStream(open_frames, asset.size, max_frames=asset.frame_count)
 
     # ------------------------------------------------------------------ #
     # 渲染
@@ -639,8 +1068,7 @@ class VideoPlaybackController:
                 return
             target_rect = self._compute_rect(surface, frame, self.active.size_ratio, self.active.position)
             if target_rect:
-                scaled = pygame.transform.smoothscale(frame, (target_rect.width, target_rect.height))
-                surface.blit(scaled, target_rect.topleft)
+                surface.blit(self._scaled_frame(frame, target_rect.size), target_rect.topleft)
         except Exception as exc:
             if self.debug:
                 print(f"[Video] render_world 错误: {exc}")
@@ -659,13 +1087,32 @@ class VideoPlaybackController:
             else:
                 target_rect = self._compute_rect(surface, frame, self.active.size_ratio, None)
             if target_rect:
-                scaled = pygame.transform.smoothscale(frame, (target_rect.width, target_rect.height))
-                surface.blit(scaled, target_rect.topleft)
+                surface.blit(self._scaled_frame(frame, target_rect.size), target_rect.topleft)
         except Exception as exc:
             if self.debug:
                 print(f"[Video] render_screen 错误: {exc}")
             # 不抛出异常，避免闪退
 
+    def _scaled_frame(self, frame: pygame.Surface, size: Tuple[int, int]) -> pygame.Surface:
+        """缩放后的当前帧（源帧与目标尺寸未变时直接复用上次结果）。"""
+        if frame.get_size() == size:
+            return frame
+        cached = self._scaled
+        if cached is not None and cached[0] is frame and cached[1].get_size() == size:
+            return cached[1]
+        dest = cached[1] if cached is not None and cached[1].get_size() == size else None
+        alpha = frame.get_flags() & pygame.SRCALPHA  # 半透明占位帧缩放后保留透明度
+        if dest is None or dest.get_bitsize() != frame.get_bitsize() or (dest.get_flags() & pygame.SRCALPHA) != alpha:
+            dest = pygame.Surface(size, alpha, frame)
+        pygame.transform.smoothscale(frame, size, dest)
+        self._scaled = (frame, dest)
+        self.scale_count += 1
+        return dest
+
+    def invalidate_scaled_frames(self):
+        """丢弃缩放帧缓存（窗口尺寸变化或播放结束时调用）。"""
+        self._scaled = None
+
     def _compute_rect(
         self, surface: pygame.Surface, frame: pygame.Surface, ratio: float, position: Optional[Tuple[int, int]]
     ) -> Optional[pygame.Rect]:
@@ -7,7 +7,7 @@ from typing import Dict, List, Tuple
 from src.game_engine.wall import Wall
 
 
-def generate_level_map(level: int, map_width: int = 800, map_height: int = 600) -> Dict[str, any]:
+def generate_level_map(level: int, map_width: int = 800, map_height: int = 600, rng=None) -> Dict[str, any]:
     """
     根据关卡生成地图数据
     
@@ -15,10 +15,12 @@ def generate_level_map(level: int, map_width: int = 800, map_height: int = 600)
         level: 当前关卡
         map_width: 地图宽度（像素）
         map_height: 地图高度（像素）
+        rng: 随机数发生器（如 GameWorld.rng），默认使用全局 random
         
     Returns:
         地图数据字典
     """
+    rng = rng or random
     grid_size = 50  # 每个格子的大小
     cols = map_width // grid_size
     rows = map_height // grid_size
@@ -64,7 +66,7 @@ def generate_level_map(level: int, map_width: int = 800, map_height: int = 600)
     # 敌人出生点（最上面一行的随机位置）
     enemy_spawns = []
     for i in range(3):  # 生成3个敌人出生点
-        col = random.randint(1, cols - 2)  # 避免太靠边
+        col = rng.randint(1, cols - 2)  # 避免太靠边
         enemy_spawns.append([col * grid_size, grid_size])  # 最上面一行
     
     # 根据关卡增加墙体数量和难度
@@ -78,8 +80,8 @@ def generate_level_map(level: int, map_width: int = 800, map_height: int = 600)
     while placed_walls < wall_count and attempts < max_attempts:
         attempts += 1
         
-        col = random.randint(0, cols - 1)
-        row = random.randint(1, rows - 2)  # 避免最上面一行（敌人出生区域）和最下面两行（基地区域）
+        col = rng.randint(0, cols - 1)
+        row = rng.randint(1, rows - 2)  # 避免最上面一行（敌人出生区域）和最下面两行（基地区域）
         
         # 跳过玩家和敌人出生点附近
         too_close = False
@@ -105,7 +107,7 @@ def generate_level_map(level: int, map_width: int = 800, map_height: int = 600)
         
         # 随机选择墙体类型（钢墙概率随关卡增加而增加）
         steel_probability = min(0.1 + level * 0.02, 0.3)  # 从10%到30%
-        wall_type = Wall.STEEL if random.random() < steel_probability else Wall.BRICK
+        wall_type = Wall.STEEL if rng.random() < steel_probability else Wall.BRICK
         
         walls.append({
             "x": x,
@@ -117,10 +119,10 @@ def generate_level_map(level: int, map_width: int = 800, map_height: int = 600)
     
     # 随机添加一些草地和河流
     # 草地概率较低
-    grass_count = random.randint(3, 8)
+    grass_count = rng.randint(3, 8)
     for _ in range(grass_count):
-        col = random.randint(0, cols - 1)
-        row = random.randint(1, rows - 2)
+        col = rng.randint(0, cols - 1)
+        row = rng.randint(1, rows - 2)
         
         x = col * grid_size
         y = row * grid_size
@@ -134,10 +136,10 @@ def generate_level_map(level: int, map_width: int = 800, map_height: int = 600)
         })
     
     # 河流概率较低
-    river_count = random.randint(1, 3)
+    river_count = rng.randint(1, 3)
     for _ in range(river_count):
-        col = random.randint(0, cols - 1)
-        row = random.randint(1, rows - 2)
+        col = rng.randint(0, cols - 1)
+        row = rng.randint(1, rows - 2)
         
         x = col * grid_size
         y = row * grid_size
@@ -0,0 +1,97 @@
+"""
+地图内容缓存 - 按内容哈希（sha256）存取联机地图
+
+主机开局时只发送地图哈希，客户端在本地缓存目录和 maps/ 中查找
+内容一致的地图；未命中时主机再分块发送完整地图，客户端收齐校验后写入缓存，
+之后的对局即可直接命中。
+"""
+import base64
+import hashlib
+import json
+import os
+import zlib
+from typing import Callable, Dict, List, Optional
+
+
+def canonical_map_json(map_data: Dict) -> str:
+    """地图数据的规范 JSON 文本（键排序、无多余空白），用于计算哈希。"""
+    return json.dumps(map_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def map_content_hash(map_data: Dict) -> str:
+    """计算地图内容哈希（与字典键顺序、元组/列表差异无关）。"""
+    return hashlib.sha256(canonical_map_json(map_data).encode("utf-8")).hexdigest()
+
+
+def split_map_payload(map_data: Dict, chunk_size: int) -> List[str]:
+    """把地图压缩为 base64 文本并按 chunk_size 字符切块。"""
+    blob = base64.b64encode(zlib.compress(canonical_map_json(map_data).encode("utf-8"), 9)).decode("ascii")
+    return [blob[i:i + chunk_size] for i in range(0, len(blob), chunk_size)] or [""]
+
+
+def join_map_payload(chunks: List[str]) -> Dict:
+    """split_map_payload 的逆操作。"""
+    return json.loads(zlib.decompress(base64.b64decode("".join(chunks))).decode("utf-8"))
+
+
+class MapCache:
+    """以内容哈希为文件名的本地地图缓存（<cache_dir>/<hash>.json）。"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._memory: Dict[str, Dict] = {}
+
+    def _path(self, map_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{map_hash}.json")
+
+    def get(self, map_hash: str) -> Optional[Dict]:
+        """按哈希读取缓存地图；文件缺失或内容与哈希不符时返回 None。"""
+        if map_hash in self._memory:
+            return self._memory[map_hash]
+        path = self._path(map_hash)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                map_data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"[MapCache] 读取缓存地图失败: {e}")
+            return None
+        if map_content_hash(map_data) != map_hash:
+            print(f"[MapCache] 缓存地图校验失败，忽略: {map_hash[:12]}")
+            return None
+        self._memory[map_hash] = map_data
+        return map_data
+
+    def put(self, map_data: Dict) -> str:
+        """写入缓存，返回地图哈希。"""
+        map_hash = map_content_hash(map_data)
+        self._memory[map_hash] = map_data
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(map_hash) + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(canonical_map_json(map_data))
+            os.replace(tmp_path, self._path(map_hash))
+        except IOError as e:
+            print(f"[MapCache] 写入缓存地图失败: {e}")
+        return map_hash
+
+    def lookup(self, map_hash: str, local_loader: Optional[Callable[[], Optional[Dict]]] = None) -> Optional[Dict]:
+        """先查缓存，再用 local_loader 加载本地同名地图并比对哈希。
+
+        Args:
+            map_hash: 主机发送的地图哈希
+            local_loader: 返回本地地图数据的函数（如从 maps/ 加载同名地图）
+
+        Returns:
+            内容一致的地图数据，未命中时返回 None
+        """
+        map_data = self.get(map_hash)
+        if map_data is not None or local_loader is None:
+            return map_data
+        local = local_loader()
+        if local and map_content_hash(local) == map_hash:
+            self.put(local)
+            return local
+        return None
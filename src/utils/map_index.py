@@ -0,0 +1,147 @@
+"""
+地图索引 - 持久化保存地图列表所需的显示信息
+
+地图选择界面只需要名称、尺寸、障碍物数量等少量信息，却要为此完整解析每个地图 JSON。
+索引按文件路径记录 [mtime_ns, 大小] 与这些显示信息，写入 config.MAP_INDEX_PATH：
+
+    {"version": 1, "entries": {"maps/xxx.json": {"stamp": [mtime_ns, size], "meta": {...}}}}
+
+列出目录时只 stat 每个文件，未变化的文件直接使用索引中的信息，
+只有新增或修改过的文件才重新解析；已删除的文件从索引中移除。
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+from src.config.game_config import config
+
+INDEX_VERSION = 1
+
+
+def map_metadata(map_data: Dict, filename: str) -> Dict:
+    """从地图数据中提取列表显示所需的信息。
+
+    Args:
+        map_data: 地图 JSON 数据
+        filename: 地图文件名（缺少 name 字段时用作名称）
+
+    Returns:
+        dict: 显示信息（wall_count 与 MapLoader.load_map 返回的墙体数量一致）
+    """
+    wall_grid_data = map_data.get("wall_grid_data", [])
+    has_base = any(wall.get("type") in (5, "base", "BASE") for wall in wall_grid_data)
+    wall_count = len(wall_grid_data)
+    if not has_base and "base_grid" in map_data:
+        wall_count += 1  # load_map 会把单独的 base_grid 补进墙体列表
+    return {
+        "name": map_data.get("name", filename.replace(".json", "")),
+        "original_width": map_data.get("original_width", 800),
+        "original_height": map_data.get("original_height", 600),
+        "aspect_ratio": map_data.get("aspect_ratio", 4/3),
+        "grid_size": map_data.get("grid_size", config.GRID_SIZE),
+        "wall_count": wall_count,
+        "level_number": map_data.get("level_number"),
+        "difficulty": map_data.get("difficulty", "normal"),
+    }
+
+
+class MapIndex:
+    """按文件 mtime 与大小增量刷新的地图显示信息索引。"""
+
+    def __init__(self, path: Optional[str]):
+        """
+        Args:
+            path: 索引文件路径（None 表示只在内存中缓存）
+        """
+        self.path = path
+        self._entries: Optional[Dict[str, dict]] = None
+        self.parsed = 0  # 累计重新解析的地图文件数
+
+    def _load(self) -> Dict[str, dict]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION and isinstance(data.get("entries"), dict):
+                    self._entries = data["entries"]
+            except (json.JSONDecodeError, IOError, AttributeError) as e:
+                print(f"[MapIndex] 索引文件无效，重新建立: {e}")
+        return self._entries
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": INDEX_VERSION, "entries": self._entries}, f,
+                          ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except IOError as e:
+            print(f"[MapIndex] 写入索引失败: {e}")
+
+    def list_maps(self, maps_dir: str) -> List[Dict]:
+        """列出目录下所有可解析的地图（按文件名排序）。
+
+        Args:
+            maps_dir: 地图目录（不递归子目录）
+
+        Returns:
+            list: 每张地图的显示信息，附加 filename 与 filepath
+        """
+        entries = self._load()
+        prefix = os.path.normpath(maps_dir) + os.sep
+        seen = set()
+        changed = False
+        maps = []
+        try:
+            with os.scandir(maps_dir) as it:
+                files = sorted((entry for entry in it if entry.name.endswith(".json") and entry.is_file()),
+                               key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"获取地图列表时出错: {e}")
+            files = []
+        for entry in files:
+            filepath = os.path.join(maps_dir, entry.name)
+            key = os.path.normpath(filepath)
+            seen.add(key)
+            st = entry.stat()
+            stamp = [st.st_mtime_ns, st.st_size]
+            cached = entries.get(key)
+            if cached is None or cached.get("stamp") != stamp:
+                try:
+                    with open(filepath, 'r', encoding='utf-8') as f:
+                        meta = map_metadata(json.load(f), entry.name)
+                except (json.JSONDecodeError, IOError, UnicodeDecodeError, AttributeError, TypeError) as e:
+                    print(f"加载地图文件 {entry.name} 时出错: {e}")
+                    meta = None  # 同样记录下来，文件未修改前不再重复解析
+                cached = {"stamp": stamp, "meta": meta}
+                entries[key] = cached
+                self.parsed += 1
+                changed = True
+            if cached.get("meta") is not None:
+                maps.append(dict(cached["meta"], filename=entry.name, filepath=filepath))
+        for key in [key for key in entries if key.startswith(prefix) and os.sep not in key[len(prefix):]
+                    and key not in seen]:
+            del entries[key]
+            changed = True
+        if changed:
+            self._save()
+        return maps
+
+
+_shared_index: Optional[MapIndex] = None
+
+
+def get_map_index() -> MapIndex:
+    """全局共享的地图索引（单人地图与联机地图共用同一个索引文件）。"""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = MapIndex(config.MAP_INDEX_PATH)
+    return _shared_index
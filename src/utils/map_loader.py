@@ -6,58 +6,45 @@ import json
 import pygame
 from src.game_engine.wall import Wall
 from src.config.game_config import config
+from src.utils.map_index import get_map_index
 
 
 class MapLoader:
     """地图加载器类 - 支持16:9屏幕比例和动态分辨率"""
     
-    def __init__(self, maps_dir="maps"):
-        """初始化地图加载器"""
+    def __init__(self, maps_dir="maps", map_index=None):
+        """初始化地图加载器
+        
+        Args:
+            maps_dir: 地图目录
+            map_index: 地图索引（None 时使用全局共享索引）
+        """
         self.maps_dir = maps_dir
-        self.maps = []
+        self.map_index = map_index if map_index is not None else get_map_index()
+        # 地图列表在第一次需要时才通过索引获取，导入模块时不再扫描目录
+        self.maps = None
         
         # 确保地图目录存在
         if not os.path.exists(self.maps_dir):
             os.makedirs(self.maps_dir)
-        
-        # 获取可用地图列表
-        self._load_maps_list()
     
     def _load_maps_list(self):
-        """加载可用地图列表"""
-        self.maps = []
-        try:
-            for filename in os.listdir(self.maps_dir):
-                if filename.endswith(".json"):
-                    filepath = os.path.join(self.maps_dir, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            map_data = json.load(f)
-                        
-                        # 获取地图基本信息
-                        map_info = {
-                            "name": map_data.get("name", filename.replace(".json", "")),
-                            "filename": filename,
-                            "filepath": filepath,
-                            "original_width": map_data.get("original_width", 800),
-                            "original_height": map_data.get("original_height", 600),
-                            "aspect_ratio": map_data.get("aspect_ratio", 4/3),
-                            "grid_size": map_data.get("grid_size", config.GRID_SIZE)
-                        }
-                        self.maps.append(map_info)
-                        print(f"加载地图信息: {map_info['name']} ({map_info['original_width']}x{map_info['original_height']})")
-                    except Exception as e:
-                        print(f"加载地图文件 {filename} 时出错: {e}")
-        except Exception as e:
-            print(f"获取地图列表时出错: {e}")
+        """加载可用地图列表（只解析新增或修改过的地图文件）"""
+        self.maps = self.map_index.list_maps(self.maps_dir)
+    
+    def _maps_list(self):
+        """已加载的地图列表，尚未加载时加载一次"""
+        if self.maps is None:
+            self._load_maps_list()
+        return self.maps
     
     def get_available_maps(self):
         """获取所有可用地图的列表
         
         Returns:
-            list: 包含地图信息的字典列表
+            list: 包含地图信息的字典列表（含 wall_count 等显示信息）
         """
-        # 重新加载地图列表以确保最新
+        # 重新加载地图列表以确保最新（未变化的文件直接使用索引）
         self._load_maps_list()
         return self.maps
     
@@ -76,7 +63,7 @@ class MapLoader:
         
         # 查找地图文件
         map_filepath = None
-        for map_info in self.maps:
+        for map_info in self._maps_list():
             if map_info["name"] == map_name or map_info["filename"] == map_name:
                 map_filepath = map_info["filepath"]
                 break
@@ -315,14 +302,10 @@ class MapLoader:
         Returns:
             str: 地图的显示名称
         """
-        try:
-            filepath = os.path.join(self.maps_dir, filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                map_data = json.load(f)
-                return map_data.get("name", filename.replace(".json", ""))
-        except Exception as e:
-            print(f"获取地图显示名称时出错: {e}")
-            return filename.replace(".json", "")
+        for map_info in self._maps_list():
+            if map_info["filename"] == filename:
+                return map_info["name"]
+        return filename.replace(".json", "")
     
     def add_map(self, map_data, filename=None):
         """添加新地图
@@ -368,7 +351,7 @@ class MapLoader:
         try:
             # 查找地图文件
             map_filepath = None
-            for map_info in self.maps:
+            for map_info in self._maps_list():
                 if map_info["name"] == map_name or map_info["filename"] == map_name:
                     map_filepath = map_info["filepath"]
                     break
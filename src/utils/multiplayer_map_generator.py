@@ -17,6 +17,8 @@ class MultiplayerMapGenerator:
         self.maps_dir = maps_dir
         self.map_loader = MapLoader(maps_dir)
         self.grid_size = config.GRID_SIZE
+        # 生成用随机数发生器；各生成方法传入 seed 时可复现同一张地图
+        self.rng = random.Random()
         
         # 确保地图目录存在
         if not os.path.exists(self.maps_dir):
@@ -27,17 +29,21 @@ class MultiplayerMapGenerator:
         if not os.path.exists(self.multiplayer_dir):
             os.makedirs(self.multiplayer_dir)
     
-    def generate_pvp_map(self, map_name: str, width: int = 800, height: int = 600) -> Dict:
+    def generate_pvp_map(self, map_name: str, width: int = 800, height: int = 600, seed: Optional[int] = None) -> Dict:
         """生成对战模式地图
         
         Args:
             map_name: 地图名称
             width: 地图宽度
             height: 地图高度
+            seed: 随机种子（None 时沿用生成器当前的随机状态）
             
         Returns:
             dict: 生成的地图数据
         """
+        if seed is not None:
+            self.rng.seed(seed)
+        
         # 计算网格尺寸
         grid_width = width // self.grid_size
         grid_height = height // self.grid_size
@@ -70,7 +76,7 @@ class MultiplayerMapGenerator:
         return map_data
     
     def generate_coop_map(self, map_name: str, width: int = 800, height: int = 600, 
-                          difficulty: str = "normal") -> Dict:
+                          difficulty: str = "normal", seed: Optional[int] = None) -> Dict:
         """生成合作模式地图
         
         Args:
@@ -78,10 +84,14 @@ class MultiplayerMapGenerator:
             width: 地图宽度
             height: 地图高度
             difficulty: 难度等级 (easy, normal, hard)
+            seed: 随机种子（None 时沿用生成器当前的随机状态）
             
         Returns:
             dict: 生成的地图数据
         """
+        if seed is not None:
+            self.rng.seed(seed)
+        
         # 计算网格尺寸
         grid_width = width // self.grid_size
         grid_height = height // self.grid_size
@@ -143,7 +153,7 @@ class MultiplayerMapGenerator:
         return map_data
     
     def generate_mixed_map(self, map_name: str, width: int = 800, height: int = 600,
-                         difficulty: str = "normal") -> Dict:
+                         difficulty: str = "normal", seed: Optional[int] = None) -> Dict:
         """生成混战模式地图（PvP + AI敌人）
         
         Args:
@@ -151,10 +161,14 @@ class MultiplayerMapGenerator:
             width: 地图宽度
             height: 地图高度
             difficulty: 难度等级 (easy, normal, hard)
+            seed: 随机种子（None 时沿用生成器当前的随机状态）
             
         Returns:
             dict: 生成的地图数据
         """
+        if seed is not None:
+            self.rng.seed(seed)
+        
         # 计算网格尺寸
         grid_width = width // self.grid_size
         grid_height = height // self.grid_size
@@ -200,17 +214,21 @@ class MultiplayerMapGenerator:
         
         return map_data
     
-    def generate_level_map(self, level_number: int, width: int = 800, height: int = 600) -> Dict:
+    def generate_level_map(self, level_number: int, width: int = 800, height: int = 600, seed: Optional[int] = None) -> Dict:
         """生成联机关卡模式地图
         
         Args:
             level_number: 关卡编号
             width: 地图宽度
             height: 地图高度
+            seed: 随机种子（None 时沿用生成器当前的随机状态）
             
         Returns:
             dict: 生成的地图数据
         """
+        if seed is not None:
+            self.rng.seed(seed)
+        
         # 计算网格尺寸
         grid_width = width // self.grid_size
         grid_height = height // self.grid_size
@@ -312,8 +330,8 @@ class MultiplayerMapGenerator:
         for _ in range(obstacle_count):
             attempts = 0
             while attempts < 50:  # 最多尝试50次
-                x = random.randint(1, grid_width - 2)
-                y = random.randint(1, grid_height - 2)
+                x = self.rng.randint(1, grid_width - 2)
+                y = self.rng.randint(1, grid_height - 2)
                 
                 # 检查是否与现有障碍物重叠
                 if (x, y) in positions:
@@ -336,7 +354,7 @@ class MultiplayerMapGenerator:
         
         # 添加障碍物到地图数据
         for x, y in positions:
-            wall_type = random.choice(wall_types)
+            wall_type = self.rng.choice(wall_types)
             map_data["wall_grid_data"].append({
                 "grid_x": x,
                 "grid_y": y,
@@ -410,8 +428,8 @@ class MultiplayerMapGenerator:
         for _ in range(count):
             attempts = 0
             while attempts < 50:
-                x = random.randint(grid_width // 4, 3 * grid_width // 4)
-                y = random.randint(grid_height // 4, 3 * grid_height // 4)
+                x = self.rng.randint(grid_width // 4, 3 * grid_width // 4)
+                y = self.rng.randint(grid_height // 4, 3 * grid_height // 4)
                 
                 # 检查是否与现有出生点重叠
                 if (x, y) in positions:
@@ -480,8 +498,8 @@ class MultiplayerMapGenerator:
             # 模式4: 随机散布的钢墙
             steel_count = min(5 + level_number, 15)
             for _ in range(steel_count):
-                x = random.randint(3, grid_width - 4)
-                y = random.randint(3, grid_height - 4)
+                x = self.rng.randint(3, grid_width - 4)
+                y = self.rng.randint(3, grid_height - 4)
                 map_data["wall_grid_data"].append({
                     "grid_x": x,
                     "grid_y": y,
@@ -523,30 +541,27 @@ class MultiplayerMapGenerator:
         if not os.path.exists(mode_dir):
             return []
         
-        maps = []
-        try:
-            for filename in os.listdir(mode_dir):
-                if filename.endswith(".json"):
-                    filepath = os.path.join(mode_dir, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            map_data = json.load(f)
-                        
-                        map_info = {
-                            "name": map_data.get("name", filename.replace(".json", "")),
-                            "filename": filename,
-                            "filepath": filepath,
-                            "game_mode": game_mode,
-                            "level_number": map_data.get("level_number"),
-                            "difficulty": map_data.get("difficulty", "normal")
-                        }
-                        maps.append(map_info)
-                    except Exception as e:
-                        print(f"加载{game_mode}模式地图文件 {filename} 时出错: {e}")
-        except Exception as e:
-            print(f"获取{game_mode}模式地图列表时出错: {e}")
+        # 通过地图索引获取，只解析新增或修改过的文件
+        return [dict(map_info, game_mode=game_mode) for map_info in self.map_loader.map_index.list_maps(mode_dir)]
+    
+    def _find_multiplayer_map(self, game_mode: str, map_name: str) -> Optional[Dict]:
+        """在索引中查找指定游戏模式的地图信息（按文件名匹配）"""
+        for map_info in self.get_multiplayer_maps(game_mode):
+            if map_info["filename"] == map_name or map_info["filename"] == f"{map_name}.json":
+                return map_info
+        return None
+    
+    def has_multiplayer_map(self, game_mode: str, map_name: str) -> bool:
+        """指定游戏模式的地图是否存在且可以解析（不读取地图内容）
         
-        return maps
+        Args:
+            game_mode: 游戏模式 (pvp, coop, mixed, level)
+            map_name: 地图名称或文件名
+            
+        Returns:
+            bool: 地图是否可用
+        """
+        return self._find_multiplayer_map(game_mode, map_name) is not None
     
     def load_multiplayer_map(self, game_mode: str, map_name: str) -> Optional[Dict]:
         """加载指定游戏模式的地图
@@ -558,23 +573,13 @@ class MultiplayerMapGenerator:
         Returns:
             dict: 地图数据，如果加载失败则返回None
         """
-        mode_dir = os.path.join(self.multiplayer_dir, game_mode)
-        if not os.path.exists(mode_dir):
-            return None
-        
         # 查找地图文件
-        map_filepath = None
-        for filename in os.listdir(mode_dir):
-            if filename.endswith(".json"):
-                if filename == map_name or filename == f"{map_name}.json":
-                    map_filepath = os.path.join(mode_dir, filename)
-                    break
-        
-        if not map_filepath:
+        map_info = self._find_multiplayer_map(game_mode, map_name)
+        if not map_info:
             return None
         
         try:
-            with open(map_filepath, 'r', encoding='utf-8') as f:
+            with open(map_info["filepath"], 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
             print(f"加载{game_mode}模式地图 {map_name} 时出错: {e}")
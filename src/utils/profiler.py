@@ -0,0 +1,195 @@
+"""
+逐帧性能剖析 - 统计 update/render 各阶段耗时
+
+用法：在需要计时的代码外包一层 ``with profiler.section("ai"):``。
+阶段可以嵌套，记录的是自身耗时（扣除内层阶段），各阶段之和不会重复计算。
+未开启时 section() 直接返回一个共享的空上下文，开销只有一次属性判断；
+开启后每个渲染帧结束时调用 end_frame()，各阶段耗时进入滚动窗口
+（config.PROFILER_WINDOW 帧）用于计算 p50/p95/p99，同时写入逐帧轨迹，
+可通过 export() 导出为 CSV 或 JSON。
+
+游戏内：F3 开关剖析叠加层，F4 导出轨迹到 config.PROFILER_TRACE_DIR。
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pygame
+
+from src.config.game_config import config
+
+# 叠加层与导出中的阶段顺序（未列出的阶段按首次出现顺序排在后面）
+PHASES = (
+    "network", "ai", "predictive", "world", "collisions",
+    "state_encode", "state_decode", "video", "ui", "render", "present",
+)
+
+_NULL_SECTION = nullcontext()
+_OVERLAY_REFRESH_FRAMES = 30  # 叠加层每隔多少帧重新计算一次百分位
+
+
+class _Section:
+    __slots__ = ("_profiler", "_name", "_start", "_children_ms")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self._profiler = profiler
+        self._name = name
+        self._children_ms = 0.0
+
+    def __enter__(self):
+        self._profiler._stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        total_ms = (time.perf_counter() - self._start) * 1000
+        stack = self._profiler._stack
+        stack.pop()
+        if stack:
+            stack[-1]._children_ms += total_ms
+        self._profiler.add(self._name, total_ms - self._children_ms)
+        return False
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """已排序序列的百分位（最近秩）。"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class FrameProfiler:
+    """逐帧阶段计时器（全局实例见模块底部的 profiler）。"""
+
+    def __init__(self, window: int = None, trace_frames: int = None):
+        """
+        Args:
+            window: 百分位统计的滚动窗口（帧），默认 config.PROFILER_WINDOW
+            trace_frames: 轨迹最多保留的帧数，默认 config.PROFILER_TRACE_FRAMES
+        """
+        self.window = window or config.PROFILER_WINDOW
+        self.enabled = False
+        self.frame = 0
+        self._current: Dict[str, float] = {}
+        self._stack: List[_Section] = []
+        self._phases: List[str] = list(PHASES)
+        self._samples: Dict[str, Deque[float]] = {}
+        self._frame_ms: Deque[float] = deque(maxlen=self.window)
+        self._trace: Deque[Tuple[int, float, Dict[str, float]]] = deque(maxlen=trace_frames or config.PROFILER_TRACE_FRAMES)
+        self._frame_start = 0.0
+        self._overlay_lines: List[str] = []
+        self._font: Optional[pygame.font.Font] = None
+
+    def set_enabled(self, enabled: bool):
+        """开启/关闭计时（开启时清空上一轮统计）。"""
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def reset(self):
+        self.frame = 0
+        self._current.clear()
+        self._stack.clear()
+        self._samples.clear()
+        self._frame_ms.clear()
+        self._trace.clear()
+        self._overlay_lines = []
+        self._frame_start = time.perf_counter()
+
+    def section(self, name: str):
+        """计时上下文；未开启时返回空上下文。"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def add(self, name: str, ms: float):
+        """累加当前帧某阶段耗时（同一帧内多次进入同一阶段时求和）。"""
+        self._current[name] = self._current.get(name, 0.0) + ms
+
+    def end_frame(self):
+        """结束一个渲染帧：写入滚动窗口与轨迹。"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        frame_ms = (now - self._frame_start) * 1000
+        self._frame_start = now
+        self._frame_ms.append(frame_ms)
+        for name, ms in self._current.items():
+            if name not in self._samples:
+                self._samples[name] = deque(maxlen=self.window)
+                if name not in self._phases:
+                    self._phases.append(name)
+        # 本帧未出现的阶段记 0，保证各阶段窗口对齐
+        for name, samples in self._samples.items():
+            samples.append(self._current.get(name, 0.0))
+        self._trace.append((self.frame, frame_ms, self._current))
+        self._current = {}
+        self.frame += 1
+
+    def phases(self) -> List[str]:
+        return [name for name in self._phases if name in self._samples]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """滚动窗口内各阶段及整帧耗时的 p50/p95/p99（毫秒）。"""
+        result = {}
+        for name, samples in [("frame", self._frame_ms)] + [(p, self._samples[p]) for p in self.phases()]:
+            ordered = sorted(samples)
+            result[name] = {
+                "p50": percentile(ordered, 0.50),
+                "p95": percentile(ordered, 0.95),
+                "p99": percentile(ordered, 0.99),
+            }
+        return result
+
+    def export(self, path: str) -> str:
+        """导出逐帧轨迹（扩展名为 .json 时写 JSON，否则写 CSV），返回路径。"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        phases = self.phases()
+        if path.endswith(".json"):
+            data = {
+                "phases": phases,
+                "summary": self.summary(),
+                "frames": [dict(frame=frame, frame_ms=round(frame_ms, 4),
+                                **{p: round(times.get(p, 0.0), 4) for p in phases})
+                           for frame, frame_ms, times in self._trace],
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        else:
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "frame_ms"] + phases)
+                for frame, frame_ms, times in self._trace:
+                    writer.writerow([frame, f"{frame_ms:.4f}"] + [f"{times.get(p, 0.0):.4f}" for p in phases])
+        return path
+
+    def export_default(self) -> str:
+        """按时间戳导出到 config.PROFILER_TRACE_DIR。"""
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        return self.export(os.path.join(config.PROFILER_TRACE_DIR, f"profile_{stamp}.{config.PROFILER_TRACE_FORMAT}"))
+
+    def render_overlay(self, screen):
+        """在屏幕右上角绘制各阶段百分位（每隔若干帧刷新一次文本）。"""
+        if not self.enabled:
+            return
+        if not self._overlay_lines or self.frame % _OVERLAY_REFRESH_FRAMES == 0:
+            lines = [f"{'phase':<13}{'p50':>7}{'p95':>7}{'p99':>7}"]
+            for name, stats in self.summary().items():
+                lines.append(f"{name:<13}{stats['p50']:>7.2f}{stats['p95']:>7.2f}{stats['p99']:>7.2f}")
+            self._overlay_lines = lines
+        if self._font is None:
+            self._font = pygame.font.SysFont("consolas", 14)
+        x = screen.get_width() - 260
+        for idx, text in enumerate(self._overlay_lines):
+            surface = self._font.render(text, True, (255, 255, 0), (0, 0, 0))
+            screen.blit(surface, (x, 5 + idx * 16))
+
+
+# 全局剖析器实例
+profiler = FrameProfiler()
@@ -2,9 +2,23 @@
 资源管理器 - 统一管理游戏中的所有图片和音频资源
 """
 import os
+import re
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pygame
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from src.config.game_config import config
+from src.utils.sprite_cache import SpriteCache
+from src.utils.texture_atlas import TextureAtlas
+
+# 坦克动画帧文件名：p1_0_1.png -> (p, 1, 0, 1)，依次为类型前缀、皮肤、等级、帧
+_TANK_FRAME_RE = re.compile(r"^([pe])(\d+)_(\d+)_(\d+)\.png$")
+
+# 坦克方向与由向上的原图得到该方向所需的旋转角度：上、右、下、左
+_TANK_ROTATIONS = ((0, 0), (1, -90), (2, 180), (3, 90))
 
 
 class ResourceManager:
@@ -12,6 +26,17 @@ class ResourceManager:
     
     _instance = None
     
+    SOUND_FILES = {
+        "boom": "boom.wav",
+        # "bullet_destroy": "bullet.destroy.wav",  # 格式不兼容，已移除
+        "enemy_move": "enemy.move.wav",
+        "fire": "fire.wav",
+        "player_move": "player.move.wav",
+        "player_idle": "玩家原地待机音效.mp3",
+        "start": "start.wav",
+        "brick_destroy": "砖块消除.wav",
+    }
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -38,6 +63,11 @@ class ResourceManager:
         self.shield_frames: List[pygame.Surface] = []
         self.river_shield_image: Optional[pygame.Surface] = None
         self.star_frames: List[pygame.Surface] = []
+        self.bullet_images: Dict[int, pygame.Surface] = {}  # 方向 -> 旋转后的子弹图片
+        self.prop_images: Dict[int, pygame.Surface] = {}  # 道具类型 -> 缩放后的图片（所有道具共享）
+        
+        # 纹理图集（预加载完成后打包，渲染时按层批量绘制）
+        self.atlas = TextureAtlas()
         
         # 音频缓存
         self.sounds: Dict[str, pygame.mixer.Sound] = {}
@@ -46,65 +76,248 @@ class ResourceManager:
         self._resources_loaded = False
         self._preload_progress = 0.0  # 预加载进度 (0.0 - 1.0)
         self._preload_status = ""  # 预加载状态文本
-        self._preload_total_steps = 7  # 总加载步骤数
-        self._preload_current_step = 0  # 当前加载步骤
+        # 并行预加载：线程池解码，主线程分批转换
+        self._preload_executor: Optional[ThreadPoolExecutor] = None
+        self._preload_jobs = None  # deque[((类别, 键, 路径), Future)]
+        self._preload_total = 0
+        self._preload_done = 0
+        self._pending_frames: Dict[str, Dict[int, pygame.Surface]] = {}
+        self._pending_tank_frames: Dict[Tuple[str, int, int], Dict[int, List[pygame.Surface]]] = {}
+        
+        # 缩放/旋转结果的磁盘缓存
+        self.sprite_cache = SpriteCache(config.SPRITE_CACHE_PATH, self.base_path)
+        self._sprite_records: List[Tuple[str, str, str, pygame.Surface]] = []
+        self._sprite_cache_misses = 0
     
     def _ensure_resources_loaded(self):
-        """确保资源已加载（延迟加载）"""
+        """确保资源已加载（延迟加载；预加载进行中时同步完成剩余部分）"""
         if not self._resources_loaded:
-            self._load_all_resources()
-            self._resources_loaded = True
+            self.preload_all()
     
-    def _load_all_resources(self):
-        """加载所有游戏资源"""
-        try:
-            self._preload_current_step = 0
-            self._preload_progress = 0.0
-            self._preload_status = "加载墙体图片..."
-            self._load_wall_images()
-            self._preload_current_step = 1
-            self._preload_progress = 1.0 / self._preload_total_steps
-            
-            self._preload_status = "加载子弹图片..."
-            self._load_bullet_image()
-            self._preload_current_step = 2
-            self._preload_progress = 2.0 / self._preload_total_steps
-            
-            self._preload_status = "加载爆炸动画..."
-            self._load_explosion_frames()
-            self._preload_current_step = 3
-            self._preload_progress = 3.0 / self._preload_total_steps
-            
-            self._preload_status = "加载护盾动画..."
-            self._load_shield_frames()
-            self._preload_current_step = 4
-            self._preload_progress = 4.0 / self._preload_total_steps
-            
-            self._preload_status = "加载河流护盾..."
-            self._load_river_shield_image()
-            self._preload_current_step = 5
-            self._preload_progress = 5.0 / self._preload_total_steps
-            
-            self._preload_status = "加载星星动画..."
-            self._load_star_frames()
-            self._preload_current_step = 6
-            self._preload_progress = 6.0 / self._preload_total_steps
-            
-            self._preload_status = "加载音频文件..."
-            self._load_sounds()
-            self._preload_current_step = 7
-            self._preload_progress = 1.0
-            self._preload_status = "资源加载完成"
-            print("✓ 游戏资源加载完成")
-        except Exception as e:
-            print(f"⚠ 加载资源时出错: {e}")
-            self._preload_status = f"加载出错: {e}"
+    def _collect_preload_jobs(self) -> List[Tuple[str, object, str]]:
+        """列出所有需要预加载的素材 (类别, 键, 路径)，包括全部坦克皮肤与等级。"""
+        images_path = os.path.join(self.base_path, "images")
+        jobs = []
+        for i in range(6):
+            jobs.append(("wall", i, os.path.join(images_path, "walls", f"{i}.png")))
+        jobs.append(("bullet", None, os.path.join(images_path, "bullet", "bullet.png")))
+        for i in range(1, 9):
+            jobs.append(("explosion", i, os.path.join(images_path, "boom", f"blast{i}.gif")))
+        for i in range(2):
+            jobs.append(("shield", i, os.path.join(images_path, "born_shield", f"bornShield{i}.png")))
+        jobs.append(("river_shield", None, os.path.join(images_path, "river_shield", "river_shield.png")))
+        for i in range(4):
+            jobs.append(("star", i, os.path.join(images_path, "star", f"star{i}.png")))
+        for i in range(1, 9):
+            jobs.append(("prop", i, os.path.join(images_path, "props", f"prop{i}.png")))
+        for key, filename in self.SOUND_FILES.items():
+            jobs.append(("sound", key, os.path.join(self.base_path, "musics", filename)))
+        
+        # 坦克图片：tank_images/<palyer|enemy>/<p1|e1>/<p1_0>/p1_0_<帧>.png
+        for tank_type, folder_name in (("player", "palyer"), ("enemy", "enemy")):
+            root = os.path.join(self.base_path, "tank_images", folder_name)
+            for dirpath, _, filenames in sorted(os.walk(root)):
+                for name in sorted(filenames):
+                    match = _TANK_FRAME_RE.match(name)
+                    if match:
+                        tank_id, level, frame = (int(g) for g in match.groups()[1:])
+                        jobs.append(("tank", (tank_type, tank_id, level, frame), os.path.join(dirpath, name)))
+        return [job for job in jobs if os.path.exists(job[2])]
+    
+    @staticmethod
+    def _decode_asset(kind: str, path: str):
+        """工作线程：解码图片 / 音频（不涉及显示格式转换）。"""
+        if kind == "sound":
+            return pygame.mixer.Sound(path)
+        return pygame.image.load(path)
+    
+    @staticmethod
+    def _sprite_outputs(kind: str, key) -> List[Tuple[str, str]]:
+        """图片素材处理后产生的表面 [(缓存条目名, 处理参数)]，顺序与 _process_image 一致。"""
+        if kind == "wall":
+            return [(f"wall_{key}", "scale=50x50")]
+        if kind == "shield":
+            return [(f"shield_{key}", "scale=30x30")]
+        if kind == "river_shield":
+            return [("river_shield", "scale=30x30")]
+        if kind == "prop":
+            return [(f"prop_{key}", f"scale={config.PROP_WIDTH}x{config.PROP_HEIGHT}")]
+        if kind == "tank":
+            prefix = "tank_%s_%d_%d_%d" % key
+            return [(f"{prefix}_{direction}", f"scale=30x30,rotate={angle}")
+                    for direction, angle in _TANK_ROTATIONS]
+        return [(kind if key is None else f"{kind}_{key}", "raw")]
+    
+    def _process_image(self, kind: str, img: pygame.Surface) -> List[pygame.Surface]:
+        """主线程：转换像素格式并缩放/旋转。"""
+        img = img.convert_alpha()
+        if kind == "wall":
+            # 缩放到50x50
+            return [pygame.transform.scale(img, (50, 50))]
+        if kind in ("shield", "river_shield"):
+            # 缩放到30x30以匹配坦克大小
+            return [pygame.transform.scale(img, (30, 30))]
+        if kind == "prop":
+            return [pygame.transform.scale(img, (config.PROP_WIDTH, config.PROP_HEIGHT))]
+        if kind == "tank":
+            rotated = self._rotate_tank_frames([pygame.transform.scale(img, (30, 30))])
+            return [rotated[direction][0] for direction, _ in _TANK_ROTATIONS]
+        return [img]
+    
+    def _store_image(self, kind: str, key, surfaces: List[pygame.Surface]):
+        """把处理后的表面放入对应的缓存。"""
+        if kind == "wall":
+            self.images[f"wall_{key}"] = surfaces[0]
+        elif kind == "bullet":
+            self.images["bullet"] = surfaces[0]
+        elif kind == "river_shield":
+            self.river_shield_image = surfaces[0]
+        elif kind == "prop":
+            self.prop_images[key] = surfaces[0]
+        elif kind == "tank":
+            tank_type, tank_id, level, frame = key
+            self._pending_tank_frames.setdefault((tank_type, tank_id, level), {})[frame] = surfaces
+        else:
+            self._pending_frames.setdefault(kind, {})[key] = surfaces[0]
+    
+    def _record_sprites(self, kind: str, key, path: str, surfaces: List[pygame.Surface]):
+        """记录处理结果，预加载结束时写入磁盘缓存。"""
+        for (name, op), surface in zip(self._sprite_outputs(kind, key), surfaces):
+            self._sprite_records.append((name, path, op, surface))
+    
+    def _sprites_cached(self, kind: str, key, path: str) -> bool:
+        """磁盘缓存中是否有该素材全部最新的处理结果（只比对索引，不构建表面）。"""
+        return kind != "sound" and all(
+            self.sprite_cache.contains(name, path, op) for name, op in self._sprite_outputs(kind, key)
+        )
+    
+    def _load_cached_sprites(self, kind: str, key, path: str) -> bool:
+        """尝试从磁盘缓存取出素材的全部处理结果，成功时直接放入缓存。"""
+        if kind == "sound":
+            return False
+        surfaces = []
+        for name, op in self._sprite_outputs(kind, key):
+            surface = self.sprite_cache.get(name, path, op)
+            if surface is None:
+                return False
+            surfaces.append(surface)
+        self._store_image(kind, key, surfaces)
+        self._record_sprites(kind, key, path, surfaces)
+        return True
+    
+    def _finalize_asset(self, kind: str, key, data, path: str):
+        """主线程：转换像素格式、缩放并放入缓存（音效已在工作线程解码）。"""
+        if kind == "sound":
+            # 预加载完成前已被 play_sound 单独加载的音效保持不变
+            self.sounds.setdefault(key, data)
+            return
+        surfaces = self._process_image(kind, data)
+        self._store_image(kind, key, surfaces)
+        self._record_sprites(kind, key, path, surfaces)
+        self._sprite_cache_misses += 1
+    
+    def _finish_preload(self):
+        """全部素材处理完毕：按编号整理动画帧，生成坦克四方向图片。"""
+        for kind, target in (("explosion", self.explosion_frames),
+                             ("shield", self.shield_frames),
+                             ("star", self.star_frames)):
+            frames = self._pending_frames.get(kind, {})
+            target[:] = [frames[i] for i in sorted(frames)]
+        for (tank_type, tank_id, level), frames in self._pending_tank_frames.items():
+            cache_key = f"{tank_type}_{tank_id}_{level}"
+            if cache_key not in self.tank_images:
+                ordered = [frames[i] for i in sorted(frames)]
+                self.tank_images[cache_key] = {
+                    direction: [surfaces[index] for surfaces in ordered]
+                    for index, (direction, _) in enumerate(_TANK_ROTATIONS)
+                }
+        bullet = self.images.get("bullet")
+        if bullet is not None:
+            self.bullet_images = {
+                0: bullet,
+                1: pygame.transform.rotate(bullet, -90),
+                2: pygame.transform.rotate(bullet, 180),
+                3: pygame.transform.rotate(bullet, 90),
+            }
+        self._pending_frames.clear()
+        self._pending_tank_frames.clear()
+        if config.SPRITE_CACHE and self._sprite_cache_misses and self.sprite_cache.save(self._sprite_records):
+            print(f"[SpriteCache] 已写入 {len(self._sprite_records)} 张处理后的图片: {self.sprite_cache.path}")
+        self._sprite_records = []
+        if config.ATLAS_ENABLED:
+            self.build_atlas()
+        if self._preload_executor is not None:
+            self._preload_executor.shutdown(wait=False)
+            self._preload_executor = None
+        self._preload_jobs = None
+        self._resources_loaded = True
+        self._preload_progress = 1.0
+        self._preload_status = "资源加载完成"
+        print(f"✓ 游戏资源加载完成（{self._preload_total} 个素材）")
+    
+    def start_preload(self):
+        """开始并行预加载：图片解码与音频读取提交到线程池，立即返回。"""
+        if self._resources_loaded or self._preload_jobs is not None:
+            return
+        jobs = self._collect_preload_jobs()
+        self._preload_total = len(jobs)
+        self._sprite_records = []
+        self._sprite_cache_misses = 0
+        self._preload_done = 0
+        self._preload_progress = 0.0
+        self._preload_status = "加载素材..."
+        cache_loaded = config.SPRITE_CACHE and self.sprite_cache.load() > 0
+        self._preload_executor = ThreadPoolExecutor(max_workers=max(1, config.ASSET_LOADER_THREADS),
+                                                    thread_name_prefix="AssetLoader")
+        # 磁盘缓存命中的图片不进线程池（Future 为 None），由 pump_preload 直接取处理后的像素
+        self._preload_jobs = deque(
+            (job, None if cache_loaded and self._sprites_cached(*job)
+             else self._preload_executor.submit(self._decode_asset, job[0], job[2]))
+            for job in jobs
+        )
+    
+    def pump_preload(self, budget_ms: Optional[float] = None) -> bool:
+        """在主线程分批处理已解码的素材（每帧调用）。
+        
+        Args:
+            budget_ms: 本次最多占用的时间（毫秒）；None 表示阻塞直到全部完成
+        
+        Returns:
+            是否已全部加载完成
+        """
+        if self._resources_loaded:
+            return True
+        if self._preload_jobs is None:
+            self.start_preload()
+        deadline = time.perf_counter() + budget_ms / 1000.0 if budget_ms is not None else None
+        jobs = self._preload_jobs
+        while jobs:
+            (kind, key, path), future = jobs[0]
+            if deadline is not None and future is not None and not future.done():
+                break
+            jobs.popleft()
+            try:
+                if future is None:
+                    if not self._load_cached_sprites(kind, key, path):
+                        self._finalize_asset(kind, key, self._decode_asset(kind, path), path)
+                else:
+                    self._finalize_asset(kind, key, future.result(), path)
+            except Exception as e:
+                print(f"⚠ 加载素材失败 {path}: {e}")
+            self._preload_done += 1
+            self._preload_progress = min(0.99, self._preload_done / max(1, self._preload_total))
+            self._preload_status = f"加载素材 ({self._preload_done}/{self._preload_total})..."
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+        if not jobs:
+            self._finish_preload()
+        return self._resources_loaded
     
     def preload_all(self):
-        """预加载所有资源（同步）"""
+        """预加载所有资源（阻塞，解码仍在线程池中并行进行）"""
         if not self._resources_loaded:
-            self._load_all_resources()
-            self._resources_loaded = True
+            self.start_preload()
+            self.pump_preload()
     
     def get_preload_progress(self) -> float:
         """获取预加载进度 (0.0 - 1.0)"""
@@ -118,78 +331,27 @@ class ResourceManager:
         """检查预加载是否完成"""
         return self._resources_loaded and self._preload_progress >= 1.0
     
-    def _load_wall_images(self):
-        """加载墙体图片"""
-        walls_path = os.path.join(self.base_path, "images", "walls")
-        for i in range(6):
-            img_path = os.path.join(walls_path, f"{i}.png")
-            if os.path.exists(img_path):
-                img = pygame.image.load(img_path).convert_alpha()
-                # 缩放到50x50
-                self.images[f"wall_{i}"] = pygame.transform.scale(img, (50, 50))
-    
-    def _load_bullet_image(self):
-        """加载子弹图片"""
-        bullet_path = os.path.join(self.base_path, "images", "bullet", "bullet.png")
-        if os.path.exists(bullet_path):
-            self.images["bullet"] = pygame.image.load(bullet_path).convert_alpha()
-    
-    def _load_explosion_frames(self):
-        """加载爆炸动画帧"""
-        boom_path = os.path.join(self.base_path, "images", "boom")
-        for i in range(1, 9):
-            img_path = os.path.join(boom_path, f"blast{i}.gif")
-            if os.path.exists(img_path):
-                self.explosion_frames.append(pygame.image.load(img_path).convert_alpha())
+    def build_atlas(self) -> int:
+        """把已加载的精灵图片打包进纹理图集，返回入集数量。"""
+        surfaces = list(self.images.values()) + list(self.bullet_images.values()) + list(self.prop_images.values())
+        surfaces += self.explosion_frames + self.shield_frames + self.star_frames
+        if self.river_shield_image is not None:
+            surfaces.append(self.river_shield_image)
+        for directions in self.tank_images.values():
+            for frames in directions.values():
+                surfaces.extend(frames)
+        self.atlas.clear()
+        packed = self.atlas.add_many(surfaces)
+        print(f"✓ 纹理图集: {packed} 张图片, {len(self.atlas.pages)} 页")
+        return packed
     
-    def _load_shield_frames(self):
-        """加载护盾动画帧"""
-        shield_path = os.path.join(self.base_path, "images", "born_shield")
-        for i in range(2):
-            img_path = os.path.join(shield_path, f"bornShield{i}.png")
-            if os.path.exists(img_path):
-                img = pygame.image.load(img_path).convert_alpha()
-                # 缩放到30x30以匹配坦克大小
-                img = pygame.transform.scale(img, (30, 30))
-                self.shield_frames.append(img)
-    
-    def _load_river_shield_image(self):
-        """加载河流护盾图片"""
-        img_path = os.path.join(self.base_path, "images", "river_shield", "river_shield.png")
-        if os.path.exists(img_path):
-            img = pygame.image.load(img_path).convert_alpha()
-            # 缩放到30x30以匹配坦克大小
-            self.river_shield_image = pygame.transform.scale(img, (30, 30))
-
-    def _load_star_frames(self):
-        """加载星星动画帧（敌人生成特效）"""
-        star_path = os.path.join(self.base_path, "images", "star")
-        for i in range(4):
-            img_path = os.path.join(star_path, f"star{i}.png")
-            if os.path.exists(img_path):
-                self.star_frames.append(pygame.image.load(img_path).convert_alpha())
-    
-    def _load_sounds(self):
-        """加载音频文件"""
-        musics_path = os.path.join(self.base_path, "musics")
-        sound_files = {
-            "boom": "boom.wav",
-            # "bullet_destroy": "bullet.destroy.wav",  # 格式不兼容，已移除
-            "enemy_move": "enemy.move.wav",
-            "fire": "fire.wav",
-            "player_move": "player.move.wav",
-            "player_idle": "玩家原地待机音效.mp3",
-            "start": "start.wav",
-            "brick_destroy": "砖块消除.wav",
+    @staticmethod
+    def _rotate_tank_frames(frames: List[pygame.Surface]) -> Dict[int, List[pygame.Surface]]:
+        """由向上的动画帧生成4个方向的版本。"""
+        return {
+            direction: [f if angle == 0 else pygame.transform.rotate(f, angle) for f in frames]
+            for direction, angle in _TANK_ROTATIONS
         }
-        
-        for key, filename in sound_files.items():
-            sound_path = os.path.join(musics_path, filename)
-            if os.path.exists(sound_path):
-                try:
-                    self.sounds[key] = pygame.mixer.Sound(sound_path)
-                except Exception as e:
-                    print(f"无法加载音频 {filename}: {e}")
     
     def load_tank_images(self, tank_type: str, tank_id: int, level: int = 0) -> Dict[int, List[pygame.Surface]]:
         """
@@ -208,8 +370,6 @@ class ResourceManager:
         if cache_key in self.tank_images:
             return self.tank_images[cache_key]
         
-        images = {0: [], 1: [], 2: [], 3: []}  # 4个方向
-        
         # 修正拼写错误：palyer -> player
         folder_name = "palyer" if tank_type == "player" else "enemy"
         prefix = f"p{tank_id}" if tank_type == "player" else f"e{tank_id}"
@@ -222,22 +382,19 @@ class ResourceManager:
             f"{prefix}_{level}"
         )
         
-        # 加载每个方向的图片
+        # 预加载未覆盖的变体：按需加载（原始图片是向上的）
+        frames = []
         for frame in range(2):  # 2帧动画
             img_path = os.path.join(tank_base_path, f"{prefix}_{level}_{frame}.png")
             if os.path.exists(img_path):
                 original = pygame.image.load(img_path).convert_alpha()
                 # 缩放到30x30
-                original = pygame.transform.scale(original, (30, 30))
-                
-                # 为4个方向创建旋转版本
-                # 原始图片是向上的
-                images[0].append(original)  # 上
-                images[1].append(pygame.transform.rotate(original, -90))  # 右
-                images[2].append(pygame.transform.rotate(original, 180))  # 下
-                images[3].append(pygame.transform.rotate(original, 90))  # 左
+                frames.append(pygame.transform.scale(original, (30, 30)))
         
+        images = self._rotate_tank_frames(frames)
         self.tank_images[cache_key] = images
+        if config.ATLAS_ENABLED:
+            self.atlas.add_many(f for direction_frames in images.values() for f in direction_frames)
         return images
     
     def get_wall_image(self, wall_type: int) -> Optional[pygame.Surface]:
@@ -250,6 +407,29 @@ class ResourceManager:
         self._ensure_resources_loaded()
         return self.images.get("bullet")
     
+    def get_bullet_images(self) -> Dict[int, pygame.Surface]:
+        """获取4个方向的子弹图片 {方向: 图片}"""
+        self._ensure_resources_loaded()
+        return self.bullet_images
+    
+    def get_prop_images(self) -> Dict[int, pygame.Surface]:
+        """获取共享的道具图片表 {道具类型: 图片}（预加载之外的类型在首次取用时补入）"""
+        self._ensure_resources_loaded()
+        return self.prop_images
+    
+    def get_prop_image(self, prop_type: int) -> Optional[pygame.Surface]:
+        """获取道具图片，未预加载的类型只从磁盘加载一次"""
+        image = self.get_prop_images().get(prop_type)
+        if image is None:
+            img_path = os.path.join(self.base_path, "images", "props", f"prop{prop_type}.png")
+            if not os.path.exists(img_path):
+                return None
+            image = self._process_image("prop", pygame.image.load(img_path))[0]
+            self.prop_images[prop_type] = image
+            if config.ATLAS_ENABLED:
+                self.atlas.add(image)
+        return image
+    
     def get_explosion_frames(self) -> List[pygame.Surface]:
         """获取爆炸动画帧"""
         self._ensure_resources_loaded()
@@ -269,6 +449,19 @@ class ResourceManager:
         """获取星星动画帧"""
         return self.star_frames
     
+    def _load_sound(self, sound_name: str) -> Optional[pygame.mixer.Sound]:
+        """单独加载一个音效（预加载完成前播放时使用）"""
+        filename = self.SOUND_FILES.get(sound_name)
+        if filename is None:
+            return None
+        try:
+            sound = pygame.mixer.Sound(os.path.join(self.base_path, "musics", filename))
+        except Exception as e:
+            print(f"无法加载音频 {filename}: {e}")
+            return None
+        self.sounds[sound_name] = sound
+        return sound
+    
     def play_sound(self, sound_name: str, loops: int = 0):
         """
         播放音效
@@ -277,10 +470,13 @@ class ResourceManager:
             sound_name: 音效名称
             loops: 循环次数，0表示播放一次，-1表示无限循环
         """
-        self._ensure_resources_loaded()
-        if sound_name in self.sounds:
+        sound = self.sounds.get(sound_name)
+        if sound is None and not self._resources_loaded:
+            # 不为一个音效阻塞等待全部图片：只加载这一个
+            sound = self._load_sound(sound_name)
+        if sound is not None:
             try:
-                self.sounds[sound_name].play(loops=loops)
+                sound.play(loops=loops)
             except Exception as e:
                 print(f"播放音效失败 {sound_name}: {e}")
     
@@ -0,0 +1,141 @@
+"""
+精灵处理结果磁盘缓存 - 缩放/旋转后的像素数据存入单个二进制容器
+
+ResourceManager 启动时把墙体缩放到 50x50、坦克帧缩放到 30x30 并旋转出 4 个方向，
+只要源图片不变，这些结果每次都一样。首次加载后把处理结果的 RGBA 像素写入
+config.SPRITE_CACHE_PATH：
+
+    b"TWSP" | 版本 u32 | 索引长度 u32 | 索引 JSON | 像素数据
+
+索引为每个条目记录源文件（相对路径、mtime_ns、大小）、处理参数（目标尺寸、旋转角度）、
+尺寸与数据偏移。下次启动一次读入整个文件，源文件与处理参数都未变的条目直接用
+pygame.image.frombuffer 构建 Surface，跳过解码、缩放与旋转；其余条目回退到正常加载。
+"""
+import json
+import os
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+MAGIC = b"TWSP"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sII")
+
+
+class SpriteCache:
+    """处理后精灵图片的单文件缓存。"""
+
+    def __init__(self, path: str, base_path: str):
+        """
+        Args:
+            path: 缓存文件路径
+            base_path: 源文件相对路径的基准目录
+        """
+        self.path = path
+        self.base_path = base_path
+        self._index: Dict[str, dict] = {}
+        self._blob: Optional[memoryview] = None
+        self._sources: Dict[str, Tuple[str, Optional[List[int]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _source_info(self, source: str) -> Tuple[str, Optional[List[int]]]:
+        """源文件的 (相对路径, [mtime_ns, 大小])，同一次运行内只计算一次。"""
+        info = self._sources.get(source)
+        if info is None:
+            try:
+                st = os.stat(source)
+                stamp = [st.st_mtime_ns, st.st_size]
+            except OSError:
+                stamp = None
+            info = (os.path.relpath(source, self.base_path).replace(os.sep, "/"), stamp)
+            self._sources[source] = info
+        return info
+
+    def load(self) -> int:
+        """一次读入整个容器，返回条目数；不存在或损坏时返回 0。"""
+        self._index = {}
+        self._blob = None
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return 0
+        try:
+            magic, version, index_len = _HEADER.unpack_from(data)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return 0
+            index = json.loads(data[_HEADER.size:_HEADER.size + index_len].decode("utf-8"))
+            blob = memoryview(data)[_HEADER.size + index_len:]
+            for entry in index.values():
+                width, height = entry["size"]
+                if entry["offset"] + width * height * 4 > len(blob):
+                    raise ValueError("像素数据不完整")
+        except (struct.error, ValueError, KeyError, TypeError) as e:
+            print(f"[SpriteCache] 缓存文件无效，忽略: {e}")
+            return 0
+        self._index = index
+        self._blob = blob
+        return len(index)
+
+    def contains(self, name: str, source: str, op: str) -> bool:
+        """条目存在且源文件与处理参数都未变化。"""
+        entry = self._index.get(name)
+        if entry is None:
+            return False
+        rel_source, stamp = self._source_info(source)
+        return entry["source"] == rel_source and entry["stamp"] == stamp and entry["op"] == op
+
+    def get(self, name: str, source: str, op: str) -> Optional[pygame.Surface]:
+        """取出条目；源文件或处理参数变化时返回 None。"""
+        if not self.contains(name, source, op):
+            return None
+        entry = self._index[name]
+        width, height = entry["size"]
+        start = entry["offset"]
+        surface = pygame.image.frombuffer(self._blob[start:start + width * height * 4], (width, height), "RGBA")
+        return surface.convert_alpha() if pygame.display.get_surface() else surface.copy()
+
+    def save(self, records: Iterable[Tuple[str, str, str, pygame.Surface]]) -> Optional[str]:
+        """写出全部条目（先写临时文件再改名）。
+
+        Args:
+            records: (条目名, 源文件路径, 处理参数, 处理后的表面) 序列
+
+        Returns:
+            缓存文件路径，失败时返回 None
+        """
+        index = {}
+        chunks = []
+        offset = 0
+        for name, source, op, surface in records:
+            rel_source, stamp = self._source_info(source)
+            if stamp is None:
+                continue
+            pixels = pygame.image.tobytes(surface, "RGBA")
+            index[name] = {"source": rel_source, "stamp": stamp, "op": op,
+                           "size": list(surface.get_size()), "offset": offset}
+            chunks.append(pixels)
+            offset += len(pixels)
+        index_bytes = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        tmp_path = self.path + ".tmp"
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(index_bytes)))
+                f.write(index_bytes)
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[SpriteCache] 写入缓存失败: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return None
+        return self.path
@@ -0,0 +1,115 @@
+"""
+纹理图集 - 把小精灵打包进少量大 Surface，按渲染层用一次 Surface.blits() 批量绘制
+
+资源预加载完成后，ResourceManager 把坦克（各皮肤/等级/方向/帧）、墙体、子弹、
+爆炸、护盾、星星等图片按行（shelf）打包进 config.ATLAS_PAGE_SIZE 见方的页面。
+SpriteBatch 提供与 Surface.blit 相同的接口：渲染时收集 (页面, 目标位置, 区域)
+三元组，flush() 时一次提交；未入图集的图片（占位符、带整体透明度或色键的表面）
+原样收集，绘制顺序不变。
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+from src.config.game_config import config
+
+
+class TextureAtlas:
+    """按行装箱的多页图集，以源 Surface 对象本身作为查找键。"""
+
+    def __init__(self, page_size: int = None, padding: int = 1):
+        """
+        Args:
+            page_size: 页面边长（像素），默认 config.ATLAS_PAGE_SIZE
+            padding: 相邻图片之间的间隔，避免缩放采样时串色
+        """
+        self.page_size = page_size or config.ATLAS_PAGE_SIZE
+        self.padding = padding
+        self.pages: List[pygame.Surface] = []
+        self._regions: Dict[pygame.Surface, Tuple[pygame.Surface, pygame.Rect]] = {}
+        self._cursor_x = 0
+        self._cursor_y = 0
+        self._shelf_height = 0
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+    def __contains__(self, surface) -> bool:
+        return surface in self._regions
+
+    def region(self, surface: pygame.Surface) -> Optional[Tuple[pygame.Surface, pygame.Rect]]:
+        """图片所在的 (页面, 区域)，未入图集时返回 None。"""
+        return self._regions.get(surface)
+
+    def add(self, surface: pygame.Surface) -> bool:
+        """把一张图片拷入图集；已存在时直接返回 True，无法入集时返回 False。"""
+        if surface in self._regions:
+            return True
+        width, height = surface.get_size()
+        if (width == 0 or height == 0 or width > self.page_size or height > self.page_size
+                or surface.get_colorkey() is not None or surface.get_alpha() not in (None, 255)):
+            return False
+        if not self.pages or self._cursor_x + width > self.page_size:
+            # 换行
+            self._cursor_x = 0
+            self._cursor_y += self._shelf_height
+            self._shelf_height = 0
+        if not self.pages or self._cursor_y + height > self.page_size:
+            self._new_page()
+        page = self.pages[-1]
+        rect = pygame.Rect(self._cursor_x, self._cursor_y, width, height)
+        page.blit(surface, rect)
+        self._regions[surface] = (page, rect)
+        self._cursor_x += width + self.padding
+        self._shelf_height = max(self._shelf_height, height + self.padding)
+        return True
+
+    def add_many(self, surfaces: Iterable[pygame.Surface]) -> int:
+        """批量入集（按高度从大到小排列以减少空隙），返回成功入集的数量。"""
+        unique = {id(surface): surface for surface in surfaces if surface is not None}
+        ordered = sorted(unique.values(), key=lambda s: (-s.get_height(), -s.get_width()))
+        return sum(1 for surface in ordered if self.add(surface))
+
+    def clear(self):
+        self.pages.clear()
+        self._regions.clear()
+        self._cursor_x = self._cursor_y = self._shelf_height = 0
+
+    def _new_page(self):
+        page = pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self._cursor_x = 0
+        self._cursor_y = 0
+        self._shelf_height = 0
+
+
+class SpriteBatch:
+    """收集一层的绘制请求，flush() 时用一次 Surface.blits() 提交。"""
+
+    def __init__(self, atlas: Optional[TextureAtlas] = None):
+        self.atlas = atlas
+        # 直接引用图集的查找表（图集重建时原地清空/填充，引用保持有效）
+        self._regions = atlas._regions if atlas is not None else {}
+        self.items: List[tuple] = []
+        self.submitted = 0  # 累计提交的绘制项数
+
+    def blit(self, source: pygame.Surface, dest, area=None):
+        """与 Surface.blit 相同的参数；图集中的图片改为引用页面区域。"""
+        region = self._regions.get(source)
+        if region is None:
+            self.items.append((source, dest, area))
+        elif area is None:
+            self.items.append((region[0], dest, region[1]))
+        else:
+            page, rect = region
+            self.items.append((page, dest, pygame.Rect(area).move(rect.topleft).clip(rect)))
+
+    def flush(self, target: pygame.Surface):
+        """把收集的绘制项一次提交到 target 并清空。"""
+        if self.items:
+            target.blits(self.items, doreturn=False)
+            self.submitted += len(self.items)
+            self.items.clear()
@@ -0,0 +1,178 @@
+"""
+视频解码帧磁盘缓存 - 每个视频一份内存映射的原始 RGB 帧文件
+
+首次遇到某个视频时在后台把缩小后的帧顺序写入 <cache_dir>/<key>/frames.rgb，
+音轨写为 audio.wav，元数据写入 meta.json；key 由源文件内容哈希与文件大小组成，
+视频文件变化后自动失效。为避免每次启动都读完整个视频计算哈希，<cache_dir>/keys.json
+按源文件路径记录 [mtime_ns, 大小] 与对应的 key，只有这两项变化时才重新计算哈希。
+之后启动时直接 mmap 帧文件，播放时按帧用 pygame.image.frombuffer 构建 Surface，
+无需 moviepy/ffmpeg 解码。
+"""
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+import pygame
+
+CACHE_FORMAT_VERSION = 1
+
+
+def file_cache_key(path: str, chunk_size: int = 1 << 20) -> str:
+    """源文件的缓存键：sha256(内容) 前 32 位 + 文件大小。"""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return f"{digest.hexdigest()[:32]}_{size}"
+
+
+class MappedFrames:
+    """内存映射的帧文件，按需把单帧构建为 Surface。"""
+
+    def __init__(self, path: str, size: Tuple[int, int], fps: int, frame_count: int):
+        self.path = path
+        self.size = size
+        self.fps = fps
+        self.frame_count = frame_count
+        self.frame_bytes = size[0] * size[1] * 3
+        self._file = None
+        self._mmap = None
+        self._view = None
+        if frame_count > 0:  # 空文件无法映射；0 帧的缓存同样有效，只是没有可播放的帧
+            self._file = open(path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+        self._surface: Optional[pygame.Surface] = None
+        self._surface_index = -1
+
+    def surface(self, index: int) -> pygame.Surface:
+        """第 index 帧的 Surface（连续请求同一帧时复用）。"""
+        index = max(0, min(self.frame_count - 1, index))
+        if index != self._surface_index:
+            start = index * self.frame_bytes
+            surf = pygame.image.frombuffer(self._view[start:start + self.frame_bytes], self.size, "RGB")
+            self._surface = surf.convert() if pygame.display.get_surface() else surf.copy()
+            self._surface_index = index
+        return self._surface
+
+    def close(self):
+        self._surface = None
+        if self._mmap is not None:
+            self._view.release()
+            self._mmap.close()
+            self._file.close()
+
+
+class VideoFrameCache:
+    """按源文件键存取解码帧缓存。"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._keys: Optional[Dict[str, dict]] = None  # 源文件路径 -> {"stamp": [mtime_ns, 大小], "key": 缓存键}
+        self._keys_lock = threading.Lock()  # 主线程与后台预取线程都会查询
+
+    def _keys_path(self) -> str:
+        return os.path.join(self.cache_dir, "keys.json")
+
+    def key_for(self, path: str) -> str:
+        """源文件的缓存键；文件大小与 mtime 未变化时直接使用记录的键，不再读取整个文件。"""
+        st = os.stat(path)
+        stamp = [st.st_mtime_ns, st.st_size]
+        source = os.path.abspath(path)
+        with self._keys_lock:
+            if self._keys is None:
+                try:
+                    with open(self._keys_path(), "r", encoding="utf-8") as f:
+                        self._keys = dict(json.load(f))
+                except (OSError, ValueError, TypeError):
+                    self._keys = {}
+            record = self._keys.get(source)
+            if isinstance(record, dict) and record.get("stamp") == stamp and record.get("key"):
+                return record["key"]
+            key = file_cache_key(path)
+            self._keys[source] = {"stamp": stamp, "key": key}
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = self._keys_path() + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._keys, f, ensure_ascii=False)
+                os.replace(tmp_path, self._keys_path())
+            except OSError as e:
+                print(f"[VideoCache] 写入键索引失败: {e}")
+            return key
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str) -> Optional[MappedFrames]:
+        """映射已有缓存；不存在或不完整时返回 None。"""
+        entry = self._entry_dir(key)
+        try:
+            with open(os.path.join(entry, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != CACHE_FORMAT_VERSION:
+                return None
+            size = tuple(meta["size"])
+            frame_count = meta["frame_count"]
+            frames_path = os.path.join(entry, "frames.rgb")
+            # meta.json 最后写入并随目录整体改名，存在即表示缓存完整；帧数可以为 0
+            if frame_count < 0 or os.path.getsize(frames_path) != frame_count * size[0] * size[1] * 3:
+                print(f"[VideoCache] 缓存不完整，忽略: {key}")
+                return None
+            return MappedFrames(frames_path, size, meta["fps"], frame_count)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def audio_path(self, key: str) -> Optional[str]:
+        path = os.path.join(self._entry_dir(key), "audio.wav")
+        return path if os.path.exists(path) else None
+
+    def store(self, key: str, frames: Iterable, size: Tuple[int, int], fps: int,
+              audio_path: Optional[str] = None, max_frames: Optional[int] = None) -> Optional[str]:
+        """写入缓存（先写临时目录再整体改名，中途失败不会留下半成品）。
+
+        Args:
+            key: key_for / file_cache_key 计算的缓存键
+            frames: RGB 帧迭代器（uint8 数组或 bytes，尺寸须为 size）
+            size: 帧尺寸 (宽, 高)
+            fps: 帧率
+            audio_path: 已提取的音轨 wav（复制进缓存），可为 None
+            max_frames: 最多写入的帧数
+
+        Returns:
+            缓存目录，失败时返回 None
+        """
+        entry = self._entry_dir(key)
+        tmp_entry = entry + ".tmp"
+        frame_bytes = size[0] * size[1] * 3
+        try:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            os.makedirs(tmp_entry)
+            frame_count = 0
+            with open(os.path.join(tmp_entry, "frames.rgb"), "wb") as f:
+                for frame in frames:
+                    if max_frames is not None and frame_count >= max_frames:
+                        break
+                    data = bytes(frame)
+                    if len(data) != frame_bytes:
+                        raise ValueError(f"帧尺寸不符: {len(data)} != {frame_bytes}")
+                    f.write(data)
+                    frame_count += 1
+            if audio_path:
+                shutil.copyfile(audio_path, os.path.join(tmp_entry, "audio.wav"))
+            with open(os.path.join(tmp_entry, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_FORMAT_VERSION, "size": list(size), "fps": fps,
+                           "frame_count": frame_count}, f)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp_entry, entry)
+            return entry
+        except (OSError, ValueError) as e:
+            print(f"[VideoCache] 写入缓存失败 {key}: {e}")
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            return None
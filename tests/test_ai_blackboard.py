@@ -0,0 +1,67 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game_engine.ai_blackboard import AIBlackboard, ROLE_ATTACKER, ROLE_FLANKER, ROLE_BASE_RAIDER
+from src.game_engine.game import EnemyAIController
+from src.game_engine.wall import Wall
+
+
+def _tank(tank_id, tank_type, x, y):
+    return SimpleNamespace(tank_id=tank_id, tank_type=tank_type, x=x, y=y, width=30, height=30,
+                           active=True, shield_active=False)
+
+
+class TestAIBlackboard(unittest.TestCase):
+    def setUp(self):
+        self.players = [_tank(1, "player", 100, 100), _tank(2, "player", 900, 100)]
+        self.enemies = [_tank(10, "enemy", 120, 300), _tank(11, "enemy", 600, 900),
+                        _tank(12, "enemy", 150, 150), _tank(13, "enemy", 800, 400)]
+        self.base = SimpleNamespace(wall_id=99, wall_type=Wall.BASE, x=650, y=1000, width=50, height=50, active=True)
+        self.world = SimpleNamespace(width=1400, height=1050, tanks=self.players + self.enemies,
+                                     walls=[self.base], bullets=[], freeze_enemies_timer=0)
+        self.controllers = [EnemyAIController(t.tank_id, self.world, "hell") for t in self.enemies]
+        self.board = AIBlackboard()
+
+    def test_shared_perception(self):
+        self.board.update(self.world, self.controllers)
+        self.assertIs(self.board.base, self.base)
+        self.assertIs(self.board.nearest_player[12], self.players[0])
+        self.assertIs(self.board.nearest_player[13], self.players[1])
+        self.assertTrue(self.board.close_player[12])
+        self.assertFalse(self.board.close_player[11])
+        self.assertAlmostEqual(self.board.base_distance[11], ((650 - 600) ** 2 + (1000 - 900) ** 2) ** 0.5)
+        # 未启用团队协同时不分配角色，但控制器拿到黑板
+        self.assertTrue(all(c.role is None and c.blackboard is self.board for c in self.controllers))
+
+    def test_roles_assigned_with_team_coordination(self):
+        self.board.update(self.world, self.controllers, team_coordination=True)
+        roles = {c.tank_id: c.role for c in self.controllers}
+        self.assertEqual(roles[11], ROLE_BASE_RAIDER)
+        self.assertIs(self.board.focus_player, self.players[0])
+        self.assertEqual(roles[12], ROLE_ATTACKER)
+        self.assertEqual(roles[10], ROLE_FLANKER)
+        self.assertEqual(roles[13], ROLE_ATTACKER)
+
+    def test_team_threat_changes_focus(self):
+        self.controllers[0].threat_scores = {2: 100}
+        self.board.update(self.world, self.controllers, team_coordination=True)
+        self.assertIs(self.board.focus_player, self.players[1])
+
+    def test_controller_targets_follow_roles(self):
+        self.board.update(self.world, self.controllers, team_coordination=True)
+        attacker = next(c for c in self.controllers if c.role == ROLE_ATTACKER)
+        raider = next(c for c in self.controllers if c.role == ROLE_BASE_RAIDER)
+        tank = next(t for t in self.enemies if t.tank_id == attacker.tank_id)
+        self.assertEqual(attacker._select_target(tank, self.base), (self.board.focus_player, False))
+        tank = next(t for t in self.enemies if t.tank_id == raider.tank_id)
+        raider._find_first_blocker_to = lambda target: None
+        self.assertEqual(raider._select_target(tank, self.base), (self.base, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
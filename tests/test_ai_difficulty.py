@@ -138,5 +138,25 @@ class TestEnemyAIDifficulty(unittest.TestCase):
         # Let's test _should_dodge directly
         self.assertTrue(controller._bullet_will_hit(bullet, self.enemy_tank))
 
+    def test_shared_navigation_is_not_rebuilt_by_controller(self):
+        """Injected shared grids are marked dirty by the engine only"""
+        from src.config.game_config import config
+        from src.game_engine.pathfinding import NavigationCache, los_penalty_for
+        self.world.width, self.world.height = 800, 600
+        controller = EnemyAIController(1, self.world, "hard")
+        private_nav, _ = controller._get_navigation()  # 尚未注入时使用私有网格
+        self.assertTrue(controller._owns_navigation)
+
+        cache = NavigationCache()
+        shared = cache.get(800 // config.GRID_SIZE, 600 // config.GRID_SIZE, los_penalty_for("hard"))
+        controller.set_navigation(*shared)
+        self.assertFalse(controller._owns_navigation)
+        shared[0].mark_dirty = MagicMock()
+        nav, finder = controller._get_navigation()
+        self.assertIs(nav, shared[0])
+        self.assertIs(finder, shared[1])
+        shared[0].mark_dirty.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,162 @@
+import random
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game_engine.ai_worker_pool import (AIWorkerPool, build_world_snapshot, next_direction, plan_batch,
+                                            select_target, RIGHT, DOWN)
+from src.game_engine.game import EnemyAIController
+from src.game_engine.tank import Tank
+
+
+def _tank(tank_id, tank_type, x, y):
+    return SimpleNamespace(tank_id=tank_id, tank_type=tank_type, x=x, y=y, width=30, height=30,
+                           active=True, shield_active=False, direction=Tank.UP)
+
+
+class _Rect:
+    """EnemyAIController 射线检测所需的最小矩形接口（避免依赖 pygame）。"""
+
+    def __init__(self, x, y, w, h):
+        self.left, self.top, self.right, self.bottom = x, y, x + w, y + h
+
+    def collidepoint(self, p):
+        return self.left <= p[0] < self.right and self.top <= p[1] < self.bottom
+
+
+def _wall(wall_id, x, y, wall_type=1):
+    return SimpleNamespace(wall_id=wall_id, wall_type=wall_type, x=x, y=y, width=50, height=50, active=True,
+                           passable=False, shoot_through=False, destructible=wall_type == 1,
+                           rect=_Rect(x, y, 50, 50))
+
+
+def _random_world(rng):
+    """随机墙体/基地/玩家/子弹布局的 16x12 网格世界。"""
+    walls = []
+    for gx in range(16):
+        for gy in range(12):
+            if rng.random() < 0.2:
+                walls.append(_wall(len(walls) + 1, gx * 50, gy * 50, rng.choice((1, 1, 2))))
+    if rng.random() < 0.7:
+        walls.append(_wall(len(walls) + 1, rng.randrange(16) * 50, 11 * 50, 5))
+    players = [_tank(i + 1, "player", rng.randrange(0, 770), rng.randrange(0, 570))
+               for i in range(rng.randint(1, 2))]
+    for player in players:
+        player.shield_active = rng.random() < 0.3
+    enemy = _tank(10, "enemy", rng.randrange(0, 770), rng.randrange(0, 570))
+    bullets = [SimpleNamespace(x=rng.randrange(800), y=rng.randrange(600), velocity_x=rng.choice((-5, 0, 5)),
+                               velocity_y=rng.choice((-5, 0, 5)), active=True) for _ in range(rng.randint(0, 4))]
+    tanks = players + [enemy]
+    world = SimpleNamespace(width=800, height=600, walls=walls, tanks=tanks, bullets=bullets, rng=rng,
+                            freeze_enemies_timer=0, wall_id_map={w.wall_id: w for w in walls},
+                            tank_id_map={t.tank_id: t for t in tanks})
+    return world, enemy
+
+
+class TestAIWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.enemy = _tank(10, "enemy", 10, 10)
+        self.player = _tank(1, "player", 410, 10)
+        # 敌人与玩家之间有一道竖墙，直行被挡
+        walls = [_wall(y + 1, 200, y * 50) for y in range(0, 3)]
+        self.world = SimpleNamespace(width=500, height=500, walls=walls,
+                                     tanks=[self.enemy, self.player], bullets=[])
+
+    def test_snapshot_is_compact(self):
+        snap = build_world_snapshot(self.world, 50)
+        self.assertEqual(set(snap["blocked"]), {(4, 0), (4, 1), (4, 2)})
+        self.assertEqual(snap["enemies"], {10: (10, 10, 30, 30)})
+        self.assertIsNone(snap["base"])
+
+    def test_plan_batch_routes_around_wall(self):
+        snap = build_world_snapshot(self.world, 50)
+        plans = plan_batch(snap, [(10, "hard", {}, 1.0, 1.0), (99, "hard", {}, 1.0, 1.0)])
+        self.assertEqual(len(plans), 1)
+        self.assertEqual(plans[0]["target"], ("player", 1))
+        self.assertIn(plans[0]["direction"], (RIGHT, DOWN))
+
+    def test_pool_returns_plans(self):
+        pool = AIWorkerPool(1)
+        try:
+            snap = build_world_snapshot(self.world, 50)
+            self.assertTrue(pool.submit(snap, [(10, "normal", {}, 1.0, 1.0)], tick=5))
+            # 上一批未取回前不再提交新批次
+            self.assertTrue(pool.busy)
+            self.assertFalse(pool.submit(snap, [(10, "normal", {}, 1.0, 1.0)], tick=6))
+            plans = pool.collect(wait=True)
+            self.assertFalse(pool.busy)
+        finally:
+            pool.shutdown()
+        self.assertIn(10, plans)
+        self.assertEqual(plans[10]["target"], ("player", 1))
+        self.assertEqual(plans[10]["tick"], 5)
+
+    def test_controller_uses_plan(self):
+        world = MagicMock()
+        world.tanks = [self.enemy, self.player]
+        world.walls = []
+        world.bullets = []
+        world.rng = random.Random(0)
+        world.tank_id_map = {1: self.player, 10: self.enemy}
+        controller = EnemyAIController(10, world, "hard")
+        controller.config = dict(controller.config, tracking_prob=1.0, safe_distance=0)
+        controller._state = "attack"
+        controller._next_direction_via_path = MagicMock()
+        controller.apply_plan({"tank_id": 10, "target": ("player", 1), "direction": Tank.DOWN})
+        tank = MagicMock()
+        tank.x, tank.y, tank.direction = 10, 10, Tank.DOWN
+        controller._move_with_tracking(tank)
+        controller._next_direction_via_path.assert_not_called()
+        tank.move.assert_called_with(Tank.DOWN)
+
+        # 规划只使用一次；基于一帧以前快照的规划不再使用
+        self.assertIsNone(controller._plan)
+        controller.apply_plan({"tank_id": 10, "target": ("player", 1), "direction": Tank.DOWN})
+        controller._plan_age = 2
+        controller._next_direction_via_path.return_value = Tank.RIGHT
+        tank.direction = Tank.RIGHT
+        controller._move_with_tracking(tank)
+        controller._next_direction_via_path.assert_called_once()
+        tank.move.assert_called_with(Tank.RIGHT)
+
+        # 年龄从提交时算起：晚了几帧才取回的规划在应用时即被丢弃
+        controller.apply_plan({"tank_id": 10, "target": ("player", 1), "direction": Tank.DOWN}, age=3)
+        self.assertIsNone(controller._plan)
+
+    def test_worker_matches_in_process_planner(self):
+        rng = random.Random(7)
+        compared = 0
+        for trial in range(150):
+            world, enemy = _random_world(rng)
+            difficulty = rng.choice(("easy", "normal", "hard", "hell"))
+            controller = EnemyAIController(enemy.tank_id, world, difficulty,
+                                           player_weight=rng.choice((0.5, 1.0, 2.0)),
+                                           base_weight=rng.choice((0.5, 1.0, 2.0)))
+            controller.threat_scores = {1: rng.choice((0, 3)), 2: rng.choice((0, 3))}
+            controller.role = rng.choice((None, None, "base_raider"))
+            snapshot = build_world_snapshot(world, 50)
+            tank_rect = snapshot["enemies"][enemy.tank_id]
+            request = controller.make_plan_request()
+
+            target, target_is_base = controller._select_target(enemy, controller._find_player_base())
+            worker_target = select_target(snapshot, tank_rect, *request[1:])
+            if target is None:
+                self.assertIsNone(worker_target)
+                continue
+            kind = "base" if target_is_base else "player" if getattr(target, "tank_type", None) == "player" else "blocker"
+            target_id = target.tank_id if kind == "player" else target.wall_id
+            self.assertEqual(worker_target[:2], (kind, target_id), trial)
+
+            self.assertEqual(next_direction(snapshot, tank_rect, worker_target[2], difficulty),
+                             controller._next_direction_via_path(enemy, target), trial)
+            compared += 1
+        self.assertGreater(compared, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game_engine.game_loop import FixedTimestep
+from src.game_engine.game_object import GameObject
+
+
+class TestFixedTimestep(unittest.TestCase):
+    def test_ticks_at_fixed_rate_regardless_of_render_rate(self):
+        loop = FixedTimestep(tick_rate=60, max_steps=5)
+        # 144Hz 渲染：大多数帧不执行逻辑，1 秒内仍恰好 60 步
+        steps = sum(loop.advance(1 / 144) for _ in range(144))
+        self.assertIn(steps, (59, 60))
+        self.assertGreaterEqual(loop.alpha, 0.0)
+        self.assertLessEqual(loop.alpha, 1.0)
+
+        # 30Hz 渲染：每帧追赶两步
+        loop = FixedTimestep(tick_rate=60, max_steps=5)
+        self.assertEqual(sum(loop.advance(1 / 30 + 1e-9) for _ in range(30)), 60)
+        self.assertEqual(loop.skipped_renders, 30)
+
+    def test_backlog_is_capped_and_dropped(self):
+        loop = FixedTimestep(tick_rate=60, max_steps=5)
+        self.assertEqual(loop.advance(1.0), 5)
+        self.assertEqual(loop.dropped_ticks, 55)
+        self.assertLess(loop.alpha, 1.0)
+        self.assertEqual(loop.advance(0.0), 0)
+
+    def test_draw_position_interpolates_between_ticks(self):
+        obj = GameObject(100, 100, 30, 30)
+        obj.velocity_x = 4
+        obj.update()
+        self.assertEqual(obj.draw_position(0.5), (102, 100))
+        self.assertEqual(obj.draw_position(1.0), (104, 100))
+        # 瞬移（重生、状态校正）不插值
+        obj.x = 600
+        self.assertEqual(obj.draw_position(0.5), (600, 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import unittest
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from src.game_engine.game_object import GameObject
+from src.game_engine.game_world import GameWorld
+from src.game_engine.tank import Tank
+from src.game_engine.wall import Wall
+from src.state_sync.lockstep import EMPTY_INPUT, LockstepSession, world_checksum
+from src.utils.level_map_generator import generate_level_map
+
+
+def _world(seed):
+    world = GameWorld(800, 600)
+    world.seed_match(seed)
+    world.spawn_tank("player", 1, (100, 100))
+    world.spawn_tank("player", 2, (300, 100))
+    world.spawn_wall(200, 200, Wall.BRICK)
+    return world
+
+
+def _step(world, session, remote_input):
+    """模拟一方推进一帧：应用双方输入后只移动坦克（不触发音效）。"""
+    session.receive_input(session.tick + session.input_delay, remote_input)
+    session.submit_local({"move": Tank.DOWN, "shoot": False})
+    if not session.ready():
+        return None
+    for player_id, player_input in session.pop_inputs().items():
+        tank = world.tank_id_map[player_id]
+        if player_input["move"] != -1:
+            tank.move(player_input["move"])
+        else:
+            tank.stop()
+        GameObject.update(tank)
+    world.rng.random()  # 模拟 AI/掉落消耗随机数
+    return session.end_tick(world)
+
+
+class TestLockstep(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+
+    def test_seeded_world_and_generation_are_reproducible(self):
+        a, b = GameWorld(800, 600), GameWorld(800, 600)
+        self.assertEqual(a.seed_match(1234), 1234)
+        b.seed_match(1234)
+        self.assertEqual([a.rng.random() for _ in range(5)], [b.rng.random() for _ in range(5)])
+        self.assertEqual(generate_level_map(3, rng=random.Random(7)), generate_level_map(3, rng=random.Random(7)))
+        self.assertIsInstance(GameWorld(800, 600).seed_match(), int)
+
+    def test_session_waits_for_both_inputs(self):
+        session = LockstepSession(local_id=1, remote_id=2, input_delay=2, checksum_interval=2)
+        # 输入延迟内的帧已预填充空输入
+        self.assertTrue(session.ready())
+        self.assertEqual(session.submit_local({"move": 1, "shoot": True}), 2)
+        self.assertIsNone(session.submit_local({"move": 0, "shoot": False}))
+        self.assertEqual(session.pop_inputs(), {1: EMPTY_INPUT, 2: EMPTY_INPUT})
+        session.end_tick(_world(1))
+        session.pop_inputs()
+        session.end_tick(_world(1))
+        self.assertFalse(session.ready())  # 对端第 2 帧输入未到
+        session.receive_input(2, {"move": -1, "shoot": False})
+        self.assertTrue(session.ready())
+        self.assertEqual(session.pop_inputs()[1], {"move": 1, "shoot": True})
+        self.assertEqual(session.waiting, 0)
+
+    def test_same_seed_and_inputs_keep_checksums_equal(self):
+        host_world, client_world = _world(99), _world(99)
+        self.assertEqual(world_checksum(host_world), world_checksum(client_world))
+        host = LockstepSession(1, 2, input_delay=2, checksum_interval=5)
+        client = LockstepSession(2, 1, input_delay=2, checksum_interval=5)
+        for _ in range(20):
+            host_crc = _step(host_world, host, {"move": Tank.DOWN, "shoot": False})
+            client_crc = _step(client_world, client, {"move": Tank.DOWN, "shoot": False})
+            self.assertEqual(host_crc, client_crc)
+            if host_crc is not None:
+                host.receive_checksum(host.tick, client_crc)
+        self.assertFalse(host.desynced)
+
+    def test_checksum_mismatch_flags_desync(self):
+        host_world, client_world = _world(5), _world(6)  # 不同种子 → 随机数状态不同
+        host = LockstepSession(1, 2, input_delay=1, checksum_interval=1)
+        client = LockstepSession(2, 1, input_delay=1, checksum_interval=1)
+        host_crc = _step(host_world, host, EMPTY_INPUT)
+        client_crc = _step(client_world, client, EMPTY_INPUT)
+        self.assertNotEqual(host_crc, client_crc)
+        host.receive_checksum(1, client_crc)
+        self.assertEqual(host.desync_tick, 1)
+
+
+    def test_engine_ends_match_when_peer_input_stalls(self):
+        from unittest import mock
+        from src.game_engine.game import GameEngine
+        engine = GameEngine()
+        engine._setup_single_player_world()
+        engine.lockstep = LockstepSession(1, 2, input_delay=1, stall_limit=5)
+        engine.network_manager = mock.Mock()
+        engine.network_manager.get_inputs.return_value = []
+        engine.screen_manager.set_state = mock.Mock()
+        engine.current_state = "game"
+
+        engine._update_lockstep("host")  # 输入延迟内的预填充帧照常推进
+        self.assertEqual(engine.lockstep.tick, 1)
+        for _ in range(4):
+            engine._update_lockstep("host")
+        self.assertIsNotNone(engine.lockstep)  # 未超过上限时继续等待
+        engine._update_lockstep("host")
+        self.assertIsNone(engine.lockstep)
+        self.assertTrue(engine.game_world.game_over)
+        engine.network_manager.stop.assert_called_once()
+        engine.screen_manager.set_state.assert_called_with("game_over")
+        self.assertEqual(engine.screen_manager.context.game_over_reason, "与对方的连接已中断")
+
+
+if __name__ == '__main__':
+    unittest.main()
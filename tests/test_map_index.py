@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import map_index
+from src.utils.map_index import MapIndex
+from src.utils.map_loader import MapLoader
+
+
+def _write_map(path, name, walls, base_grid=None):
+    map_data = {
+        "name": name,
+        "original_width": 1000,
+        "original_height": 600,
+        "wall_grid_data": [{"grid_x": i, "grid_y": 0, "type": "brick"} for i in range(walls)],
+    }
+    if base_grid is not None:
+        map_data["base_grid"] = base_grid
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(map_data, f)
+
+
+class TestMapIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.maps_dir = os.path.join(self.tmp.name, "maps")
+        os.makedirs(self.maps_dir)
+        self.index_path = os.path.join(self.tmp.name, "cache", "map_index.json")
+        _write_map(os.path.join(self.maps_dir, "a.json"), "甲", 3, base_grid=[5, 5])
+        _write_map(os.path.join(self.maps_dir, "b.json"), "乙", 7)
+        with open(os.path.join(self.maps_dir, "broken.json"), 'w', encoding='utf-8') as f:
+            f.write("{not json")
+
+    def test_metadata_matches_loaded_map(self):
+        loader = MapLoader(self.maps_dir, MapIndex(self.index_path))
+        self.assertIsNone(loader.maps)  # 构造时不扫描目录
+        with mock.patch("builtins.print"):
+            maps = loader.get_available_maps()
+            self.assertEqual([m["filename"] for m in maps], ["a.json", "b.json"])
+            for map_info in maps:
+                loaded = loader.load_map(map_info["filename"])
+                self.assertEqual(map_info["name"], loaded["name"])
+                self.assertEqual(map_info["wall_count"], len(loaded["walls"]))
+                self.assertEqual(map_info["original_width"], loaded["original_width"])
+        self.assertEqual(maps[0]["wall_count"], 4)  # base_grid 计入障碍物
+
+    def test_only_changed_files_are_parsed(self):
+        index = MapIndex(self.index_path)
+        with mock.patch("builtins.print"):
+            self.assertEqual(len(index.list_maps(self.maps_dir)), 2)
+        self.assertEqual(index.parsed, 3)  # 无法解析的文件也记录，避免重复解析
+        self.assertTrue(os.path.exists(self.index_path))
+
+        # 新实例从索引文件读取，无需再解析任何地图
+        reopened = MapIndex(self.index_path)
+        with mock.patch.object(map_index.json, "load", wraps=json.load) as json_load:
+            self.assertEqual(reopened.list_maps(self.maps_dir), index.list_maps(self.maps_dir))
+        self.assertEqual(json_load.call_count, 1)  # 只读取索引文件本身
+        self.assertEqual(reopened.parsed, 0)
+
+        _write_map(os.path.join(self.maps_dir, "b.json"), "乙二", 12)
+        os.remove(os.path.join(self.maps_dir, "a.json"))
+        maps = reopened.list_maps(self.maps_dir)
+        self.assertEqual(reopened.parsed, 1)
+        self.assertEqual([(m["name"], m["wall_count"]) for m in maps], [("乙二", 12)])
+        with open(self.index_path, encoding='utf-8') as f:
+            entries = json.load(f)["entries"]
+        self.assertEqual(sorted(os.path.basename(key) for key in entries), ["b.json", "broken.json"])
+
+    def test_corrupt_index_is_rebuilt(self):
+        os.makedirs(os.path.dirname(self.index_path))
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            f.write("garbage")
+        index = MapIndex(self.index_path)
+        with mock.patch("builtins.print"):
+            self.assertEqual(len(index.list_maps(self.maps_dir)), 2)
+        self.assertEqual(index.parsed, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
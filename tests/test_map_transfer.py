@@ -0,0 +1,149 @@
+import os
+import shutil
+import socket
+import tempfile
+import unittest
+import sys
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.game_config import config
+from src.network.network_manager import NetworkManager
+from src.utils.map_cache import MapCache, join_map_payload, map_content_hash, split_map_payload
+
+
+def _map_data():
+    walls = [{"x": x * 50, "y": y * 50, "type": (x + y) % 4} for x in range(28) for y in range(21) if (x * y) % 3 == 0]
+    return {"name": "test", "width": 1400, "height": 1050, "walls": walls,
+            "player_spawns": [(100, 1000), (200, 1000)], "enemy_spawns": [[0, 0]]}
+
+
+class TestMapTransfer(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_hash_ignores_key_order_and_tuples(self):
+        data = _map_data()
+        reordered = dict(reversed(list(data.items())))
+        reordered["player_spawns"] = [list(p) for p in data["player_spawns"]]
+        self.assertEqual(map_content_hash(data), map_content_hash(reordered))
+        reordered["width"] = 1401
+        self.assertNotEqual(map_content_hash(data), map_content_hash(reordered))
+
+    def test_cache_lookup_hits_cache_then_local_maps(self):
+        data = _map_data()
+        map_hash = map_content_hash(data)
+        cache = MapCache(self.cache_dir)
+        self.assertIsNone(cache.lookup(map_hash))
+        # 本地同名地图内容一致时命中并写入缓存
+        self.assertEqual(cache.lookup(map_hash, lambda: data), data)
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, f"{map_hash}.json")))
+        # 内容不同的本地地图不算命中
+        self.assertIsNone(cache.lookup("0" * 64, lambda: data))
+        # 新实例从磁盘读取
+        self.assertEqual(MapCache(self.cache_dir).get(map_hash)["walls"], data["walls"])
+
+    def test_chunked_transfer_on_cache_miss(self):
+        data = _map_data()
+        chunks = split_map_payload(data, 64)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(map_content_hash(join_map_payload(chunks)), map_content_hash(data))
+
+        host, client = NetworkManager(), NetworkManager()
+        client.map_cache = MapCache(self.cache_dir)
+        host_sock, client_sock = socket.socketpair()
+        old_chunk_size = config.MAP_CHUNK_SIZE
+        config.MAP_CHUNK_SIZE = 256
+        try:
+            host._conn = host_sock
+            host.stats.role = "host"
+            host.stats.connected = True
+            host.send_game_start(1, 2, "test", data)
+            start = host._parse_line(client_sock.recv(65536).decode('utf-8').strip())
+            self.assertNotIn("map_data", start["payload"])
+            map_hash = start["payload"]["map_hash"]
+
+            host._handle_map_status({"map_hash": map_hash, "cached": True})
+            self.assertEqual(len(host._outgoing_chunks), 0)
+            host._handle_map_status({"map_hash": map_hash, "cached": False})
+            total = len(host._outgoing_chunks)
+            self.assertGreater(total, config.MAP_CHUNKS_PER_UPDATE)
+
+            # 每次 update 只发送有限块数，分块按行交给客户端处理
+            host.update()
+            self.assertEqual(len(host._outgoing_chunks), total - config.MAP_CHUNKS_PER_UPDATE)
+            while host._outgoing_chunks:
+                host._pump_map_chunks()
+            buffer = ""
+            received = 0
+            while received < total:
+                buffer += client_sock.recv(65536).decode('utf-8')
+                while '\n' in buffer:
+                    line, buffer = buffer.split('\n', 1)
+                    client._handle_map_chunk(client._parse_line(line)["payload"])
+                    received += 1
+            events = client.get_events()
+            self.assertEqual(len(events), 1)
+            self.assertEqual(events[0]["type"], "map_data")
+            self.assertEqual(map_content_hash(events[0]["payload"]["map_data"]), map_hash)
+            self.assertIsNotNone(client.map_cache.get(map_hash))
+        finally:
+            config.MAP_CHUNK_SIZE = old_chunk_size
+            host_sock.close()
+            client_sock.close()
+
+
+    def test_peer_reports_map_ready_only_after_full_transfer(self):
+        data = _map_data()
+        host, client = NetworkManager(), NetworkManager()
+        client.map_cache = MapCache(self.cache_dir)
+        host_sock, client_sock = socket.socketpair()
+        old_chunk_size = config.MAP_CHUNK_SIZE
+        config.MAP_CHUNK_SIZE = 256
+
+        def read_lines(sock, count):
+            buffer, lines = "", []
+            while len(lines) < count:
+                buffer += sock.recv(65536).decode('utf-8')
+                while '\n' in buffer and len(lines) < count:
+                    line, buffer = buffer.split('\n', 1)
+                    lines.append(host._parse_line(line))
+            return lines
+
+        try:
+            host._conn, client._conn = host_sock, client_sock
+            host.stats.role, client.stats.role = "host", "client"
+            host.stats.connected = client.stats.connected = True
+            map_hash = host.offer_map("test", data)
+            offer = read_lines(client_sock, 1)[0]
+            self.assertEqual(offer["type"], "map_offer")
+            self.assertEqual(offer["payload"]["map_hash"], map_hash)
+            self.assertIsNone(host.peer_map_state(map_hash))
+
+            # 缓存未命中：主机分块发送，收齐之前仍未就绪
+            host._handle_map_status({"map_hash": map_hash, "cached": False})
+            total = len(host._outgoing_chunks)
+            while host._outgoing_chunks:
+                host._pump_map_chunks()
+            for chunk in read_lines(client_sock, total):
+                self.assertIsNone(host.peer_map_state(map_hash))
+                client._handle_map_chunk(chunk["payload"])
+            status = read_lines(host_sock, 1)[0]
+            self.assertEqual(status, {"type": "map_status", "payload": {"map_hash": map_hash, "cached": True}})
+            host._handle_map_status(status["payload"])
+            self.assertTrue(host.peer_map_state(map_hash))
+
+            host._handle_map_status({"map_hash": "bad", "cached": False, "failed": True})
+            self.assertIs(host.peer_map_state("bad"), False)
+        finally:
+            config.MAP_CHUNK_SIZE = old_chunk_size
+            host_sock.close()
+            client_sock.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import base64
 import unittest
 import sys
 import os
@@ -59,10 +60,13 @@ class TestMultiplayerPropSync(unittest.TestCase):
         # Encode state
         state = self.state_manager.encode_state()
         
-        # Check wall changes
-        self.assertIn("c_walls", state)
+        # Check wall cells
+        self.assertIn("walls", state)
+        cells = base64.b64decode(state["walls"]["cells"])
         # Should have 2 active walls
-        self.assertEqual(len(state["c_walls"]), 2)
+        self.assertEqual(sum(1 for c in cells if c), 2)
+        self.assertEqual(cells[2 * state["walls"]["cols"] + 2], Wall.BRICK + 1)
+        self.assertEqual(cells[2 * state["walls"]["cols"] + 3], Wall.STEEL + 1)
 
 if __name__ == '__main__':
     unittest.main()
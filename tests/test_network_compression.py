@@ -0,0 +1,59 @@
+import json
+import socket
+import unittest
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.game_config import config
+from src.network.network_manager import NetworkManager
+
+
+def _big_message():
+    walls = [{"x": x * 50, "y": y * 50, "type": 1} for x in range(28) for y in range(0, 21, 3)]
+    return {"type": "game_start", "payload": {"map_name": "test", "map_data": {"walls": walls}}}
+
+
+class TestNetworkCompression(unittest.TestCase):
+    def test_uncompressed_without_handshake(self):
+        nm = NetworkManager()
+        line = nm._encode_line(_big_message())
+        self.assertIn('"type": "game_start"', line)
+        self.assertEqual(nm.stats.compressed_messages, 0)
+        self.assertEqual(nm.stats.compression_ratio, 1.0)
+
+    def test_compressed_round_trip_above_threshold(self):
+        nm = NetworkManager()
+        nm._peer_compression = "zlib"
+        message = _big_message()
+        line = nm._encode_line(message)
+        self.assertNotIn("game_start", line)
+        self.assertEqual(nm._parse_line(line), message)
+        self.assertGreater(nm.stats.compression_ratio, 3.0)
+        self.assertGreater(nm.stats.compress_time_ms, 0.0)
+
+        small = {"type": "input", "payload": {"dir": 1}}
+        self.assertLess(len(json.dumps(small)), config.NETWORK_COMPRESS_THRESHOLD)
+        self.assertEqual(json.loads(nm._encode_line(small)), small)
+
+    def test_handshake_enables_compression(self):
+        host, client = NetworkManager(), NetworkManager()
+        host_sock, client_sock = socket.socketpair()
+        try:
+            client._conn = client_sock
+            client._send_hello()
+            hello = host._parse_line(host_sock.recv(4096).decode('utf-8').strip())
+            self.assertEqual(hello["type"], "hello")
+            host._handle_hello(host_sock, hello["payload"])
+            self.assertEqual(host._peer_compression, "zlib")
+            ack = client._parse_line(client_sock.recv(4096).decode('utf-8').strip())
+            self.assertEqual(ack, {"type": "hello_ack", "payload": {"compression": "zlib"}})
+        finally:
+            host_sock.close()
+            client_sock.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
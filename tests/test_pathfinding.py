@@ -0,0 +1,92 @@
+import unittest
+import random
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game_engine.pathfinding import NavGrid, GridPathfinder, NavigationCache, los_penalty_for
+
+
+class TestPathfinding(unittest.TestCase):
+    def setUp(self):
+        # 10x6 网格，x=4 处有一道竖墙（最下面一行留出缺口）
+        self.nav = NavGrid(10, 6)
+        self.nav.build([(4, y) for y in range(5)], [], [], 1.5)
+        self.finder = GridPathfinder(10, 6)
+
+    def test_build_bumps_version_only_on_change(self):
+        version = self.nav.version
+        self.assertFalse(self.nav.build([(4, y) for y in range(5)], [], [], 1.5))
+        self.assertEqual(self.nav.version, version)
+        self.assertTrue(self.nav.build([(4, y) for y in range(4)], [], [], 1.5))
+        self.assertEqual(self.nav.version, version + 1)
+
+    def test_first_step_routes_through_gap(self):
+        step = self.finder.first_step(self.nav, self.nav.index(3, 0), self.nav.index(5, 0))
+        # 贴墙格代价较高，路径先离开墙边再绕行
+        self.assertEqual(self.nav.cell(step), (2, 0))
+        self.assertEqual(self.finder.first_step(self.nav, self.nav.index(3, 0), self.nav.index(3, 0)), -1)
+
+    def test_cache_keyed_on_version(self):
+        start, goal = self.nav.index(0, 0), self.nav.index(9, 0)
+        self.finder.first_step(self.nav, start, goal)
+        self.finder.first_step(self.nav, start, goal)
+        self.assertEqual(self.finder.stats["cache_hits"], 1)
+        self.nav.build([], [], [], 1.5)
+        self.finder.first_step(self.nav, start, goal)
+        self.assertEqual(self.finder.stats["searches"], 2)
+
+    def test_max_expansions_returns_partial_step(self):
+        step = self.finder.first_step(self.nav, self.nav.index(0, 0), self.nav.index(9, 0), max_expansions=3)
+        self.assertGreaterEqual(step, 0)
+        self.assertEqual(self.finder.stats["capped"], 1)
+
+    def test_unreachable_goal(self):
+        self.nav.build([(4, y) for y in range(6)], [], [], 1.5)
+        self.assertEqual(self.finder.first_step(self.nav, self.nav.index(0, 0), self.nav.index(9, 0)), -1)
+
+    def test_closest_free_cell(self):
+        self.assertEqual(self.nav.closest_free_cell(4, 0), (5, 0))
+        self.assertEqual(self.nav.closest_free_cell(0, 0), (0, 0))
+
+    def test_jps_matches_astar_cost_on_uniform_grid(self):
+        rng = random.Random(3)
+        for trial in range(200):
+            cols, rows = rng.randint(2, 12), rng.randint(2, 10)
+            nav = NavGrid(cols, rows)
+            nav.build([(x, y) for x in range(cols) for y in range(rows) if rng.random() < 0.3], [], [], 1.5)
+            nav.cost = [1.0] * nav.size
+            nav.uniform = True
+            free = [i for i in range(nav.size) if not nav.blocked[i]]
+            if len(free) < 2:
+                continue
+            start, goal = rng.sample(free, 2)
+            finder = GridPathfinder(cols, rows)
+            finder.first_step(nav, start, goal)
+            astar_cost = finder.last_cost
+            finder.first_step(nav, start, goal, use_jps=True)
+            self.assertEqual(finder.last_cost, astar_cost)
+
+
+    def test_navigation_cache_separates_los_penalties(self):
+        cache = NavigationCache()
+        normal, hell = los_penalty_for("normal"), los_penalty_for("hell")
+        self.assertIs(cache.get(10, 6, normal), cache.get(10, 6, normal))
+        normal_nav, _ = cache.get(10, 6, normal)
+        hell_nav, _ = cache.get(10, 6, hell)
+        self.assertIsNot(normal_nav, hell_nav)
+
+        # 同一帧内两种难度各自重建，代价图互不覆盖
+        cache.mark_dirty()
+        normal_nav.build([], [(5, 3)], [], normal)
+        hell_nav.build([], [(5, 3)], [], hell)
+        far = normal_nav.index(0, 3)  # 只受直线视野惩罚影响的格子
+        self.assertEqual(normal_nav.cost[far], 1.0 + normal)
+        self.assertEqual(hell_nav.cost[far], 1.0 + hell)
+        self.assertIsNot(cache.get(12, 6, normal)[0], normal_nav)  # 地图尺寸变化时重新创建
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.profiler import FrameProfiler, percentile
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_disabled_profiler_records_nothing(self):
+        profiler = FrameProfiler(window=10)
+        with profiler.section("ai"):
+            pass
+        self.assertIs(profiler.section("ai"), profiler.section("world"))  # 共享空上下文
+        profiler.end_frame()
+        self.assertEqual(profiler.frame, 0)
+        self.assertEqual(profiler.phases(), [])
+
+    def test_nested_sections_record_self_time(self):
+        profiler = FrameProfiler(window=10)
+        profiler.set_enabled(True)
+        with profiler.section("world"):
+            with profiler.section("collisions"):
+                time.sleep(0.02)
+        with profiler.section("ai"):
+            pass
+        profiler.end_frame()
+        summary = profiler.summary()
+        self.assertEqual(profiler.phases(), ["ai", "world", "collisions"])
+        self.assertGreaterEqual(summary["collisions"]["p50"], 15)
+        self.assertLess(summary["world"]["p50"], 10)  # 内层耗时已扣除
+        self.assertGreaterEqual(summary["frame"]["p50"], summary["collisions"]["p50"])
+
+    def test_rolling_percentiles_and_export(self):
+        profiler = FrameProfiler(window=100)
+        profiler.set_enabled(True)
+        for ms in range(1, 201):
+            profiler.add("ai", float(ms))
+            if ms % 2:
+                profiler.add("network", 1.0)
+            profiler.end_frame()
+        stats = profiler.summary()["ai"]
+        # 窗口只保留最近 100 帧（101..200）
+        self.assertEqual((stats["p50"], stats["p95"], stats["p99"]), (151.0, 196.0, 200.0))
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(profiler.export(os.path.join(tmp, "trace.csv")), newline="") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ["frame", "frame_ms", "network", "ai"])
+            self.assertEqual(len(rows), 201)
+            self.assertEqual(float(rows[2][2]), 0.0)  # 未出现的阶段记 0
+            with open(profiler.export(os.path.join(tmp, "trace.json")), encoding="utf-8") as f:
+                data = json.load(f)
+            self.assertEqual(data["frames"][-1]["ai"], 200.0)
+            self.assertIn("frame", data["summary"])
+
+
+    def test_host_tick_times_tank_physics_under_world(self):
+        import pygame
+        from unittest import mock
+        from src.game_engine.game import GameEngine
+        from src.utils.profiler import profiler as shared_profiler
+        pygame.init()
+        self.addCleanup(pygame.quit)
+        engine = GameEngine()
+        engine._setup_single_player_world()
+        phases = []
+        engine.player_tank.update = lambda: phases.append(shared_profiler._stack[-1]._name)
+        shared_profiler.set_enabled(True)
+        self.addCleanup(shared_profiler.set_enabled, False)
+        with mock.patch.object(engine.game_world, "update"):
+            engine._simulate_world_tick(host_physics=True)
+        self.assertEqual(phases, ["world"])
+
+
+if __name__ == '__main__':
+    unittest.main()
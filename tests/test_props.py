@@ -2,6 +2,7 @@ import unittest
 import pygame
 import sys
 import os
+from unittest.mock import patch
 
 # Add project root to sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -10,6 +11,7 @@ from src.game_engine.game_world import GameWorld
 from src.game_engine.tank import Tank
 from src.game_engine.wall import Wall
 from src.items.prop import Prop
+from src.config.game_config import config
 
 class TestProps(unittest.TestCase):
     def setUp(self):
@@ -74,5 +76,16 @@ class TestProps(unittest.TestCase):
         restored_wall = next((w for w in self.world.walls if w.x == 350 and w.y == 550), None)
         self.assertEqual(restored_wall.wall_type, Wall.BRICK)
 
+    def test_props_share_cached_images(self):
+        """Test spawned props reference shared images without disk I/O"""
+        manager = self.world.prop_manager
+        first = manager.spawn_prop(0, 0, prop_type=2)
+        with patch("pygame.image.load", side_effect=AssertionError("prop spawn must not load from disk")):
+            second = manager.spawn_prop(50, 0, prop_type=2)
+            other = manager.spawn_prop(100, 0, prop_type=6)
+        self.assertIs(first.image, second.image)
+        self.assertIsNot(first.image, other.image)
+        self.assertEqual(other.image.get_size(), (config.PROP_WIDTH, config.PROP_HEIGHT))
+
 if __name__ == '__main__':
     unittest.main()
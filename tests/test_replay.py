@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.game_engine.replay import ACTION_SHOOT, ACTION_STOP, Replay, ReplayRecorder, play_replay
+from src.game_engine.tank import Tank
+
+
+class _FakeEngine:
+    """记录重放调用顺序的引擎替身（第 game_over_at 帧后结束对局）。"""
+
+    def __init__(self, game_over_at=None):
+        self.calls = []
+        self.game_over_at = game_over_at
+        self.game_world = SimpleNamespace(game_over=False, winner=None, consume_events=lambda: [])
+
+    def setup_replay(self, header):
+        self.calls.append(("setup", header["seed"]))
+
+    def _apply_player_action(self, player_id, action):
+        self.calls.append(("action", player_id, action))
+
+    def _simulate_world_tick(self, host_physics=False):
+        self.calls.append(("tick", host_physics))
+
+    def _update_match_rules(self):
+        # 关卡模式的目标得分/时间限制在规则检查中结束对局
+        self.calls.append(("rules",))
+        ticks = sum(1 for call in self.calls if call[0] == "tick")
+        if self.game_over_at is not None and ticks >= self.game_over_at:
+            self.game_world.game_over = True
+            self.game_world.winner = "player"
+
+
+def _record(ticks):
+    recorder = ReplayRecorder({"seed": 42, "physics": "host", "players": [1, 2]})
+    for actions in ticks:
+        for player_id, action in actions:
+            recorder.record(player_id, action)
+        recorder.end_tick()
+    return recorder
+
+
+class TestReplay(unittest.TestCase):
+    def test_round_trip_and_run_length_encoding(self):
+        ticks = [[(1, Tank.UP), (2, ACTION_STOP)]] * 300 + [[(1, ACTION_SHOOT), (1, Tank.LEFT)]] + [[]] * 50
+        recorder = _record(ticks)
+        self.assertEqual(recorder.ticks, len(ticks))
+        self.assertEqual(len(recorder._records), 3)  # 按住同一方向的 300 帧只占一条记录
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = recorder.save(os.path.join(tmp, "sub", "match.twr"))
+            replay = Replay.load(path)
+        self.assertEqual(replay.header["seed"], 42)
+        self.assertEqual(replay.header["ticks"], len(ticks))
+        self.assertEqual(replay.ticks, len(ticks))
+        self.assertEqual(list(replay.iter_ticks()), ticks)
+        self.assertLess(len(recorder.to_bytes()), 150)
+
+    def test_rejects_foreign_files(self):
+        with self.assertRaises(ValueError):
+            Replay.from_bytes(b"PNG\x00" + b"\x00" * 16)
+
+    def test_playback_applies_actions_in_recorded_order(self):
+        replay = Replay.from_bytes(_record([[(2, ACTION_SHOOT), (1, Tank.DOWN)]] * 5).to_bytes())
+        engine = _FakeEngine(game_over_at=3)
+        stats = play_replay(replay, engine, timing=True)
+        self.assertEqual(engine.calls[0], ("setup", 42))
+        self.assertEqual(engine.calls[1:5], [("action", 2, ACTION_SHOOT), ("action", 1, Tank.DOWN), ("tick", True),
+                                             ("rules",)])
+        self.assertEqual(stats["ticks"], 3)
+        self.assertEqual(len(stats["tick_ms"]), 3)
+        self.assertEqual(stats["winner"], "player")
+
+        engine = _FakeEngine(game_over_at=3)
+        self.assertEqual(play_replay(replay, engine, stop_on_game_over=False)["ticks"], 5)
+
+
+class TestReplaySetup(unittest.TestCase):
+    def setUp(self):
+        import pygame
+        from src.game_engine.game import GameEngine
+        pygame.init()
+        self.addCleanup(pygame.quit)
+        self.engine = GameEngine()
+
+    def test_refuses_replay_when_map_hash_differs(self):
+        header = {"seed": 7, "physics": "single", "map_name": "default", "level": 1,
+                  "players": [1], "local_player_id": 1}
+        self.engine.setup_replay(dict(header, map_hash=None))
+        from src.utils.map_cache import map_content_hash
+        recorded_hash = map_content_hash(self.engine.map_data)
+        self.engine.setup_replay(dict(header, map_hash=recorded_hash))  # 同一关卡地图可以重放
+        with self.assertRaises(ValueError):
+            self.engine.setup_replay(dict(header, map_hash="0" * 64))
+
+    def test_level_clock_follows_simulated_ticks(self):
+        header = {"seed": 7, "physics": "single", "map_name": "default", "level": 1,
+                  "players": [1], "local_player_id": 1}
+        self.engine.setup_replay(header)
+        for _ in range(120):
+            self.engine._simulate_world_tick()
+        self.assertEqual(self.engine._level_clock_ms(), 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.game_config import config
+from src.utils.resource_manager import ResourceManager
+
+
+def _fresh_manager():
+    """绕过单例，得到一个未加载任何资源的实例。"""
+    manager = object.__new__(ResourceManager)
+    manager._initialized = False
+    manager.__init__()
+    return manager
+
+
+class TestParallelPreload(unittest.TestCase):
+    def setUp(self):
+        self.manager = _fresh_manager()
+        self.decode_threads = set()
+        self.finalized = []
+
+        def fake_decode(kind, path):
+            self.decode_threads.add(threading.current_thread().name)
+            return path
+
+        def fake_finalize(kind, key, data, path):
+            self.assertEqual(data, path)
+            self.finalized.append((kind, key))
+
+        patches = [
+            mock.patch.object(config, "SPRITE_CACHE", False),
+            mock.patch.object(ResourceManager, "_decode_asset", staticmethod(fake_decode)),
+            mock.patch.object(self.manager, "_finalize_asset", side_effect=fake_finalize),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_jobs_cover_every_tank_variant_and_sound(self):
+        jobs = self.manager._collect_preload_jobs()
+        tank_keys = {key[:3] for kind, key, _ in jobs if kind == "tank"}
+        for tank_type, folder, prefix in (("player", "palyer", "p"), ("enemy", "enemy", "e")):
+            root = os.path.join(self.manager.base_path, "tank_images", folder)
+            for skin in os.listdir(root):
+                for level_dir in os.listdir(os.path.join(root, skin)):
+                    level = int(level_dir.split("_")[1])
+                    self.assertIn((tank_type, int(skin[len(prefix):]), level), tank_keys)
+        sound_keys = {key for kind, key, _ in jobs if kind == "sound"}
+        self.assertEqual(sound_keys, set(ResourceManager.SOUND_FILES))
+        self.assertTrue(all(os.path.exists(path) for _, _, path in jobs))
+
+    def test_budgeted_pump_finalizes_in_order(self):
+        self.manager.start_preload()
+        self.manager._preload_executor.shutdown(wait=True)  # 等解码全部完成，便于断言批次
+        total = self.manager._preload_total
+        self.assertGreater(total, 50)
+
+        # 预算为 0 时每次只处理一个素材
+        self.assertFalse(self.manager.pump_preload(budget_ms=0))
+        self.assertEqual(len(self.finalized), 1)
+        self.assertAlmostEqual(self.manager.get_preload_progress(), 1 / total)
+        self.assertIn(f"1/{total}", self.manager.get_preload_status())
+        self.assertFalse(self.manager.is_preload_complete())
+
+        self.assertTrue(self.manager.pump_preload(budget_ms=1000))
+        self.assertTrue(self.manager.is_preload_complete())
+        self.assertEqual(len(self.finalized), total)
+        expected = [(kind, key) for kind, key, _ in self.manager._collect_preload_jobs()]
+        self.assertEqual(self.finalized, expected)
+        self.assertTrue(all(name.startswith("AssetLoader") for name in self.decode_threads))
+
+    def test_preload_all_blocks_until_done(self):
+        self.manager.preload_all()
+        self.assertTrue(self.manager.is_preload_complete())
+        self.assertEqual(self.manager.get_preload_status(), "资源加载完成")
+        self.manager.start_preload()  # 已完成时不再重复提交
+        self.assertIsNone(self.manager._preload_jobs)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.ui.screen_manager import ScreenManager
+
+
+def _bare_manager():
+    """不创建窗口与 UI 管理器的 ScreenManager，只测试状态机。"""
+    manager = ScreenManager.__new__(ScreenManager)
+    manager.screens = {}
+    manager._screen_factories = {}
+    manager.current_state = "menu"
+    manager.ui_manager = mock.Mock()
+    manager.game_engine = None
+    return manager
+
+
+class TestLazyScreens(unittest.TestCase):
+    def test_screen_is_built_on_first_set_state(self):
+        manager = _bare_manager()
+        built = []
+
+        def factory():
+            built.append(1)
+            return mock.Mock()
+
+        manager.register_screen_factory("menu", mock.Mock)
+        manager.register_screen_factory("settings", factory)
+        self.assertEqual(built, [])
+        manager.set_state("settings")
+        self.assertNotIn("menu", manager.screens)  # 离开尚未创建的屏幕不会构造它
+        screen = manager.screens["settings"]
+        screen.on_enter.assert_called_once()
+        manager.set_state("menu")
+        screen.on_exit.assert_called_once()
+        manager.set_state("settings")
+        self.assertEqual(built, [1])  # 只构造一次
+        self.assertIs(manager.get_screen("settings"), screen)
+        with self.assertRaises(ValueError):
+            manager.set_state("unknown")
+
+    def test_default_screens_are_registered_without_construction(self):
+        manager = _bare_manager()
+        manager._init_default_screens()
+        self.assertEqual(manager.screens, {})
+        for state in ("menu", "loading", "game", "game_over", "map_editor", "level_select", "settings"):
+            self.assertIn(state, manager._screen_factories)
+
+        # 直接注册的实例优先于尚未执行的构造函数
+        instance = mock.Mock()
+        manager.register_screen("map_editor", instance)
+        self.assertIs(manager.get_screen("map_editor"), instance)
+        self.assertNotIn("map_editor", manager._screen_factories)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import random
+import unittest
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.state_sync.snapshot_codec import (
+    decode_snapshot, dequantize_position, encode_snapshot, quantize_position,
+    read_varint, unzigzag, write_varint, zigzag,
+)
+
+
+def _snapshot():
+    return {
+        "ts": 1700000000.125,
+        "tanks": [
+            {"id": 1, "type": "player", "x": 100, "y": 1020, "dir": 3, "vx": -3, "vy": 0, "hp": 100,
+             "shield": True, "skin": 2, "level": 1, "has_boat": True, "is_on_river": False, "active": True},
+            {"id": 12, "type": "enemy", "x": 1370, "y": 0, "dir": 2, "vx": 0, "vy": 2, "hp": 50,
+             "shield": False, "skin": 1, "level": 0, "has_boat": False, "is_on_river": False, "active": True},
+            {"id": 13, "type": "enemy", "active": False, "hp": 0},
+        ],
+        "my_tank": None,
+        "bullets": [{"nid": 7, "x": -3, "y": 1049, "dir": 1, "owner": 1},
+                    {"nid": None, "x": 700, "y": 20, "dir": 0, "owner": -1}],
+        "exps": [{"nid": 8, "x": -10, "y": 400, "r": 18, "d": 18, "e": 5}],
+        "stars": [{"nid": 9, "x": 650, "y": 0, "d": 60, "e": 59}],
+        "respawn": {"lives": {1: 3, 12: 0}, "timers": {12: 90}},
+        "walls": None,
+        "props": [{"nid": 1, "type": 3, "x": 200, "y": 200}],
+        "events": [],
+        "meta": {"over": False, "win": None},
+    }
+
+
+class TestSnapshotCodec(unittest.TestCase):
+    def test_varint_and_zigzag_round_trip(self):
+        for value in (0, 1, -1, 63, -64, 127, 128, 300, -300, 2 ** 40, -(2 ** 40)):
+            self.assertEqual(unzigzag(zigzag(value)), value)
+            buf = bytearray()
+            write_varint(buf, zigzag(value))
+            self.assertEqual(read_varint(bytes(buf), 0), (zigzag(value), len(buf)))
+        self.assertEqual([zigzag(v) for v in (0, -1, 1, -2)], [0, 1, 2, 3])
+
+    def test_positions_are_lossless_on_world(self):
+        # 整数与 1/32 像素倍数的坐标在 1400x1050 世界内无损
+        for value in list(range(-64, 1400 + 64)) + [12.5, 0.03125, 1049.96875]:
+            self.assertEqual(dequantize_position(quantize_position(value)), value)
+        rng = random.Random(3)
+        for _ in range(200):
+            value = rng.uniform(0, 1400)
+            self.assertLessEqual(abs(dequantize_position(quantize_position(value)) - value), 1 / 64)
+
+    def test_snapshot_round_trip_preserves_gameplay_fields(self):
+        state = _snapshot()
+        original = json.loads(json.dumps(state))
+        packed = encode_snapshot(state)
+        self.assertEqual(json.loads(json.dumps(state)), original)  # 不修改主机快照
+        self.assertNotIn("tanks", packed)
+
+        decoded = decode_snapshot(json.loads(json.dumps(packed)))
+        self.assertEqual(decoded["tanks"], state["tanks"])
+        self.assertEqual(decoded["bullets"], state["bullets"])
+        self.assertEqual(decoded["exps"], state["exps"])
+        self.assertEqual(decoded["stars"], state["stars"])
+        self.assertEqual(decoded["respawn"], state["respawn"])
+        self.assertAlmostEqual(decoded["ts"], state["ts"], places=3)
+        self.assertEqual(decoded["props"], state["props"])
+        self.assertEqual(decoded["meta"], state["meta"])
+        self.assertLess(len(json.dumps(packed)), len(json.dumps(state)))
+
+    def test_my_tank_and_passthrough(self):
+        state = _snapshot()
+        state["my_tank"] = state["tanks"][0]
+        self.assertEqual(decode_snapshot(encode_snapshot(state))["my_tank"], state["tanks"][0])
+        plain = {"ts": 1.0, "meta": {}}
+        self.assertIs(decode_snapshot(plain), plain)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import sprite_cache
+from src.utils.sprite_cache import SpriteCache
+
+# 其他测试模块可能把 sys.modules['pygame'] 替换为 Mock，这里使用缓存模块自身引用的 pygame
+pygame = sprite_cache.pygame
+
+
+class TestSpriteCache(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.source = os.path.join(self.tmp.name, "images", "wall.png")
+        os.makedirs(os.path.dirname(self.source))
+        with open(self.source, "wb") as f:
+            f.write(b"png bytes")
+        self.cache_path = os.path.join(self.tmp.name, "cache", "sprites.bin")
+        self.surface = pygame.Surface((5, 3), pygame.SRCALPHA)
+        self.surface.fill((10, 20, 30, 128))
+        self.surface.set_at((4, 2), (200, 100, 0, 255))
+
+    def _saved_cache(self):
+        cache = SpriteCache(self.cache_path, self.tmp.name)
+        other = pygame.Surface((2, 2), pygame.SRCALPHA)
+        self.assertEqual(cache.save([("wall_1", self.source, "scale=5x3", self.surface),
+                                     ("wall_1_small", self.source, "scale=2x2", other)]), self.cache_path)
+        return SpriteCache(self.cache_path, self.tmp.name)
+
+    def test_round_trip_preserves_pixels(self):
+        cache = self._saved_cache()
+        self.assertEqual(cache.load(), 2)
+        restored = cache.get("wall_1", self.source, "scale=5x3")
+        self.assertEqual(restored.get_size(), (5, 3))
+        self.assertEqual(tuple(restored.get_at((0, 0))), (10, 20, 30, 128))
+        self.assertEqual(tuple(restored.get_at((4, 2))), (200, 100, 0, 255))
+        self.assertIsNone(cache.get("missing", self.source, "raw"))
+
+    def test_changed_source_or_op_misses(self):
+        cache = self._saved_cache()
+        cache.load()
+        self.assertIsNone(cache.get("wall_1", self.source, "scale=50x50"))  # 处理参数不同
+
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        cache = SpriteCache(self.cache_path, self.tmp.name)
+        cache.load()
+        self.assertIsNone(cache.get("wall_1", self.source, "scale=5x3"))  # 源文件已修改
+
+    def test_corrupt_or_truncated_file_is_ignored(self):
+        self._saved_cache()
+        with open(self.cache_path, "r+b") as f:
+            f.truncate(os.path.getsize(self.cache_path) - 4)
+        self.assertEqual(SpriteCache(self.cache_path, self.tmp.name).load(), 0)
+        with open(self.cache_path, "wb") as f:
+            f.write(b"garbage")
+        self.assertEqual(SpriteCache(self.cache_path, self.tmp.name).load(), 0)
+        self.assertEqual(SpriteCache(os.path.join(self.tmp.name, "none.bin"), self.tmp.name).load(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+import unittest
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from src.game_engine.bullet import Bullet
+from src.game_engine.game_object import GameObject
+from src.game_engine.game_world import GameWorld
+from src.game_engine.tank import Tank
+from src.game_engine.wall import Wall
+from src.network.network_manager import NetworkManager
+from src.state_sync.state_manager import StateManager
+
+
+class TestStateDelta(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.world = GameWorld(800, 600)
+        self.state_manager = StateManager()
+        self.state_manager.attach_world(self.world)
+        self.p1 = self.world.spawn_tank("player", 1, (100, 100))
+        self.p2 = self.world.spawn_tank("player", 2, (300, 100))
+
+    def test_version_bumps_on_state_changes(self):
+        tank = Tank(0, 0)
+        v = tank.version
+        tank.move(Tank.RIGHT)
+        self.assertGreater(tank.version, v)
+        v = tank.version
+        tank.move(Tank.RIGHT)  # 方向未变，不算变化
+        self.assertEqual(tank.version, v)
+        tank.stop()
+        self.assertGreater(tank.version, v)
+        v = tank.version
+        tank.stop()
+        GameObject.update(tank)  # 静止时更新位置不改变版本
+        self.assertEqual(tank.version, v)
+        tank.activate_shield()
+        self.assertGreater(tank.version, v)
+
+        wall = Wall(0, 0, Wall.BRICK)
+        v = wall.version
+        wall.set_wall_type(Wall.STEEL)
+        self.assertGreater(wall.version, v)
+        self.assertFalse(wall.destructible)
+
+    def test_unchanged_tank_reuses_cached_encoding(self):
+        first = self.state_manager.encode_state()
+        second = self.state_manager.encode_state()
+        self.assertIs(first["tanks"][0], second["tanks"][0])
+        self.p1.move(Tank.DOWN)
+        third = self.state_manager.encode_state()
+        self.assertIsNot(second["tanks"][0], third["tanks"][0])
+
+    def test_delta_contains_only_changed_tanks(self):
+        self.state_manager.reset_send_clock()
+        keyframe = self.state_manager.build_snapshot()
+        self.assertNotIn("delta", keyframe)
+        self.assertEqual(len(keyframe["tanks"]), 2)
+
+        self.p2.move(Tank.LEFT)
+        delta = self.state_manager.build_snapshot()
+        self.assertTrue(delta["delta"])
+        self.assertEqual([t["id"] for t in delta["tanks"]], [2])
+        self.assertEqual(sorted(delta["tank_ids"]), [1, 2])
+
+    def test_client_merges_delta_and_skipped_snapshots(self):
+        self.state_manager.reset_send_clock()
+        keyframe = self.state_manager.build_snapshot()
+        self.p1.move(Tank.DOWN)
+        skipped = self.state_manager.build_snapshot()
+        self.p2.move(Tank.LEFT)
+        latest = self.state_manager.build_snapshot()
+
+        # 网络层丢弃旧快照时，把其中的坦克变化并入最新的增量快照
+        NetworkManager._fold_skipped_state(skipped, latest)
+        self.assertEqual(sorted(t["id"] for t in latest["tanks"]), [1, 2])
+
+        client = StateManager()
+        merged = client._merge_remote_tanks(keyframe)
+        self.assertEqual(set(merged), {1, 2})
+        merged = client._merge_remote_tanks({"delta": True, "tanks": [], "tank_ids": [2]})
+        self.assertEqual(set(merged), {2})
+
+    def test_id_maps_follow_add_and_remove(self):
+        self.assertIs(self.world.tank_id_map[1], self.p1)
+        respawned = self.world.spawn_tank("player", 1, (500, 100))
+        self.assertIs(self.world.tank_id_map[1], respawned)
+        self.world.remove_object(respawned)
+        self.assertIs(self.world.tank_id_map[1], self.p1)
+        self.world.remove_object(self.p1)
+        self.assertNotIn(1, self.world.tank_id_map)
+
+        wall = self.world.spawn_wall(0, 0, Wall.BRICK)
+        self.assertIs(self.world.wall_id_map[wall.wall_id], wall)
+        self.world.remove_object(wall)
+        self.assertNotIn(wall.wall_id, self.world.wall_id_map)
+
+    def test_decode_reconciles_entities_in_place(self):
+        bullet = Bullet(110, 90, Tank.UP, owner=self.p1)
+        self.world.add_object(bullet)
+        self.world.trigger_explosion((200, 200))
+
+        client_world = GameWorld(800, 600)
+        client_world.is_client_mode = True
+        client = StateManager()
+        client.attach_world(client_world)
+        client.decode_state(self.state_manager.encode_state())
+        client_bullet = client_world.bullets[0]
+        client_exp = client_world.explosions[0]
+
+        bullet.update()
+        self.world.explosions[0].update()
+        self.world.add_object(Bullet(310, 90, Tank.UP, owner=self.p2))
+        client.decode_state(self.state_manager.encode_state())
+        self.assertIs(client_world.bullets[0], client_bullet)
+        self.assertEqual((client_bullet.x, client_bullet.y), (bullet.x, bullet.y))
+        self.assertEqual(len(client_world.bullets), 2)
+        self.assertIs(client_world.explosions[0], client_exp)
+        self.assertEqual(client_exp.elapsed, 1)
+
+        self.world.remove_object(bullet)
+        client.decode_state(self.state_manager.encode_state())
+        self.assertNotIn(client_bullet, client_world.bullets)
+        self.assertNotIn(client_bullet, client_world.game_objects)
+
+    def test_wall_cells_sent_only_on_change_and_applied_as_diff(self):
+        brick = self.world.spawn_wall(100, 200, Wall.BRICK)
+        steel = self.world.spawn_wall(150, 200, Wall.STEEL)
+        self.state_manager.reset_send_clock()
+        keyframe = self.state_manager.build_snapshot()
+        self.assertIsNotNone(keyframe["walls"])
+        self.assertIsNone(self.state_manager.build_snapshot()["walls"])
+
+        client_world = GameWorld(800, 600)
+        client_brick = client_world.spawn_wall(100, 200, Wall.BRICK)
+        client_world.spawn_wall(150, 200, Wall.STEEL)
+        client = StateManager()
+        client.attach_world(client_world)
+        client._apply_wall_cells(keyframe["walls"])
+
+        brick.destroy()
+        steel.set_wall_type(Wall.BRICK)
+        self.world.spawn_wall(200, 200, Wall.GRASS)
+        delta = self.state_manager.build_snapshot()
+        self.assertEqual(delta["walls"]["v"], keyframe["walls"]["v"] + 1)
+
+        client._apply_wall_cells(delta["walls"])
+        self.assertFalse(client_brick.active)
+        self.assertEqual(
+            sorted((w.x, w.wall_type) for w in client_world.walls if w.active),
+            [(150, Wall.BRICK), (200, Wall.GRASS)],
+        )
+
+    def test_runtime_walls_use_host_ids_on_client(self):
+        client_world = GameWorld(800, 600)
+        client_world.spawn_wall(100, 200, Wall.BRICK)
+        client_world.spawn_wall(150, 200, Wall.BRICK)  # 客户端本地占用的ID与主机不同
+        client_world.spawn_wall(150, 250, Wall.BRICK)
+        self.world.next_wall_id = 40
+        client = StateManager()
+        client.attach_world(client_world)
+
+        # 主机对局中生成的墙体（如基地强化），客户端此前没有
+        host_wall = self.world.spawn_wall(300, 300, Wall.STEEL)
+        self.world.runtime_wall_ids.add(host_wall.wall_id)
+        # 客户端已在本地生成、但ID与主机不一致的墙体
+        client_local = client_world.spawn_wall(400, 300, Wall.STEEL)
+        client_world.runtime_wall_ids.add(client_local.wall_id)
+        host_twin = self.world.spawn_wall(400, 300, Wall.STEEL, wall_id=2)
+        self.world.runtime_wall_ids.add(host_twin.wall_id)
+
+        self.state_manager.reset_send_clock()
+        client._apply_wall_cells(self.state_manager.build_snapshot()["walls"], force=True)
+
+        spawned = client_world.wall_id_map[host_wall.wall_id]
+        self.assertEqual((spawned.x, spawned.y, spawned.wall_type), (300, 300, Wall.STEEL))
+        self.assertIs(client_world.wall_id_map[2], client_local)  # 本地墙改用主机ID
+        moved = next(w for w in client_world.walls if (w.x, w.y) == (150, 200))
+        self.assertIs(client_world.wall_id_map[moved.wall_id], moved)  # 被占用ID的墙换用新ID
+        self.assertNotIn(moved.wall_id, (2, host_wall.wall_id))
+        self.assertEqual(len(client_world.wall_id_map), len(client_world.walls))
+        self.assertGreater(client_world.next_wall_id, host_wall.wall_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config.game_config import config
+from src.state_sync.state_manager import StateManager
+
+
+class TestStateSendRate(unittest.TestCase):
+    def setUp(self):
+        self.state_manager = StateManager()
+        self.state_manager.attach_world(MagicMock())
+        self.state_manager.encode_state = MagicMock(return_value={"ts": 0})
+
+    def test_send_ticks_follow_rate(self):
+        for rate in (20, 30, 60):
+            self.state_manager.set_send_rate(rate)
+            sends = sum(1 for _ in range(config.SIMULATION_FPS) if self.state_manager.should_send())
+            self.assertEqual(sends, rate)
+
+    def test_constructor_rate_is_clamped(self):
+        self.assertEqual(StateManager(0).send_rate, 1)
+        self.assertEqual(StateManager(-5).send_rate, 1)
+        self.assertEqual(StateManager(config.SIMULATION_FPS * 4).send_rate, config.SIMULATION_FPS)
+        self.assertEqual(StateManager().send_rate, max(1, min(config.NETWORK_SEND_RATE, config.SIMULATION_FPS)))
+
+    def test_first_tick_sends_after_reset(self):
+        self.state_manager.set_send_rate(20)
+        self.state_manager.reset_send_clock()
+        self.assertTrue(self.state_manager.should_send())
+        self.assertFalse(self.state_manager.should_send())
+
+    def test_update_does_not_encode(self):
+        for _ in range(10):
+            self.state_manager.update()
+        self.state_manager.encode_state.assert_not_called()
+
+    def test_events_accumulate_until_send(self):
+        self.state_manager.capture_events([{"type": "a"}])
+        self.state_manager.capture_events([])
+        self.state_manager.capture_events([{"type": "b"}])
+        self.assertEqual([e["type"] for e in self.state_manager._captured_events], ["a", "b"])
+        state = self.state_manager.build_snapshot()
+        self.assertIs(self.state_manager.latest_snapshot, state)
+        self.assertEqual(self.state_manager._captured_events, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import texture_atlas
+from src.utils.texture_atlas import SpriteBatch, TextureAtlas
+
+# 其他测试模块可能把 sys.modules['pygame'] 替换为 Mock，这里使用图集模块自身引用的 pygame
+pygame = texture_atlas.pygame
+
+
+def _sprite(size, color):
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill(color)
+    return surface
+
+
+class TestTextureAtlas(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def test_shelf_packing_and_page_overflow(self):
+        atlas = TextureAtlas(page_size=64, padding=1)
+        sprites = [_sprite((30, 30), (index * 40, 0, 0, 255)) for index in range(5)]
+        self.assertEqual(atlas.add_many(sprites + [sprites[0]]), 5)  # 重复的图片只入集一次
+        self.assertEqual(len(atlas), 5)
+        self.assertEqual(len(atlas.pages), 2)  # 64 见方每页只容纳 2x2 个 30x30
+
+        rects = [atlas.region(sprite)[1] for sprite in sprites[:4]]
+        for i, rect in enumerate(rects):
+            for other in rects[i + 1:]:
+                self.assertFalse(rect.colliderect(other))
+        page, rect = atlas.region(sprites[4])
+        self.assertIs(page, atlas.pages[1])
+        self.assertEqual(tuple(page.get_at(rect.topleft)), (160, 0, 0, 255))
+
+    def test_rejects_oversized_and_surface_alpha(self):
+        atlas = TextureAtlas(page_size=32)
+        self.assertFalse(atlas.add(_sprite((40, 10), (1, 2, 3, 255))))
+        faded = pygame.Surface((10, 10))
+        faded.set_alpha(128)
+        self.assertFalse(atlas.add(faded))
+        self.assertEqual(len(atlas), 0)
+
+    def test_batch_matches_individual_blits(self):
+        atlas = TextureAtlas(page_size=128)
+        tank = _sprite((30, 30), (10, 200, 10, 255))
+        shield = _sprite((30, 30), (0, 0, 255, 100))
+        loose = _sprite((8, 8), (250, 250, 0, 255))  # 未入图集的图片
+        atlas.add_many([tank, shield])
+
+        expected = pygame.Surface((100, 60), pygame.SRCALPHA)
+        actual = expected.copy()
+        draws = [(tank, (5, 5)), (shield, (5, 5)), (loose, (40.6, 10)), (tank, (60, 20))]
+        for source, dest in draws:
+            expected.blit(source, dest)
+
+        batch = SpriteBatch(atlas)
+        for source, dest in draws:
+            batch.blit(source, dest)
+        batch.blit(tank, (0, 40), pygame.Rect(20, 0, 50, 10))  # 区域裁剪在原图范围内
+        expected.blit(tank, (0, 40), pygame.Rect(20, 0, 50, 10))
+        self.assertIs(batch.items[0][0], atlas.pages[0])
+        batch.flush(actual)
+        self.assertEqual((batch.items, batch.submitted), ([], 5))
+
+        for x in range(0, 100, 3):
+            for y in range(0, 60, 3):
+                self.assertEqual(actual.get_at((x, y)), expected.get_at((x, y)), (x, y))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from src.ui.video_manager import VideoAsset, VideoAssetCache, VideoPlaybackController
+
+
+def _asset(name, resident_bytes=1000):
+    asset = VideoAsset(name, [], 15, frame_count=30, size=(16, 16))
+    asset.resident_bytes = resident_bytes
+    return asset
+
+
+class TestVideoAssetCache(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def test_evicts_least_recently_played_within_budget(self):
+        one_clip = 1000
+        cache = VideoAssetCache(budget_bytes=one_clip * 2)
+        cache["a"] = _asset("a")
+        cache["b"] = _asset("b")
+        cache.touch("a")  # a 最近播放过
+        cache["c"] = _asset("c")
+        self.assertEqual(list(cache), ["a", "c"])
+        self.assertEqual(cache.total_bytes, one_clip * 2)
+        self.assertEqual(cache.evictions, 1)
+
+        cache.pinned = "a"  # 正在播放的资源不淘汰
+        cache["d"] = _asset("d")
+        self.assertEqual(list(cache), ["a", "d"])
+        del cache["a"]
+        self.assertEqual(cache.total_bytes, one_clip)
+
+    def test_prefetch_hint_loads_on_background_thread(self):
+        controller = VideoPlaybackController("/nonexistent-video-dir")
+        filename = controller.DEFAULT_CONFIG["grenade_pickup"]["file"]
+        threads = []
+
+        def fake_prepare(name):
+            threads.append(threading.current_thread().name)
+            return _asset(name)
+
+        with mock.patch.object(controller, "_prepare_prefetch", side_effect=fake_prepare), \
+                mock.patch.object(controller, "_load_asset") as load_asset:
+            controller.prefetch("grenade_pickup")
+            controller.prefetch("grenade_pickup")
+            controller.prefetch("unknown_event")
+            self.assertEqual(list(controller._prefetch_futures), [filename])
+            controller._prefetch_futures[filename].result(timeout=5)
+            controller.update(1)
+            load_asset.assert_not_called()  # 主线程只收取结果，不加载
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("VideoLoader"))
+        self.assertEqual(controller._prefetch_futures, {})
+        report = controller.get_memory_report()
+        self.assertEqual(report[0]["file"], filename)
+        self.assertEqual(report[0]["kind"], "frames")
+        self.assertEqual(controller.get_preload_status()["resident_bytes"], report[0]["bytes"])
+
+    def test_duplicate_prefetch_result_is_released(self):
+        controller = VideoPlaybackController("/nonexistent-video-dir")
+        filename = controller.DEFAULT_CONFIG["grenade_pickup"]["file"]
+        prefetched = _asset(filename)
+        prefetched.release = mock.Mock()
+        with mock.patch.object(controller, "_prepare_prefetch", return_value=prefetched):
+            controller.prefetch("grenade_pickup")
+            controller._prefetch_futures[filename].result(timeout=5)
+        loaded = _asset(filename)
+        controller.assets[filename] = loaded  # play() 已抢先加载
+        controller.update(1)
+        self.assertIs(controller.assets[filename], loaded)
+        prefetched.release.assert_called_once()
+
+    def test_prefetch_of_missing_file_leaves_loading_to_play(self):
+        controller = VideoPlaybackController("/nonexistent-video-dir")
+        controller.prefetch("grenade_pickup")
+        future = next(iter(controller._prefetch_futures.values()))
+        self.assertIsNone(future.result(timeout=5))
+        controller.update(1)
+        self.assertEqual(len(controller.assets), 0)
+        self.assertFalse(controller._backend_checked)  # 没有需要解码的文件时不导入 moviepy
+
+    def test_scaled_frame_is_reused_until_frame_or_size_changes(self):
+        from src.ui import video_manager
+        surface_cls = video_manager.pygame.Surface  # 与被测模块使用同一个 pygame
+        controller = VideoPlaybackController("/nonexistent-video-dir")
+        frame_a, frame_b = surface_cls((32, 18), 0, 32), surface_cls((32, 18), 0, 32)
+        scaled = controller._scaled_frame(frame_a, (64, 36))
+        self.assertEqual(scaled.get_size(), (64, 36))
+        self.assertIs(controller._scaled_frame(frame_a, (64, 36)), scaled)
+        self.assertEqual(controller.scale_count, 1)
+        # 下一帧复用同一目标 Surface
+        self.assertIs(controller._scaled_frame(frame_b, (64, 36)), scaled)
+        self.assertEqual(controller.scale_count, 2)
+        self.assertEqual(controller._scaled_frame(frame_b, (128, 72)).get_size(), (128, 72))
+        self.assertIs(controller._scaled_frame(frame_b, (32, 18)), frame_b)  # 尺寸一致不缩放
+        controller.invalidate_scaled_frames()
+        controller._scaled_frame(frame_b, (128, 72))
+        self.assertEqual(controller.scale_count, 4)
+
+        # 带透明通道的帧缩放后仍然透明，且不复用不透明的目标 Surface
+        translucent = surface_cls((32, 18), video_manager.pygame.SRCALPHA, 32)
+        translucent.fill((255, 0, 0, 64))
+        scaled_alpha = controller._scaled_frame(translucent, (128, 72))
+        self.assertTrue(scaled_alpha.get_flags() & video_manager.pygame.SRCALPHA)
+        self.assertEqual(scaled_alpha.get_at((10, 10)).a, 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
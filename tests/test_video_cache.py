@@ -0,0 +1,100 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from src.config.game_config import config
+from src.ui.video_manager import VideoInstance, VideoPlaybackController
+from src.utils.video_cache import VideoFrameCache, file_cache_key
+
+SIZE = (6, 4)
+
+
+def _frames(count):
+    return [bytes([index, 255 - index, 0]) * (SIZE[0] * SIZE[1]) for index in range(count)]
+
+
+class TestVideoFrameCache(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.video_path = os.path.join(self.tmp.name, "clip.mp4")
+        with open(self.video_path, "wb") as f:
+            f.write(b"fake video bytes")
+
+    def test_store_and_map_frames(self):
+        cache = VideoFrameCache(os.path.join(self.tmp.name, "cache"))
+        key = file_cache_key(self.video_path)
+        self.assertIsNone(cache.load(key))
+        self.assertIsNotNone(cache.store(key, iter(_frames(20)), SIZE, 15, max_frames=12))
+
+        frames = cache.load(key)
+        self.assertEqual((frames.frame_count, frames.size, frames.fps), (12, SIZE, 15))
+        self.assertEqual(tuple(frames.surface(7).get_at((5, 3)))[:3], (7, 248, 0))
+        self.assertIs(frames.surface(7), frames.surface(7))
+        self.assertEqual(tuple(frames.surface(99).get_at((0, 0)))[:3], (11, 244, 0))  # 越界取最后一帧
+        frames.close()
+
+        # 源文件变化后键不同，旧缓存不再命中
+        with open(self.video_path, "ab") as f:
+            f.write(b"!")
+        self.assertNotEqual(file_cache_key(self.video_path), key)
+
+    def test_truncated_cache_is_ignored(self):
+        cache = VideoFrameCache(os.path.join(self.tmp.name, "cache"))
+        key = file_cache_key(self.video_path)
+        entry = cache.store(key, iter(_frames(4)), SIZE, 15)
+        with open(os.path.join(entry, "frames.rgb"), "r+b") as f:
+            f.truncate(10)
+        self.assertIsNone(cache.load(key))
+        # 尺寸不符的帧不会写出半成品
+        self.assertIsNone(cache.store("bad", iter([b"\x00" * 5]), SIZE, 15))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, "cache", "bad")))
+
+    def test_key_for_rehashes_only_when_file_changes(self):
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        key = VideoFrameCache(cache_dir).key_for(self.video_path)
+        self.assertEqual(key, file_cache_key(self.video_path))
+        # 新实例从 keys.json 读取记录，大小与 mtime 未变时不再读取源文件
+        with mock.patch("src.utils.video_cache.file_cache_key") as rehash:
+            self.assertEqual(VideoFrameCache(cache_dir).key_for(self.video_path), key)
+        rehash.assert_not_called()
+
+        with open(self.video_path, "ab") as f:
+            f.write(b"!")
+        cache = VideoFrameCache(cache_dir)
+        new_key = cache.key_for(self.video_path)
+        self.assertNotEqual(new_key, key)
+        self.assertEqual(new_key, file_cache_key(self.video_path))
+
+    def test_zero_frame_entry_is_a_cache_hit(self):
+        cache = VideoFrameCache(os.path.join(self.tmp.name, "cache"))
+        key = file_cache_key(self.video_path)
+        self.assertIsNotNone(cache.store(key, iter([]), SIZE, 15))
+        frames = cache.load(key)
+        self.assertIsNotNone(frames)
+        self.assertEqual(frames.frame_count, 0)
+        frames.close()
+
+    def test_controller_plays_from_cache_without_decoder(self):
+        cache_dir = os.path.join(self.tmp.name, "cache")
+        VideoFrameCache(cache_dir).store(file_cache_key(self.video_path), iter(_frames(30)), SIZE, 15)
+        with mock.patch.object(config, "VIDEO_CACHE_DIR", cache_dir), mock.patch.object(config, "VIDEO_CACHE", True):
+            controller = VideoPlaybackController(self.tmp.name)
+            asset = controller._load_asset("clip.mp4")
+        self.assertFalse(asset.placeholder)
+        self.assertEqual(asset.duration_ms, 2000)
+        instance = VideoInstance(asset, priority=1, area="screen")
+        frame = instance.current_frame(instance.start_ticks + 1000)
+        self.assertEqual(tuple(frame.get_at((0, 0)))[:3], (15, 240, 0))
+        asset.frame_store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import unittest
+
+# Add project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+from src.ui.video_manager import VideoAsset, VideoStream
+
+SIZE = (8, 4)
+
+
+def _wait(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestVideoStream(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.closed = False
+        self.decoded = 0
+
+    def _frames(self, count):
+        def open_frames():
+            try:
+                for index in range(count):
+                    self.decoded += 1
+                    yield bytes([index % 256, 0, 0]) * (SIZE[0] * SIZE[1])
+            finally:
+                self.closed = True
+        return open_frames
+
+    def test_buffer_is_bounded_and_frames_follow_playback(self):
+        stream = VideoStream(self._frames(100), SIZE, capacity=4)
+        self.assertTrue(_wait(lambda: stream.buffered() == 4))
+        time.sleep(0.05)
+        self.assertEqual(stream.buffered(), 4)  # 缓冲区满后解码线程等待
+        self.assertLessEqual(self.decoded, 5)
+
+        self.assertEqual(stream.frame(0).get_at((0, 0))[0], 0)
+        self.assertTrue(_wait(lambda: stream.buffered() == 4))
+        surface = stream.frame(3)  # 跳过过期的第 1、2 帧
+        self.assertEqual(surface.get_at((0, 0))[0], 3)
+        self.assertEqual(stream.dropped_frames, 2)
+        self.assertIs(stream.frame(3), surface)  # 同一帧不重复上传
+        stream.close()
+        self.assertTrue(_wait(lambda: stream.finished and self.closed))
+        self.assertEqual(stream.buffered(), 0)
+
+    def test_stream_stops_at_frame_limit(self):
+        stream = VideoStream(self._frames(100), SIZE, capacity=16, max_frames=10)
+        self.assertTrue(_wait(lambda: stream.finished))
+        self.assertEqual(stream.buffered(), 10)
+        self.assertEqual(stream.frame(50).get_at((0, 0))[0], 9)  # 取最后一帧
+        self.assertTrue(self.closed)
+
+    def test_streaming_asset_metadata(self):
+        asset = VideoAsset("clip.mp4", [], 15, stream_path="videos/clip.mp4", frame_count=30, size=(320, 180))
+        self.assertTrue(asset.streaming)
+        self.assertFalse(asset.placeholder)
+        self.assertEqual(asset.duration_ms, 2000)
+        self.assertEqual(asset.size, (320, 180))
+
+
+if __name__ == '__main__':
+    unittest.main()